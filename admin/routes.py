@@ -12,7 +12,8 @@ from fastapi import status
 from dependencies import get_db
 from auth import verify_token
 
-from asset_service import list_all_jobs_with_metadata
+from asset_service import JobListFilters, job_list_filters, list_all_jobs_with_metadata
+from json_response import FastJSONResponse
 from group_service import (
     create_group as create_group_record,
     get_group_or_404,
@@ -40,15 +41,19 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 def get_all_jobs(
     limit: int = Query(DEFAULT_JOB_LIST_LIMIT, ge=1, le=MAX_JOB_LIST_LIMIT),
     offset: int = Query(0, ge=0),
+    filters: JobListFilters = Depends(job_list_filters),
     db: Session = Depends(get_db),
     current_user=Depends(verify_token),
 ):
     """
-    List all non-deleted jobs for all users, ordered by submission time - most recent first.
+    List all non-deleted jobs for all users, ordered by submission time - most recent first
+    unless sort is given.
     Job group metadata comes from the job's persisted group_id, not from the
     owner's current group membership.
     :param limit: Maximum number of jobs to return, up to 100.
     :param offset: Number of sorted jobs to skip.
+    :param filters: Status, calculation_type, method, basis_set, and tag
+        filters and the sort order; see job_list_filters.
     :param db: Database session dependency.
     :param current_user: Current user dependency, verified via token.
     :return: List of serialized job details.
@@ -57,7 +62,15 @@ def get_all_jobs(
     if not has_admin_permission(user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
     try:
-        return list_all_jobs_with_metadata(db, limit=limit, offset=offset)
+        return FastJSONResponse(
+            list_all_jobs_with_metadata(
+                db,
+                *filters.criteria,
+                limit=limit,
+                offset=offset,
+                order_by=filters.order_by,
+            )
+        )
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -81,7 +94,7 @@ def get_all_users(
     if not has_admin_permission(user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
     try:
-        return list_users_for_admin(db, limit=limit, offset=offset)
+        return FastJSONResponse(list_users_for_admin(db, limit=limit, offset=offset))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -105,7 +118,7 @@ def get_all_groups(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
 
     try:
-        return list_groups_with_users(db, limit=limit, offset=offset)
+        return FastJSONResponse(list_groups_with_users(db, limit=limit, offset=offset))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -0,0 +1,131 @@
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARTIFACT_STORE_MAX_BYTES = 1024 * 1024 * 1024
+
+Parsed = TypeVar("Parsed")
+Stored = TypeVar("Stored")
+
+
+def write_directory_atomically(directory: Path, write_files: Callable[[Path], None]) -> None:
+    """
+    Call write_files on a sibling temporary directory and rename it to
+    directory, so readers never see a partly written artifact.
+    """
+    temp_directory = directory.with_name(
+        f"{directory.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    temp_directory.mkdir(parents=True, exist_ok=True)
+    try:
+        write_files(temp_directory)
+        os.replace(temp_directory, directory)
+    except OSError:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+        if directory.exists():
+            # Another worker process stored the same artifact first.
+            return
+        raise
+    except BaseException:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+        raise
+
+
+def _directory_size(directory: Path) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+
+class ArtifactStore(Generic[Parsed, Stored]):
+    """
+    Directory of ingested job artifacts, one subdirectory per key. Each key
+    is ingested at most once, even when several requests miss at the same
+    time; later reads open the stored files directly.
+    Every read touches the artifact's directory, and after each ingest the
+    least recently read artifacts are removed until the store fits in
+    max_bytes. A removed artifact is ingested again on its next read.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        write: Callable[[Parsed, Path], None],
+        open_stored: Callable[[Path], Stored],
+        max_bytes: Optional[int] = DEFAULT_ARTIFACT_STORE_MAX_BYTES,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._write = write
+        self._open = open_stored
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+
+    def get_or_ingest(self, key: str, load: Callable[[], Parsed]) -> Stored:
+        directory = self.root / key
+        if directory.exists():
+            self._touch(directory)
+            return self._open(directory)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if not directory.exists():
+                self._write(load(), directory)
+                self._evict(keep=directory)
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return self._open(directory)
+
+    def _touch(self, directory: Path) -> None:
+        try:
+            os.utime(directory)
+        except OSError:
+            # Removed by another worker since the existence check.
+            pass
+
+    def _stored_artifacts(self) -> List[Tuple[float, int, Path]]:
+        artifacts = []
+        for entry in os.scandir(self.root):
+            if not entry.is_dir() or entry.name.endswith(".tmp"):
+                continue
+            try:
+                artifacts.append(
+                    (entry.stat().st_mtime, _directory_size(Path(entry.path)), Path(entry.path))
+                )
+            except OSError:
+                continue
+        return artifacts
+
+    def _evict(self, keep: Path) -> None:
+        """
+        Remove the least recently read artifacts other than keep until the
+        store fits in max_bytes. Directories are renamed away before removal,
+        so readers never see a partly removed artifact.
+        """
+        if self.max_bytes is None:
+            return
+
+        artifacts = sorted(self._stored_artifacts())
+        total = sum(size for _read_at, size, _path in artifacts)
+        for _read_at, size, path in artifacts:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            doomed = path.with_name(
+                f"{path.name}.{os.getpid()}.{threading.get_ident()}.evicted.tmp"
+            )
+            try:
+                os.replace(path, doomed)
+            except OSError:
+                # Another worker removed it first.
+                continue
+            shutil.rmtree(doomed, ignore_errors=True)
+            total -= size
+            logger.info("Evicted stored artifact %s", path)
@@ -1,18 +1,46 @@
-from typing import Any, Callable, Dict, Iterable, List, Optional, Type, TypeVar
-from uuid import UUID
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type, TypeVar
+from uuid import UUID, uuid4
 
-from fastapi import HTTPException, status
-from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from fastapi import HTTPException, Query, status
+from sqlalchemy import (
+    JSON,
+    String,
+    column,
+    delete,
+    func,
+    literal_column,
+    select,
+    table,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session, joinedload, selectinload
 
-from enum_types import AssetOwnership
+from enum_types import JOB_STATUSES, AssetOwnership, CalculationType
 from permissions import (
     can_change_asset_visibility,
     can_delete_asset,
     can_transfer_asset_ownership,
+    can_write_asset,
     is_admin,
+    readable_assets_clause,
+    writable_assets_clause,
+)
+from models import (
+    SEARCH_CONFIG,
+    Asset,
+    Group,
+    Job,
+    Structure,
+    Tags,
+    User,
+    jobs_structures,
+    jobs_tags,
 )
-from models import Asset, Group, Job, Structure, Tags, User
+from tag_usage import mark_tag_usage_stale
 from utils import (
     DEFAULT_JOB_LIST_LIMIT,
     DEFAULT_STRUCTURE_LIST_LIMIT,
@@ -24,6 +52,196 @@ from utils import (
 AssetModel = TypeVar("AssetModel", bound=Asset)
 PermissionCheck = Callable[[User, Asset], bool]
 
+# Scalar fields and related collections that fields= and include= can name.
+JOB_FIELDS = (
+    "job_id",
+    "submitted_at",
+    "group_id",
+    "is_public",
+    "user_sub",
+    "job_name",
+    "job_notes",
+    "filename",
+    "status",
+    "calculation_type",
+    "method",
+    "basis_set",
+    "charge",
+    "multiplicity",
+    "completed_at",
+    "slurm_id",
+    "runtime",
+    "is_deleted",
+)
+JOB_INCLUDES = ("structures", "tags")
+STRUCTURE_FIELDS = (
+    "structure_id",
+    "uploaded_at",
+    "group_id",
+    "is_public",
+    "user_sub",
+    "name",
+    "formula",
+    "location",
+    "notes",
+)
+STRUCTURE_INCLUDES = ("tags",)
+
+_ASSET_FIELDS = {
+    Job: (JOB_FIELDS, JOB_INCLUDES),
+    Structure: (STRUCTURE_FIELDS, STRUCTURE_INCLUDES),
+}
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    """
+    The parts of an asset a response should contain. fields is None when
+    every scalar field is wanted; include names the related collections.
+    """
+    fields: Optional[FrozenSet[str]]
+    include: FrozenSet[str]
+
+    def wants(self, field: str) -> bool:
+        return self.fields is None or field in self.fields
+
+    def project(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.fields is None:
+            return payload
+        return {
+            key: value
+            for key, value in payload.items()
+            if key in self.fields or key in self.include
+        }
+
+
+# Columns that sort= can name. Nullable ones sort their NULLs last.
+_JOB_SORT_COLUMNS = {
+    "submitted_at": Job.created_at,
+    "completed_at": Job.completed_at,
+    "job_name": Job.job_name,
+    "status": Job.status,
+    "calculation_type": Job.calculation_type,
+    "method": Job.method,
+    "basis_set": Job.basis_set,
+}
+_NULLABLE_JOB_SORT_FIELDS = {"completed_at", "job_name"}
+
+
+@dataclass(frozen=True)
+class JobListFilters:
+    """
+    SQL criteria and ordering for a job listing; see job_list_filters.
+    """
+    criteria: tuple
+    order_by: tuple
+
+
+def _reject_unknown(kind: str, values: Iterable[str], allowed: Iterable[str]) -> None:
+    allowed = set(allowed)
+    for value in values:
+        if value not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown {kind}: {value}",
+            )
+
+
+def job_list_filters(
+    job_status: List[str] = Query([], alias="status"),
+    calculation_type: List[str] = Query([]),
+    method: List[str] = Query([]),
+    basis_set: List[str] = Query([]),
+    tag: Optional[str] = Query(None),
+    sort: str = Query("-submitted_at"),
+) -> JobListFilters:
+    """
+    Dependency reading the filter and sort query parameters of job listings.
+    Repeating a filter matches any of its values; different filters must all
+    match. sort names one of _JOB_SORT_COLUMNS, with a leading - for
+    descending order; ties keep the job_id order.
+    :param job_status: Job statuses to keep, passed as query parameter status.
+    :param calculation_type: Calculation types to keep.
+    :param method: Methods to keep.
+    :param basis_set: Basis sets to keep.
+    :param tag: Keep jobs that have a tag with this name.
+    :param sort: Field to sort by; defaults to newest submissions first.
+    :raises HTTPException: 400 for an unknown status, calculation type, or sort field.
+    """
+    _reject_unknown("status", job_status, JOB_STATUSES)
+    _reject_unknown(
+        "calculation_type",
+        calculation_type,
+        (calculation.value for calculation in CalculationType),
+    )
+    sort_field = sort.removeprefix("-")
+    _reject_unknown("sort field", [sort_field], _JOB_SORT_COLUMNS)
+
+    criteria = []
+    for column, values in (
+        (Job.status, job_status),
+        (Job.calculation_type, calculation_type),
+        (Job.method, method),
+        (Job.basis_set, basis_set),
+    ):
+        if len(values) == 1:
+            criteria.append(column == values[0])
+        elif values:
+            criteria.append(column.in_(values))
+    if tag is not None:
+        criteria.append(Job.tags.any(Tags.name == tag))
+
+    column = _JOB_SORT_COLUMNS[sort_field]
+    ordering = column.desc() if sort.startswith("-") else column.asc()
+    if sort_field in _NULLABLE_JOB_SORT_FIELDS:
+        ordering = ordering.nulls_last()
+    return JobListFilters(criteria=tuple(criteria), order_by=(ordering, Job.id.asc()))
+
+
+def _split_field_list(value: str) -> List[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def parse_field_selection(
+    model: Type[AssetModel],
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    extra_fields: Iterable[str] = (),
+) -> FieldSelection:
+    """
+    Parse comma-separated fields= and include= query values.
+    Without fields, every scalar field is returned and include defaults to
+    every related collection. With fields, only the named fields and the ID
+    are returned, and related collections only when named in include.
+    :param extra_fields: Endpoint-specific fields that fields= may also name.
+    :raises HTTPException: 400 when a name is not a field of the model.
+    """
+    allowed_fields, allowed_includes = _ASSET_FIELDS[model]
+    allowed_fields = (*allowed_fields, *extra_fields)
+
+    selected_fields = None
+    if fields is not None:
+        requested = _split_field_list(fields)
+        for name in requested:
+            if name not in allowed_fields:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown field: {name}",
+                )
+        selected_fields = frozenset((model.api_id_field, *requested))
+
+    if include is None:
+        selected_include = frozenset(allowed_includes if fields is None else ())
+    else:
+        selected_include = frozenset(_split_field_list(include))
+        for name in sorted(selected_include):
+            if name not in allowed_includes:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown include: {name}",
+                )
+    return FieldSelection(fields=selected_fields, include=selected_include)
+
 
 def _default_asset_list_limit(model: Type[AssetModel]) -> int:
     if model is Job:
@@ -36,10 +254,14 @@ def _default_asset_list_limit(model: Type[AssetModel]) -> int:
 def _asset_list_options(
     model: Type[AssetModel],
     *,
+    include: Optional[Iterable[str]] = None,
     include_owner_metadata: bool = False,
 ) -> list:
-    options = [selectinload(model.tags)]
-    if model is Job:
+    include = _ASSET_FIELDS[model][1] if include is None else include
+    options = []
+    if "tags" in include:
+        options.append(selectinload(model.tags))
+    if model is Job and "structures" in include:
         options.append(selectinload(Job.structures))
     if include_owner_metadata:
         options.extend((joinedload(model.user), joinedload(model.group)))
@@ -78,8 +300,12 @@ def serialize_structure(
     return result
 
 
-def serialize_job(job: Job, include_user_sub: bool = True) -> Dict[str, Any]:
-    return {
+def serialize_job(
+    job: Job,
+    include_user_sub: bool = True,
+    include: Iterable[str] = JOB_INCLUDES,
+) -> Dict[str, Any]:
+    result = {
         **serialize_asset(job, include_user_sub=include_user_sub),
         "job_name": job.job_name,
         "job_notes": job.job_notes,
@@ -92,29 +318,33 @@ def serialize_job(job: Job, include_user_sub: bool = True) -> Dict[str, Any]:
         "multiplicity": job.multiplicity,
         "completed_at": job.completed_at.isoformat() if job.completed_at else None,
         "slurm_id": job.slurm_id and str(job.slurm_id),
-        "structures": [
-            serialize_structure(structure, include_tags=False)
-            for structure in job.structures
-        ],
-        "tags": [tag.name for tag in job.tags],
         "runtime": str(job.runtime) if job.runtime else None,
         "is_deleted": job.is_deleted,
     }
+    if "structures" in include:
+        result["structures"] = [
+            serialize_structure(structure, include_tags=False)
+            for structure in job.structures
+        ]
+    if "tags" in include:
+        result["tags"] = [tag.name for tag in job.tags]
+    return result
 
 
 def list_user_assets(
     db: Session,
     model: Type[AssetModel],
     user_sub: str,
-    *,
+    *criteria,
     limit: Optional[int] = None,
     offset: int = 0,
+    include: Optional[Iterable[str]] = None,
 ) -> List[AssetModel]:
     result_limit = limit if limit is not None else _default_asset_list_limit(model)
     return (
         db.query(model)
-        .options(*_asset_list_options(model))
-        .filter(model.user_sub == user_sub, model.is_deleted.is_(False))
+        .options(*_asset_list_options(model, include=include))
+        .filter(model.user_sub == user_sub, model.is_deleted.is_(False), *criteria)
         .order_by(model.created_at.desc(), model.id.asc())
         .offset(offset)
         .limit(result_limit)
@@ -126,52 +356,382 @@ def list_group_assets(
     db: Session,
     model: Type[AssetModel],
     group_id: UUID,
-    *,
+    *criteria,
     public_only: bool = False,
     limit: Optional[int] = None,
     offset: int = 0,
+    include: Optional[Iterable[str]] = None,
+    order_by: Optional[Iterable] = None,
 ) -> List[AssetModel]:
     result_limit = limit if limit is not None else _default_asset_list_limit(model)
     query = (
         db.query(model)
-        .options(*_asset_list_options(model))
-        .filter(model.group_id == group_id, model.is_deleted.is_(False))
+        .options(*_asset_list_options(model, include=include))
+        .filter(model.group_id == group_id, model.is_deleted.is_(False), *criteria)
     )
     if public_only:
         query = query.filter(model.is_public.is_(True))
+    if order_by is None:
+        order_by = (model.created_at.desc(), model.id.asc())
     return (
-        query.order_by(model.created_at.desc(), model.id.asc())
+        query.order_by(*order_by)
         .offset(offset)
         .limit(result_limit)
         .all()
     )
 
 
-def list_all_jobs_with_metadata(
+_SEARCH_TERM = re.compile(r"\w+")
+
+
+def search_readable_assets(
     db: Session,
+    model: Type[AssetModel],
+    user: User,
+    query: str,
     *,
-    limit: int = DEFAULT_JOB_LIST_LIMIT,
+    limit: Optional[int] = None,
     offset: int = 0,
-) -> list[dict]:
-    jobs = (
-        db.query(Job)
-        .options(*_asset_list_options(Job, include_owner_metadata=True))
-        .filter(Job.is_deleted.is_(False))
-        .order_by(Job.submitted_at.desc(), Job.job_id.asc())
+    include: Optional[Iterable[str]] = None,
+) -> List[AssetModel]:
+    """
+    Full-text search over the name and notes of non-deleted assets user can
+    read, best match first. Every word of query must match, and the last one
+    also matches as a prefix. PostgreSQL ranks name matches above notes
+    matches; SQLite ranks with FTS5's bm25.
+    """
+    terms = _SEARCH_TERM.findall(query.lower())
+    if not terms:
+        return []
+
+    result_limit = limit if limit is not None else _default_asset_list_limit(model)
+    search = (
+        db.query(model)
+        .options(*_asset_list_options(model, include=include))
+        .filter(model.is_deleted.is_(False), readable_assets_clause(user, model))
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        vector = literal_column(f"{model.__tablename__}.search_vector")
+        ts_query = func.to_tsquery(
+            SEARCH_CONFIG,
+            " & ".join(terms[:-1] + [f"{terms[-1]}:*"]),
+        )
+        search = search.filter(vector.op("@@")(ts_query))
+        rank = func.ts_rank(vector, ts_query).desc()
+    else:
+        search_table = table(
+            f"{model.__tablename__}_search",
+            column(model.__asset_id_column__),
+        )
+        match = " ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+        search = (
+            search.join(search_table, search_table.c[model.__asset_id_column__] == model.id)
+            .filter(literal_column(search_table.name).op("MATCH")(match))
+        )
+        # FTS5's rank is bm25, where lower is better.
+        rank = literal_column(f"{search_table.name}.rank")
+
+    return (
+        search.order_by(rank, model.created_at.desc(), model.id.asc())
         .offset(offset)
-        .limit(limit)
+        .limit(result_limit)
+        .all()
+    )
+
+
+def list_readable_assets(
+    db: Session,
+    model: Type[AssetModel],
+    user: User,
+    *criteria,
+    writable_only: bool = False,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    include: Optional[Iterable[str]] = None,
+    order_by: Optional[Iterable] = None,
+) -> List[AssetModel]:
+    """
+    List non-deleted assets matching criteria that user can read, or write
+    with writable_only, most recent first unless order_by is given. Access is
+    part of the query, so limit and offset count accessible assets only.
+    """
+    result_limit = limit if limit is not None else _default_asset_list_limit(model)
+    access = (
+        writable_assets_clause(user, model)
+        if writable_only
+        else readable_assets_clause(user, model)
+    )
+    if order_by is None:
+        order_by = (model.created_at.desc(), model.id.asc())
+    return (
+        db.query(model)
+        .options(*_asset_list_options(model, include=include))
+        .filter(*criteria, model.is_deleted.is_(False), access)
+        .order_by(*order_by)
+        .offset(offset)
+        .limit(result_limit)
         .all()
     )
 
+
+MAX_TAG_FILTERS = 20
+
+
+def _clean_tag_names(tag_names: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(name.strip() for name in tag_names if name.strip())
+
+
+def parse_tag_filter(tag_names: Iterable[str]) -> FrozenSet[str]:
+    """
+    Strip and de-duplicate the tag names of a list-by-tag request.
+    :raises HTTPException: 400 without any tag name, or with more than
+        MAX_TAG_FILTERS of them.
+    """
+    names = _clean_tag_names(tag_names)
+    if not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one tag is required.",
+        )
+    if len(names) > MAX_TAG_FILTERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_TAG_FILTERS} tags can be given.",
+        )
+    return names
+
+
+def tagged_asset_criterion(
+    model: Type[AssetModel],
+    tag_names: Iterable[str],
+    *,
+    match_all: bool,
+):
+    """
+    SQL criterion keeping assets linked to tags named tag_names, all of them
+    when match_all is true and any of them otherwise. Names match in every
+    user's tag namespace, since serialized tags only show names. The lookup
+    goes from tag names to asset ids through idx_tags_name and the
+    association table's tag_id index.
+    """
+    tag_names = set(tag_names)
+    links = model.__tags_secondary__
+    asset_id = links.c[model.__asset_id_column__]
+    tagged = (
+        select(asset_id)
+        .select_from(links.join(Tags, Tags.tag_id == links.c.tag_id))
+        .where(Tags.name.in_(tag_names))
+    )
+    if match_all and len(tag_names) > 1:
+        tagged = tagged.group_by(asset_id).having(
+            func.count(Tags.name.distinct()) == len(tag_names)
+        )
+    return model.id.in_(tagged)
+
+# Columns read by the job list endpoints, labelled with their JOB_FIELDS name.
+_JOB_LIST_COLUMNS = (
+    Job.id.label("job_id"),
+    Job.created_at.label("submitted_at"),
+    Job.group_id,
+    Job.is_public,
+    Job.user_sub,
+    Job.job_name,
+    Job.job_notes,
+    Job.filename,
+    Job.status,
+    Job.calculation_type,
+    Job.method,
+    Job.basis_set,
+    Job.charge,
+    Job.multiplicity,
+    Job.completed_at,
+    Job.slurm_id,
+    Job.runtime,
+    Job.is_deleted,
+)
+
+# How _job_row_payload formats each column the way serialize_job does.
+_JOB_FIELD_FORMATTERS: Dict[str, Callable[[Any], Any]] = {
+    "job_id": str,
+    "submitted_at": lambda value: value.isoformat(),
+    "group_id": lambda value: str(value) if value else None,
+    "completed_at": lambda value: value.isoformat() if value else None,
+    "slurm_id": lambda value: value and str(value),
+    "runtime": lambda value: str(value) if value else None,
+}
+
+_JOB_STRUCTURE_COLUMNS = (
+    jobs_structures.c.job_id,
+    Structure.id.label("structure_id"),
+    Structure.created_at.label("uploaded_at"),
+    Structure.group_id,
+    Structure.is_public,
+    Structure.name,
+    Structure.formula,
+    Structure.location,
+    Structure.notes,
+)
+
+
+def _job_tag_names_column(dialect_name: str):
+    """
+    Correlated subquery aggregating each job's tag names into one list, so
+    tags come back with the job row instead of from a separate query.
+    """
+    if dialect_name == "postgresql":
+        aggregate = func.array_agg(Tags.name, type_=ARRAY(String))
+    else:
+        aggregate = func.json_group_array(Tags.name, type_=JSON)
+    return (
+        select(aggregate)
+        .select_from(jobs_tags.join(Tags, Tags.tag_id == jobs_tags.c.tag_id))
+        .where(jobs_tags.c.job_id == Job.id)
+        .scalar_subquery()
+        .label("tag_names")
+    )
+
+
+def _job_structure_summaries(db: Session, job_ids: List[UUID]) -> Dict[UUID, list]:
+    """
+    Serialize the structures of every listed job with one column query.
+    Structures are not aggregated in SQL because JSON aggregates format
+    timestamps differently on each database.
+    """
+    summaries: Dict[UUID, list] = {job_id: [] for job_id in job_ids}
+    if not job_ids:
+        return summaries
+
+    rows = db.execute(
+        select(*_JOB_STRUCTURE_COLUMNS)
+        .join(Structure, Structure.id == jobs_structures.c.structure_id)
+        .where(jobs_structures.c.job_id.in_(job_ids))
+    )
+    for row in rows:
+        summaries[row.job_id].append({
+            "structure_id": str(row.structure_id),
+            "uploaded_at": row.uploaded_at.isoformat(),
+            "group_id": str(row.group_id) if row.group_id else None,
+            "is_public": row.is_public,
+            "name": row.name,
+            "formula": row.formula,
+            "location": row.location,
+            "notes": row.notes,
+        })
+    return summaries
+
+
+def _job_row_payload(
+    row,
+    columns: List[str],
+    selection: FieldSelection,
+    structures: Dict[UUID, list],
+) -> Dict[str, Any]:
+    """
+    Build the same dict as serialize_job from a row of the selected columns.
+    """
+    result = {}
+    for name in columns:
+        value = getattr(row, name)
+        formatter = _JOB_FIELD_FORMATTERS.get(name)
+        result[name] = value if formatter is None else formatter(value)
+    if "structures" in selection.include:
+        result["structures"] = structures[row.job_id]
+    if "tags" in selection.include:
+        # PostgreSQL aggregates no rows to NULL rather than an empty array.
+        result["tags"] = list(row.tag_names or [])
+    return result
+
+
+def _list_job_rows(
+    db: Session,
+    *criteria,
+    limit: int,
+    offset: int,
+    include_owner_metadata: bool = False,
+    selection: Optional[FieldSelection] = None,
+    order_by: Optional[Iterable] = None,
+) -> list[dict]:
+    """
+    List non-deleted jobs matching criteria as serialized dicts, newest first
+    unless order_by is given, reading only the selected columns instead of
+    loading Job objects.
+    """
+    selection = selection or parse_field_selection(Job)
+    field_columns = [
+        column for column in _JOB_LIST_COLUMNS if selection.wants(column.name)
+    ]
+    query = select(*field_columns)
+    if "tags" in selection.include:
+        query = query.add_columns(_job_tag_names_column(db.get_bind().dialect.name))
+    if include_owner_metadata:
+        query = (
+            query.add_columns(User.email.label("user_email"), Group.name.label("group_name"))
+            .outerjoin(User, User.user_sub == Job.user_sub)
+            .outerjoin(Group, Group.group_id == Job.group_id)
+        )
+    if order_by is None:
+        order_by = (Job.created_at.desc(), Job.id.asc())
+    rows = db.execute(
+        query.where(Job.is_deleted.is_(False), *criteria)
+        .order_by(*order_by)
+        .offset(offset)
+        .limit(limit)
+    ).all()
+
+    structures = {}
+    if "structures" in selection.include:
+        structures = _job_structure_summaries(db, [row.job_id for row in rows])
+    field_names = [column.name for column in field_columns]
     result = []
-    for job in jobs:
-        payload = serialize_job(job)
-        payload["user_email"] = job.user.email if job.user else None
-        payload["group_name"] = job.group.name if job.group else None
+    for row in rows:
+        payload = _job_row_payload(row, field_names, selection, structures)
+        if include_owner_metadata:
+            payload["user_email"] = row.user_email
+            payload["group_name"] = row.group_name
         result.append(payload)
     return result
 
 
+def list_user_job_payloads(
+    db: Session,
+    user_sub: str,
+    *criteria,
+    limit: int = DEFAULT_JOB_LIST_LIMIT,
+    offset: int = 0,
+    selection: Optional[FieldSelection] = None,
+    order_by: Optional[Iterable] = None,
+) -> list[dict]:
+    """
+    Serialized equivalent of list_user_assets for jobs, for list endpoints.
+    """
+    return _list_job_rows(
+        db,
+        Job.user_sub == user_sub,
+        *criteria,
+        limit=limit,
+        offset=offset,
+        selection=selection,
+        order_by=order_by,
+    )
+
+
+def list_all_jobs_with_metadata(
+    db: Session,
+    *criteria,
+    limit: int = DEFAULT_JOB_LIST_LIMIT,
+    offset: int = 0,
+    order_by: Optional[Iterable] = None,
+) -> list[dict]:
+    return _list_job_rows(
+        db,
+        *criteria,
+        limit=limit,
+        offset=offset,
+        include_owner_metadata=True,
+        order_by=order_by,
+    )
+
+
 def get_asset_or_404(
     db: Session,
     model: Type[AssetModel],
@@ -194,7 +754,11 @@ def _validate_transfer_request(
     ownership: AssetOwnership,
     requested_user_sub: Optional[str],
     requested_group_id: Optional[str],
-) -> None:
+) -> Optional[User]:
+    """
+    Check the shape of a transfer request and that its targets exist.
+    :return: The target user, or None for group ownership.
+    """
     if ownership == AssetOwnership.user:
         if not requested_user_sub:
             raise HTTPException(
@@ -206,8 +770,7 @@ def _validate_transfer_request(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="group_id must be omitted for user ownership",
             )
-        _require_transfer_user_exists(db, requested_user_sub)
-        return
+        return _require_transfer_user_exists(db, requested_user_sub)
 
     if ownership == AssetOwnership.group:
         if not requested_group_id:
@@ -221,7 +784,7 @@ def _validate_transfer_request(
                 detail="user_sub must be omitted for group ownership",
             )
         _require_transfer_group_exists(db, requested_group_id)
-        return
+        return None
 
     if not requested_user_sub:
         raise HTTPException(
@@ -233,16 +796,19 @@ def _validate_transfer_request(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="group_id is required for co_owned ownership",
         )
-    _require_transfer_user_exists(db, requested_user_sub)
+    target_user = _require_transfer_user_exists(db, requested_user_sub)
     _require_transfer_group_exists(db, requested_group_id)
+    return target_user
 
 
-def _require_transfer_user_exists(db: Session, user_sub: str) -> None:
-    if not db.query(User).filter_by(user_sub=user_sub).first():
+def _require_transfer_user_exists(db: Session, user_sub: str) -> User:
+    target_user = db.query(User).filter_by(user_sub=user_sub).first()
+    if not target_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Target user not found",
         )
+    return target_user
 
 
 def _require_transfer_group_exists(db: Session, group_id: str) -> None:
@@ -280,12 +846,12 @@ def _require_target_group_allowed(
 
 
 def _require_target_user_allowed(
-    db: Session,
     user: User,
     asset: Asset,
     ownership: AssetOwnership,
     requested_group_id: Optional[str],
     requested_user_sub: Optional[str],
+    target_user: Optional[User],
 ) -> None:
     if is_admin(user):
         return
@@ -312,7 +878,6 @@ def _require_target_user_allowed(
             detail="Group admins cannot replace a co-owner directly",
         )
 
-    target_user = db.query(User).filter_by(user_sub=requested_user_sub).first()
     if not target_user or str(target_user.group_id) != str(requested_group_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -337,17 +902,22 @@ def transfer_asset_ownership(
     group/co-owned transfers, and cannot directly transfer group-only assets to
     user-only ownership.
     """
-    _validate_transfer_request(db, ownership, requested_user_sub, requested_group_id)
+    target_user = _validate_transfer_request(
+        db,
+        ownership,
+        requested_user_sub,
+        requested_group_id,
+    )
     _require_base_transfer_permission(user, asset)
     _require_target_group_allowed(user, requested_group_id)
 
     _require_target_user_allowed(
-        db,
         user,
         asset,
         ownership,
         requested_group_id,
         requested_user_sub,
+        target_user,
     )
 
     asset.user_sub = requested_user_sub
@@ -380,6 +950,7 @@ def soft_delete_asset(
 ) -> AssetModel:
     require_asset_permission(user, asset, can_delete_asset)
     asset.is_deleted = True
+    mark_tag_usage_stale(db, (tag.user_sub for tag in asset.tags))
     commit_or_rollback(
         db,
         integrity_error_detail="Database integrity error",
@@ -416,17 +987,23 @@ def set_asset_tags(
     Tags are user-scoped, so user_sub determines which tag rows are reused or
     created. On co-owned assets, a group admin updating tags uses their own tag
     rows unless the caller passes a different user_sub. If replace is true,
-    every current tag link on the asset is removed before the requested tags
-    are attached, including links to tags owned by other users.
+    every other tag link on the asset is removed, including links to tags
+    owned by other users. The tag
+    usage counts of every affected tag owner are dropped from the cache when
+    the session commits.
     """
+    requested_tag_names = _clean_tag_names(tag_names)
     if replace:
-        asset.tags.clear()
-
-    requested_tag_names = set()
-    for tag_name in tag_names:
-        clean_tag_name = tag_name.strip()
-        if clean_tag_name:
-            requested_tag_names.add(clean_tag_name)
+        # Links that stay are left alone, so only changed rows are written.
+        unlinked_tags = [
+            tag
+            for tag in asset.tags
+            if tag.user_sub != user_sub or tag.name not in requested_tag_names
+        ]
+        mark_tag_usage_stale(db, (tag.user_sub for tag in unlinked_tags))
+        for tag in unlinked_tags:
+            asset.tags.remove(tag)
+    mark_tag_usage_stale(db, [user_sub])
 
     linked_tag_names = {
         tag.name
@@ -479,3 +1056,300 @@ def set_asset_tags(
         tag = Tags(user_sub=user_sub, name=tag_name)
         db.add(tag)
         asset.tags.append(tag)
+
+
+def _bulk_targets(
+    db: Session,
+    model: Type[AssetModel],
+    asset_ids: List[str],
+    check: Callable[[AssetModel], None],
+) -> Tuple[List[Dict[str, Any]], Dict[UUID, AssetModel]]:
+    """
+    Load the non-deleted assets named by asset_ids with one query and run
+    check on each; check raises HTTPException to refuse an asset.
+    :return: One result per requested id, in request order, and the accepted
+        assets by id. Accepted ids get status 200; the caller applies the change.
+    """
+    parsed_ids = {}
+    for asset_id in asset_ids:
+        try:
+            parsed_ids[asset_id] = UUID(str(asset_id))
+        except ValueError:
+            pass
+
+    assets_by_id = {}
+    if parsed_ids:
+        assets_by_id = {
+            asset.id: asset
+            for asset in db.query(model)
+            .filter(model.id.in_(set(parsed_ids.values())), model.is_deleted.is_(False))
+            .all()
+        }
+
+    results = []
+    accepted = {}
+    for asset_id in asset_ids:
+        asset = assets_by_id.get(parsed_ids.get(asset_id))
+        try:
+            if asset is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=model.not_found_detail,
+                )
+            check(asset)
+        except HTTPException as error:
+            results.append({
+                model.api_id_field: asset_id,
+                "status_code": error.status_code,
+                "detail": error.detail,
+            })
+            continue
+        accepted[asset.id] = asset
+        results.append({model.api_id_field: asset_id, "status_code": status.HTTP_200_OK})
+    return results, accepted
+
+
+def _insert_ignoring_conflicts(db: Session, table, rows: List[dict], *index_elements) -> None:
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    db.execute(
+        insert(table)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=list(index_elements) or None)
+    )
+
+
+def _ensure_user_tag_ids(db: Session, user_sub: str, tag_names: Iterable[str]) -> List[UUID]:
+    """
+    Return the ids of user_sub's tags named tag_names, creating the missing
+    ones in one INSERT. Names another request creates first are reused.
+    """
+    _insert_ignoring_conflicts(
+        db,
+        Tags.__table__,
+        [
+            {"tag_id": uuid4(), "user_sub": user_sub, "name": tag_name}
+            for tag_name in sorted(tag_names)
+        ],
+        Tags.user_sub,
+        Tags.name,
+    )
+    return db.scalars(
+        select(Tags.tag_id).where(Tags.user_sub == user_sub, Tags.name.in_(tag_names))
+    ).all()
+
+
+def bulk_update_asset_tags(
+    db: Session,
+    user: User,
+    model: Type[AssetModel],
+    asset_ids: List[str],
+    *,
+    add: Iterable[str] = (),
+    remove: Iterable[str] = (),
+) -> List[Dict[str, Any]]:
+    """
+    Add and remove tags on many assets in one transaction. Every asset is
+    loaded with one query and checked with can_write_asset; missing or
+    forbidden assets do not block the others. Added names use user's tag
+    namespace, as set_asset_tags does. Removed names match tags of any owner,
+    as listing by tag does. The association table is written with one
+    INSERT ... ON CONFLICT DO NOTHING and one DELETE, whatever the number
+    of assets.
+    :raises HTTPException: 400 when there is nothing to add or remove, or when
+        a name is both added and removed.
+    :return: One result per requested id, in request order.
+    """
+    add_names = _clean_tag_names(add)
+    remove_names = _clean_tag_names(remove)
+    if not add_names and not remove_names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No tags to add or remove.",
+        )
+    conflicting_names = add_names & remove_names
+    if conflicting_names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tag cannot be both added and removed: {min(conflicting_names)}",
+        )
+
+    results, writable = _bulk_targets(
+        db,
+        model,
+        asset_ids,
+        lambda asset: require_asset_permission(user, asset, can_write_asset),
+    )
+    if not writable:
+        return results
+    writable_ids = set(writable)
+
+    links = model.__tags_secondary__
+    link_asset_id = links.c[model.__asset_id_column__]
+
+    def write_links() -> None:
+        if remove_names:
+            removed_tag_ids = select(Tags.tag_id).where(Tags.name.in_(remove_names))
+            mark_tag_usage_stale(
+                db,
+                db.scalars(
+                    select(Tags.user_sub)
+                    .distinct()
+                    .join(links, links.c.tag_id == Tags.tag_id)
+                    .where(link_asset_id.in_(writable_ids), Tags.name.in_(remove_names))
+                ),
+            )
+            db.execute(
+                delete(links).where(
+                    link_asset_id.in_(writable_ids),
+                    links.c.tag_id.in_(removed_tag_ids),
+                )
+            )
+        if add_names:
+            tag_ids = _ensure_user_tag_ids(db, user.user_sub, add_names)
+            _insert_ignoring_conflicts(
+                db,
+                links,
+                [
+                    {link_asset_id.name: asset_id, "tag_id": tag_id}
+                    for asset_id in sorted(writable_ids)
+                    for tag_id in tag_ids
+                ],
+            )
+            mark_tag_usage_stale(db, [user.user_sub])
+
+    commit_or_rollback(
+        db,
+        before_commit=write_links,
+        integrity_error_detail="Database integrity error",
+    )
+    return results
+
+
+def _bulk_update(
+    db: Session,
+    model: Type[AssetModel],
+    asset_ids: Iterable[UUID],
+    values: Dict[str, Any],
+    before_update: Optional[Callable[[], None]] = None,
+) -> None:
+    def write() -> None:
+        if before_update is not None:
+            before_update()
+        db.execute(update(model).where(model.id.in_(set(asset_ids))).values(**values))
+
+    commit_or_rollback(
+        db,
+        before_commit=write,
+        integrity_error_detail="Database integrity error",
+    )
+
+
+def bulk_soft_delete_assets(
+    db: Session,
+    user: User,
+    model: Type[AssetModel],
+    asset_ids: List[str],
+) -> List[Dict[str, Any]]:
+    """
+    Soft-delete many assets with one UPDATE, checking each with
+    can_delete_asset. Missing, already deleted, or forbidden assets do not
+    block the others.
+    :return: One result per requested id, in request order.
+    """
+    results, deletable = _bulk_targets(
+        db,
+        model,
+        asset_ids,
+        lambda asset: require_asset_permission(user, asset, can_delete_asset),
+    )
+    if not deletable:
+        return results
+
+    links = model.__tags_secondary__
+
+    def mark_tag_owners_stale() -> None:
+        mark_tag_usage_stale(
+            db,
+            db.scalars(
+                select(Tags.user_sub)
+                .distinct()
+                .join(links, links.c.tag_id == Tags.tag_id)
+                .where(links.c[model.__asset_id_column__].in_(deletable))
+            ),
+        )
+
+    _bulk_update(db, model, deletable, {"is_deleted": True}, mark_tag_owners_stale)
+    return results
+
+
+def bulk_update_asset_visibility(
+    db: Session,
+    user: User,
+    model: Type[AssetModel],
+    asset_ids: List[str],
+    is_public: bool,
+) -> List[Dict[str, Any]]:
+    """
+    Set is_public on many assets with one UPDATE, checking each with
+    can_change_asset_visibility. Refused assets do not block the others.
+    :return: One result per requested id, in request order.
+    """
+    results, changeable = _bulk_targets(
+        db,
+        model,
+        asset_ids,
+        lambda asset: require_asset_permission(user, asset, can_change_asset_visibility),
+    )
+    if changeable:
+        _bulk_update(db, model, changeable, {"is_public": is_public})
+    return results
+
+
+def bulk_transfer_asset_ownership(
+    db: Session,
+    user: User,
+    model: Type[AssetModel],
+    asset_ids: List[str],
+    ownership: AssetOwnership,
+    requested_user_sub: Optional[str],
+    requested_group_id: Optional[str],
+) -> List[Dict[str, Any]]:
+    """
+    Transfer many assets to the same owner with one UPDATE. The request is
+    validated once, as in transfer_asset_ownership, and each asset is checked
+    against the same rules; refused assets do not block the others.
+    :raises HTTPException: When the request itself is invalid, its target user
+        or group does not exist, or user may not transfer into its group.
+    :return: One result per requested id, in request order.
+    """
+    target_user = _validate_transfer_request(
+        db,
+        ownership,
+        requested_user_sub,
+        requested_group_id,
+    )
+    _require_target_group_allowed(user, requested_group_id)
+
+    def check(asset: AssetModel) -> None:
+        _require_base_transfer_permission(user, asset)
+        _require_target_user_allowed(
+            user,
+            asset,
+            ownership,
+            requested_group_id,
+            requested_user_sub,
+            target_user,
+        )
+
+    results, transferable = _bulk_targets(db, model, asset_ids, check)
+    if transferable:
+        _bulk_update(
+            db,
+            model,
+            transferable,
+            {
+                "user_sub": requested_user_sub,
+                "group_id": UUID(str(requested_group_id)) if requested_group_id else None,
+            },
+        )
+    return results
@@ -0,0 +1,134 @@
+"""
+Compare encode time for one page of list results: FastAPI's default path
+(jsonable_encoder, then JSONResponse) against FastJSONResponse.
+
+Usage:
+    python benchmarks/list_encoding.py [--rows 100] [--runs 200]
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from asset_service import serialize_job, serialize_structure  # noqa: E402
+from json_response import FastJSONResponse  # noqa: E402
+from models import Group, Job, Request, Structure, Tags, User  # noqa: E402
+from request_service import serialize_request  # noqa: E402
+from user_service import serialize_user_profile  # noqa: E402
+
+
+def _pages(rows: int) -> dict:
+    now = datetime.now(timezone.utc)
+    group = Group(group_id=uuid.uuid4(), name="Benchmark group")
+    users = [
+        User(
+            user_sub=f"auth0|user{index}",
+            email=f"user{index}@example.com",
+            role="member",
+            group_id=group.group_id,
+            role_or_group_updated_at=now,
+        )
+        for index in range(rows)
+    ]
+    tags = [Tags(tag_id=uuid.uuid4(), user_sub="auth0|user0", name=f"tag {i}") for i in range(3)]
+    structures = [
+        Structure(
+            id=uuid.uuid4(),
+            created_at=now,
+            user_sub="auth0|user0",
+            group_id=group.group_id,
+            is_public=False,
+            is_deleted=False,
+            name=f"Structure {index}",
+            formula="C6H6",
+            location=f"structures/{index}.xyz",
+            notes="Optimised geometry",
+            tags=tags,
+        )
+        for index in range(rows)
+    ]
+    jobs = [
+        Job(
+            id=uuid.uuid4(),
+            created_at=now,
+            user_sub="auth0|user0",
+            group_id=group.group_id,
+            is_public=False,
+            is_deleted=False,
+            job_name=f"Job {index}",
+            job_notes="Benchmark job",
+            filename="input.xyz",
+            status="completed",
+            calculation_type="frequency",
+            method="b3lyp",
+            basis_set="def2-svp",
+            charge=0,
+            multiplicity=1,
+            completed_at=now,
+            slurm_id=str(index),
+            runtime=timedelta(minutes=index),
+            structures=structures[index:index + 2],
+            tags=tags,
+        )
+        for index in range(rows)
+    ]
+    requests = [
+        Request(
+            request_id=uuid.uuid4(),
+            status="pending",
+            request_type="invite",
+            requested_at=now,
+            expires_at=now + timedelta(days=7),
+            group=group,
+            group_id=group.group_id,
+            sender_sub="auth0|user0",
+            receiver_sub=user.user_sub,
+            created_by_sub="auth0|user0",
+            sender=users[0],
+            receiver=user,
+            created_by=users[0],
+        )
+        for user in users
+    ]
+    return {
+        "jobs": [serialize_job(job) for job in jobs],
+        "structures": [serialize_structure(structure) for structure in structures],
+        "requests": [
+            serialize_request(request, include_user_metadata=True) for request in requests
+        ],
+        "users": [serialize_user_profile(user) for user in users],
+    }
+
+
+def _median_ms(encode, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        encode()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'page':>10}  {'default ms':>10}  {'fast ms':>8}  {'speedup':>7}")
+    for name, page in _pages(args.rows).items():
+        default = _median_ms(lambda: JSONResponse(jsonable_encoder(page)), args.runs)
+        fast = _median_ms(lambda: FastJSONResponse(page), args.runs)
+        print(f"{name:>10}  {default:10.3f}  {fast:8.3f}  {default / fast:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measure API cold start: importing main and building the app with
+create_app(), each in a fresh interpreter like a new uvicorn worker.
+
+Usage:
+    python benchmarks/startup.py [--runs 5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+MEASURE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.create_app()
+created = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "create_app_s": created - imported,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": sorted(
+        name for name in ("ase", "pymatgen") if name in sys.modules
+    ),
+}))
+"""
+
+
+def measure_once() -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", MEASURE],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.runs)]
+    for key in ("import_s", "create_app_s", "max_rss_mb"):
+        values = [run[key] for run in runs]
+        print(f"{key:>14}: median {statistics.median(values):.3f}  max {max(values):.3f}")
+    print(f"{'heavy_modules':>14}: {runs[-1]['heavy_modules'] or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
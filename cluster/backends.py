@@ -0,0 +1,345 @@
+import heapq
+import io
+import json
+import os
+import random
+import shlex
+import subprocess
+import tarfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+
+class ClusterCommandError(Exception):
+    """
+    Raised when the cluster rejects or fails a command.
+    """
+
+
+class ClusterTimeoutError(Exception):
+    """
+    Raised when the cluster does not answer in time.
+    """
+
+
+class ClusterBackend(ABC):
+    """
+    Operations the cluster routes need from a scheduler.
+    Every method raises ClusterCommandError or ClusterTimeoutError on failure.
+    """
+
+    @abstractmethod
+    def submit(
+        self,
+        remote_dir: str,
+        job_files: dict[str, bytes],
+        submit_cmd: List[str],
+        job_ids: List[str],
+    ) -> str:
+        """
+        Place job_files under remote_dir and run submit_cmd.
+        :param job_ids: Job IDs covered by the submission, in array task order.
+        :return: SLURM job ID, or the array job ID when job_ids has several entries.
+        """
+
+    @abstractmethod
+    def status(self, slurm_id: str) -> str:
+        ...
+
+    @abstractmethod
+    def cancel(self, slurm_id: str) -> str:
+        ...
+
+    @abstractmethod
+    def output(self, job_id: str, command_name: str) -> str:
+        """
+        :param command_name: "result" for standard output, "error" for standard error.
+        """
+
+    @abstractmethod
+    def upload_results(self, job_id: str, calculation_type: str, success: bool) -> None:
+        """
+        Upload a finished job's results to S3 from the cluster.
+        :param success: Whether the job completed rather than failed.
+        """
+
+
+def _job_files_tar(job_files: dict[str, bytes]) -> bytes:
+    """
+    Pack small job input files into an in-memory tar archive.
+    """
+    buffer = io.BytesIO()
+    modified_at = int(time.time())
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        for name, content in job_files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mode = 0o644
+            info.mtime = modified_at
+            archive.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class SSHClusterBackend(ClusterBackend):
+    """
+    Runs dispatch.py on the `cluster` host from the local SSH config.
+    """
+
+    def __init__(self, cluster_work_dir: Optional[str]):
+        self.cluster_work_dir = cluster_work_dir
+
+    def _run(self, command: List[str], **kwargs) -> subprocess.CompletedProcess:
+        try:
+            return subprocess.run(
+                command,
+                check=True,
+                capture_output=True,
+                timeout=120,
+                **kwargs,
+            )
+        except subprocess.CalledProcessError as error:
+            raise ClusterCommandError(str(error)) from error
+        except subprocess.TimeoutExpired as error:
+            raise ClusterTimeoutError(str(error)) from error
+
+    def _dispatch(self, arguments: str) -> str:
+        proc = self._run(
+            ["ssh", "cluster", f"python3 {self.cluster_work_dir}/dispatch.py {arguments}"],
+            text=True,
+        )
+        return proc.stdout
+
+    def submit(self, remote_dir, job_files, submit_cmd, job_ids):
+        """
+        The files travel as a tar stream on stdin and are unpacked into the
+        remote directory before the submit command runs, so nothing is written
+        to the backend's disk and no separate scp process is needed.
+        """
+        quoted_dir = shlex.quote(remote_dir)
+        proc = self._run(
+            [
+                "ssh", "cluster",
+                f"mkdir -p {quoted_dir} && tar -xf - -C {quoted_dir} &&",
+                *submit_cmd,
+            ],
+            input=_job_files_tar(job_files),
+        )
+        return proc.stdout.decode()
+
+    def status(self, slurm_id):
+        return self._dispatch(f"status {slurm_id}")
+
+    def cancel(self, slurm_id):
+        return self._dispatch(f"cancel {slurm_id}")
+
+    def output(self, job_id, command_name):
+        return self._dispatch(f"{command_name} {job_id}")
+
+    def upload_results(self, job_id, calculation_type, success):
+        if not self.cluster_work_dir:
+            raise ClusterCommandError("CLUSTER_WORK_DIR is not set")
+        self._run(
+            [
+                "ssh",
+                "cluster",
+                "python3",
+                f"{self.cluster_work_dir}/Cluster-API-QC/src/upload_result.py",
+                job_id,
+                str(calculation_type),
+                "true" if success else "false",
+            ],
+            text=True,
+        )
+
+
+@dataclass
+class FakeClusterJob:
+    job_id: str
+    slurm_id: str
+    submitted_at: float
+    starts_at: float
+    ends_at: float
+    fails: bool
+    cancelled_at: Optional[float] = None
+    files: dict[str, bytes] = field(default_factory=dict, repr=False)
+
+
+class FakeClusterBackend(ClusterBackend):
+    """
+    In-process stand-in for SLURM, used to load-test the submission pipeline
+    on one machine without SSH. Jobs run on a fixed number of slots in
+    submission order; their state is derived from the clock, so no threads
+    are started.
+    :param latency: Seconds every call waits, standing in for the SSH round trip.
+    :param run_seconds: Seconds each job runs once it has a slot.
+    :param failure_rate: Fraction of jobs that finish as FAILED.
+    :param queue_depth: Most unfinished jobs accepted; further submissions fail.
+    :param slots: Jobs that run at the same time.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        run_seconds: float = 5.0,
+        failure_rate: float = 0.0,
+        queue_depth: int = 1000,
+        slots: int = 4,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.latency = latency
+        self.run_seconds = run_seconds
+        self.failure_rate = failure_rate
+        self.queue_depth = queue_depth
+        self.clock = clock
+        self.sleep = sleep
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._slot_free_at = [0.0] * slots
+        self._jobs_by_slurm_id: dict[str, FakeClusterJob] = {}
+        self._jobs_by_job_id: dict[str, FakeClusterJob] = {}
+        self._array_tasks: dict[str, List[FakeClusterJob]] = {}
+        self.uploaded_job_ids: List[str] = []
+
+    @classmethod
+    def from_env(cls) -> "FakeClusterBackend":
+        seed = os.getenv("FAKE_CLUSTER_SEED")
+        return cls(
+            latency=float(os.getenv("FAKE_CLUSTER_LATENCY", 0.0)),
+            run_seconds=float(os.getenv("FAKE_CLUSTER_RUN_SECONDS", 5.0)),
+            failure_rate=float(os.getenv("FAKE_CLUSTER_FAILURE_RATE", 0.0)),
+            queue_depth=int(os.getenv("FAKE_CLUSTER_QUEUE_DEPTH", 1000)),
+            slots=int(os.getenv("FAKE_CLUSTER_SLOTS", 4)),
+            seed=int(seed) if seed is not None else None,
+        )
+
+    def _state(self, job: FakeClusterJob, now: float) -> str:
+        if job.cancelled_at is not None:
+            return "CANCELLED"
+        if now < job.starts_at:
+            return "PENDING"
+        if now < job.ends_at:
+            return "RUNNING"
+        return "FAILED" if job.fails else "COMPLETED"
+
+    def _unfinished_count(self, now: float) -> int:
+        return sum(
+            1
+            for job in self._jobs_by_slurm_id.values()
+            if self._state(job, now) in ("PENDING", "RUNNING")
+        )
+
+    def _get_jobs(self, slurm_id: str) -> List[FakeClusterJob]:
+        """
+        A bare array ID stands for all of its tasks, as it does for SLURM.
+        """
+        if slurm_id in self._jobs_by_slurm_id:
+            return [self._jobs_by_slurm_id[slurm_id]]
+        if slurm_id in self._array_tasks:
+            return self._array_tasks[slurm_id]
+        raise ClusterCommandError(f"Unknown job {slurm_id}")
+
+    def submit(self, remote_dir, job_files, submit_cmd, job_ids):
+        self.sleep(self.latency)
+        with self._lock:
+            now = self.clock()
+            if self._unfinished_count(now) + len(job_ids) > self.queue_depth:
+                raise ClusterCommandError("Queue is full")
+
+            array_id = str(self._next_id)
+            self._next_id += 1
+            for task_index, job_id in enumerate(job_ids):
+                slurm_id = array_id if len(job_ids) == 1 else f"{array_id}_{task_index}"
+                starts_at = max(now, heapq.heappop(self._slot_free_at))
+                ends_at = starts_at + self.run_seconds
+                heapq.heappush(self._slot_free_at, ends_at)
+
+                prefix = "" if len(job_ids) == 1 else f"{job_id}/"
+                job = FakeClusterJob(
+                    job_id=job_id,
+                    slurm_id=slurm_id,
+                    submitted_at=now,
+                    starts_at=starts_at,
+                    ends_at=ends_at,
+                    fails=self._random.random() < self.failure_rate,
+                    files={
+                        name.removeprefix(prefix): content
+                        for name, content in job_files.items()
+                        if name.startswith(prefix)
+                    },
+                )
+                self._jobs_by_slurm_id[slurm_id] = job
+                self._jobs_by_job_id[job_id] = job
+                if len(job_ids) > 1:
+                    self._array_tasks.setdefault(array_id, []).append(job)
+        return f"{array_id}\n"
+
+    def status(self, slurm_id):
+        """
+        An array reports the state of its least advanced task, and FAILED
+        when any task failed once all have finished.
+        """
+        self.sleep(self.latency)
+        with self._lock:
+            now = self.clock()
+            states = {self._state(job, now) for job in self._get_jobs(slurm_id)}
+        for state in ("RUNNING", "PENDING", "FAILED", "CANCELLED"):
+            if state in states:
+                return state
+        return "COMPLETED"
+
+    def cancel(self, slurm_id):
+        """
+        A cancelled job keeps its slot until it would have finished.
+        Cancelling an array cancels all of its unfinished tasks.
+        """
+        self.sleep(self.latency)
+        with self._lock:
+            now = self.clock()
+            unfinished = [
+                job
+                for job in self._get_jobs(slurm_id)
+                if self._state(job, now) in ("PENDING", "RUNNING")
+            ]
+            for job in unfinished:
+                job.cancelled_at = now
+            return "True" if unfinished else "False"
+
+    def output(self, job_id, command_name):
+        self.sleep(self.latency)
+        with self._lock:
+            job = self._jobs_by_job_id.get(job_id)
+            if job is None:
+                raise ClusterCommandError(f"Unknown job {job_id}")
+            state = self._state(job, self.clock())
+
+        if state in ("PENDING", "RUNNING"):
+            raise ClusterCommandError(f"Job {job_id} has not finished")
+        if command_name == "error":
+            return "Simulated failure\n" if state == "FAILED" else ""
+        return json.dumps(
+            {
+                "job_id": job_id,
+                "slurm_id": job.slurm_id,
+                "state": state,
+                "runtime": self.run_seconds,
+            }
+        )
+
+    def upload_results(self, job_id, calculation_type, success):
+        """
+        Records the upload instead of writing to S3.
+        """
+        self.sleep(self.latency)
+        with self._lock:
+            job = self._jobs_by_job_id.get(job_id)
+            if job is None:
+                raise ClusterCommandError(f"Unknown job {job_id}")
+            if self._state(job, self.clock()) in ("PENDING", "RUNNING"):
+                raise ClusterCommandError(f"Job {job_id} has not finished")
+            self.uploaded_job_ids.append(job_id)
@@ -10,11 +10,14 @@ Usage:
 Ensure your SSH key is loaded locally and `cluster` is in your SSH config.
 """
 import json
+import logging
 import os
 import uuid
 import shutil
 import subprocess
-from typing import Optional
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
 
 from fastapi import (
     # FastAPI,
@@ -23,26 +26,57 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Request,
+    Response,
     UploadFile,
 )
 from pydantic import BaseModel
 # from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 
-from asset_service import get_asset_or_404, require_asset_permission
+from asset_service import get_asset_or_404, require_asset_permission, set_asset_tags
 from auth import verify_token
+from cluster.backends import (
+    ClusterBackend,
+    ClusterCommandError,
+    ClusterTimeoutError,
+    FakeClusterBackend,
+    SSHClusterBackend,
+)
 from dependencies import get_db
+from enum_types import CalculationType, FINISHED_JOB_STATUSES
 from models import Job
 from permissions import can_read_asset
-from storage import construct_upload_script
+from process_pool import validate_xyz_upload
+from result_cache import (
+    DEFAULT_RESULT_CACHE_MAX_BYTES,
+    ResultCache,
+    cached_payload_response,
+)
+from storage import construct_upload_script, construct_upload_scripts
 from user_service import get_user_or_404
-from utils import clean_up_upload_cache, get_user_sub
+from utils import commit_or_rollback, get_user_sub
+from xyz_parser import XYZParseError, count_xyz_frames, split_xyz_frames
+
+logger = logging.getLogger(__name__)
 
 BACKEND_WORK_DIR = os.getenv("BACKEND_WORK_DIR")
 CLUSTER_WORK_DIR = os.getenv("CLUSTER_WORK_DIR")
 
 ENV = os.getenv("ENV")
 ANACONDA_DIR = os.getenv("ANACONDA_DIR")
+# "ssh" submits to the real cluster; "fake" uses the in-process scheduler.
+CLUSTER_BACKEND = os.getenv("CLUSTER_BACKEND", "ssh")
+
+MAX_BATCH_JOBS = 100
+
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR") or (
+    f"{BACKEND_WORK_DIR}/result_cache" if BACKEND_WORK_DIR else None
+)
+result_cache = ResultCache(
+    max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", DEFAULT_RESULT_CACHE_MAX_BYTES)),
+    cache_dir=RESULT_CACHE_DIR,
+)
 
 class SubmitResponse(BaseModel):
     job_id: str
@@ -61,6 +95,31 @@ class CancelResponse(BaseModel):
 
 router = APIRouter(prefix="/cluster", tags=["cluster"])
 
+_fake_cluster_backend: Optional[FakeClusterBackend] = None
+
+
+def get_cluster_backend() -> ClusterBackend:
+    """
+    Provides the cluster backend selected by CLUSTER_BACKEND to cluster routes.
+    The fake scheduler is created once so its queue survives between requests.
+    """
+    global _fake_cluster_backend
+    if CLUSTER_BACKEND == "fake":
+        if _fake_cluster_backend is None:
+            _fake_cluster_backend = FakeClusterBackend.from_env()
+        return _fake_cluster_backend
+    return SSHClusterBackend(CLUSTER_WORK_DIR)
+
+
+def _write_local_job_files(job_dir: str, job_files: dict[str, bytes]) -> None:
+    if os.path.exists(job_dir):
+        shutil.rmtree(job_dir)
+    os.makedirs(job_dir)
+    for name, content in job_files.items():
+        with open(os.path.join(job_dir, name), "wb") as f:
+            f.write(content)
+
+
 @router.post("/run_advanced_analysis")
 def run_advanced_analysis(
         file: UploadFile = File(...),
@@ -71,6 +130,7 @@ def run_advanced_analysis(
         multiplicity: int = Form(...),
         opt_type: Optional[str] = Form(None),
         keywords: Optional[UploadFile] = File(None),
+        backend: ClusterBackend = Depends(get_cluster_backend),
 ):
     """
     Endpoint to run advanced analysis on the cluster.
@@ -83,24 +143,22 @@ def run_advanced_analysis(
     :param basis_set: Basis set to be used for the job.
     :param charge: Charge of the system for the job.
     :param multiplicity: Multiplicity of the system for the job.
+    :param backend: Cluster backend dependency.
     :return: A message indicating the analysis has been initiated.
     """
+    # Reject malformed input here rather than after it waits in the queue.
+    xyz_content = validate_xyz_upload(file.file.read(), charge, multiplicity)
     job_id = uuid.uuid4()
-    backend_job_dir = f"{BACKEND_WORK_DIR}/jobs/{job_id}"
     remote_cluster_job_dir = f"{CLUSTER_WORK_DIR}/jobs/{job_id}"
-    os.makedirs(backend_job_dir, exist_ok=True)
 
     xyz_file_path = "/input.xyz"
-    with open(backend_job_dir + xyz_file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-
-    urls_path = "/urls.json"
     urls = construct_upload_script(str(job_id), calculation_type)
-    with open(backend_job_dir + urls_path, "w") as f:
-        f.write(json.dumps(urls))
+    job_files = {
+        "input.xyz": xyz_content,
+        "urls.json": json.dumps(urls).encode(),
+    }
 
-    ssh_cmd = [
-        "ssh", "cluster",
+    submit_cmd = [
         f"python3 {CLUSTER_WORK_DIR}/dispatch.py submit",
         remote_cluster_job_dir + xyz_file_path,
         str(job_id),
@@ -112,34 +170,19 @@ def run_advanced_analysis(
     ]
 
     if opt_type is not None:
-        ssh_cmd.append(f"--opt-type {opt_type} ")
+        submit_cmd.append(f"--opt-type {opt_type} ")
 
     if keywords is not None:
         keywords_json_path = "/keywords.json"
-        with open(backend_job_dir + keywords_json_path, "wb") as f:
-            shutil.copyfileobj(keywords.file, f)
-        ssh_cmd.append(f"--keywords-file {remote_cluster_job_dir + keywords_json_path}")
+        job_files["keywords.json"] = keywords.file.read()
+        submit_cmd.append(f"--keywords-file {remote_cluster_job_dir + keywords_json_path}")
 
     try:
-        subprocess.run(
-            ["scp", "-r", backend_job_dir, f"cluster:{remote_cluster_job_dir}"],
-            check=True,
-            timeout=120,
-        )
-
-        result = subprocess.run(
-            ssh_cmd,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        stdout = backend.submit(remote_cluster_job_dir, job_files, submit_cmd, [str(job_id)])
+    except (ClusterCommandError, ClusterTimeoutError):
         raise HTTPException(status_code=500, detail="Cluster job submission failed")
-    finally:
-        clean_up_upload_cache(backend_job_dir)
 
-    slurm_id = result.stdout.strip()
+    slurm_id = stdout.strip()
     return {"job_id":job_id, "slurm_id":slurm_id}
 
 @router.post("/run_standard_analysis")
@@ -148,6 +191,7 @@ def run_standard_analysis(
         charge: int = Form(...),
         multiplicity: int = Form(...),
         opt_type: Optional[str] = Form(None),
+        backend: ClusterBackend = Depends(get_cluster_backend),
 ):
     """
     Endpoint to run advanced analysis on the cluster.
@@ -155,25 +199,25 @@ def run_standard_analysis(
     :param file: The file to be analyzed.
     :param charge: Charge of the system for the job.
     :param multiplicity: Multiplicity of the system for the job.
+    :param backend: Cluster backend dependency.
     :return: A message indicating the analysis has been initiated.
     """
+    xyz_content = validate_xyz_upload(file.file.read(), charge, multiplicity)
     job_id = uuid.uuid4()
-    backend_job_dir = f"{BACKEND_WORK_DIR}/jobs/{job_id}"
     remote_cluster_job_dir = f"{CLUSTER_WORK_DIR}/jobs/{job_id}"
-    os.makedirs(backend_job_dir, exist_ok=True)
 
     xyz_file_path = "/input.xyz"
-    with open(backend_job_dir + xyz_file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-
-    urls_path = "/urls.json"
     urls = construct_upload_script(str(job_id), "standard")
-    with open(backend_job_dir + urls_path, "w") as f:
-        f.write(json.dumps(urls))
-
-    # Differentiate unix command for local and production environment
-    if (ENV == "local"):
-        ssh_cmd = [
+    job_files = {
+        "input.xyz": xyz_content,
+        "urls.json": json.dumps(urls).encode(),
+    }
+
+    # Differentiate unix command for local and production environment.
+    # The fake backend takes precedence so local load tests skip the real script.
+    run_locally = ENV == "local" and not isinstance(backend, FakeClusterBackend)
+    if run_locally:
+        submit_cmd = [
             f"{ANACONDA_DIR}",
             f"{CLUSTER_WORK_DIR}/src/standard_analysis.py",
             str(job_id),
@@ -182,53 +226,45 @@ def run_standard_analysis(
             str(multiplicity),
         ]
     else:
-        ssh_cmd = [
-            "ssh", "cluster",
+        submit_cmd = [
             f"python3 {CLUSTER_WORK_DIR}/dispatch.py submit",
             remote_cluster_job_dir + xyz_file_path,
             str(job_id),
             str(charge),
             str(multiplicity),
         ]
-    
-    if opt_type is not None:
-        ssh_cmd.append(f"--opt-type {opt_type} ")
 
-    # subprocess.run(
-    #     ["ssh", "cluster", "mkdir", f"{WORK_DIR}/{job_dir}"],
-    #     check=True,
-    # )
+    if opt_type is not None:
+        submit_cmd.append(f"--opt-type {opt_type} ")
 
     try:
-        # Local development, use shutil.copytree instead
-        if (ENV == "local"):
-            if os.path.exists(remote_cluster_job_dir):
-                shutil.rmtree(remote_cluster_job_dir)
-            shutil.copytree(backend_job_dir, remote_cluster_job_dir)
-        else:
-            subprocess.run(
-                ["scp", "-r", backend_job_dir, f"cluster:{remote_cluster_job_dir}"],
+        # Local development writes straight into the local cluster directory
+        # and runs the analysis script there.
+        if run_locally:
+            _write_local_job_files(remote_cluster_job_dir, job_files)
+            result = subprocess.run(
+                submit_cmd,
                 check=True,
+                capture_output=True,
+                text=True,
                 timeout=120,
+                cwd=f"{CLUSTER_WORK_DIR}",
             )
-
-        result = subprocess.run(
-            ssh_cmd,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=120,
-            # For local development, setting current working directory as local cluster working directory.
-            cwd=f"{CLUSTER_WORK_DIR}" if ENV == "local" else None
-        )
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+            stdout = result.stdout
+        else:
+            stdout = backend.submit(remote_cluster_job_dir, job_files, submit_cmd, [str(job_id)])
+    except (
+        subprocess.CalledProcessError,
+        subprocess.TimeoutExpired,
+        OSError,
+        ClusterCommandError,
+        ClusterTimeoutError,
+    ):
         raise HTTPException(status_code=500, detail="Cluster job submission failed")
-    finally:
-        clean_up_upload_cache(backend_job_dir)
 
-    slurm_id = result.stdout.strip()
+    slurm_id = stdout.strip()
     # For local development, setting slurm ID to None
-    if (ENV == "local"):
+    if run_locally:
         try:
             int(slurm_id)
         except ValueError:
@@ -236,26 +272,220 @@ def run_standard_analysis(
 
     return {"job_id":job_id, "slurm_id":slurm_id}
 
-@router.get("/status/{slurm_id}", response_model=StatusResponse)
-def status(slurm_id: str):
-    cmd = [
-        "ssh", "cluster",
-        f"python3 {CLUSTER_WORK_DIR}/dispatch.py status {slurm_id}"
+def _batch_inputs(
+    files: List[UploadFile],
+    charge: int,
+    multiplicity: int,
+) -> List[tuple[str, bytes]]:
+    """
+    Validate uploaded .xyz files and split them into (filename, content)
+    pairs, one per job. A multi-frame file becomes one job per frame, named
+    <stem>_<n>.xyz. Frames are counted before any file is sent to the
+    structure pool, so an oversized batch is refused without parsing it.
+    """
+    uploads = []
+    frame_count = 0
+    for upload in files:
+        safe_name = Path(upload.filename or "").name
+        if not safe_name.lower().endswith(".xyz"):
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid file format. Only .xyz allowed.",
+            )
+        content = upload.file.read()
+        try:
+            frame_count += count_xyz_frames(content)
+        except XYZParseError as error:
+            raise HTTPException(status_code=400, detail=f"{safe_name}: {error}")
+        if frame_count > MAX_BATCH_JOBS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"A batch can contain at most {MAX_BATCH_JOBS} structures",
+            )
+        uploads.append((safe_name, content))
+
+    inputs = []
+    for safe_name, content in uploads:
+        try:
+            content = validate_xyz_upload(content, charge, multiplicity)
+        except HTTPException as error:
+            if error.status_code != 400:
+                raise
+            raise HTTPException(status_code=400, detail=f"{safe_name}: {error.detail}")
+        frames = split_xyz_frames(content)
+
+        if len(frames) == 1:
+            inputs.append((safe_name, frames[0]))
+            continue
+        stem = Path(safe_name).stem
+        inputs.extend(
+            (f"{stem}_{frame_number}.xyz", frame)
+            for frame_number, frame in enumerate(frames, start=1)
+        )
+    return inputs
+
+
+def _cancel_orphaned_array(backend: ClusterBackend, array_id: str) -> None:
+    """
+    Cancel a submitted array job whose Job rows could not be saved, so it
+    does not run on the cluster with nothing pointing at it.
+    """
+    logger.error("Cancelling array job %s because its jobs were not saved", array_id)
+    try:
+        backend.cancel(array_id)
+    except (ClusterCommandError, ClusterTimeoutError):
+        logger.exception("Could not cancel orphaned array job %s", array_id)
+
+
+@router.post("/run_batch_analysis", status_code=201)
+def run_batch_analysis(
+        files: List[UploadFile] = File(...),
+        calculation_type: CalculationType = Form(...),
+        method: str = Form(...),
+        basis_set: str = Form(...),
+        charge: int = Form(...),
+        multiplicity: int = Form(...),
+        job_name: Optional[str] = Form(None),
+        tags: List[str] = Form([]),
+        opt_type: Optional[str] = Form(None),
+        keywords: Optional[UploadFile] = File(None),
+        backend: ClusterBackend = Depends(get_cluster_backend),
+        db: Session = Depends(get_db),
+        current_user=Depends(verify_token),
+):
+    """
+    Submit the same calculation for many structures as one SLURM array job.
+    Every uploaded file becomes one job, and every frame of a multi-frame
+    file becomes its own job. All inputs travel to the cluster in one SSH
+    call and are submitted with dispatch.py submit-array, which reads the
+    job IDs from a manifest file in array task order. All Job rows are
+    created in one transaction after the cluster accepts the array.
+    Ownership follows the same rules as POST /jobs/.
+    :param files: One or more .xyz files, each with one or more frames.
+    :param calculation_type: Type of calculation to be performed.
+    :param method: Computational method shared by every job.
+    :param basis_set: Basis set shared by every job.
+    :param charge: Charge shared by every job.
+    :param multiplicity: Multiplicity shared by every job.
+    :param job_name: Optional name prefix; defaults to each input's file name.
+    :param tags: List of tags to associate with every job.
+    :param opt_type: Optional optimization type for every job.
+    :param keywords: Optional file containing keywords for every job.
+    :param backend: Cluster backend dependency.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: Batch ID, SLURM array ID, and a summary of each created job.
+    """
+    user = get_user_or_404(db, get_user_sub(current_user))
+    inputs = _batch_inputs(files, charge, multiplicity)
+
+    batch_id = uuid.uuid4()
+    job_ids = [uuid.uuid4() for _ in inputs]
+    urls_by_job_id = construct_upload_scripts(
+        [str(job_id) for job_id in job_ids],
+        calculation_type.value,
+    )
+
+    remote_jobs_dir = f"{CLUSTER_WORK_DIR}/jobs"
+    manifest_name = f"batch_{batch_id}.txt"
+    job_files = {
+        manifest_name: "".join(f"{job_id}\n" for job_id in job_ids).encode(),
+    }
+    for job_id, (_filename, content) in zip(job_ids, inputs):
+        job_files[f"{job_id}/input.xyz"] = content
+        job_files[f"{job_id}/urls.json"] = json.dumps(urls_by_job_id[str(job_id)]).encode()
+
+    submit_cmd = [
+        f"python3 {CLUSTER_WORK_DIR}/dispatch.py submit-array",
+        f"{remote_jobs_dir}/{manifest_name}",
+        calculation_type.value,
+        method,
+        basis_set,
+        str(charge),
+        str(multiplicity),
     ]
+
+    if opt_type is not None:
+        submit_cmd.append(f"--opt-type {opt_type} ")
+
+    if keywords is not None:
+        keywords_name = f"batch_{batch_id}_keywords.json"
+        job_files[keywords_name] = keywords.file.read()
+        submit_cmd.append(f"--keywords-file {remote_jobs_dir}/{keywords_name}")
+
     try:
-        proc = subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=120,
+        stdout = backend.submit(
+            remote_jobs_dir,
+            job_files,
+            submit_cmd,
+            [str(job_id) for job_id in job_ids],
+        )
+    except (ClusterCommandError, ClusterTimeoutError):
+        raise HTTPException(status_code=500, detail="Cluster job submission failed")
+
+    array_id = stdout.strip()
+    submitted_at = datetime.now(timezone.utc)
+    jobs = []
+    for task_index, (job_id, (filename, _content)) in enumerate(zip(job_ids, inputs)):
+        job = Job(
+            job_id=job_id,
+            job_name=(
+                f"{job_name} ({task_index + 1})" if job_name else Path(filename).stem
+            ),
+            filename=filename,
+            method=method,
+            basis_set=basis_set,
+            calculation_type=calculation_type.value,
+            charge=charge,
+            multiplicity=multiplicity,
+            slurm_id=f"{array_id}_{task_index}",
+            submitted_at=submitted_at,
+            user_sub=user.user_sub,
+            group_id=user.group_id,
+            status="pending",
+            is_deleted=False,
+            is_uploaded=False,
         )
+        jobs.append(job)
+
+    def add_jobs() -> None:
+        db.add_all(jobs)
+        # Tag rows are looked up or created once, then shared by every job.
+        set_asset_tags(db, jobs[0], user.user_sub, tags or [])
+        for job in jobs[1:]:
+            job.tags.extend(jobs[0].tags)
+
+    summaries = [
+        {
+            "job_id": str(job.job_id),
+            "job_name": job.job_name,
+            "filename": job.filename,
+            "slurm_id": job.slurm_id,
+        }
+        for job in jobs
+    ]
+    commit_or_rollback(
+        db,
+        before_commit=add_jobs,
+        error_detail="Failed to create jobs",
+        on_error=lambda: _cancel_orphaned_array(backend, array_id),
+    )
+
+    return {
+        "batch_id": str(batch_id),
+        "slurm_id": array_id,
+        "jobs": summaries,
+    }
+
+@router.get("/status/{slurm_id}", response_model=StatusResponse)
+def status(slurm_id: str, backend: ClusterBackend = Depends(get_cluster_backend)):
+    try:
         # TODO: state here is still a raw output, hasn't captured the actual state in the JSON object result
-        state = proc.stdout.strip()
+        state = backend.status(slurm_id).strip()
         return StatusResponse(slurm_id=slurm_id, state=state)
-    except subprocess.CalledProcessError as e:
+    except ClusterCommandError:
         raise HTTPException(500, detail="Failed to fetch status")
-    except subprocess.TimeoutExpired:
+    except ClusterTimeoutError:
         raise HTTPException(500, detail="Timed out fetching status")
 
 class ResultResponse(BaseModel):
@@ -267,85 +497,100 @@ def _require_job_read_access(
     job_id: str,
     db: Session,
     current_user,
-) -> None:
+) -> Job:
     job = get_asset_or_404(db, Job, job_id)
     user = get_user_or_404(db, get_user_sub(current_user))
     require_asset_permission(user, job, can_read_asset)
+    return job
 
 
-def _fetch_cluster_result(job_id: str, command_name: str) -> ResultResponse:
-    cmd = [
-        "ssh", "cluster",
-        f"python3 {CLUSTER_WORK_DIR}/dispatch.py {command_name} {job_id}"
-    ]
+def _fetch_cluster_result(
+    backend: ClusterBackend,
+    job_id: str,
+    command_name: str,
+) -> ResultResponse:
     try:
-        proc = subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-        return ResultResponse(job_id=job_id, output=proc.stdout)
-    except subprocess.CalledProcessError:
+        return ResultResponse(job_id=job_id, output=backend.output(job_id, command_name))
+    except ClusterCommandError:
         raise HTTPException(404, detail="Result not found yet")
-    except subprocess.TimeoutExpired:
+    except ClusterTimeoutError:
         raise HTTPException(500, detail="Timed out fetching result")
 
 
+def _job_result_response(
+    request: Request,
+    backend: ClusterBackend,
+    job: Job,
+    command_name: str,
+):
+    """
+    Return cluster output for a job, asking the cluster only once per
+    finished job. Output of unfinished jobs can still change, so it is
+    fetched on every call and never cached.
+    """
+    job_id = str(job.id)
+    if job.status not in FINISHED_JOB_STATUSES:
+        return _fetch_cluster_result(backend, job_id, command_name)
+
+    payload = result_cache.get_or_load(
+        f"{command_name}:{job_id}",
+        lambda: _fetch_cluster_result(backend, job_id, command_name).model_dump_json().encode(),
+    )
+    return cached_payload_response(request, payload)
+
+
 @router.get("/error/{job_id}", response_model=ResultResponse)
 def error_result(
     job_id: str,
+    request: Request,
+    backend: ClusterBackend = Depends(get_cluster_backend),
     db: Session = Depends(get_db),
     current_user=Depends(verify_token),
 ):
     """
     Fetch cluster stderr output when the authenticated user can read the job.
     Allows admins, direct owners, group admins for the job's group_id, and
-    current group members when the job is public.
+    current group members when the job is public. Output of finished jobs is
+    cached and served with an ETag, so If-None-Match requests get 304.
     :param job_id: ID of the job whose error output should be fetched.
+    :param request: Incoming request, used for conditional and gzip headers.
+    :param backend: Cluster backend dependency.
     :param db: Database session dependency.
     :param current_user: Current user dependency, verified via token.
     :return: Cluster error output for the job.
     """
-    _require_job_read_access(job_id, db, current_user)
-    return _fetch_cluster_result(job_id, "error")
+    job = _require_job_read_access(job_id, db, current_user)
+    return _job_result_response(request, backend, job, "error")
 
 @router.get("/result/{job_id}", response_model=ResultResponse)
 def result(
     job_id: str,
+    request: Request,
+    backend: ClusterBackend = Depends(get_cluster_backend),
     db: Session = Depends(get_db),
     current_user=Depends(verify_token),
 ):
     """
     Fetch cluster result output when the authenticated user can read the job.
     Allows admins, direct owners, group admins for the job's group_id, and
-    current group members when the job is public.
+    current group members when the job is public. Output of finished jobs is
+    cached and served with an ETag, so If-None-Match requests get 304.
     :param job_id: ID of the job whose result output should be fetched.
+    :param request: Incoming request, used for conditional and gzip headers.
+    :param backend: Cluster backend dependency.
     :param db: Database session dependency.
     :param current_user: Current user dependency, verified via token.
     :return: Cluster result output for the job.
     """
-    _require_job_read_access(job_id, db, current_user)
-    return _fetch_cluster_result(job_id, "result")
+    job = _require_job_read_access(job_id, db, current_user)
+    return _job_result_response(request, backend, job, "result")
 
 @router.post("/cancel/{slurm_id}", response_model=CancelResponse)
-def cancel(slurm_id: str):
-    cmd = [
-        "ssh", "cluster",
-        f"python3 {CLUSTER_WORK_DIR}/dispatch.py cancel {slurm_id}"
-    ]
+def cancel(slurm_id: str, backend: ClusterBackend = Depends(get_cluster_backend)):
     try:
-        proc = subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-        success = proc.stdout.strip()
+        success = backend.cancel(slurm_id).strip()
         return CancelResponse(slurm_id=slurm_id, success=success)
-    except subprocess.CalledProcessError as e:
+    except ClusterCommandError:
         raise HTTPException(500, detail="Failed to cancel the job")
-    except subprocess.TimeoutExpired:
+    except ClusterTimeoutError:
         raise HTTPException(500, detail="Timed out canceling the job")
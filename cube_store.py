@@ -0,0 +1,204 @@
+import gzip
+import json
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from artifact_store import (
+    DEFAULT_ARTIFACT_STORE_MAX_BYTES,
+    ArtifactStore,
+    write_directory_atomically,
+)
+
+# Levels of detail halve the grid in every dimension until the largest
+# dimension is at most this many points.
+MIN_LEVEL_POINTS = 16
+MAX_LEVELS = 6
+
+_META_FILE = "meta.json"
+# Every level is also stored gzip-compressed in each served dtype, so whole
+# levels can be sent compressed without compressing them per request.
+GZIP_DTYPES = {"float32": "<f4", "float16": "<f2"}
+
+
+class CubeParseError(ValueError):
+    pass
+
+
+@dataclass
+class ParsedCube:
+    comments: List[str]
+    # Origin and voxel axes as written in the cube header, in units.
+    origin: List[float]
+    axes: List[List[float]]
+    # (atomic number, nuclear charge, x, y, z) per atom.
+    atoms: List[List[float]]
+    values: np.ndarray
+    # "bohr", or "angstrom" when the header gives negative voxel counts.
+    units: str = "bohr"
+
+
+def parse_cube(content: bytes) -> ParsedCube:
+    """
+    Parse a Gaussian cube file. Files with several values per grid point,
+    such as multi-orbital cubes, keep the first value. Negative voxel counts
+    mark a file whose coordinates are in Ångström.
+    :raises CubeParseError: When the content is not a cube file.
+    """
+    lines = content.split(b"\n", 6)
+    try:
+        header = [line.split() for line in lines[2:6]]
+        atom_count = int(header[0][0])
+        origin = [float(value) for value in header[0][1:4]]
+        counts = [int(row[0]) for row in header[1:4]]
+        shape = tuple(abs(count) for count in counts)
+        axes = [[float(value) for value in row[1:4]] for row in header[1:4]]
+
+        remaining = lines[6].split(b"\n", abs(atom_count))
+        atoms = [
+            [float(value) for value in line.split()[:5]]
+            for line in remaining[:abs(atom_count)]
+        ]
+        data = remaining[abs(atom_count)]
+        values_per_point = 1
+        if atom_count < 0:
+            # The line after the atoms lists the orbitals in the file.
+            orbital_line, data = data.split(b"\n", 1)
+            values_per_point = int(orbital_line.split()[0])
+    except (IndexError, ValueError):
+        raise CubeParseError("Cube header is malformed")
+
+    if min(shape) < 1 or any(len(atom) != 5 for atom in atoms):
+        raise CubeParseError("Cube header is malformed")
+
+    with warnings.catch_warnings():
+        # NumPy warns, and in later versions raises, when the text stops
+        # being numbers.
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(
+                data.decode("ascii", errors="replace"),
+                dtype=np.float32,
+                sep=" ",
+            )
+        except (DeprecationWarning, ValueError):
+            raise CubeParseError("Cube grid values must be numbers")
+    expected = shape[0] * shape[1] * shape[2] * values_per_point
+    if values.size != expected:
+        raise CubeParseError(f"Expected {expected} grid values, found {values.size}")
+
+    return ParsedCube(
+        comments=[line.decode("utf-8", errors="replace").strip() for line in lines[:2]],
+        origin=origin,
+        axes=axes,
+        atoms=atoms,
+        values=values.reshape(*shape, values_per_point)[..., 0],
+        units="angstrom" if any(count < 0 for count in counts) else "bohr",
+    )
+
+
+def _halve(values: np.ndarray) -> np.ndarray:
+    """
+    Average 2 x 2 x 2 blocks. Odd dimensions repeat their last plane first.
+    """
+    padding = [(0, size % 2) for size in values.shape]
+    if any(after for _before, after in padding):
+        values = np.pad(values, padding, mode="edge")
+    nx, ny, nz = (size // 2 for size in values.shape)
+    return values.reshape(nx, 2, ny, 2, nz, 2).mean(axis=(1, 3, 5), dtype=np.float32)
+
+
+def build_levels(values: np.ndarray) -> List[np.ndarray]:
+    levels = [np.ascontiguousarray(values, dtype=np.float32)]
+    while max(levels[-1].shape) > MIN_LEVEL_POINTS and len(levels) < MAX_LEVELS:
+        levels.append(_halve(levels[-1]))
+    return levels
+
+
+def _level_file(level: int) -> str:
+    return f"level_{level}.npy"
+
+
+def _gzip_level_file(level: int, dtype: str) -> str:
+    return f"level_{level}.{dtype}.gz"
+
+
+def write_cube(parsed: ParsedCube, directory: Path) -> None:
+    levels = build_levels(parsed.values)
+    origin = np.array(parsed.origin)
+    axes = np.array(parsed.axes)
+    level_meta = []
+    for level, values in enumerate(levels):
+        factor = 2 ** level
+        level_meta.append({
+            "level": level,
+            "shape": list(values.shape),
+            # Each point averages a block, so it sits at the block's centre.
+            "origin": (origin + (factor - 1) / 2 * axes.sum(axis=0)).tolist(),
+            "axes": (axes * factor).tolist(),
+        })
+
+    def write_files(target: Path) -> None:
+        for level, values in enumerate(levels):
+            np.save(target / _level_file(level), values)
+            for dtype, encoding in GZIP_DTYPES.items():
+                (target / _gzip_level_file(level, dtype)).write_bytes(
+                    gzip.compress(values.astype(encoding).tobytes(), mtime=0)
+                )
+        (target / _META_FILE).write_text(json.dumps({
+            "comments": parsed.comments,
+            "units": parsed.units,
+            "atoms": parsed.atoms,
+            "levels": level_meta,
+        }))
+
+    write_directory_atomically(directory, write_files)
+
+
+class Cube:
+    """
+    Read-only view of a stored cube. Every level is a memory-mapped float32
+    array in C order (x slowest, z fastest), as in the cube file.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.meta = json.loads((directory / _META_FILE).read_text())
+
+    @property
+    def level_count(self) -> int:
+        return len(self.meta["levels"])
+
+    def values(self, level: int) -> np.ndarray:
+        return np.load(self.directory / _level_file(level), mmap_mode="r")
+
+    def level_size(self, level: int, dtype: str) -> int:
+        return int(np.prod(self.meta["levels"][level]["shape"])) * np.dtype(dtype).itemsize
+
+    def level_bytes(self, level: int, dtype: str, start: int, stop: int) -> bytes:
+        """
+        Return bytes start:stop of a level encoded as little-endian dtype.
+        Only the grid points overlapping the range are read and converted.
+        """
+        itemsize = np.dtype(dtype).itemsize
+        first, last = start // itemsize, -(-stop // itemsize)
+        points = self.values(level).reshape(-1)[first:last]
+        encoded = points.astype(np.dtype(dtype).newbyteorder("<")).tobytes()
+        offset = start - first * itemsize
+        return encoded[offset:offset + stop - start]
+
+    def level_gzip(self, level: int, dtype: str) -> Optional[bytes]:
+        """
+        Return a whole level encoded as little-endian dtype and gzip-compressed,
+        or None for cubes stored before compressed levels were written.
+        """
+        path = self.directory / _gzip_level_file(level, dtype)
+        return path.read_bytes() if path.exists() else None
+
+
+class CubeStore(ArtifactStore[ParsedCube, Cube]):
+    def __init__(self, root: str, max_bytes: Optional[int] = DEFAULT_ARTIFACT_STORE_MAX_BYTES):
+        super().__init__(root, write_cube, Cube, max_bytes)
@@ -30,6 +30,10 @@ class RequestStatus(str, Enum):
     cancelled = "cancelled"
 
 
+JOB_STATUSES = {"pending", "running", "completed", "failed", "cancelled", "out_of_memory", "timeout"}
+FINISHED_JOB_STATUSES = {"completed", "failed", "cancelled", "out_of_memory", "timeout"}
+
+
 calculation_types = {
     'Molecular Energy': 'energy',
 	'Geometric Optimization': 'optimization',
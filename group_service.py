@@ -1,9 +1,9 @@
-from typing import Optional, Protocol, Type, TypeVar
+from typing import Iterable, Optional, Protocol, Type, TypeVar
 
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session, selectinload
 
-from asset_service import list_group_assets
+from asset_service import FieldSelection, list_group_assets
 from models import Asset, Group, Job, Structure, User
 from permissions import (
     can_demember_group_user,
@@ -162,10 +162,17 @@ def list_group_assets_for_user(
     user: User,
     model: Type[AssetModel],
     serialize_asset: AssetSerializer[AssetModel],
-    *,
+    *criteria,
     limit: Optional[int] = None,
     offset: int = 0,
+    selection: Optional[FieldSelection] = None,
+    order_by: Optional[Iterable] = None,
 ) -> list[dict]:
+    """
+    List the user's group assets. When selection is given, serialize_asset
+    should already omit collections outside selection.include; only those
+    collections are loaded, and the result is projected onto its fields.
+    """
     require_group_membership(user)
 
     include_all_owner_metadata = can_view_group_owner_metadata(user)
@@ -173,18 +180,24 @@ def list_group_assets_for_user(
         db,
         model,
         user.group_id,
+        *criteria,
         public_only=not include_all_owner_metadata,
         limit=limit,
         offset=offset,
+        include=selection.include if selection else None,
+        order_by=order_by,
     )
 
-    return [
+    payloads = [
         serialize_asset(
             asset,
             include_user_sub=include_all_owner_metadata or asset.user_sub == user.user_sub,
         )
         for asset in assets
     ]
+    if selection is None:
+        return payloads
+    return [selection.project(payload) for payload in payloads]
 
 
 def update_group_name(
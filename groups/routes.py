@@ -1,4 +1,5 @@
-from typing import Optional
+from functools import partial
+from typing import List, Optional
 
 from fastapi import (
     APIRouter,
@@ -6,11 +7,13 @@ from fastapi import (
     Depends,
     Query,
 )
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from enum_types import AssetOwnership, RequestStatus, RequestType
 from dependencies import get_db
 from auth import verify_token
+from json_response import FastJSONResponse
 from request_service import (
     DEFAULT_RECENT_DAYS,
     list_group_requests,
@@ -25,7 +28,11 @@ from group_service import (
     update_group_name,
 )
 from asset_service import (
+    JobListFilters,
+    bulk_transfer_asset_ownership,
     get_asset_or_404,
+    job_list_filters,
+    parse_field_selection,
     serialize_job,
     serialize_structure,
     transfer_asset_ownership,
@@ -40,16 +47,35 @@ from utils import (
     MAX_JOB_LIST_LIMIT,
     MAX_REQUEST_LIST_LIMIT,
     MAX_STRUCTURE_LIST_LIMIT,
+    MAX_BULK_ASSET_UPDATES,
     MAX_USER_LIST_LIMIT,
     get_user_sub,
 )
 
 router = APIRouter(prefix="/group", tags=["group"])
 
+
+class OwnershipTransfer(BaseModel):
+    ownership: AssetOwnership
+    user_sub: Optional[str] = None
+    group_id: Optional[str] = None
+
+
+class BulkJobOwnershipTransfer(OwnershipTransfer):
+    job_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_ASSET_UPDATES)
+
+
+class BulkStructureOwnershipTransfer(OwnershipTransfer):
+    structure_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_ASSET_UPDATES)
+
+
 @router.get("/jobs")
 def get_all_jobs(
     limit: int = Query(DEFAULT_JOB_LIST_LIMIT, ge=1, le=MAX_JOB_LIST_LIMIT),
     offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
+    filters: JobListFilters = Depends(job_list_filters),
     db: Session = Depends(get_db),
     current_user=Depends(verify_token),
 ):
@@ -62,19 +88,59 @@ def get_all_jobs(
     owner; use GET /jobs/ for the authenticated user's own jobs.
     :param limit: Maximum number of jobs to return, up to 100.
     :param offset: Number of sorted jobs to skip.
+    :param fields: Comma-separated job fields to return; job_id is always
+        returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: structures,
+        tags. Defaults to both without fields and to neither with fields.
+    :param filters: Status, calculation_type, method, basis_set, and tag
+        filters and the sort order; see job_list_filters.
     :param db: Database session dependency.
     :param current_user: Current user dependency, verified via token.
     :return: List of serialized job details.
     """
+    selection = parse_field_selection(Job, fields, include)
+    user = get_user_or_404(db, get_user_sub(current_user))
+    return FastJSONResponse(
+        list_group_assets_for_user(
+            db,
+            user,
+            Job,
+            partial(serialize_job, include=selection.include),
+            *filters.criteria,
+            limit=limit,
+            offset=offset,
+            selection=selection,
+            order_by=filters.order_by,
+        )
+    )
+
+@router.patch("/jobs")
+def update_jobs_ownership(
+    payload: BulkJobOwnershipTransfer,
+    db: Session = Depends(get_db),
+    current_user=Depends(verify_token),
+):
+    """
+    Transfer ownership of many non-deleted jobs to the same owner in one
+    transaction, with the same rules as PATCH /group/jobs/{job_id}. An
+    invalid request fails as a whole; jobs the user may not transfer do not
+    block the others.
+    :param payload: Job ids and the target ownership, user_sub, and group_id.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: One result per requested job, in request order.
+    """
     user = get_user_or_404(db, get_user_sub(current_user))
-    return list_group_assets_for_user(
+    results = bulk_transfer_asset_ownership(
         db,
         user,
         Job,
-        serialize_job,
-        limit=limit,
-        offset=offset,
+        payload.job_ids,
+        payload.ownership,
+        payload.user_sub,
+        payload.group_id,
     )
+    return {"results": results}
 
 @router.patch("/jobs/{job_id}")
 def update_job_ownership(
@@ -119,6 +185,8 @@ def get_all_structures(
         le=MAX_STRUCTURE_LIST_LIMIT,
     ),
     offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user=Depends(verify_token),
 ):
@@ -132,19 +200,55 @@ def get_all_structures(
     structures.
     :param limit: Maximum number of structures to return, up to 100.
     :param offset: Number of sorted structures to skip.
+    :param fields: Comma-separated structure fields to return; structure_id is
+        always returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: tags.
+        Defaults to tags without fields and to none with fields.
     :param db: Database session dependency.
     :param current_user: Current user dependency, verified via token.
     :return: List of serialized structure details.
     """
+    selection = parse_field_selection(Structure, fields, include)
     user = get_user_or_404(db, get_user_sub(current_user))
-    return list_group_assets_for_user(
+    return FastJSONResponse(
+        list_group_assets_for_user(
+            db,
+            user,
+            Structure,
+            partial(serialize_structure, include_tags="tags" in selection.include),
+            limit=limit,
+            offset=offset,
+            selection=selection,
+        )
+    )
+
+@router.patch("/structures")
+def update_structures_ownership(
+    payload: BulkStructureOwnershipTransfer,
+    db: Session = Depends(get_db),
+    current_user=Depends(verify_token),
+):
+    """
+    Transfer ownership of many non-deleted structures to the same owner in
+    one transaction, with the same rules as PATCH
+    /group/structures/{structure_id}. An invalid request fails as a whole;
+    structures the user may not transfer do not block the others.
+    :param payload: Structure ids and the target ownership, user_sub, and group_id.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: One result per requested structure, in request order.
+    """
+    user = get_user_or_404(db, get_user_sub(current_user))
+    results = bulk_transfer_asset_ownership(
         db,
         user,
         Structure,
-        serialize_structure,
-        limit=limit,
-        offset=offset,
+        payload.structure_ids,
+        payload.ownership,
+        payload.user_sub,
+        payload.group_id,
     )
+    return {"results": results}
 
 @router.patch("/structures/{structure_id}")
 def update_structure_ownership(
@@ -270,14 +374,16 @@ def get_group_requests(
     :return: Request details for the current group.
     """
     user = get_user_or_404(db, get_user_sub(current_user))
-    return list_group_requests(
-        db,
-        user,
-        request_status,
-        request_type,
-        recent_days,
-        limit=limit,
-        offset=offset,
+    return FastJSONResponse(
+        list_group_requests(
+            db,
+            user,
+            request_status,
+            request_type,
+            recent_days,
+            limit=limit,
+            offset=offset,
+        )
     )
 
 @router.patch("/{group_id}")
@@ -0,0 +1,215 @@
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from artifact_store import (
+    DEFAULT_ARTIFACT_STORE_MAX_BYTES,
+    ArtifactStore,
+    write_directory_atomically,
+)
+
+_NUMBER = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)(?:[Ee][+-]?\d+)?")
+# Uncompressed data is numbers separated by blanks, commas, or semicolons,
+# or run together with their signs as separators (packed form). Any other
+# token, such as 450E or @A1J, is in one of the compressed ASDF forms.
+_DATA_SEPARATORS = re.compile(rb"[\s,;]+")
+_NUMBERS_TOKEN = re.compile(rb"(?:" + _NUMBER.pattern + rb")+")
+
+_X_FILE = "x.npy"
+_Y_FILE = "y.npy"
+_META_FILE = "meta.json"
+
+
+class JCAMPParseError(ValueError):
+    pass
+
+
+@dataclass
+class Spectrum:
+    # "continuous" for sampled curves, "peaks" for stick spectra.
+    kind: str
+    title: str
+    x_units: str
+    y_units: str
+    x: np.ndarray
+    y: np.ndarray
+
+
+def _labelled_records(content: bytes) -> Dict[str, bytes]:
+    """
+    Split JCAMP-DX content into its ##LABEL=value records, keeping the first
+    block of a multi-block file. Labels are upper-cased without spaces,
+    dashes, or slashes, as the standard compares them.
+    """
+    records: Dict[str, bytes] = {}
+    current = None
+    for line in content.splitlines():
+        # $$ starts a comment that runs to the end of the line.
+        line = line.split(b"$$", 1)[0]
+        if line.startswith(b"##"):
+            raw_label, _, value = line[2:].partition(b"=")
+            label = re.sub(r"[\s\-/_]", "", raw_label.decode("ascii", "replace")).upper()
+            if label == "END" and records.keys() & {"XYDATA", "XYPOINTS", "PEAKTABLE"}:
+                break
+            # Later blocks repeat labels such as TITLE; the first one wins.
+            current = None if label in records else label
+            if current is not None:
+                records[current] = value.strip()
+        elif current is not None:
+            records[current] += b"\n" + line
+    return records
+
+
+def _number(records: Dict[str, bytes], label: str, default: Optional[float] = None) -> float:
+    value = records.get(label)
+    if value is None or not value.strip():
+        if default is None:
+            raise JCAMPParseError(f"Missing ##{label}")
+        return default
+    try:
+        return float(value.split()[0])
+    except ValueError:
+        raise JCAMPParseError(f"##{label} must be a number")
+
+
+def _data_body(data: bytes) -> bytes:
+    # The first line of a data record names its form, e.g. (X++(Y..Y)).
+    _form, _, body = data.partition(b"\n")
+    for token in _DATA_SEPARATORS.split(body):
+        if token and not _NUMBERS_TOKEN.fullmatch(token):
+            raise JCAMPParseError("Compressed (ASDF) spectrum data is not supported")
+    return body
+
+
+def _parse_xydata(records: Dict[str, bytes]) -> tuple[np.ndarray, np.ndarray]:
+    x_factor = _number(records, "XFACTOR", 1.0)
+    y_factor = _number(records, "YFACTOR", 1.0)
+    first_x = _number(records, "FIRSTX")
+    last_x = _number(records, "LASTX")
+    point_count = int(_number(records, "NPOINTS"))
+    if point_count < 1:
+        raise JCAMPParseError("##NPOINTS must be positive")
+    delta_x = (last_x - first_x) / (point_count - 1) if point_count > 1 else 0.0
+
+    xs, ys = [], []
+    for line in _data_body(records["XYDATA"]).splitlines():
+        numbers = [float(number) for number in _NUMBER.findall(line)]
+        if len(numbers) < 2:
+            continue
+        # Each line starts with the abscissa of its first ordinate.
+        line_x = numbers[0] * x_factor
+        for index, y in enumerate(numbers[1:]):
+            xs.append(line_x + index * delta_x)
+            ys.append(y * y_factor)
+
+    if len(xs) != point_count:
+        raise JCAMPParseError(f"Expected {point_count} points, found {len(xs)}")
+    return np.array(xs), np.array(ys)
+
+
+def _parse_pairs(records: Dict[str, bytes], label: str) -> tuple[np.ndarray, np.ndarray]:
+    numbers = np.array(_NUMBER.findall(_data_body(records[label])), dtype=np.float64)
+    if len(numbers) % 2:
+        raise JCAMPParseError(f"##{label} must contain x, y pairs")
+    pairs = numbers.reshape(-1, 2)
+    return (
+        pairs[:, 0] * _number(records, "XFACTOR", 1.0),
+        pairs[:, 1] * _number(records, "YFACTOR", 1.0),
+    )
+
+
+def parse_jcamp_spectrum(content: bytes) -> Spectrum:
+    """
+    Parse a JCAMP-DX spectrum written as uncompressed (AFFN) ##XYDATA,
+    ##XYPOINTS, or ##PEAK TABLE data. Points are returned sorted by x.
+    :raises JCAMPParseError: When the content has no readable spectrum.
+    """
+    records = _labelled_records(content)
+    if "XYDATA" in records:
+        kind = "continuous"
+        x, y = _parse_xydata(records)
+    elif "XYPOINTS" in records:
+        kind = "continuous"
+        x, y = _parse_pairs(records, "XYPOINTS")
+    elif "PEAKTABLE" in records:
+        kind = "peaks"
+        x, y = _parse_pairs(records, "PEAKTABLE")
+    else:
+        raise JCAMPParseError("No ##XYDATA, ##XYPOINTS, or ##PEAK TABLE record")
+    if len(x) == 0:
+        raise JCAMPParseError("Spectrum has no points")
+
+    order = np.argsort(x, kind="stable")
+    return Spectrum(
+        kind=kind,
+        title=records.get("TITLE", b"").decode("utf-8", "replace").strip(),
+        x_units=records.get("XUNITS", b"").decode("utf-8", "replace").strip(),
+        y_units=records.get("YUNITS", b"").decode("utf-8", "replace").strip(),
+        x=x[order],
+        y=y[order],
+    )
+
+
+def spectrum_grid(start: float, stop: float, resolution: float) -> np.ndarray:
+    """
+    Return evenly spaced abscissas from start to stop inclusive.
+    """
+    return start + np.arange(int(np.floor((stop - start) / resolution + 1e-9)) + 1) * resolution
+
+
+def spectrum_range(spectra: List[Spectrum]) -> tuple[float, float]:
+    """
+    Return the smallest and largest x over all spectra.
+    """
+    return (
+        min(float(spectrum.x[0]) for spectrum in spectra),
+        max(float(spectrum.x[-1]) for spectrum in spectra),
+    )
+
+
+def resample_spectrum(spectrum: Spectrum, grid: np.ndarray, resolution: float) -> np.ndarray:
+    """
+    Resample a spectrum onto grid, where each grid point stands for the bin
+    of width resolution around it. Peak intensities in a bin are summed.
+    Curves are averaged over each bin, and interpolated where a bin is
+    narrower than the spacing of the data. Outside the data the result is 0.
+    """
+    edges = np.append(grid - resolution / 2, grid[-1] + resolution / 2)
+    totals, _edges = np.histogram(spectrum.x, bins=edges, weights=spectrum.y)
+    if spectrum.kind == "peaks":
+        return totals
+
+    counts, _edges = np.histogram(spectrum.x, bins=edges)
+    interpolated = np.interp(grid, spectrum.x, spectrum.y, left=0.0, right=0.0)
+    return np.where(counts > 0, totals / np.maximum(counts, 1), interpolated)
+
+
+def write_spectrum(spectrum: Spectrum, directory: Path) -> None:
+    def write_files(target: Path) -> None:
+        np.save(target / _X_FILE, spectrum.x)
+        np.save(target / _Y_FILE, spectrum.y)
+        (target / _META_FILE).write_text(json.dumps({
+            "kind": spectrum.kind,
+            "title": spectrum.title,
+            "x_units": spectrum.x_units,
+            "y_units": spectrum.y_units,
+        }))
+
+    write_directory_atomically(directory, write_files)
+
+
+def read_spectrum(directory: Path) -> Spectrum:
+    return Spectrum(
+        **json.loads((directory / _META_FILE).read_text()),
+        x=np.load(directory / _X_FILE),
+        y=np.load(directory / _Y_FILE),
+    )
+
+
+class SpectrumStore(ArtifactStore[Spectrum, Spectrum]):
+    def __init__(self, root: str, max_bytes: Optional[int] = DEFAULT_ARTIFACT_STORE_MAX_BYTES):
+        super().__init__(root, write_spectrum, read_spectrum, max_bytes)
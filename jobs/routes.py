@@ -2,9 +2,10 @@ import os
 import uuid
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List
+from typing import List, Literal, Optional
 from fastapi import (
     APIRouter,
     UploadFile,
@@ -17,14 +18,27 @@ from fastapi import (
     Response,
 )
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from asset_service import (
+    MAX_TAG_FILTERS,
+    JobListFilters,
+    bulk_soft_delete_assets,
+    bulk_update_asset_tags,
+    bulk_update_asset_visibility,
     get_asset_or_404,
-    list_user_assets,
+    job_list_filters,
+    list_readable_assets,
+    list_user_job_payloads,
+    parse_field_selection,
+    parse_tag_filter,
     require_asset_permission,
+    search_readable_assets,
     serialize_job,
     set_asset_tags,
     soft_delete_asset,
+    tagged_asset_criterion,
     update_asset_visibility,
 )
 from permissions import (
@@ -35,23 +49,100 @@ from permissions import (
 from models import Job, Structure
 from dependencies import get_db
 from auth import verify_token
+from cluster.backends import ClusterBackend, ClusterCommandError, ClusterTimeoutError
+from cluster.routes import get_cluster_backend
 from user_service import get_user_or_404
+from json_response import FastJSONResponse
 from utils import (
     DEFAULT_JOB_LIST_LIMIT,
+    MAX_BULK_ASSET_UPDATES,
     MAX_JOB_LIST_LIMIT,
     commit_or_rollback,
     get_user_sub,
 )
-from enum_types import CalculationType
+from enum_types import CalculationType, FINISHED_JOB_STATUSES, JOB_STATUSES
+from process_pool import validate_xyz_upload
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 JOB_DIR = "./results"
-CLUSTER_WORK_DIR = os.getenv("CLUSTER_WORK_DIR")
+
+UPLOADED_JOB_STATUSES = {"completed", "failed"}
+MAX_RESULT_UPLOAD_WORKERS = 8
+
+
+class JobStatusUpdate(BaseModel):
+    job_id: str
+    state: Optional[str] = None
+    runtime: Optional[str] = None
+
+
+class BulkJobStatusUpdate(BaseModel):
+    updates: List[JobStatusUpdate] = Field(..., min_length=1, max_length=MAX_BULK_ASSET_UPDATES)
+
+
+class BulkJobIds(BaseModel):
+    job_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_ASSET_UPDATES)
+
+
+class BulkJobTagUpdate(BulkJobIds):
+    add: List[str] = Field([], max_length=MAX_TAG_FILTERS)
+    remove: List[str] = Field([], max_length=MAX_TAG_FILTERS)
+
+
+class BulkJobVisibilityUpdate(BulkJobIds):
+    is_public: bool
+
+
+def _parse_runtime(runtime: str) -> timedelta:
+    try:
+        h, m, s = map(int, runtime.split(":"))
+        return timedelta(hours=h, minutes=m, seconds=s)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid runtime format. Use HH:MM:SS.",
+        )
+
+
+def _parse_job_status(state: str) -> str:
+    new_status = state.lower()
+    if new_status not in JOB_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid status. Allowed values are: {', '.join(JOB_STATUSES)}",
+        )
+    return new_status
+
+
+def _bulk_error(job_id: str, status_code: int, detail: str) -> dict:
+    return {"job_id": job_id, "status_code": status_code, "detail": detail}
+
+
+def _upload_job_results(
+    backend: ClusterBackend,
+    job_id: str,
+    calculation_type: str,
+    new_status: str,
+) -> bool:
+    """
+    Ask the cluster to upload a finished job's results to S3.
+    Failures are reported as False so a status update never fails because of
+    the upload; the job stays marked as not uploaded.
+    """
+    try:
+        backend.upload_results(job_id, calculation_type, new_status == "completed")
+        return True
+    except (ClusterCommandError, ClusterTimeoutError):
+        return False
+
 
 @router.get("/")
 def get_all_jobs(
     limit: int = Query(DEFAULT_JOB_LIST_LIMIT, ge=1, le=MAX_JOB_LIST_LIMIT),
     offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
+    filters: JobListFilters = Depends(job_list_filters),
     db: Session = Depends(get_db),
     current_user=Depends(verify_token),
 ):
@@ -59,21 +150,193 @@ def get_all_jobs(
     List non-deleted jobs directly owned by the authenticated user.
     This includes co-owned jobs even if the user later leaves the group, but
     does not include public jobs owned only by the user's current group.
-    Results are ordered by submission time, most recent first.
+    Results are ordered by submission time, most recent first, unless sort
+    is given. Filters run in SQL, so status=running returns the user's running
+    jobs directly. Pass fields, and include when needed, to read only part of each job; for
+    example fields=job_id,status,job_name for status polling.
     :param limit: Maximum number of jobs to return, up to 100.
     :param offset: Number of sorted jobs to skip.
+    :param fields: Comma-separated job fields to return; job_id is always
+        returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: structures,
+        tags. Defaults to both without fields and to neither with fields.
+    :param filters: Status, calculation_type, method, basis_set, and tag
+        filters and the sort order; see job_list_filters.
     :param db: Database session dependency.
     :param current_user: Current user dependency, verified via token.
     :return: List of serialized job details.
     """
+    selection = parse_field_selection(Job, fields, include)
     user_sub = get_user_sub(current_user)
-    jobs = list_user_assets(db, Job, user_sub, limit=limit, offset=offset)
-    return [serialize_job(job) for job in jobs]
+    return FastJSONResponse(
+        list_user_job_payloads(
+            db,
+            user_sub,
+            *filters.criteria,
+            limit=limit,
+            offset=offset,
+            selection=selection,
+            order_by=filters.order_by,
+        )
+    )
+
+
+@router.get("/search")
+def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_JOB_LIST_LIMIT, ge=1, le=MAX_JOB_LIST_LIMIT),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    current_user=Depends(verify_token),
+):
+    """
+    Search the names and notes of non-deleted jobs the authenticated user can
+    read, best match first. Every word must appear, with the last word also
+    matching as a prefix, so q=benz finds "benzene scan".
+    :param q: Words to search for.
+    :param limit: Maximum number of jobs to return, up to 100.
+    :param offset: Number of ranked jobs to skip.
+    :param fields: Comma-separated job fields to return; job_id is always
+        returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: structures,
+        tags. Defaults to both without fields and to neither with fields.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: List of serialized job details.
+    """
+    selection = parse_field_selection(Job, fields, include)
+    user = get_user_or_404(db, get_user_sub(current_user))
+    jobs = search_readable_assets(
+        db,
+        Job,
+        user,
+        q,
+        limit=limit,
+        offset=offset,
+        include=selection.include,
+    )
+    return FastJSONResponse([
+        selection.project(
+            serialize_job(
+                job,
+                include_user_sub=can_view_asset_user_owner(user, job),
+                include=selection.include,
+            )
+        )
+        for job in jobs
+    ])
+
+
+@router.get("/tagged")
+def get_jobs_by_tag(
+    tag: List[str] = Query([]),
+    match: Literal["all", "any"] = Query("all"),
+    limit: int = Query(DEFAULT_JOB_LIST_LIMIT, ge=1, le=MAX_JOB_LIST_LIMIT),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    current_user=Depends(verify_token),
+):
+    """
+    List non-deleted jobs the authenticated user can read that carry the
+    given tags, most recent first. Tags match by name, whoever created them.
+    :param tag: Tag name to look for; repeat it for several tags.
+    :param match: "all" keeps jobs with every tag, "any" jobs with at least one.
+    :param limit: Maximum number of jobs to return, up to 100.
+    :param offset: Number of sorted jobs to skip.
+    :param fields: Comma-separated job fields to return; job_id is always
+        returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: structures,
+        tags. Defaults to both without fields and to neither with fields.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: List of serialized job details.
+    """
+    selection = parse_field_selection(Job, fields, include)
+    tag_names = parse_tag_filter(tag)
+    user = get_user_or_404(db, get_user_sub(current_user))
+    jobs = list_readable_assets(
+        db,
+        Job,
+        user,
+        tagged_asset_criterion(Job, tag_names, match_all=match == "all"),
+        limit=limit,
+        offset=offset,
+        include=selection.include,
+    )
+    return FastJSONResponse([
+        selection.project(
+            serialize_job(
+                job,
+                include_user_sub=can_view_asset_user_owner(user, job),
+                include=selection.include,
+            )
+        )
+        for job in jobs
+    ])
+
+
+@router.get("/visible")
+def get_visible_jobs(
+    writable: bool = Query(False),
+    limit: int = Query(DEFAULT_JOB_LIST_LIMIT, ge=1, le=MAX_JOB_LIST_LIMIT),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
+    filters: JobListFilters = Depends(job_list_filters),
+    db: Session = Depends(get_db),
+    current_user=Depends(verify_token),
+):
+    """
+    List every non-deleted job the authenticated user can read in one query:
+    their own and co-owned jobs, and their group's jobs (all of them for group
+    admins, public ones for members). Filters and sort work as in GET /jobs.
+    :param writable: Only list jobs the user can edit.
+    :param limit: Maximum number of jobs to return, up to 100.
+    :param offset: Number of sorted jobs to skip.
+    :param fields: Comma-separated job fields to return; job_id is always
+        returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: structures,
+        tags. Defaults to both without fields and to neither with fields.
+    :param filters: Status, calculation_type, method, basis_set, and tag
+        filters and the sort order; see job_list_filters.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: List of serialized job details.
+    """
+    selection = parse_field_selection(Job, fields, include)
+    user = get_user_or_404(db, get_user_sub(current_user))
+    jobs = list_readable_assets(
+        db,
+        Job,
+        user,
+        *filters.criteria,
+        writable_only=writable,
+        limit=limit,
+        offset=offset,
+        include=selection.include,
+        order_by=filters.order_by,
+    )
+    return FastJSONResponse([
+        selection.project(
+            serialize_job(
+                job,
+                include_user_sub=can_view_asset_user_owner(user, job),
+                include=selection.include,
+            )
+        )
+        for job in jobs
+    ])
 
 
 @router.get("/{job_id}")
 def get_job_by_id(
     job_id: str,
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user=Depends(verify_token),
 ):
@@ -83,15 +346,26 @@ def get_job_by_id(
     current group members when the job is public. Public group viewers do not
     receive another user's user_sub.
     :param job_id: ID of the job to retrieve.
+    :param fields: Comma-separated job fields to return; job_id is always
+        returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: structures,
+        tags. Defaults to both without fields and to neither with fields.
     :param db: Database session dependency.
     :param current_user: Current user dependency, verified via token.
     :return: Serialized job details.
     """
+    selection = parse_field_selection(Job, fields, include)
     job = get_asset_or_404(db, Job, job_id)
     user = get_user_or_404(db, get_user_sub(current_user))
     require_asset_permission(user, job, can_read_asset)
 
-    return serialize_job(job, include_user_sub=can_view_asset_user_owner(user, job))
+    return selection.project(
+        serialize_job(
+            job,
+            include_user_sub=can_view_asset_user_owner(user, job),
+            include=selection.include,
+        )
+    )
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -115,6 +389,25 @@ def delete_job(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.post("/delete", status_code=status.HTTP_200_OK)
+def delete_jobs(
+    payload: BulkJobIds,
+    db: Session = Depends(get_db),
+    current_user=Depends(verify_token),
+):
+    """
+    Soft-delete many jobs in one transaction, with the same rules as DELETE
+    /jobs/{job_id}. Missing, already deleted, or forbidden jobs do not block
+    the others.
+    :param payload: IDs of the jobs to delete.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: One result per requested job, in request order.
+    """
+    user = get_user_or_404(db, get_user_sub(current_user))
+    return {"results": bulk_soft_delete_assets(db, user, Job, payload.job_ids)}
+
+
 @router.post("/", status_code=status.HTTP_201_CREATED)
 def create_job(
     file: UploadFile = File(...),
@@ -136,6 +429,9 @@ def create_job(
     Create a new job by uploading a .xyz file and job metadata.
     Ownership is derived from the authenticated user's database record. Users in a
     group always create co-owned jobs with user_sub and group_id set.
+    The file, including charge and multiplicity parity, is checked in the
+    structure process pool before anything is saved, and 503 is returned when
+    the pool is saturated. The upload is saved as sent.
     :param tags: List of tags to associate with the job.
     :param file: Upload file containing the job structure (must be .xyz format).
     :param job_id: Unique ID for the job (UUID format).
@@ -168,6 +464,9 @@ def create_job(
             detail="Invalid file format. Only .xyz allowed.",
         )
 
+    content = file.file.read()
+    validate_xyz_upload(content, charge, multiplicity)
+
     user = get_user_or_404(db, get_user_sub(current_user))
     user_sub = user.user_sub
 
@@ -178,7 +477,7 @@ def create_job(
     try:
         # Save file
         with open(file_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+            f.write(content)
 
         new_job = Job(
             job_id=parsed_job_id,
@@ -243,6 +542,185 @@ def create_job(
     )
 
 
+@router.patch("/status", status_code=status.HTTP_200_OK)
+def update_job_statuses(
+    payload: BulkJobStatusUpdate,
+    current_user=Depends(verify_token),
+    db: Session = Depends(get_db),
+    backend: ClusterBackend = Depends(get_cluster_backend),
+):
+    """
+    Update the execution status or runtime of many jobs in one transaction.
+    Intended for cluster callbacks at the end of array jobs. Every job is
+    loaded with one query and checked with the same rules as PATCH
+    /jobs/{job_id}; valid updates are written with one batched UPDATE and one
+    commit. Result uploads for newly completed or failed jobs then run in
+    parallel, and the uploaded jobs are marked in a second short transaction.
+    Invalid, missing, or forbidden entries do not block the others.
+    :param payload: List of job_id, state, and runtime updates.
+    :param current_user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :param backend: Cluster backend dependency, used for result uploads.
+    :return: One result per requested update, in request order.
+    """
+    user = get_user_or_404(db, get_user_sub(current_user))
+
+    parsed_job_ids = {}
+    for item in payload.updates:
+        try:
+            parsed_job_ids[item.job_id] = uuid.UUID(str(item.job_id))
+        except ValueError:
+            pass
+
+    jobs_by_id = {}
+    if parsed_job_ids:
+        jobs_by_id = {
+            job.id: job
+            for job in db.query(Job)
+            .filter(
+                Job.id.in_(set(parsed_job_ids.values())),
+                Job.is_deleted.is_(False),
+            )
+            .all()
+        }
+
+    now = datetime.now(timezone.utc)
+    results = []
+    rows_by_job_id = {}
+    status_changed_job_ids = set()
+    for item in payload.updates:
+        job = jobs_by_id.get(parsed_job_ids.get(item.job_id))
+        if job is None:
+            results.append(_bulk_error(item.job_id, status.HTTP_404_NOT_FOUND, Job.not_found_detail))
+            continue
+        if not can_write_asset(user, job):
+            results.append(_bulk_error(item.job_id, status.HTTP_403_FORBIDDEN, "Insufficient permissions"))
+            continue
+
+        # Every row carries the same columns so the UPDATE runs as a single
+        # executemany. A later entry for the same job builds on an earlier one,
+        # as separate PATCH calls in the same order would.
+        row = rows_by_job_id.get(job.id) or {
+            "id": job.id,
+            "status": job.status,
+            "runtime": job.runtime,
+            "completed_at": job.completed_at,
+        }
+        try:
+            runtime = _parse_runtime(item.runtime) if item.runtime else row["runtime"]
+            new_status = (
+                _parse_job_status(item.state) if item.state is not None else None
+            )
+        except HTTPException as error:
+            results.append(_bulk_error(item.job_id, error.status_code, error.detail))
+            continue
+
+        row["runtime"] = runtime
+        if new_status is not None:
+            row["status"] = new_status
+            status_changed_job_ids.add(job.id)
+            if new_status in FINISHED_JOB_STATUSES:
+                row["completed_at"] = now
+        rows_by_job_id[job.id] = row
+        results.append({"job_id": item.job_id, "status_code": status.HTTP_200_OK})
+
+    for result in results:
+        if result["status_code"] != status.HTTP_200_OK:
+            continue
+        row = rows_by_job_id[parsed_job_ids[result["job_id"]]]
+        result["status"] = row["status"]
+        result["runtime"] = str(row["runtime"]) if row["runtime"] is not None else None
+
+    uploads = {
+        job_pk: (str(job_pk), jobs_by_id[job_pk].calculation_type, row["status"])
+        for job_pk, row in rows_by_job_id.items()
+        if row["status"] in UPLOADED_JOB_STATUSES
+        and job_pk in status_changed_job_ids
+        and not jobs_by_id[job_pk].is_uploaded
+    }
+    if not rows_by_job_id:
+        return {"results": results}
+
+    # Statuses are committed before the uploads start, which can take minutes
+    # for a large batch, so no row stays locked while they run.
+    commit_or_rollback(
+        db,
+        before_commit=lambda: db.execute(update(Job), list(rows_by_job_id.values())),
+        integrity_error_detail="Database integrity error",
+    )
+
+    if uploads:
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_RESULT_UPLOAD_WORKERS, len(uploads))
+        ) as executor:
+            uploaded = executor.map(
+                lambda args: _upload_job_results(backend, *args), uploads.values()
+            )
+            uploaded_job_ids = [
+                job_pk for job_pk, is_uploaded in zip(uploads, uploaded) if is_uploaded
+            ]
+        if uploaded_job_ids:
+            commit_or_rollback(
+                db,
+                before_commit=lambda: db.execute(
+                    update(Job)
+                    .where(Job.id.in_(uploaded_job_ids))
+                    .values(is_uploaded=True)
+                ),
+                integrity_error_detail="Database integrity error",
+            )
+
+    return {"results": results}
+
+
+@router.patch("/tags", status_code=status.HTTP_200_OK)
+def update_job_tags(
+    payload: BulkJobTagUpdate,
+    current_user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    Add and remove tags on many jobs in one transaction. Jobs are checked
+    with the same rules as PATCH /jobs/{job_id}; missing or forbidden jobs do
+    not block the others. Added tags are the authenticated user's; removed
+    names unlink matching tags of any owner.
+    :param payload: Job ids and the tag names to add and to remove.
+    :param current_user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: One result per requested job, in request order.
+    """
+    user = get_user_or_404(db, get_user_sub(current_user))
+    results = bulk_update_asset_tags(
+        db,
+        user,
+        Job,
+        payload.job_ids,
+        add=payload.add,
+        remove=payload.remove,
+    )
+    return {"results": results}
+
+
+@router.patch("/visibility", status_code=status.HTTP_200_OK)
+def update_jobs_visibility(
+    payload: BulkJobVisibilityUpdate,
+    current_user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    Update public/private visibility for many jobs in one transaction, with
+    the same rules as PATCH /jobs/{job_id}/visibility. Refused jobs do not
+    block the others.
+    :param payload: Job ids and the visibility to set.
+    :param current_user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: One result per requested job, in request order.
+    """
+    user = get_user_or_404(db, get_user_sub(current_user))
+    results = bulk_update_asset_visibility(db, user, Job, payload.job_ids, payload.is_public)
+    return {"results": results}
+
+
 @router.patch("/{job_id}/visibility", status_code=status.HTTP_200_OK)
 def update_job_visibility(
     job_id: str,
@@ -280,6 +758,7 @@ def update_job(
     user_sub: Optional[str] = Form(None),
     current_user=Depends(verify_token),
     db: Session = Depends(get_db),
+    backend: ClusterBackend = Depends(get_cluster_backend),
 ):
     """
     Update a job's execution status or runtime.
@@ -290,6 +769,7 @@ def update_job(
     :param job_id: ID of the job to update.
     :param current_user: Current user dependency, verified via token.
     :param db: Database session dependency.
+    :param backend: Cluster backend dependency, used for result uploads.
     :return: JSONResponse with updated job details and status code 200 OK.
     """
     job = get_asset_or_404(db, Job, job_id)
@@ -297,56 +777,23 @@ def update_job(
     require_asset_permission(user, job, can_write_asset)
 
     if runtime:
-        try:
-            h, m, s = map(int, runtime.split(":"))
-            job.runtime = timedelta(hours=h, minutes=m, seconds=s)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid runtime format. Use HH:MM:SS.",
-            )
+        job.runtime = _parse_runtime(runtime)
 
     if state is not None:
-        allowed = {"pending", "running", "completed", "failed", "cancelled", "out_of_memory", "timeout"}
-        new_status = state.lower()
-        if new_status not in allowed:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status. Allowed values are: {', '.join(allowed)}",
-            )
+        new_status = _parse_job_status(state)
         job.status = new_status
 
-        if new_status in {"completed", "failed", "cancelled", "out_of_memory", "timeout"}:
+        if new_status in FINISHED_JOB_STATUSES:
             job.completed_at = datetime.now(timezone.utc)
 
             # Attempt result upload for completed/failed jobs
-            if new_status in {"completed", "failed"} and not job.is_uploaded:
-                if not CLUSTER_WORK_DIR:
-                    # Server misconfiguration — do not crash request, just skip upload
-                    job.is_uploaded = False
-                else:
-                    is_success = "true" if new_status == "completed" else "false"
-                    try:
-                        proc = subprocess.run(
-                            [
-                                "ssh",
-                                "cluster",
-                                "python3",
-                                f"{CLUSTER_WORK_DIR}/Cluster-API-QC/src/upload_result.py",
-                                job_id,
-                                str(job.calculation_type),
-                                is_success,
-                            ],
-                            check=True,
-                            capture_output=True,
-                            text=True,
-                            timeout=120,
-                        )
-                        job.is_uploaded = (proc.returncode == 0)
-                    except subprocess.CalledProcessError:
-                        job.is_uploaded = False
-                    except subprocess.TimeoutExpired:
-                        job.is_uploaded = False
+            if new_status in UPLOADED_JOB_STATUSES and not job.is_uploaded:
+                job.is_uploaded = _upload_job_results(
+                    backend,
+                    job_id,
+                    job.calculation_type,
+                    new_status,
+                )
 
     commit_or_rollback(
         db,
@@ -0,0 +1,17 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson.
+    FastAPI runs returned values through jsonable_encoder before any response
+    class sees them. List endpoints return this response directly instead,
+    because the serializers already produce plain str, int, bool, None,
+    list, and dict values and the extra pass costs more than encoding.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from database import init_db
+from json_response import FastJSONResponse
 from jobs.routes import router as jobs_router
 from structures.routes import router as structures_router
 from enums.routes import router as enums_router
@@ -14,7 +15,7 @@ from s3.routes import router as s3_router
 
 
 def create_app(create_tables: bool = False) -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(default_response_class=FastJSONResponse)
 
     app.add_middleware(
         CORSMiddleware,
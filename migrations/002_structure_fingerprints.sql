@@ -0,0 +1,18 @@
+-- Add the indexed structure fingerprints used by POST /structures/search.
+-- Run this after 001_pr14_database_changes.sql.
+-- Existing structures keep NULL fingerprints, so search does not match them.
+-- It is safe to run this file again after it succeeds.
+
+BEGIN;
+
+ALTER TABLE public.structures
+    ADD COLUMN IF NOT EXISTS fingerprint text,
+    ADD COLUMN IF NOT EXISTS near_fingerprint text;
+
+CREATE INDEX IF NOT EXISTS idx_structures_fingerprint
+ON public.structures(fingerprint);
+
+CREATE INDEX IF NOT EXISTS idx_structures_near_fingerprint
+ON public.structures(near_fingerprint);
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- Add the indexed element composition used by GET /structures/composition.
+-- Run this after 002_structure_fingerprints.sql.
+-- Existing structures keep NULL compositions until filled from their formula
+-- text with `python structure_composition.py`.
+-- It is safe to run this file again after it succeeds.
+
+BEGIN;
+
+ALTER TABLE public.structures
+    ADD COLUMN IF NOT EXISTS composition jsonb,
+    ADD COLUMN IF NOT EXISTS heavy_atom_count integer;
+
+CREATE INDEX IF NOT EXISTS idx_structures_composition
+ON public.structures USING gin (composition);
+
+CREATE INDEX IF NOT EXISTS idx_structures_heavy_atom_count
+ON public.structures(heavy_atom_count);
+
+COMMIT;
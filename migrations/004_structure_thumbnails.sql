@@ -0,0 +1,11 @@
+-- Add the content hash that keys server-rendered structure thumbnails.
+-- Run this after 003_structure_composition.sql.
+-- Existing structures keep NULL hashes, so listings link their uploaded image.
+-- It is safe to run this file again after it succeeds.
+
+BEGIN;
+
+ALTER TABLE public.structures
+    ADD COLUMN IF NOT EXISTS content_hash text;
+
+COMMIT;
@@ -0,0 +1,20 @@
+-- Add the partial indexes used by status-filtered job listings.
+-- Run this after 004_structure_thumbnails.sql.
+-- The predicates match the is_deleted IS FALSE filter of every job listing.
+-- It is safe to run this file again after it succeeds.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_user_status_active
+ON public.jobs(user_sub, status, submitted_at DESC)
+WHERE is_deleted IS FALSE;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_group_status_active
+ON public.jobs(group_id, status, submitted_at DESC)
+WHERE is_deleted IS FALSE;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status_active
+ON public.jobs(status, submitted_at DESC)
+WHERE is_deleted IS FALSE;
+
+COMMIT;
@@ -0,0 +1,30 @@
+-- Add the full-text search vectors behind GET /jobs/search and
+-- GET /structures/search.
+-- Run this after 005_job_list_filters.sql.
+-- The generated columns are filled in for existing rows when they are added,
+-- which rewrites both tables, so run this outside busy hours.
+-- It is safe to run this file again after it succeeds.
+
+BEGIN;
+
+ALTER TABLE public.jobs
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(job_name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(job_notes, '')), 'B')
+    ) STORED;
+
+ALTER TABLE public.structures
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(notes, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_search
+ON public.jobs USING gin (search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_structures_search
+ON public.structures USING gin (search_vector);
+
+COMMIT;
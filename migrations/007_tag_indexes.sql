@@ -0,0 +1,18 @@
+-- Add the indexes used to list jobs and structures by tag.
+-- Run this after 006_asset_search.sql.
+-- The association tables' primary keys lead with the asset id, so lookups by
+-- tag_id scanned them before.
+-- It is safe to run this file again after it succeeds.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_tags_tag_id
+ON public.jobs_tags(tag_id);
+
+CREATE INDEX IF NOT EXISTS idx_structures_tags_tag_id
+ON public.structures_tags(tag_id);
+
+CREATE INDEX IF NOT EXISTS idx_tags_name
+ON public.tags(name);
+
+COMMIT;
@@ -3,18 +3,21 @@ from sqlalchemy import (
     Boolean,
     CheckConstraint,
     Column,
+    DDL,
     DateTime,
     ForeignKey,
     Index,
     Integer,
     Interval,
+    JSON,
     String,
     Table,
     Text,
     UniqueConstraint,
+    event,
     text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import declared_attr, relationship, synonym
 
 from database import Base
@@ -54,6 +57,8 @@ structures_tags = Table(
         ForeignKey('tags.tag_id', ondelete='CASCADE'),
         primary_key=True
     ),
+    # The primary key leads with structure_id; this serves lookups by tag.
+    Index("idx_structures_tags_tag_id", "tag_id"),
 )
 
 jobs_tags = Table(
@@ -71,6 +76,8 @@ jobs_tags = Table(
         ForeignKey('tags.tag_id', ondelete='CASCADE'),
         primary_key=True
     ),
+    # The primary key leads with job_id; this serves lookups by tag.
+    Index("idx_jobs_tags_tag_id", "tag_id"),
 )
 
 
@@ -139,6 +146,31 @@ class Job(Asset):
         ),
         Index("idx_jobs_user_active_submitted", "user_sub", "is_deleted", "submitted_at"),
         Index("idx_jobs_group_active_submitted", "group_id", "is_deleted", "submitted_at"),
+        # Filtered job listings, newest first as in migration 005; the
+        # predicates match Job.is_deleted.is_(False).
+        Index(
+            "idx_jobs_user_status_active",
+            "user_sub",
+            "status",
+            text("submitted_at DESC"),
+            postgresql_where=text("is_deleted IS FALSE"),
+            sqlite_where=text("is_deleted IS 0"),
+        ),
+        Index(
+            "idx_jobs_group_status_active",
+            "group_id",
+            "status",
+            text("submitted_at DESC"),
+            postgresql_where=text("is_deleted IS FALSE"),
+            sqlite_where=text("is_deleted IS 0"),
+        ),
+        Index(
+            "idx_jobs_status_active",
+            "status",
+            text("submitted_at DESC"),
+            postgresql_where=text("is_deleted IS FALSE"),
+            sqlite_where=text("is_deleted IS 0"),
+        ),
     )
 
     job_id = synonym("id")
@@ -182,6 +214,10 @@ class Structure(Asset):
         ),
         Index("idx_structures_user_active_uploaded", "user_sub", "is_deleted", "uploaded_at"),
         Index("idx_structures_group_active_uploaded", "group_id", "is_deleted", "uploaded_at"),
+        Index("idx_structures_fingerprint", "fingerprint"),
+        Index("idx_structures_near_fingerprint", "near_fingerprint"),
+        Index("idx_structures_composition", "composition", postgresql_using="gin"),
+        Index("idx_structures_heavy_atom_count", "heavy_atom_count"),
     )
 
     structure_id = synonym("id")
@@ -190,6 +226,18 @@ class Structure(Asset):
     formula = Column(Text, nullable=False)
     location = Column(Text, nullable=False)
     notes = Column(Text, nullable=True)
+    # Set from the uploaded file; see structure_fingerprint.py.
+    fingerprint = Column(Text, nullable=True)
+    near_fingerprint = Column(Text, nullable=True)
+    # Element symbol to atom count, and the number of non-hydrogen atoms; see
+    # structure_composition.py.
+    composition = Column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+        nullable=True,
+    )
+    heavy_atom_count = Column(Integer, nullable=True)
+    # SHA-256 of the uploaded file, which keys its cached thumbnails.
+    content_hash = Column(Text, nullable=True)
 
     jobs = relationship(
         'Job',
@@ -197,10 +245,64 @@ class Structure(Asset):
         back_populates='structures'
     )
 
+# Full-text search over each asset's name and notes. PostgreSQL keeps a
+# generated tsvector column with a GIN index. SQLite keeps an FTS5 table named
+# <table>_search in step with triggers. Neither is mapped; see
+# asset_service.search_readable_assets.
+SEARCH_CONFIG = "english"
+
+
+def _add_search_index(table: Table, name_column: str, notes_column: str) -> None:
+    id_column = table.primary_key.columns.values()[0].name
+    search_table = f"{table.name}_search"
+    postgresql_ddl = [
+        f"""ALTER TABLE {table.name} ADD COLUMN search_vector tsvector
+GENERATED ALWAYS AS (
+    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({name_column}, '')), 'A')
+    || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({notes_column}, '')), 'B')
+) STORED""",
+        f"CREATE INDEX idx_{table.name}_search ON {table.name} USING gin (search_vector)",
+    ]
+    sqlite_ddl = [
+        f"""CREATE VIRTUAL TABLE {search_table} USING fts5(
+    {id_column} UNINDEXED, {name_column}, {notes_column}, tokenize='porter unicode61'
+)""",
+        f"""CREATE TRIGGER {search_table}_insert AFTER INSERT ON {table.name} BEGIN
+    INSERT INTO {search_table} ({id_column}, {name_column}, {notes_column})
+    VALUES (new.{id_column}, new.{name_column}, new.{notes_column});
+END""",
+        f"""CREATE TRIGGER {search_table}_update
+AFTER UPDATE OF {name_column}, {notes_column} ON {table.name} BEGIN
+    UPDATE {search_table}
+    SET {name_column} = new.{name_column}, {notes_column} = new.{notes_column}
+    WHERE {id_column} = old.{id_column};
+END""",
+        f"""CREATE TRIGGER {search_table}_delete AFTER DELETE ON {table.name} BEGIN
+    DELETE FROM {search_table} WHERE {id_column} = old.{id_column};
+END""",
+    ]
+    for statement in postgresql_ddl:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in sqlite_ddl:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    # Dropping the table drops its triggers but not the FTS5 table.
+    event.listen(
+        table,
+        "after_drop",
+        DDL(f"DROP TABLE IF EXISTS {search_table}").execute_if(dialect="sqlite"),
+    )
+
+
+_add_search_index(Job.__table__, "job_name", "job_notes")
+_add_search_index(Structure.__table__, "name", "notes")
+
+
 class Tags(Base):
     __tablename__ = "tags"
     __table_args__ = (
         UniqueConstraint("user_sub", "name", name="uq_tags_user_sub_name"),
+        # Tag filters match names in every user's namespace.
+        Index("idx_tags_name", "name"),
     )
 
     tag_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
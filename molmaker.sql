@@ -56,6 +56,7 @@ CREATE TABLE public.jobs (
     is_public boolean DEFAULT false NOT NULL,
     is_uploaded boolean DEFAULT false NOT NULL,
     group_id uuid,
+    search_vector tsvector GENERATED ALWAYS AS ((setweight(to_tsvector('english'::regconfig, COALESCE(job_name, ''::text)), 'A'::"char") || setweight(to_tsvector('english'::regconfig, COALESCE(job_notes, ''::text)), 'B'::"char"))) STORED,
     CONSTRAINT ck_jobs_owner_present CHECK ((is_deleted OR (user_sub IS NOT NULL) OR (group_id IS NOT NULL)))
 );
 
@@ -119,6 +120,12 @@ CREATE TABLE public.structures (
     formula text NOT NULL,
     group_id uuid,
     is_public boolean DEFAULT false NOT NULL,
+    fingerprint text,
+    near_fingerprint text,
+    composition jsonb,
+    heavy_atom_count integer,
+    content_hash text,
+    search_vector tsvector GENERATED ALWAYS AS ((setweight(to_tsvector('english'::regconfig, COALESCE(name, ''::text)), 'A'::"char") || setweight(to_tsvector('english'::regconfig, COALESCE(notes, ''::text)), 'B'::"char"))) STORED,
     CONSTRAINT ck_structures_owner_present CHECK ((is_deleted OR (user_sub IS NOT NULL) OR (group_id IS NOT NULL)))
 );
 
@@ -387,6 +394,34 @@ ALTER TABLE ONLY public.users
 CREATE INDEX idx_jobs_group_active_submitted ON public.jobs USING btree (group_id, is_deleted, submitted_at DESC);
 
 
+--
+-- Name: idx_jobs_group_status_active; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_jobs_group_status_active ON public.jobs USING btree (group_id, status, submitted_at DESC) WHERE (is_deleted IS FALSE);
+
+
+--
+-- Name: idx_jobs_search; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_jobs_search ON public.jobs USING gin (search_vector);
+
+
+--
+-- Name: idx_jobs_status_active; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_jobs_status_active ON public.jobs USING btree (status, submitted_at DESC) WHERE (is_deleted IS FALSE);
+
+
+--
+-- Name: idx_jobs_tags_tag_id; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_jobs_tags_tag_id ON public.jobs_tags USING btree (tag_id);
+
+
 --
 -- Name: idx_jobs_user_active_submitted; Type: INDEX; Schema: public; Owner: -
 --
@@ -394,6 +429,13 @@ CREATE INDEX idx_jobs_group_active_submitted ON public.jobs USING btree (group_i
 CREATE INDEX idx_jobs_user_active_submitted ON public.jobs USING btree (user_sub, is_deleted, submitted_at DESC);
 
 
+--
+-- Name: idx_jobs_user_status_active; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_jobs_user_status_active ON public.jobs USING btree (user_sub, status, submitted_at DESC) WHERE (is_deleted IS FALSE);
+
+
 --
 -- Name: idx_requests_created_by_status; Type: INDEX; Schema: public; Owner: -
 --
@@ -429,6 +471,20 @@ CREATE INDEX idx_requests_sender_status ON public.requests USING btree (sender_s
 CREATE INDEX idx_requests_status_expires_at ON public.requests USING btree (status, expires_at);
 
 
+--
+-- Name: idx_structures_composition; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_structures_composition ON public.structures USING gin (composition);
+
+
+--
+-- Name: idx_structures_fingerprint; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_structures_fingerprint ON public.structures USING btree (fingerprint);
+
+
 --
 -- Name: idx_structures_group_active_uploaded; Type: INDEX; Schema: public; Owner: -
 --
@@ -436,6 +492,34 @@ CREATE INDEX idx_requests_status_expires_at ON public.requests USING btree (stat
 CREATE INDEX idx_structures_group_active_uploaded ON public.structures USING btree (group_id, is_deleted, uploaded_at DESC);
 
 
+--
+-- Name: idx_structures_heavy_atom_count; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_structures_heavy_atom_count ON public.structures USING btree (heavy_atom_count);
+
+
+--
+-- Name: idx_structures_near_fingerprint; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_structures_near_fingerprint ON public.structures USING btree (near_fingerprint);
+
+
+--
+-- Name: idx_structures_search; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_structures_search ON public.structures USING gin (search_vector);
+
+
+--
+-- Name: idx_structures_tags_tag_id; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_structures_tags_tag_id ON public.structures_tags USING btree (tag_id);
+
+
 --
 -- Name: idx_structures_user_active_uploaded; Type: INDEX; Schema: public; Owner: -
 --
@@ -443,6 +527,13 @@ CREATE INDEX idx_structures_group_active_uploaded ON public.structures USING btr
 CREATE INDEX idx_structures_user_active_uploaded ON public.structures USING btree (user_sub, is_deleted, uploaded_at DESC);
 
 
+--
+-- Name: idx_tags_name; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_tags_name ON public.tags USING btree (name);
+
+
 --
 -- Name: idx_users_group_role; Type: INDEX; Schema: public; Owner: -
 --
@@ -1,3 +1,6 @@
+from typing import Type
+
+from sqlalchemy import and_, or_, true
 from sqlalchemy.orm import Session
 
 from enum_types import RequestType
@@ -190,3 +193,38 @@ def can_transfer_asset_ownership(user: User, asset: Asset) -> bool:
 
 def can_view_asset_user_owner(user: User, asset: Asset) -> bool:
     return can_write_asset(user, asset)
+
+
+# Asset query predicates
+#
+# SQL forms of the asset permissions above, for filtering a query to the rows
+# a user may see without loading them first. They must stay in step with
+# their Python counterparts.
+
+def readable_assets_clause(user: User, model: Type[Asset]):
+    """
+    SQL form of can_read_asset for rows of model.
+    """
+    if is_admin(user):
+        return true()
+
+    readable = [model.user_sub == user.user_sub]
+    if user.group_id is not None:
+        group_assets = model.group_id == user.group_id
+        if not is_group_admin(user):
+            group_assets = and_(group_assets, model.is_public.is_(True))
+        readable.append(group_assets)
+    return or_(*readable)
+
+
+def writable_assets_clause(user: User, model: Type[Asset]):
+    """
+    SQL form of can_write_asset for rows of model.
+    """
+    if is_admin(user):
+        return true()
+
+    writable = [model.user_sub == user.user_sub]
+    if is_group_admin(user) and user.group_id is not None:
+        writable.append(model.group_id == user.group_id)
+    return or_(*writable)
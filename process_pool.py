@@ -0,0 +1,206 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+
+from cube_store import CubeParseError, ParsedCube, parse_cube
+from ir_spectrum import JCAMPParseError, Spectrum, parse_jcamp_spectrum
+from structure_fingerprint import StructureFingerprint, fingerprint_xyz
+from structure_thumbnail import fingerprint_and_render_xyz
+from trajectory_store import ParsedTrajectory, parse_trajectory
+from xyz_parser import XYZParseError
+from xyz_validation import normalize_xyz
+
+STRUCTURE_POOL_RETRY_AFTER_SECONDS = 1
+
+
+class PoolSaturatedError(RuntimeError):
+    pass
+
+
+class BoundedProcessPool:
+    """
+    Process pool for CPU-bound work that would otherwise hold the GIL in the
+    request threadpool. At most max_pending calls may be queued or running;
+    further calls raise PoolSaturatedError instead of waiting, so callers can
+    shed load. With max_workers=0 calls run inline in the calling thread.
+    Worker processes are started on first use.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn keeps workers from inheriting the server's threads,
+                # sockets, and database connections.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reset_executor(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """
+        :raises PoolSaturatedError: When max_pending calls are already in flight.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturatedError("Process pool is saturated")
+
+        try:
+            if self.max_workers == 0:
+                future = Future()
+                try:
+                    future.set_result(fn(*args))
+                except Exception as error:
+                    future.set_exception(error)
+            else:
+                executor = self._get_executor()
+                try:
+                    future = executor.submit(fn, *args)
+                except BrokenProcessPool:
+                    # A worker died; start a fresh pool for this and later calls.
+                    self._reset_executor(executor)
+                    future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+    def run(self, fn: Callable, *args):
+        """
+        Run fn in the pool and wait for its result. Exceptions raised by fn
+        are re-raised in the caller.
+        """
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def pool_saturated_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Structure parser is busy, please retry shortly",
+        headers={"Retry-After": str(STRUCTURE_POOL_RETRY_AFTER_SECONDS)},
+    )
+
+
+STRUCTURE_POOL_WORKERS = int(
+    os.getenv("STRUCTURE_POOL_WORKERS", min(4, os.cpu_count() or 1))
+)
+structure_pool = BoundedProcessPool(
+    max_workers=STRUCTURE_POOL_WORKERS,
+    max_pending=int(
+        os.getenv("STRUCTURE_POOL_MAX_PENDING", 4 * max(STRUCTURE_POOL_WORKERS, 1))
+    ),
+)
+
+
+def _run_parse_task(
+    fn: Callable,
+    *args,
+    parse_error: Type[ValueError] = XYZParseError,
+    file_description: str = "XYZ file",
+):
+    try:
+        return structure_pool.run(fn, *args)
+    except PoolSaturatedError:
+        raise pool_saturated_exception()
+    except parse_error as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {file_description}: {e}",
+        )
+
+
+def validate_xyz_upload(
+    content: bytes,
+    charge: Optional[int] = None,
+    multiplicity: Optional[int] = None,
+) -> bytes:
+    """
+    Validate uploaded XYZ content in the structure process pool.
+    :return: The normalized XYZ content.
+    :raises HTTPException: 400 for invalid XYZ, 503 when the pool is saturated.
+    """
+    return _run_parse_task(normalize_xyz, content, charge, multiplicity)
+
+
+def fingerprint_xyz_upload(content: bytes) -> StructureFingerprint:
+    """
+    Validate uploaded XYZ content and fingerprint it in the structure process pool.
+    :raises HTTPException: 400 for invalid XYZ, 503 when the pool is saturated.
+    """
+    return _run_parse_task(fingerprint_xyz, content)
+
+
+def fingerprint_and_render_upload(
+    content: bytes,
+    render_thumbnails: bool,
+) -> Tuple[StructureFingerprint, Optional[Dict[str, bytes]]]:
+    """
+    Validate and fingerprint uploaded XYZ content and, when render_thumbnails
+    is set, render its PNG thumbnails, parsing it once in one pool task.
+    :return: The fingerprint, and the PNGs by size name or None.
+    :raises HTTPException: 400 for invalid XYZ, 503 when the pool is saturated.
+    """
+    return _run_parse_task(fingerprint_and_render_xyz, content, render_thumbnails)
+
+
+def parse_trajectory_file(content: bytes) -> ParsedTrajectory:
+    """
+    Parse multi-frame XYZ content in the structure process pool.
+    :raises HTTPException: 400 for invalid XYZ, 503 when the pool is saturated.
+    """
+    return _run_parse_task(parse_trajectory, content)
+
+
+def parse_cube_file(content: bytes) -> ParsedCube:
+    """
+    Parse cube file content in the structure process pool.
+    :raises HTTPException: 400 for an invalid cube file, 503 when the pool is saturated.
+    """
+    return _run_parse_task(
+        parse_cube,
+        content,
+        parse_error=CubeParseError,
+        file_description="cube file",
+    )
+
+
+def parse_jcamp_file(content: bytes) -> Spectrum:
+    """
+    Parse JCAMP-DX spectrum content in the structure process pool.
+    :raises HTTPException: 400 for an invalid spectrum, 503 when the pool is saturated.
+    """
+    return _run_parse_task(
+        parse_jcamp_spectrum,
+        content,
+        parse_error=JCAMPParseError,
+        file_description="JCAMP-DX file",
+    )
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from auth import verify_token
 from dependencies import get_db
+from json_response import FastJSONResponse
 from enum_types import RequestStatus, RequestType
 from group_service import get_group_or_404
 from permissions import can_create_invite_request, is_admin_or_group_admin
@@ -52,14 +53,16 @@ def get_received_requests(
     :return: Request details.
     """
     user = get_user_or_404(db, get_user_sub(current_user))
-    return list_received_requests(
-        db,
-        user,
-        request_status,
-        request_type,
-        recent_days,
-        limit=limit,
-        offset=offset,
+    return FastJSONResponse(
+        list_received_requests(
+            db,
+            user,
+            request_status,
+            request_type,
+            recent_days,
+            limit=limit,
+            offset=offset,
+        )
     )
 
 
@@ -91,14 +94,16 @@ def get_sent_requests(
     :return: Request details.
     """
     user = get_user_or_404(db, get_user_sub(current_user))
-    return list_sent_requests(
-        db,
-        user,
-        request_status,
-        request_type,
-        recent_days,
-        limit=limit,
-        offset=offset,
+    return FastJSONResponse(
+        list_sent_requests(
+            db,
+            user,
+            request_status,
+            request_type,
+            recent_days,
+            limit=limit,
+            offset=offset,
+        )
     )
 
 
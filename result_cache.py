@@ -0,0 +1,184 @@
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body)
+
+
+def build_payload(body: bytes) -> CachedPayload:
+    return CachedPayload(
+        body=body,
+        gzip_body=gzip.compress(body, mtime=0),
+        etag=_etag(body),
+    )
+
+
+def _etag(body: bytes) -> str:
+    # Weak because the same entity is served both plain and gzip-encoded.
+    return f'W/"{hashlib.sha256(body).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cached_payload_response(request: Request, payload: CachedPayload) -> Response:
+    """
+    Respond with payload, gzip-encoded when the client accepts it, or with
+    304 Not Modified when If-None-Match already names its ETag.
+    """
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    if "gzip" in request.headers.get("accept-encoding", "").lower():
+        headers["Content-Encoding"] = "gzip"
+        return Response(payload.gzip_body, media_type="application/json", headers=headers)
+    return Response(payload.body, media_type="application/json", headers=headers)
+
+
+class ResultCache:
+    """
+    Two-tier cache for payloads that never change once written.
+    The memory tier evicts least recently used entries once max_bytes is
+    reached. The optional disk tier keeps gzip bodies under cache_dir so a
+    restarted worker does not have to ask the cluster again.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES,
+        cache_dir: Optional[str] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: "OrderedDict[str, CachedPayload]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+
+    def get(self, key: str) -> Optional[CachedPayload]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                return payload
+
+        payload = self._read_disk(key)
+        if payload is not None:
+            self._remember(key, payload)
+        return payload
+
+    def put(self, key: str, body: bytes) -> CachedPayload:
+        payload = build_payload(body)
+        self._remember(key, payload)
+        self._write_disk(key, payload)
+        return payload
+
+    def get_or_load(self, key: str, load: Callable[[], bytes]) -> CachedPayload:
+        """
+        Return the cached payload for key, calling load at most once per key
+        even when several requests miss at the same time.
+        """
+        payload = self.get(key)
+        if payload is not None:
+            return payload
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            payload = self.get(key)
+            if payload is None:
+                payload = self.put(key, load())
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remember(self, key: str, payload: CachedPayload) -> None:
+        if payload.size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[key] = payload
+            self._size += payload.size
+            while self._size > self.max_bytes:
+                _evicted_key, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.gz"
+
+    def _read_disk(self, key: str) -> Optional[CachedPayload]:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            gzip_body = path.read_bytes()
+            body = gzip.decompress(gzip_body)
+        except (OSError, EOFError):
+            logger.exception("Could not read cached result %s", path)
+            return None
+        return CachedPayload(
+            body=body,
+            gzip_body=gzip_body,
+            etag=_etag(body),
+        )
+
+    def _write_disk(self, key: str, payload: CachedPayload) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_bytes(payload.gzip_body)
+            os.replace(temp_path, path)
+        except OSError:
+            logger.exception("Could not write cached result %s", path)
@@ -1,22 +1,75 @@
+import math
+import os
+from typing import List, Literal, Optional
+
+import numpy as np
+import orjson
+
+from botocore.exceptions import ClientError
 from fastapi import (
     APIRouter,
     Depends,
     HTTPException,
+    Query,
+    Request,
+    Response,
+    status as http_status,
 )
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from artifact_store import DEFAULT_ARTIFACT_STORE_MAX_BYTES
 from asset_service import get_asset_or_404, require_asset_permission
 from auth import verify_token
 from dependencies import get_db
 from models import Job
 from permissions import can_read_asset
-from storage import construct_fetch_script, presign_zip_download_url
+from cube_store import Cube, CubeStore
+from ir_spectrum import (
+    Spectrum,
+    SpectrumStore,
+    resample_spectrum,
+    spectrum_grid,
+    spectrum_range,
+)
+from process_pool import parse_cube_file, parse_jcamp_file, parse_trajectory_file
+from result_cache import build_payload, cached_payload_response
+from storage import (
+    construct_fetch_script,
+    job_artifact_key,
+    presign_zip_download_url,
+    read_object,
+)
+from trajectory_store import TrajectoryStore
 from user_service import get_user_or_404
-from utils import get_user_sub
+from utils import get_user_sub, parse_byte_range
 
 router = APIRouter(prefix="/storage", tags=["storage"])
 
+TRAJECTORY_CALCULATION_TYPES = {"optimization", "transition", "irc", "standard"}
+MAX_TRAJECTORY_FRAMES = 200
+trajectory_store = TrajectoryStore(
+    os.getenv("TRAJECTORY_DIR", "./results/trajectories"),
+    max_bytes=int(os.getenv("TRAJECTORY_MAX_BYTES", DEFAULT_ARTIFACT_STORE_MAX_BYTES)),
+)
+
+CUBE_CALCULATION_TYPES = {"orbitals", "standard"}
+cube_store = CubeStore(
+    os.getenv("CUBE_DIR", "./results/cubes"),
+    max_bytes=int(os.getenv("CUBE_MAX_BYTES", DEFAULT_ARTIFACT_STORE_MAX_BYTES)),
+)
+
+SPECTRUM_CALCULATION_TYPES = {"frequency"}
+MAX_SPECTRUM_JOBS = 20
+MAX_SPECTRUM_POINTS = 20000
+# Intensities are rounded to this many significant digits, which is finer
+# than any chart can show and keeps the JSON short.
+_SPECTRUM_DIGITS = 6
+spectrum_store = SpectrumStore(
+    os.getenv("SPECTRUM_DIR", "./results/spectra"),
+    max_bytes=int(os.getenv("SPECTRUM_MAX_BYTES", DEFAULT_ARTIFACT_STORE_MAX_BYTES)),
+)
+
 class JobFilesResponse(BaseModel):
     job_id: str
     calculation: str
@@ -26,6 +79,72 @@ class ZipDownloadResponse(BaseModel):
     job_id: str
     url: str
 
+
+def _trajectory_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=http_status.HTTP_404_NOT_FOUND,
+        detail="Trajectory not found.",
+    )
+
+
+def _cube_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=http_status.HTTP_404_NOT_FOUND,
+        detail="Cube file not found.",
+    )
+
+
+def _readable_completed_job(
+    job_id: str,
+    db: Session,
+    current_user,
+    calculation_types: set,
+) -> Optional[Job]:
+    """
+    Load a job the user can read. Returns None unless it is a completed job
+    of one of calculation_types, which are the jobs with that artifact.
+    """
+    job = get_asset_or_404(db, Job, job_id)
+    user = get_user_or_404(db, get_user_sub(current_user))
+    require_asset_permission(user, job, can_read_asset)
+    if job.calculation_type not in calculation_types or job.status != "completed":
+        return None
+    return job
+
+
+def _spectrum_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=http_status.HTTP_404_NOT_FOUND,
+        detail="IR spectrum not found.",
+    )
+
+
+def _ir_spectrum(job: Job) -> Spectrum:
+    def load():
+        try:
+            content = read_object(job_artifact_key(str(job.id), "ir.jdx"))
+        except ClientError:
+            raise _spectrum_not_found()
+        return parse_jcamp_file(content)
+
+    return spectrum_store.get_or_ingest(str(job.id), load)
+
+
+def _round_significant(values: np.ndarray) -> List[float]:
+    return [float(f"{value:.{_SPECTRUM_DIGITS}g}") for value in values.tolist()]
+
+
+def _esp_cube(job: Job) -> Cube:
+    def load():
+        try:
+            content = read_object(job_artifact_key(str(job.id), "esp.cube"))
+        except ClientError:
+            raise _cube_not_found()
+        return parse_cube_file(content)
+
+    return cube_store.get_or_ingest(str(job.id), load)
+
+
 # @router.get("/files/{job_id}", response_model=JobFilesResponse)
 # def fetch_job_files(
 #     job_id: str,
@@ -83,3 +202,217 @@ def download_job_zip(job_id: str, db: Session = Depends(get_db), current_user =
         return ZipDownloadResponse(job_id=job_id, url=zip_url)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch files from S3: {e}")
+
+
+@router.get("/trajectory/{job_id}")
+def get_job_trajectory_frames(
+    job_id: str,
+    start: int = Query(0, ge=0),
+    stop: Optional[int] = Query(None, ge=0),
+    step: int = Query(1, ge=1),
+    db: Session = Depends(get_db),
+    current_user=Depends(verify_token),
+):
+    """
+    Return frames start, start + step, ... before stop of a job's trajectory
+    when the authenticated user can read the job. On first access the
+    trajectory.xyz artifact is downloaded once and stored as memory-mapped
+    float32 arrays with a frame index, so later requests only read the frames
+    they return.
+    :param job_id: ID of the job whose trajectory should be read.
+    :param start: Index of the first frame.
+    :param stop: Index after the last frame; defaults to the end.
+    :param step: Distance between returned frames.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: Frame count and the requested frames with symbols and positions.
+    """
+    job = _readable_completed_job(job_id, db, current_user, TRAJECTORY_CALCULATION_TYPES)
+    if job is None:
+        raise _trajectory_not_found()
+
+    def load():
+        try:
+            content = read_object(job_artifact_key(str(job.id), "trajectory.xyz"))
+        except ClientError:
+            raise _trajectory_not_found()
+        return parse_trajectory_file(content)
+
+    trajectory = trajectory_store.get_or_ingest(str(job.id), load)
+    indices = range(trajectory.frame_count)[start:stop:step]
+    if len(indices) > MAX_TRAJECTORY_FRAMES:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_TRAJECTORY_FRAMES} frames can be requested at once",
+        )
+    return {
+        "job_id": str(job.id),
+        "frame_count": trajectory.frame_count,
+        "frames": trajectory.frames(indices),
+    }
+
+
+@router.get("/cube/{job_id}")
+def get_job_cube_metadata(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user=Depends(verify_token),
+):
+    """
+    Describe the electrostatic potential cube of a completed orbitals or
+    standard job when the authenticated user can read the job. On first access
+    esp.cube is read from S3 once and stored as binary grids at full
+    resolution and at levels of detail that halve every dimension.
+    :param job_id: ID of the job whose cube should be described.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: Cube comments, units, atoms, and the shape, origin, and axes of
+        every level in those units.
+    """
+    job = _readable_completed_job(job_id, db, current_user, CUBE_CALCULATION_TYPES)
+    if job is None:
+        raise _cube_not_found()
+
+    return {"job_id": str(job.id), **_esp_cube(job).meta}
+
+
+@router.get("/cube/{job_id}/levels/{level}")
+def get_job_cube_level(
+    job_id: str,
+    level: int,
+    request: Request,
+    dtype: Literal["float32", "float16"] = Query("float32"),
+    db: Session = Depends(get_db),
+    current_user=Depends(verify_token),
+):
+    """
+    Return one level of a job's cube as raw little-endian values in C order
+    (x slowest, z fastest). A single-range Range header returns only those
+    bytes with 206 Partial Content, so viewers can stream large grids. Whole
+    levels are sent gzip-encoded, from files compressed at ingest, when the
+    client accepts gzip.
+    :param job_id: ID of the job whose cube should be read.
+    :param level: Level of detail; 0 is full resolution.
+    :param request: Incoming request, used for the Range and gzip headers.
+    :param dtype: float32, or float16 for half the size.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: Binary grid values.
+    """
+    job = _readable_completed_job(job_id, db, current_user, CUBE_CALCULATION_TYPES)
+    if job is None:
+        raise _cube_not_found()
+
+    cube = _esp_cube(job)
+    if not 0 <= level < cube.level_count:
+        raise HTTPException(
+            status_code=http_status.HTTP_404_NOT_FOUND,
+            detail="Cube level not found.",
+        )
+
+    size = cube.level_size(level, dtype)
+    byte_range = parse_byte_range(request.headers.get("range"), size)
+    start, stop = byte_range or (0, size)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+        "X-Cube-Shape": ",".join(str(n) for n in cube.meta["levels"][level]["shape"]),
+    }
+    if byte_range is None and "gzip" in request.headers.get("accept-encoding", "").lower():
+        compressed = cube.level_gzip(level, dtype)
+        if compressed is not None:
+            headers["Content-Encoding"] = "gzip"
+            return Response(
+                compressed,
+                media_type="application/octet-stream",
+                headers=headers,
+            )
+
+    status_code = http_status.HTTP_200_OK
+    if byte_range is not None:
+        status_code = http_status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    return Response(
+        cube.level_bytes(level, dtype, start, stop),
+        status_code=status_code,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
+
+
+
+@router.get("/spectrum/ir")
+def get_job_ir_spectra(
+    request: Request,
+    job_ids: List[str] = Query(...),
+    resolution: float = Query(4.0, gt=0),
+    min_x: Optional[float] = Query(None),
+    max_x: Optional[float] = Query(None),
+    db: Session = Depends(get_db),
+    current_user=Depends(verify_token),
+):
+    """
+    Return the IR spectra of completed frequency jobs resampled
+    onto one shared grid, so several jobs can be overlaid from one response.
+    On first access ir.jdx is read from S3 once, parsed, and stored as NumPy
+    arrays. Peak tables are summed into each bin; sampled curves are averaged.
+    :param request: Incoming request, used for conditional and gzip headers.
+    :param job_ids: IDs of the jobs to compare.
+    :param resolution: Grid spacing in the spectra's x units.
+    :param min_x: First grid point; defaults to the lowest x of the spectra.
+    :param max_x: Last grid point; defaults to the highest x of the spectra.
+    :param db: Database session dependency.
+    :param current_user: Current user dependency, verified via token.
+    :return: The grid and the resampled intensities of each job.
+    """
+    job_ids = list(dict.fromkeys(job_ids))
+    if len(job_ids) > MAX_SPECTRUM_JOBS:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_SPECTRUM_JOBS} jobs can be compared.",
+        )
+    for name, value in (("resolution", resolution), ("min_x", min_x), ("max_x", max_x)):
+        if value is not None and not math.isfinite(value):
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=f"{name} must be a finite number.",
+            )
+
+    spectra = []
+    for job_id in job_ids:
+        job = _readable_completed_job(job_id, db, current_user, SPECTRUM_CALCULATION_TYPES)
+        if job is None:
+            raise _spectrum_not_found()
+        spectra.append((job, _ir_spectrum(job)))
+
+    default_min_x, default_max_x = spectrum_range([spectrum for _job, spectrum in spectra])
+    start = default_min_x if min_x is None else min_x
+    stop = default_max_x if max_x is None else max_x
+    if stop < start:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail="max_x must not be less than min_x.",
+        )
+    if (stop - start) / resolution + 1 > MAX_SPECTRUM_POINTS:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=f"The range and resolution give more than {MAX_SPECTRUM_POINTS} points.",
+        )
+
+    grid = spectrum_grid(start, stop, resolution)
+    body = {
+        "x": _round_significant(grid),
+        "x_units": spectra[0][1].x_units,
+        "y_units": spectra[0][1].y_units,
+        "spectra": [
+            {
+                "job_id": str(job.id),
+                "title": spectrum.title,
+                "kind": spectrum.kind,
+                "y": _round_significant(resample_spectrum(spectrum, grid, resolution)),
+            }
+            for job, spectrum in spectra
+        ],
+    }
+    payload = build_payload(orjson.dumps(body))
+    return cached_payload_response(request, payload)
@@ -1,5 +1,7 @@
 import json
 import sys
+from functools import lru_cache
+from typing import Iterable
 
 import boto3
 from botocore.client import Config
@@ -8,17 +10,23 @@ BUCKET_NAME: str = "ubchemica-bucket-1"
 REGION: str = "ca-central-1"
 BUCKET_ROOT_DIR: str = "ubchemica"
 
+@lru_cache(maxsize=1)
+def _s3_client():
+    # Presigning is local signing work; creating the client is the slow part,
+    # so every URL in a process shares one client.
+    return boto3.client(
+        "s3",
+        region_name=REGION,
+        config=Config(signature_version="s3v4")
+    )
+
 def generate_presigned_put_url(key: str):
     """
     Returns a presigned URL which allows anyone (with that URL) to PUT a file into s3://bucket/key.
     - expires_in: time in seconds that the URL remains valid.
     """
     # TODO: Fix the aws access later
-    s3 = boto3.client(
-        "s3",
-        region_name=REGION,
-        config=Config(signature_version="s3v4")
-    )
+    s3 = _s3_client()
 
     url = s3.generate_presigned_url(
         ClientMethod="put_object",
@@ -66,12 +74,17 @@ def construct_upload_script(job_id: str, calculation_type: str):
 
     return urls
 
+def construct_upload_scripts(job_ids: Iterable[str], calculation_type: str) -> dict[str, dict]:
+    """
+    Build upload URLs for many jobs that share one calculation type.
+    """
+    return {
+        job_id: construct_upload_script(job_id, calculation_type)
+        for job_id in job_ids
+    }
+
 def generate_presigned_get_url(key: str):
-    s3 = boto3.client(
-        "s3",
-        region_name=REGION,
-        config=Config(signature_version="s3v4")
-    )
+    s3 = _s3_client()
 
     url = s3.generate_presigned_url(
         ClientMethod="get_object",
@@ -81,6 +94,16 @@ def generate_presigned_get_url(key: str):
 
     return url
 
+def read_object(key: str) -> bytes:
+    """
+    Download an object from the bucket into memory.
+    :raises botocore.exceptions.ClientError: When the object does not exist.
+    """
+    return _s3_client().get_object(Bucket=BUCKET_NAME, Key=key)["Body"].read()
+
+def job_artifact_key(job_id: str, filename: str) -> str:
+    return f"{BUCKET_ROOT_DIR}/jobs/{job_id}/{filename}"
+
 def presign_zip_download_url(job_id: str) -> str:
     return generate_presigned_get_url(f"{BUCKET_ROOT_DIR}/archive/{job_id}.zip")
 
@@ -0,0 +1,137 @@
+"""
+Element composition of structures, stored in Structure.composition and
+Structure.heavy_atom_count so searches by element can use indexes.
+
+Structures created before these columns existed only have their free-text
+formula. Fill them in with:
+    python structure_composition.py
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Text, cast, func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from models import Structure
+from xyz_parser import ATOMIC_NUMBERS
+
+_FORMULA_TOKEN = re.compile(r"([A-Z][a-z]?)(\d*)|(\()|(\))(\d*)")
+# Charges written as a trailing "(-2)", "(+)", "^2-" or "-". A bare "2-" is
+# read as a count followed by "-", so "NH4+" keeps its four hydrogens.
+_CHARGE_SUFFIX = re.compile(r"(\([+-]?\d*[+-]?\)|\^\d*[+-]|[+-])$")
+
+
+def parse_formula(formula: str) -> Optional[Dict[str, int]]:
+    """
+    Parse a chemical formula such as "C8H12Cr2O7(-2)" or "Ca(OH)2" into
+    element counts. Returns None when the text is not a formula.
+    """
+    text = _CHARGE_SUFFIX.sub("", formula.strip().replace(" ", ""))
+    if not text:
+        return None
+
+    stack: List[Counter] = [Counter()]
+    position = 0
+    while position < len(text):
+        match = _FORMULA_TOKEN.match(text, position)
+        if match is None:
+            return None
+        symbol, count, opening, closing, group_count = match.groups()
+        if symbol:
+            if symbol not in ATOMIC_NUMBERS:
+                return None
+            stack[-1][symbol] += int(count or 1)
+        elif opening:
+            stack.append(Counter())
+        elif closing:
+            if len(stack) == 1:
+                return None
+            group = stack.pop()
+            for element, element_count in group.items():
+                stack[-1][element] += element_count * int(group_count or 1)
+        position = match.end()
+
+    if len(stack) != 1 or not stack[0]:
+        return None
+    return dict(stack[0])
+
+
+def heavy_atom_count(composition: Dict[str, int]) -> int:
+    return sum(count for element, count in composition.items() if element != "H")
+
+
+def composition_filters(
+    dialect_name: str,
+    elements: Iterable[str] = (),
+    min_heavy_atoms: Optional[int] = None,
+    max_heavy_atoms: Optional[int] = None,
+) -> list:
+    """
+    Build Structure filters for structures containing every element in
+    elements and with a heavy atom count in range. PostgreSQL answers the
+    element test from the GIN index on composition; other databases check
+    each row's JSON.
+    """
+    elements = sorted(set(elements))
+    filters = []
+    if elements:
+        if dialect_name == "postgresql":
+            filters.append(
+                Structure.composition.op("?&")(
+                    cast(postgresql.array(elements), postgresql.ARRAY(Text))
+                )
+            )
+        else:
+            filters.append(Structure.composition.is_not(None))
+            filters.extend(
+                func.json_extract(Structure.composition, f'$."{element}"').is_not(None)
+                for element in elements
+            )
+    if min_heavy_atoms is not None:
+        filters.append(Structure.heavy_atom_count >= min_heavy_atoms)
+    if max_heavy_atoms is not None:
+        filters.append(Structure.heavy_atom_count <= max_heavy_atoms)
+    return filters
+
+
+def backfill_structure_compositions(db: Session, batch_size: int = 500) -> int:
+    """
+    Fill composition and heavy_atom_count for structures that lack them by
+    parsing their stored formula. Rows whose formula cannot be parsed are
+    left empty.
+    :return: Number of structures updated.
+    """
+    updated = 0
+    last_id = None
+    while True:
+        query = db.query(Structure).filter(Structure.composition.is_(None))
+        if last_id is not None:
+            query = query.filter(Structure.id > last_id)
+        structures = query.order_by(Structure.id).limit(batch_size).all()
+        if not structures:
+            return updated
+
+        for structure in structures:
+            composition = parse_formula(structure.formula or "")
+            if composition is not None:
+                structure.composition = composition
+                structure.heavy_atom_count = heavy_atom_count(composition)
+                updated += 1
+        last_id = structures[-1].id
+        db.commit()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    from database import get_session_local
+
+    session = get_session_local()()
+    try:
+        print(f"Updated {backfill_structure_compositions(session)} structures")
+    finally:
+        session.close()
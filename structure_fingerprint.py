@@ -0,0 +1,93 @@
+import hashlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from xyz_parser import ATOMIC_NUMBERS, hill_formula
+from xyz_validation import XYZFrame, parse_xyz_frames
+
+# Pairwise distances grow with the square of the atom count; larger
+# structures are stored without fingerprints.
+MAX_FINGERPRINT_ATOMS = 2000
+
+# Exact fingerprints compare interatomic distances to 0.01 angstrom; near
+# fingerprints only compare how many distances fall in each 0.25 angstrom bin,
+# so a distance that crosses a bin edge changes them.
+EXACT_DISTANCE_RESOLUTION = 0.01
+NEAR_DISTANCE_BIN_WIDTH = 0.25
+
+# Element pair codes use Z_low * 256 + Z_high, so distance values are packed
+# above 2**16.
+_PAIR_CODE_BITS = 16
+
+
+@dataclass(frozen=True)
+class StructureFingerprint:
+    formula: str
+    # Element symbol to atom count.
+    composition: Dict[str, int]
+    # "<Hill formula>:<hash>" so one index lookup matches formula and geometry.
+    fingerprint: Optional[str]
+    near_fingerprint: Optional[str]
+
+
+def _digest(formula: str, values: np.ndarray) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(formula.encode())
+    hasher.update(np.ascontiguousarray(values, dtype="<i8").tobytes())
+    return f"{formula}:{hasher.hexdigest()[:32]}"
+
+
+def fingerprint_frame(frame: XYZFrame) -> StructureFingerprint:
+    """
+    Fingerprint a frame from its element pairs and interatomic distances,
+    which do not change under translation, rotation, or atom reordering.
+    """
+    counts = Counter(frame.symbols)
+    formula = hill_formula(counts)
+    atom_count = len(frame.symbols)
+    if atom_count > MAX_FINGERPRINT_ATOMS:
+        return StructureFingerprint(
+            formula=formula,
+            composition=dict(counts),
+            fingerprint=None,
+            near_fingerprint=None,
+        )
+
+    atomic_numbers = np.array([ATOMIC_NUMBERS[symbol] for symbol in frame.symbols])
+    first, second = np.triu_indices(atom_count, k=1)
+    distances = np.linalg.norm(
+        frame.positions[first] - frame.positions[second],
+        axis=1,
+    )
+    pair_codes = (
+        np.minimum(atomic_numbers[first], atomic_numbers[second]) * 256
+        + np.maximum(atomic_numbers[first], atomic_numbers[second])
+    ).astype(np.int64)
+
+    exact_keys = np.sort(
+        (np.rint(distances / EXACT_DISTANCE_RESOLUTION).astype(np.int64) << _PAIR_CODE_BITS)
+        | pair_codes
+    )
+    near_bins, near_counts = np.unique(
+        (np.floor(distances / NEAR_DISTANCE_BIN_WIDTH).astype(np.int64) << _PAIR_CODE_BITS)
+        | pair_codes,
+        return_counts=True,
+    )
+    return StructureFingerprint(
+        formula=formula,
+        composition=dict(counts),
+        fingerprint=_digest(formula, exact_keys),
+        near_fingerprint=_digest(formula, np.concatenate([near_bins, near_counts])),
+    )
+
+
+def fingerprint_xyz(content: bytes) -> StructureFingerprint:
+    """
+    Validate XYZ content and fingerprint its last frame, the geometry ASE
+    reads by default.
+    :raises XYZParseError: When the content is not valid XYZ.
+    """
+    return fingerprint_frame(parse_xyz_frames(content)[-1])
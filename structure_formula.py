@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+
+class StructureFormulaError(ValueError):
+    pass
+
+
+# ASE and Pymatgen take about a second to import, so they are loaded on first
+# use instead of in every worker at startup.
+def _ase_read(path: str):
+    from ase.io import read
+
+    return read(path)
+
+
+def _pymatgen_molecule_from_file(path: str):
+    from pymatgen.core import Molecule
+
+    return Molecule.from_file(path)
+
+
+def structure_file_formula(content: bytes) -> str:
+    """
+    Read the formula of a structure file that is not plain XYZ with ASE, then
+    Pymatgen. Both need a file path, so the content is written to a temporary
+    file that is removed afterwards. Meant for the structure process pool.
+    :raises StructureFormulaError: When neither library can read the file.
+    """
+    descriptor, path = tempfile.mkstemp(prefix="temp_", suffix=".xyz")
+    try:
+        with os.fdopen(descriptor, "wb") as temp_file:
+            temp_file.write(content)
+        try:
+            return _ase_read(path).get_chemical_formula()
+        except Exception:
+            try:
+                return _pymatgen_molecule_from_file(path).composition.reduced_formula
+            except Exception as error:
+                # Library exceptions may not pickle back from a pool worker.
+                raise StructureFormulaError(str(error)) from None
+    finally:
+        os.remove(path)
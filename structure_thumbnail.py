@@ -0,0 +1,222 @@
+import struct
+import zlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from structure_fingerprint import StructureFingerprint, fingerprint_frame
+from xyz_validation import XYZFrame, parse_xyz_frames
+
+# Thumbnail edge lengths in pixels. Each size is the largest one halved, so
+# smaller sizes are box-filtered from the same render.
+THUMBNAIL_SIZES = {"small": 128, "medium": 256, "large": 512}
+
+# Images are drawn at this multiple of the largest size and averaged down,
+# which antialiases atom and bond edges.
+_SUPERSAMPLE = 2
+
+# Bonds are only drawn below this atom count; above it the pairwise distance
+# matrix gets large and bonds are too small to see anyway.
+MAX_BONDED_ATOMS = 2000
+
+_BACKGROUND = np.array([1.0, 1.0, 1.0])
+_BOND_COLOR = np.array([0.55, 0.55, 0.55])
+_DEFAULT_COLOR = np.array([1.0, 0.41, 0.71])
+_DEFAULT_COVALENT_RADIUS = 1.5
+
+# Jmol colours for common elements.
+_ELEMENT_COLORS = {
+    "H": (1.0, 1.0, 1.0),
+    "B": (1.0, 0.71, 0.71),
+    "C": (0.56, 0.56, 0.56),
+    "N": (0.19, 0.31, 0.97),
+    "O": (1.0, 0.05, 0.05),
+    "F": (0.56, 0.88, 0.31),
+    "Na": (0.67, 0.36, 0.95),
+    "Mg": (0.54, 1.0, 0.0),
+    "Al": (0.75, 0.65, 0.65),
+    "Si": (0.94, 0.78, 0.63),
+    "P": (1.0, 0.5, 0.0),
+    "S": (1.0, 1.0, 0.19),
+    "Cl": (0.12, 0.94, 0.12),
+    "K": (0.56, 0.25, 0.83),
+    "Ca": (0.24, 1.0, 0.0),
+    "Ti": (0.75, 0.76, 0.78),
+    "Cr": (0.54, 0.6, 0.78),
+    "Mn": (0.61, 0.48, 0.78),
+    "Fe": (0.88, 0.4, 0.2),
+    "Co": (0.94, 0.56, 0.63),
+    "Ni": (0.31, 0.82, 0.31),
+    "Cu": (0.78, 0.5, 0.2),
+    "Zn": (0.49, 0.5, 0.69),
+    "Br": (0.65, 0.16, 0.16),
+    "Ru": (0.14, 0.56, 0.56),
+    "Pd": (0.0, 0.41, 0.52),
+    "Ag": (0.75, 0.75, 0.75),
+    "I": (0.58, 0.0, 0.58),
+    "Pt": (0.82, 0.82, 0.88),
+    "Au": (1.0, 0.82, 0.14),
+}
+
+# Covalent radii in angstrom (Cordero et al. 2008); two atoms are bonded when
+# closer than 1.2 times the sum of their radii.
+_COVALENT_RADII = {
+    "H": 0.31, "B": 0.84, "C": 0.76, "N": 0.71, "O": 0.66, "F": 0.57,
+    "Na": 1.66, "Mg": 1.41, "Al": 1.21, "Si": 1.11, "P": 1.07, "S": 1.05,
+    "Cl": 1.02, "K": 2.03, "Ca": 1.76, "Ti": 1.60, "Cr": 1.39, "Mn": 1.39,
+    "Fe": 1.32, "Co": 1.26, "Ni": 1.24, "Cu": 1.32, "Zn": 1.22, "Br": 1.20,
+    "Ru": 1.46, "Pd": 1.39, "Ag": 1.45, "I": 1.39, "Pt": 1.36, "Au": 1.36,
+}
+_BOND_TOLERANCE = 1.2
+
+
+def _oriented_positions(positions: np.ndarray) -> np.ndarray:
+    """
+    Center positions and rotate them onto their principal axes, so the
+    longest extent of the molecule lies across the image.
+    """
+    centered = positions - positions.mean(axis=0)
+    if len(centered) < 2:
+        return centered
+    _values, vectors = np.linalg.eigh(centered.T @ centered)
+    # eigh sorts ascending; put the largest spread on x and the smallest on z.
+    return centered @ vectors[:, ::-1]
+
+
+def _bonds(symbols, positions: np.ndarray) -> np.ndarray:
+    if len(symbols) > MAX_BONDED_ATOMS or len(symbols) < 2:
+        return np.empty((0, 2), dtype=int)
+    radii = np.array([_COVALENT_RADII.get(s, _DEFAULT_COVALENT_RADIUS) for s in symbols])
+    first, second = np.triu_indices(len(symbols), k=1)
+    distances = np.linalg.norm(positions[first] - positions[second], axis=1)
+    bonded = distances < _BOND_TOLERANCE * (radii[first] + radii[second])
+    return np.stack([first[bonded], second[bonded]], axis=1)
+
+
+def _draw_bond(image: np.ndarray, start: np.ndarray, end: np.ndarray, width: float) -> None:
+    low = np.floor(np.minimum(start, end) - width).astype(int).clip(0, image.shape[0])
+    high = np.ceil(np.maximum(start, end) + width).astype(int).clip(0, image.shape[0])
+    if (high <= low).any():
+        return
+    ys, xs = np.mgrid[low[1]:high[1], low[0]:high[0]] + 0.5
+    segment = end - start
+    length_squared = float(segment @ segment) or 1.0
+    t = (((xs - start[0]) * segment[0] + (ys - start[1]) * segment[1]) / length_squared).clip(0, 1)
+    distance_squared = (xs - start[0] - t * segment[0]) ** 2 + (ys - start[1] - t * segment[1]) ** 2
+    image[low[1]:high[1], low[0]:high[0]][distance_squared <= width * width] = _BOND_COLOR
+
+
+def _draw_atom(image: np.ndarray, center: np.ndarray, radius: float, color: np.ndarray) -> None:
+    low = np.floor(center - radius).astype(int).clip(0, image.shape[0])
+    high = np.ceil(center + radius).astype(int).clip(0, image.shape[0])
+    if (high <= low).any():
+        return
+    ys, xs = np.mgrid[low[1]:high[1], low[0]:high[0]] + 0.5
+    distance_squared = ((xs - center[0]) ** 2 + (ys - center[1]) ** 2) / (radius * radius)
+    inside = distance_squared <= 1.0
+    # Lambert shading of a sphere lit from the viewer, with a dark rim.
+    shade = 0.45 + 0.55 * np.sqrt(np.clip(1.0 - distance_squared, 0.0, 1.0))
+    shade[distance_squared > 0.85] *= 0.6
+    region = image[low[1]:high[1], low[0]:high[0]]
+    region[inside] = color * shade[inside, None]
+
+
+def render_frame(frame: XYZFrame, size: int) -> np.ndarray:
+    """
+    Render a ball-and-stick picture of frame, viewed down its smallest
+    principal axis, as a size x size RGB array with values in [0, 1].
+    """
+    canvas = size * _SUPERSAMPLE
+    image = np.empty((canvas, canvas, 3))
+    image[:] = _BACKGROUND
+
+    positions = _oriented_positions(frame.positions)
+    radii = np.array([
+        0.25 if symbol == "H" else 0.35 for symbol in frame.symbols
+    ])
+    extent = float(np.abs(positions[:, :2]).max() + radii.max()) if len(positions) else 1.0
+    scale = 0.46 * canvas / max(extent, 1.0)
+    # Image y grows downwards.
+    pixels = np.column_stack([
+        canvas / 2 + positions[:, 0] * scale,
+        canvas / 2 - positions[:, 1] * scale,
+    ])
+
+    bond_width = max(0.08 * scale, 1.0)
+    for first, second in _bonds(frame.symbols, positions):
+        _draw_bond(image, pixels[first], pixels[second], bond_width)
+    # Painter's algorithm: far atoms first so near atoms cover them.
+    for index in np.argsort(positions[:, 2]):
+        color = np.asarray(_ELEMENT_COLORS.get(frame.symbols[index], _DEFAULT_COLOR))
+        _draw_atom(image, pixels[index], radii[index] * scale, color)
+
+    return image.reshape(size, _SUPERSAMPLE, size, _SUPERSAMPLE, 3).mean(axis=(1, 3))
+
+
+def _downsample(image: np.ndarray, factor: int) -> np.ndarray:
+    size = image.shape[0] // factor
+    return image.reshape(size, factor, size, factor, 3).mean(axis=(1, 3))
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """
+    Encode an RGB array with values in [0, 1] as an 8-bit PNG.
+    """
+    height, width, _channels = image.shape
+    pixels = np.rint(np.clip(image, 0.0, 1.0) * 255).astype(np.uint8)
+    # Each scanline starts with filter type 0 (none).
+    raw = np.concatenate(
+        [np.zeros((height, 1), dtype=np.uint8), pixels.reshape(height, width * 3)],
+        axis=1,
+    ).tobytes()
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+        )
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def render_frame_thumbnails(frame: XYZFrame) -> Dict[str, bytes]:
+    """
+    Render a frame once at the largest thumbnail size and return a PNG for
+    every name in THUMBNAIL_SIZES.
+    """
+    largest = max(THUMBNAIL_SIZES.values())
+    image = render_frame(frame, largest)
+    return {
+        name: encode_png(_downsample(image, largest // size))
+        for name, size in THUMBNAIL_SIZES.items()
+    }
+
+
+def render_xyz_thumbnails(content: bytes) -> Dict[str, bytes]:
+    """
+    Render thumbnails of the last frame of XYZ content.
+    :raises XYZParseError: When the content is not valid XYZ.
+    """
+    return render_frame_thumbnails(parse_xyz_frames(content)[-1])
+
+
+def fingerprint_and_render_xyz(
+    content: bytes,
+    render_thumbnails: bool,
+) -> Tuple[StructureFingerprint, Optional[Dict[str, bytes]]]:
+    """
+    Parse XYZ content once, fingerprint its last frame and, when
+    render_thumbnails is set, render thumbnails of the same frame.
+    :return: The fingerprint, and the PNGs by size name or None.
+    :raises XYZParseError: When the content is not valid XYZ.
+    """
+    frame = parse_xyz_frames(content)[-1]
+    thumbnails = render_frame_thumbnails(frame) if render_thumbnails else None
+    return fingerprint_frame(frame), thumbnails
@@ -1,13 +1,34 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Query, status
+from fastapi import (
+    APIRouter,
+    UploadFile,
+    File,
+    Form,
+    HTTPException,
+    Depends,
+    Query,
+    Request,
+    status,
+)
+from pydantic import BaseModel, Field
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi.responses import JSONResponse
 from asset_service import (
+    MAX_TAG_FILTERS,
+    bulk_soft_delete_assets,
+    bulk_update_asset_tags,
+    bulk_update_asset_visibility,
     get_asset_or_404,
+    list_readable_assets,
     list_user_assets,
+    parse_field_selection,
+    parse_tag_filter,
     require_asset_permission,
+    search_readable_assets,
     serialize_structure,
     set_asset_tags,
     soft_delete_asset,
+    tagged_asset_criterion,
     update_asset_visibility,
 )
 from permissions import (
@@ -19,24 +40,52 @@ from models import Structure, Tags
 from dependencies import get_db
 from auth import verify_token
 from user_service import get_user_or_404
+from json_response import FastJSONResponse
+from result_cache import cached_payload_response
+from tag_usage import tag_usage_payload
+import hashlib
 import os, uuid, shutil
 import boto3
 from pathlib import Path
 from utils import (
     DEFAULT_STRUCTURE_LIST_LIMIT,
+    MAX_BULK_ASSET_UPDATES,
     MAX_STRUCTURE_LIST_LIMIT,
     commit_or_rollback,
     get_user_sub,
 )
 from datetime import datetime, timezone
-from typing import List
-from ase.io import read
-from pymatgen.core import Molecule
+from typing import Dict, List, Literal, Optional
 from botocore.client import Config
+from botocore.exceptions import ClientError
+from process_pool import (
+    PoolSaturatedError,
+    fingerprint_and_render_upload,
+    fingerprint_xyz_upload,
+    pool_saturated_exception,
+    structure_pool,
+)
+from structure_composition import composition_filters, heavy_atom_count
+from structure_formula import structure_file_formula
+from structure_thumbnail import THUMBNAIL_SIZES
+from xyz_parser import ATOMIC_NUMBERS, XYZParseError, summarize_xyz
 
 router = APIRouter(prefix="/structures", tags=["structures"])
 JOB_DIR = "./results"
 
+
+class BulkStructureIds(BaseModel):
+    structure_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_ASSET_UPDATES)
+
+
+class BulkStructureTagUpdate(BulkStructureIds):
+    add: List[str] = Field([], max_length=MAX_TAG_FILTERS)
+    remove: List[str] = Field([], max_length=MAX_TAG_FILTERS)
+
+
+class BulkStructureVisibilityUpdate(BulkStructureIds):
+    is_public: bool
+
 # session = boto3.Session()
 # s3 = session.client('s3')
 BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
@@ -48,6 +97,27 @@ s3 = boto3.client(
     config=Config(signature_version="s3v4")
 )
 
+
+def _thumbnail_key(content_hash: str, size: str) -> str:
+    return f"thumbnails/{content_hash}/{size}.png"
+
+
+def _structure_image_key(structure: Structure, thumbnail_size: Optional[str] = None) -> str:
+    if thumbnail_size and structure.content_hash:
+        return _thumbnail_key(structure.content_hash, thumbnail_size)
+    return f"structures/{structure.id}.png"
+
+
+def _s3_object_exists(key: str) -> bool:
+    try:
+        s3.head_object(Bucket=BUCKET_NAME, Key=key)
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
+
+
 @router.get("/")
 def get_all_structures(
     limit: int = Query(
@@ -56,6 +126,9 @@ def get_all_structures(
         le=MAX_STRUCTURE_LIST_LIMIT,
     ),
     offset: int = Query(0, ge=0),
+    thumbnail_size: Optional[Literal["small", "medium", "large"]] = Query(None),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
     user=Depends(verify_token),
     db: Session = Depends(get_db)
 ):
@@ -65,10 +138,18 @@ def get_all_structures(
     includes tags and a presigned image URL.
     :param limit: Maximum number of structures to return, up to 100.
     :param offset: Number of sorted structures to skip.
+    :param thumbnail_size: Link a server-rendered thumbnail of this size instead
+        of the full-size image. Structures uploaded before thumbnails were
+        rendered keep the full-size image.
+    :param fields: Comma-separated structure fields to return, including
+        imageS3URL; structure_id is always returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: tags.
+        Defaults to tags without fields and to none with fields.
     :param user: Current user dependency, verified via token.
     :param db: Database session dependency.
     :return: List of serialized structure details.
     """
+    selection = parse_field_selection(Structure, fields, include, extra_fields=("imageS3URL",))
     try:
         user_id = get_user_sub(user)
         structures = list_user_assets(
@@ -77,22 +158,23 @@ def get_all_structures(
             user_id,
             limit=limit,
             offset=offset,
+            include=selection.include,
         )
 
-        return [
-            {
-                **serialize_structure(s),
-                "imageS3URL": s3.generate_presigned_url(
+        payloads = []
+        for s in structures:
+            payload = serialize_structure(s, include_tags="tags" in selection.include)
+            if selection.wants("imageS3URL"):
+                payload["imageS3URL"] = s3.generate_presigned_url(
                     "get_object",
                     Params={
                         "Bucket": BUCKET_NAME,
-                        "Key": f"structures/{s.id}.png"
+                        "Key": _structure_image_key(s, thumbnail_size)
                     },
                     ExpiresIn=3600
                 )
-            }
-            for s in structures
-        ]
+            payloads.append(selection.project(payload))
+        return FastJSONResponse(payloads)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -102,36 +184,146 @@ async def get_structure_formula(
 ):
     """
     Calculate molecular formula from uploaded structure file.
+    Plain XYZ content is parsed in memory in the structure process pool;
+    other formats are read with ASE, then Pymatgen, in the same pool.
+    Returns 503 when the pool is saturated.
     :param file: Uploaded structure file.
     :return: Dictionary containing the molecular formula.
     """
+    content = await file.read()
     try:
-        temp_file = f"temp_{uuid.uuid4()}.xyz"
-        try:
-            with open(temp_file, "wb") as f:
-                content = await file.read()
-                f.write(content)
-
-            # Try reading with ASE first
-            try:
-                atoms = read(temp_file)
-                chemical_formula = atoms.get_chemical_formula()
-            except:
-                # If ASE fails, try with Pymatgen
-                mol = Molecule.from_file(temp_file)
-                chemical_formula = mol.composition.reduced_formula
-
-            return {"formula": chemical_formula}
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+        summary = await structure_pool.run_async(summarize_xyz, content)
+        return {"formula": summary.formula}
+    except PoolSaturatedError:
+        raise pool_saturated_exception()
+    except XYZParseError:
+        pass
 
+    try:
+        formula = await structure_pool.run_async(structure_file_formula, content)
+    except PoolSaturatedError:
+        raise pool_saturated_exception()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Could not calculate formula: {str(e)}"
         )
+    return {"formula": formula}
+
+
+@router.post("/search")
+def search_structures_by_geometry(
+    file: UploadFile = File(...),
+    match: Literal["exact", "histogram"] = Query("exact"),
+    limit: int = Query(
+        DEFAULT_STRUCTURE_LIST_LIMIT,
+        ge=1,
+        le=MAX_STRUCTURE_LIST_LIMIT,
+    ),
+    offset: int = Query(0, ge=0),
+    user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    Find readable structures with the same molecule as an uploaded XYZ file.
+    An exact match has the same elements and the same interatomic distances to
+    0.01 angstrom, in any position, orientation, or atom order. A histogram
+    match only needs the same count of distances in each 0.25 angstrom bin, so
+    some re-optimized conformers are found too; there is no tolerance at bin
+    edges, so a distance moving across one is not matched. Structures uploaded
+    before fingerprints were added, or with more than 2000 atoms, never match.
+    :param file: XYZ file describing the molecule to look for.
+    :param match: "exact" or "histogram".
+    :param limit: Maximum number of structures to return, up to 100.
+    :param offset: Number of sorted structures to skip.
+    :param user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: Matching structures, most recent first.
+    """
+    db_user = get_user_or_404(db, get_user_sub(user))
+    fingerprint = fingerprint_xyz_upload(file.file.read())
+    if match == "exact":
+        column, value = Structure.fingerprint, fingerprint.fingerprint
+    else:
+        column, value = Structure.near_fingerprint, fingerprint.near_fingerprint
+    if value is None:
+        return []
+
+    structures = list_readable_assets(
+        db,
+        Structure,
+        db_user,
+        column == value,
+        limit=limit,
+        offset=offset,
+    )
+    return [
+        serialize_structure(
+            structure,
+            include_user_sub=can_view_asset_user_owner(db_user, structure),
+        )
+        for structure in structures
+    ]
+
+
+@router.get("/composition")
+def search_structures_by_composition(
+    elements: List[str] = Query([]),
+    min_heavy_atoms: Optional[int] = Query(None, ge=0),
+    max_heavy_atoms: Optional[int] = Query(None, ge=0),
+    limit: int = Query(
+        DEFAULT_STRUCTURE_LIST_LIMIT,
+        ge=1,
+        le=MAX_STRUCTURE_LIST_LIMIT,
+    ),
+    offset: int = Query(0, ge=0),
+    user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    List non-deleted structures directly owned by the authenticated user that
+    contain every requested element and have a heavy (non-hydrogen) atom count
+    in range, most recent first. Composition comes from the uploaded file;
+    structures without one never match.
+    :param elements: Element symbols that must all be present, e.g. C and N.
+    :param min_heavy_atoms: Minimum number of non-hydrogen atoms.
+    :param max_heavy_atoms: Maximum number of non-hydrogen atoms.
+    :param limit: Maximum number of structures to return, up to 100.
+    :param offset: Number of sorted structures to skip.
+    :param user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: List of serialized structure details.
+    """
+    unknown = [element for element in elements if element not in ATOMIC_NUMBERS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown element: {unknown[0]}",
+        )
+    if (
+        min_heavy_atoms is not None
+        and max_heavy_atoms is not None
+        and min_heavy_atoms > max_heavy_atoms
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_heavy_atoms cannot exceed max_heavy_atoms",
+        )
+
+    structures = list_user_assets(
+        db,
+        Structure,
+        get_user_sub(user),
+        *composition_filters(
+            db.get_bind().dialect.name,
+            elements,
+            min_heavy_atoms,
+            max_heavy_atoms,
+        ),
+        limit=limit,
+        offset=offset,
+    )
+    return FastJSONResponse([serialize_structure(structure) for structure in structures])
 
 
 @router.get("/tags")
@@ -147,13 +339,137 @@ def get_user_tags(
     """
     try:
         user_id = get_user_sub(user)
-        tags = (db.query(Tags)
-                .filter(Tags.user_sub == user_id)
-                .all())
-        return [t.name for t in tags]
+        return db.scalars(select(Tags.name).where(Tags.user_sub == user_id)).all()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@router.get("/tags/usage")
+def get_user_tag_usage(
+    request: Request,
+    user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the authenticated user's tags with how many non-deleted jobs and
+    structures use each, most used first. Counts are cached per user and
+    refreshed when tags change; the response carries an ETag, so unchanged
+    counts come back as 304 Not Modified.
+    :param request: Incoming request, read for conditional and gzip headers.
+    :param user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: List of tag_id, name, job_count, and structure_count.
+    """
+    return cached_payload_response(request, tag_usage_payload(db, get_user_sub(user)))
+
+@router.get("/tagged")
+def get_structures_by_tag(
+    tag: List[str] = Query([]),
+    match: Literal["all", "any"] = Query("all"),
+    limit: int = Query(
+        DEFAULT_STRUCTURE_LIST_LIMIT,
+        ge=1,
+        le=MAX_STRUCTURE_LIST_LIMIT,
+    ),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
+    user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    List non-deleted structures the authenticated user can read that carry
+    the given tags, most recent first. Tags match by name, whoever created
+    them.
+    :param tag: Tag name to look for; repeat it for several tags.
+    :param match: "all" keeps structures with every tag, "any" structures with
+        at least one.
+    :param limit: Maximum number of structures to return, up to 100.
+    :param offset: Number of sorted structures to skip.
+    :param fields: Comma-separated structure fields to return; structure_id is
+        always returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: tags.
+        Defaults to tags without fields and to none with fields.
+    :param user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: List of serialized structure details.
+    """
+    selection = parse_field_selection(Structure, fields, include)
+    tag_names = parse_tag_filter(tag)
+    db_user = get_user_or_404(db, get_user_sub(user))
+    structures = list_readable_assets(
+        db,
+        Structure,
+        db_user,
+        tagged_asset_criterion(Structure, tag_names, match_all=match == "all"),
+        limit=limit,
+        offset=offset,
+        include=selection.include,
+    )
+    return FastJSONResponse([
+        selection.project(
+            serialize_structure(
+                structure,
+                include_tags="tags" in selection.include,
+                include_user_sub=can_view_asset_user_owner(db_user, structure),
+            )
+        )
+        for structure in structures
+    ])
+
+
+@router.get("/visible")
+def get_visible_structures(
+    writable: bool = Query(False),
+    limit: int = Query(
+        DEFAULT_STRUCTURE_LIST_LIMIT,
+        ge=1,
+        le=MAX_STRUCTURE_LIST_LIMIT,
+    ),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
+    user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    List every non-deleted structure the authenticated user can read, most
+    recent first: their own and co-owned structures, and their group's
+    structures (all of them for group admins, public ones for members).
+    :param writable: Only list structures the user can edit.
+    :param limit: Maximum number of structures to return, up to 100.
+    :param offset: Number of sorted structures to skip.
+    :param fields: Comma-separated structure fields to return; structure_id is
+        always returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: tags.
+        Defaults to tags without fields and to none with fields.
+    :param user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: List of serialized structure details.
+    """
+    selection = parse_field_selection(Structure, fields, include)
+    db_user = get_user_or_404(db, get_user_sub(user))
+    structures = list_readable_assets(
+        db,
+        Structure,
+        db_user,
+        writable_only=writable,
+        limit=limit,
+        offset=offset,
+        include=selection.include,
+    )
+    return FastJSONResponse([
+        selection.project(
+            serialize_structure(
+                structure,
+                include_tags="tags" in selection.include,
+                include_user_sub=can_view_asset_user_owner(db_user, structure),
+            )
+        )
+        for structure in structures
+    ])
+
+
 @router.get("/presigned/{structure_id}")
 def get_presigned_url_for_structure(
     structure_id: str,
@@ -177,9 +493,64 @@ def get_presigned_url_for_structure(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/search")
+def search_structures_by_text(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(
+        DEFAULT_STRUCTURE_LIST_LIMIT,
+        ge=1,
+        le=MAX_STRUCTURE_LIST_LIMIT,
+    ),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
+    user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    Search the names and notes of non-deleted structures the authenticated
+    user can read, best match first. Every word must appear, with the last
+    word also matching as a prefix. POST /structures/search searches by
+    geometry instead.
+    :param q: Words to search for.
+    :param limit: Maximum number of structures to return, up to 100.
+    :param offset: Number of ranked structures to skip.
+    :param fields: Comma-separated structure fields to return; structure_id is
+        always returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: tags.
+        Defaults to tags without fields and to none with fields.
+    :param user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: List of serialized structure details.
+    """
+    selection = parse_field_selection(Structure, fields, include)
+    db_user = get_user_or_404(db, get_user_sub(user))
+    structures = search_readable_assets(
+        db,
+        Structure,
+        db_user,
+        q,
+        limit=limit,
+        offset=offset,
+        include=selection.include,
+    )
+    return FastJSONResponse([
+        selection.project(
+            serialize_structure(
+                structure,
+                include_tags="tags" in selection.include,
+                include_user_sub=can_view_asset_user_owner(db_user, structure),
+            )
+        )
+        for structure in structures
+    ])
+
+
 @router.get("/{structure_id}")
 def get_structure_by_id(
     structure_id: str,
+    fields: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
     user=Depends(verify_token),
     db: Session = Depends(get_db)
 ):
@@ -188,26 +559,107 @@ def get_structure_by_id(
     Allows admins, direct owners, group admins for the structure's group_id, and
     current group members when the structure is public.
     :param structure_id: ID of the structure to retrieve.
+    :param fields: Comma-separated structure fields to return; structure_id is
+        always returned. Defaults to every field.
+    :param include: Comma-separated related collections to embed: tags.
+        Defaults to tags without fields and to none with fields.
     :param user: Current user dependency, verified via token.
     :param db: Database session dependency.
     :return: The structure object if found, otherwise raises HTTPException.
     """
+    selection = parse_field_selection(Structure, fields, include)
     try:
         structure = get_asset_or_404(db, Structure, structure_id)
         db_user = get_user_or_404(db, get_user_sub(user))
         require_asset_permission(db_user, structure, can_read_asset)
 
-        return {
-            **serialize_structure(
+        return selection.project(
+            serialize_structure(
                 structure,
+                include_tags="tags" in selection.include,
                 include_user_sub=can_view_asset_user_owner(db_user, structure),
             )
-        }
+        )
     except HTTPException: 
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.patch("/tags", status_code=status.HTTP_200_OK)
+def update_structure_tags(
+    payload: BulkStructureTagUpdate,
+    user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    Add and remove tags on many structures in one transaction. Structures are
+    checked with the same rules as PATCH /structures/{structure_id}; missing or
+    forbidden structures do not block the others. Added tags are the
+    authenticated user's; removed names unlink matching tags of any owner.
+    :param payload: Structure ids and the tag names to add and to remove.
+    :param user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: One result per requested structure, in request order.
+    """
+    db_user = get_user_or_404(db, get_user_sub(user))
+    results = bulk_update_asset_tags(
+        db,
+        db_user,
+        Structure,
+        payload.structure_ids,
+        add=payload.add,
+        remove=payload.remove,
+    )
+    return {"results": results}
+
+
+@router.patch("/visibility", status_code=status.HTTP_200_OK)
+def update_structures_visibility(
+    payload: BulkStructureVisibilityUpdate,
+    user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    Update public/private visibility for many structures in one transaction,
+    with the same rules as PATCH /structures/{structure_id}/visibility.
+    Refused structures do not block the others.
+    :param payload: Structure ids and the visibility to set.
+    :param user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: One result per requested structure, in request order.
+    """
+    db_user = get_user_or_404(db, get_user_sub(user))
+    results = bulk_update_asset_visibility(
+        db,
+        db_user,
+        Structure,
+        payload.structure_ids,
+        payload.is_public,
+    )
+    return {"results": results}
+
+
+@router.post("/delete", status_code=status.HTTP_200_OK)
+def delete_structures(
+    payload: BulkStructureIds,
+    user=Depends(verify_token),
+    db: Session = Depends(get_db),
+):
+    """
+    Soft-delete many structures in one transaction, with the same rules as
+    DELETE /structures/{structure_id}. Missing, already deleted, or forbidden
+    structures do not block the others.
+    :param payload: IDs of the structures to delete.
+    :param user: Current user dependency, verified via token.
+    :param db: Database session dependency.
+    :return: One result per requested structure, in request order.
+    """
+    db_user = get_user_or_404(db, get_user_sub(user))
+    return {
+        "results": bulk_soft_delete_assets(db, db_user, Structure, payload.structure_ids)
+    }
+
+
 @router.patch("/{structure_id}/visibility", status_code=status.HTTP_200_OK)
 def update_structure_visibility(
     structure_id: str,
@@ -323,16 +775,22 @@ def create_and_upload_structure(
     notes: str = Form(None),
     file: UploadFile = File(...),
     tags: List[str] = Form([]),
-    image: UploadFile = File(...),
+    image: Optional[UploadFile] = File(None),
     user=Depends(verify_token),
     db: Session = Depends(get_db)
 ):
     """
-    Create a new structure by uploading a structure file and image.
+    Create a new structure by uploading a structure file and optional image.
     Ownership is derived from the authenticated user's database record. Users in a
     group always create co-owned structures with user_sub and group_id set.
+    The structure file must be valid XYZ; it is checked and fingerprinted in
+    the structure process pool, and 503 is returned when the pool is saturated.
+    Without an image, thumbnails are rendered in the same pool task and shared
+    by structures with identical files; structures with an image list it at
+    every thumbnail size.
     :param formula: Chemical formula of the structure.
-    :param image: UploadFile containing the structure image.
+    :param image: Optional UploadFile containing the structure image. The
+        large server-rendered thumbnail is used when omitted.
     :param tags: List of tags to associate with the structure.
     :param notes: Optional notes for the structure.
     :param name: Name of the structure.
@@ -346,6 +804,16 @@ def create_and_upload_structure(
         db_user = get_user_or_404(db, get_user_sub(user))
         user_id = db_user.user_sub
 
+        content = file.file.read()
+        # Thumbnails are keyed by content hash and only needed when the client
+        # sends no image; existing ones are reused instead of rendered again.
+        content_hash = None
+        render_thumbnails = False
+        if image is None:
+            content_hash = hashlib.sha256(content).hexdigest()
+            render_thumbnails = not _thumbnails_exist(content_hash)
+        fingerprint, thumbnails = fingerprint_and_render_upload(content, render_thumbnails)
+
         # Create directory for the structure
         structure_id = uuid.uuid4()
         structure_id_str = str(structure_id)
@@ -356,15 +824,27 @@ def create_and_upload_structure(
         safe_name = Path(file.filename or "").name
         file_path = os.path.join(structure_path, safe_name)
         with open(file_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+            f.write(content)
 
         s3_link = upload_structure_to_s3(file_path, structure_id_str)
         uploaded_at = datetime.now(timezone.utc)
+        if thumbnails:
+            upload_structure_thumbnails(content_hash, thumbnails)
 
         print("FORMULA", formula)
         try:
             image_key = f"structures/{structure_id_str}.png"
-            s3.upload_fileobj(image.file, BUCKET_NAME, image_key)
+            if image is not None:
+                s3.upload_fileobj(image.file, BUCKET_NAME, image_key)
+            else:
+                s3.copy_object(
+                    Bucket=BUCKET_NAME,
+                    Key=image_key,
+                    CopySource={
+                        "Bucket": BUCKET_NAME,
+                        "Key": _thumbnail_key(content_hash, "large"),
+                    },
+                )
         except Exception as e:
             print("Upload to s3 failed:", e)
             raise
@@ -378,6 +858,11 @@ def create_and_upload_structure(
             formula=formula,
             location=s3_link,
             notes=notes,
+            fingerprint=fingerprint.fingerprint,
+            near_fingerprint=fingerprint.near_fingerprint,
+            composition=fingerprint.composition,
+            heavy_atom_count=heavy_atom_count(fingerprint.composition),
+            content_hash=content_hash,
             uploaded_at=uploaded_at,
             is_deleted=False
         )
@@ -416,3 +901,25 @@ def upload_structure_to_s3(local_file_path: str, structure_id: str):
     except Exception as e:
         print("Upload to s3 failed:", e)
         raise
+
+
+def _thumbnails_exist(content_hash: str) -> bool:
+    """
+    Sizes are uploaded in THUMBNAIL_SIZES order, so the last one existing
+    means all of them do.
+    """
+    return _s3_object_exists(_thumbnail_key(content_hash, list(THUMBNAIL_SIZES)[-1]))
+
+
+def upload_structure_thumbnails(content_hash: str, thumbnails: Dict[str, bytes]) -> None:
+    """
+    Upload rendered thumbnails keyed by the SHA-256 of the structure file, so
+    identical files share them.
+    """
+    for size, png in thumbnails.items():
+        s3.put_object(
+            Bucket=BUCKET_NAME,
+            Key=_thumbnail_key(content_hash, size),
+            Body=png,
+            ContentType="image/png",
+        )
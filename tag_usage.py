@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List
+
+import orjson
+from sqlalchemy import event, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from models import Job, Structure, Tags, jobs_tags, structures_tags
+from result_cache import CachedPayload, build_payload
+
+# Each worker process has its own cache and only hears about the changes it
+# commits, so entries also expire after this many seconds.
+TAG_USAGE_MAX_AGE_SECONDS = 60
+TAG_USAGE_MAX_ENTRIES = 10000
+
+_STALE_USERS_KEY = "tag_usage_stale_users"
+
+
+class TagUsageCache:
+    """
+    Tag usage payloads keyed by tag owner, least recently used evicted first.
+    """
+
+    def __init__(
+        self,
+        max_age: float = TAG_USAGE_MAX_AGE_SECONDS,
+        max_entries: int = TAG_USAGE_MAX_ENTRIES,
+    ):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, CachedPayload]]" = OrderedDict()
+        # Generations are only kept for users with a load in flight, bumped
+        # by every invalidation, so a load that started before one knows its
+        # counts may predate the commit and is not cached.
+        self._loading: Dict[str, int] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, user_sub: str, load: Callable[[], bytes]) -> CachedPayload:
+        with self._lock:
+            entry = self._entries.get(user_sub)
+            if entry is not None and time.monotonic() - entry[0] < self.max_age:
+                self._entries.move_to_end(user_sub)
+                return entry[1]
+            generation = self._generations.setdefault(user_sub, 0)
+            self._loading[user_sub] = self._loading.get(user_sub, 0) + 1
+
+        # Loading outside the lock lets other users' requests go ahead; two
+        # misses for the same user both query, and the later one is kept.
+        loaded_at = time.monotonic()
+        try:
+            payload = build_payload(load())
+        except BaseException:
+            with self._lock:
+                self._end_load(user_sub, generation)
+            raise
+
+        with self._lock:
+            if self._end_load(user_sub, generation):
+                self._entries[user_sub] = (loaded_at, payload)
+                self._entries.move_to_end(user_sub)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return payload
+
+    def _end_load(self, user_sub: str, generation: int) -> bool:
+        """
+        Forget a finished load, and the user's generation once no other load
+        is in flight. Called with the lock held.
+        :return: Whether nothing invalidated the user since the load started.
+        """
+        is_current = self._generations[user_sub] == generation
+        self._loading[user_sub] -= 1
+        if not self._loading[user_sub]:
+            del self._loading[user_sub]
+            del self._generations[user_sub]
+        return is_current
+
+    def invalidate(self, user_subs: Iterable[str]) -> None:
+        with self._lock:
+            for user_sub in user_subs:
+                self._entries.pop(user_sub, None)
+                if user_sub in self._generations:
+                    self._generations[user_sub] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for user_sub in self._generations:
+                self._generations[user_sub] += 1
+
+
+tag_usage_cache = TagUsageCache()
+
+
+def mark_tag_usage_stale(db: Session, user_subs: Iterable[str]) -> None:
+    """
+    Drop the cached tag usage of user_subs once db commits. Dropping it
+    earlier would let another request cache the counts from before the
+    commit again.
+    """
+    db.info.setdefault(_STALE_USERS_KEY, set()).update(
+        user_sub for user_sub in user_subs if user_sub
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tag_usage(session: Session) -> None:
+    tag_usage_cache.invalidate(session.info.pop(_STALE_USERS_KEY, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_tag_usage(session: Session) -> None:
+    session.info.pop(_STALE_USERS_KEY, None)
+
+
+def list_tag_usage(db: Session, user_sub: str) -> List[dict]:
+    """
+    Count the non-deleted jobs and structures linked to each of the user's
+    tags in one grouped query, most used first. Unused tags count zero.
+    """
+    user_tag_ids = select(Tags.tag_id).where(Tags.user_sub == user_sub)
+    links = union_all(
+        select(jobs_tags.c.tag_id, literal("job").label("asset_type"))
+        .join(Job, Job.id == jobs_tags.c.job_id)
+        .where(jobs_tags.c.tag_id.in_(user_tag_ids), Job.is_deleted.is_(False)),
+        select(structures_tags.c.tag_id, literal("structure").label("asset_type"))
+        .join(Structure, Structure.id == structures_tags.c.structure_id)
+        .where(structures_tags.c.tag_id.in_(user_tag_ids), Structure.is_deleted.is_(False)),
+    ).subquery()
+    job_count = func.count(links.c.tag_id).filter(links.c.asset_type == "job")
+    structure_count = func.count(links.c.tag_id).filter(links.c.asset_type == "structure")
+    rows = db.execute(
+        select(Tags.tag_id, Tags.name, job_count, structure_count)
+        .outerjoin(links, links.c.tag_id == Tags.tag_id)
+        .where(Tags.user_sub == user_sub)
+        .group_by(Tags.tag_id, Tags.name)
+        .order_by(func.count(links.c.tag_id).desc(), Tags.name)
+    ).all()
+    return [
+        {
+            "tag_id": str(tag_id),
+            "name": name,
+            "job_count": jobs,
+            "structure_count": structures,
+        }
+        for tag_id, name, jobs, structures in rows
+    ]
+
+
+def tag_usage_payload(db: Session, user_sub: str) -> CachedPayload:
+    return tag_usage_cache.get_or_load(
+        user_sub,
+        lambda: orjson.dumps(list_tag_usage(db, user_sub)),
+    )
@@ -13,6 +13,7 @@ from database import Base
 from dependencies import get_db
 from main import create_app
 from models import Group, Job, Request, Structure, Tags, User
+from tag_usage import tag_usage_cache
 
 # --- Test database ---
 
@@ -90,6 +91,8 @@ def db():
     finally:
         session.close()
         Base.metadata.drop_all(bind=engine)
+        # Cached tag usage is keyed by user_sub, which tests reuse.
+        tag_usage_cache.clear()
 
 
 @pytest.fixture
@@ -251,6 +251,19 @@ class TestAdminAPI:
             str(expected_job.job_id)
         ]
 
+    def test_admin_job_list_filters_by_calculation_type(
+        self, client, user_factory, job_factory
+    ):
+        user_factory(user_sub="auth0|testuser", role="admin")
+        owner = user_factory(user_sub="auth0|owner")
+        frequency = job_factory(user_sub=owner.user_sub, calculation_type="frequency")
+        job_factory(user_sub=owner.user_sub, calculation_type="energy")
+
+        response = client.get("/admin/jobs", params={"calculation_type": "frequency"})
+
+        assert response.status_code == 200
+        assert [job["job_id"] for job in response.json()] == [str(frequency.job_id)]
+
     def test_admin_job_list_uses_fixed_number_of_queries(
         self,
         client,
@@ -271,7 +284,7 @@ class TestAdminAPI:
 
         assert response.status_code == 200
         assert len(response.json()) == 5
-        assert len(sql_statements) == 4
+        assert len(sql_statements) == 3
 
     def test_admin_jobs_list_requires_admin_user(self, client, user_factory):
         """
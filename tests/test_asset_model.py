@@ -1,4 +1,6 @@
 from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
 
 from models import Asset, Job, Request, Structure, Tags
 
@@ -46,3 +48,14 @@ class TestAssetModel:
         index_names = {index.name for index in Request.__table__.indexes}
 
         assert "idx_requests_status_expires_at" in index_names
+
+    def test_job_status_indexes_match_migration_order(self):
+        indexes = {index.name: index for index in Job.__table__.indexes}
+
+        ddl = str(
+            CreateIndex(indexes["idx_jobs_user_status_active"]).compile(
+                dialect=postgresql.dialect()
+            )
+        )
+
+        assert "(user_sub, status, submitted_at DESC) WHERE is_deleted IS FALSE" in ddl
@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import select
 
 from permissions import (
     can_change_asset_visibility,
@@ -10,6 +11,8 @@ from permissions import (
     is_group_admin_for_group,
     is_group_member_for_asset,
     is_user_owner,
+    readable_assets_clause,
+    writable_assets_clause,
 )
 
 
@@ -271,3 +274,46 @@ class TestAssetOwnershipTransferPermissions:
         asset = asset_factory(user_sub=owner.user_sub, group_id=None)
 
         assert can_transfer_asset_ownership(group_admin, asset) is False
+
+
+class TestAssetQueryPredicates:
+    @pytest.mark.parametrize(
+        ("clause", "predicate"),
+        [
+            (readable_assets_clause, can_read_asset),
+            (writable_assets_clause, can_write_asset),
+        ],
+    )
+    def test_sql_clauses_match_python_predicates(
+        self, db, group_factory, user_factory, asset_factory, clause, predicate
+    ):
+        """
+        The SQL clauses should select exactly the assets the Python predicates
+        allow, for every kind of user and owner.
+        """
+        group = group_factory()
+        other_group = group_factory()
+        owner = user_factory(group=group, user_sub="auth0|owner")
+        outsider = user_factory(group=other_group, user_sub="auth0|outsider")
+        users = [
+            user_factory(role="admin"),
+            user_factory(group=group, role="group_admin"),
+            user_factory(group=other_group, role="group_admin"),
+            user_factory(group=group),
+            user_factory(),
+            owner,
+        ]
+        assets = [
+            asset_factory(user_sub=owner.user_sub, group_id=None, is_public=False),
+            asset_factory(user_sub=owner.user_sub, group_id=group.group_id, is_public=False),
+            asset_factory(user_sub=None, group_id=group.group_id, is_public=True),
+            asset_factory(user_sub=None, group_id=group.group_id, is_public=False),
+            asset_factory(user_sub=outsider.user_sub, group_id=None, is_public=True),
+            asset_factory(user_sub=None, group_id=other_group.group_id, is_public=True),
+        ]
+        model = type(assets[0])
+
+        for user in users:
+            selected = set(db.scalars(select(model.id).where(clause(user, model))))
+            allowed = {asset.id for asset in assets if predicate(user, asset)}
+            assert selected == allowed, user.role
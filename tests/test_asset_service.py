@@ -9,6 +9,8 @@ from asset_service import (
     get_asset_or_404,
     list_group_assets,
     list_user_assets,
+    list_user_job_payloads,
+    parse_field_selection,
     require_asset_permission,
     serialize_job,
     serialize_structure,
@@ -224,6 +226,40 @@ def test_list_user_assets_filters_deleted_and_orders_newest_first(
     ) == [older]
 
 
+def test_list_user_job_payloads_match_serialize_job(
+    db,
+    group_factory,
+    user_factory,
+    job_factory,
+    structure_factory,
+    tag_factory,
+):
+    group = group_factory()
+    owner = user_factory(group=group, user_sub="auth0|testuser")
+    now = datetime.now(timezone.utc)
+    structure = structure_factory(user_sub=owner.user_sub, group_id=group.group_id)
+    tagged = job_factory(
+        user_sub=owner.user_sub,
+        group_id=group.group_id,
+        created_at=now,
+        completed_at=now,
+        runtime=timedelta(minutes=5),
+        slurm_id="42",
+        structures=[structure],
+        tags=[tag_factory(user_sub=owner.user_sub, name="baseline")],
+    )
+    bare = job_factory(user_sub=owner.user_sub, created_at=now - timedelta(hours=1))
+    job_factory(user_sub=owner.user_sub, is_deleted=True)
+
+    payloads = list_user_job_payloads(db, owner.user_sub)
+
+    assert payloads == [serialize_job(tagged), serialize_job(bare)]
+    assert payloads[1]["tags"] == []
+    assert list_user_job_payloads(db, owner.user_sub, limit=1, offset=1) == [
+        serialize_job(bare)
+    ]
+
+
 @pytest.mark.parametrize("model,factory_name", ASSET_CASES)
 def test_list_group_assets_filters_by_group_and_orders_newest_first(
     request,
@@ -436,3 +472,33 @@ def test_set_asset_tags_deduplicates_input_and_existing_links(
         .filter_by(user_sub=owner.user_sub, name="new")
         .count()
     ) == 1
+
+
+class TestParseFieldSelection:
+    def test_defaults_to_every_field_and_collection(self):
+        selection = parse_field_selection(Job)
+
+        assert selection.fields is None
+        assert selection.include == {"structures", "tags"}
+
+    def test_fields_always_keep_id_and_drop_collections(self):
+        selection = parse_field_selection(Structure, "name, formula")
+
+        assert selection.fields == {"structure_id", "name", "formula"}
+        assert selection.include == frozenset()
+        assert selection.project(
+            {"structure_id": "1", "name": "Water", "notes": None, "tags": []}
+        ) == {"structure_id": "1", "name": "Water"}
+
+    def test_include_without_fields_limits_collections(self):
+        selection = parse_field_selection(Job, include="tags")
+
+        assert selection.fields is None
+        assert selection.include == {"tags"}
+
+    def test_rejects_collection_from_another_model(self):
+        with pytest.raises(HTTPException) as exc_info:
+            parse_field_selection(Structure, include="structures")
+
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == "Unknown include: structures"
@@ -1,17 +1,23 @@
+import io
 import json
+import tarfile
 from types import SimpleNamespace
 import uuid
 
 import pytest
 
+from cluster.backends import FakeClusterBackend
 from conftest import make_auth0_payload
+from models import Job
+from result_cache import ResultCache
+from xyz_validation import normalize_xyz
 
 
 def _xyz_file(content=b"2\n\nH 0 0 0\nH 0 0 1\n"):
     return {"file": ("input.xyz", content, "chemical/x-xyz")}
 
 
-def _advanced_files(content=b"advanced xyz", keywords=b'{"extra": true}'):
+def _advanced_files(content=b"2\nadvanced\nH 0 0 0\nH 0 0 0.74\n", keywords=b'{"extra": true}'):
     return {
         "file": ("input.xyz", content, "chemical/x-xyz"),
         "keywords": ("keywords.json", keywords, "application/json"),
@@ -23,15 +29,26 @@ def _configure_cluster(monkeypatch, tmp_path, env="production"):
 
     backend_dir = tmp_path / "backend"
     cluster_dir = tmp_path / "cluster"
-    cleanup_calls = []
 
     monkeypatch.setattr(cluster_routes, "BACKEND_WORK_DIR", str(backend_dir))
     monkeypatch.setattr(cluster_routes, "CLUSTER_WORK_DIR", str(cluster_dir))
     monkeypatch.setattr(cluster_routes, "ENV", env)
     monkeypatch.setattr(cluster_routes, "ANACONDA_DIR", "/conda/bin/python")
-    monkeypatch.setattr(cluster_routes, "clean_up_upload_cache", cleanup_calls.append)
+    monkeypatch.setattr(cluster_routes, "result_cache", ResultCache(cache_dir=str(tmp_path / "cache")))
 
-    return cluster_routes, backend_dir, cluster_dir, cleanup_calls
+    return cluster_routes, backend_dir, cluster_dir
+
+
+def _streamed_files(kwargs):
+    with tarfile.open(fileobj=io.BytesIO(kwargs["input"])) as archive:
+        return {
+            member.name: archive.extractfile(member).read()
+            for member in archive.getmembers()
+        }
+
+
+def _unpack_command(remote_job_dir):
+    return f"mkdir -p {remote_job_dir} && tar -xf - -C {remote_job_dir} &&"
 
 
 def _freeze_job_id(monkeypatch, cluster_routes, value="11111111-1111-4111-8111-111111111111"):
@@ -62,9 +79,9 @@ def _mock_subprocess_run(monkeypatch, cluster_routes, stdout=None, side_effects=
             effect = effects.pop(0)
             if effect:
                 raise effect
-        if command[0] == "scp":
-            return SimpleNamespace(stdout="", returncode=0)
         output = stdout_values.pop(0) if stdout_values else "12345\n"
+        if "input" in kwargs:
+            output = output.encode()
         return SimpleNamespace(stdout=output, returncode=0)
 
     monkeypatch.setattr(cluster_routes.subprocess, "run", fake_run)
@@ -72,13 +89,13 @@ def _mock_subprocess_run(monkeypatch, cluster_routes, stdout=None, side_effects=
 
 
 class TestClusterRunAPI:
-    def test_run_advanced_analysis_saves_files_copies_and_submits(
+    def test_run_advanced_analysis_streams_files_and_submits(
         self, client, monkeypatch, tmp_path
     ):
         """
-        POST /cluster/run_advanced_analysis should stage files and submit expected commands.
+        POST /cluster/run_advanced_analysis should stream job files and submit in one SSH call.
         """
-        cluster_routes, backend_dir, cluster_dir, cleanup_calls = _configure_cluster(
+        cluster_routes, backend_dir, cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -101,46 +118,43 @@ class TestClusterRunAPI:
 
         assert response.status_code == 200
         assert response.json() == {"job_id": str(job_id), "slurm_id": "67890"}
-        backend_job_dir = backend_dir / "jobs" / str(job_id)
         remote_job_dir = cluster_dir / "jobs" / str(job_id)
-        assert (backend_job_dir / "input.xyz").read_bytes() == b"advanced xyz"
-        assert json.loads((backend_job_dir / "urls.json").read_text()) == {
-            "zip": f"put:{job_id}:energy"
-        }
-        assert (backend_job_dir / "keywords.json").read_bytes() == b'{"extra": true}'
         assert upload_url_calls == [(str(job_id), "energy")]
-        assert subprocess_calls == [
-            (
-                ["scp", "-r", str(backend_job_dir), f"cluster:{remote_job_dir}"],
-                {"check": True, "timeout": 120},
-            ),
-            (
-                [
-                    "ssh",
-                    "cluster",
-                    f"python3 {cluster_dir}/dispatch.py submit",
-                    f"{remote_job_dir}/input.xyz",
-                    str(job_id),
-                    "energy",
-                    "hf",
-                    "sto-3g",
-                    "0",
-                    "1",
-                    "--opt-type ts ",
-                    f"--keywords-file {remote_job_dir}/keywords.json",
-                ],
-                {"check": True, "capture_output": True, "text": True, "timeout": 120},
-            ),
+        assert len(subprocess_calls) == 1
+        command, kwargs = subprocess_calls[0]
+        assert command == [
+            "ssh",
+            "cluster",
+            _unpack_command(remote_job_dir),
+            f"python3 {cluster_dir}/dispatch.py submit",
+            f"{remote_job_dir}/input.xyz",
+            str(job_id),
+            "energy",
+            "hf",
+            "sto-3g",
+            "0",
+            "1",
+            "--opt-type ts ",
+            f"--keywords-file {remote_job_dir}/keywords.json",
         ]
-        assert cleanup_calls == [str(backend_job_dir)]
+        assert {key: value for key, value in kwargs.items() if key != "input"} == {
+            "check": True,
+            "capture_output": True,
+            "timeout": 120,
+        }
+        streamed_files = _streamed_files(kwargs)
+        assert streamed_files["input.xyz"] == normalize_xyz(b"2\nadvanced\nH 0 0 0\nH 0 0 0.74\n")
+        assert json.loads(streamed_files["urls.json"]) == {"zip": f"put:{job_id}:energy"}
+        assert streamed_files["keywords.json"] == b'{"extra": true}'
+        assert not backend_dir.exists()
 
-    def test_run_standard_analysis_copies_and_submits_remote_job(
+    def test_run_standard_analysis_streams_files_and_submits_remote_job(
         self, client, monkeypatch, tmp_path
     ):
         """
-        POST /cluster/run_standard_analysis should stage files and submit expected commands.
+        POST /cluster/run_standard_analysis should stream job files and submit in one SSH call.
         """
-        cluster_routes, backend_dir, cluster_dir, cleanup_calls = _configure_cluster(
+        cluster_routes, backend_dir, cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -151,44 +165,31 @@ class TestClusterRunAPI:
         response = client.post(
             "/cluster/run_standard_analysis",
             data={"charge": "1", "multiplicity": "2", "opt_type": "ground"},
-            files=_xyz_file(b"standard xyz"),
+            files=_xyz_file(b"2\nstandard\nh 0 0 0\nh 0 0 0.74\n"),
         )
 
         assert response.status_code == 200
         assert response.json() == {"job_id": str(job_id), "slurm_id": "24680"}
-        backend_job_dir = backend_dir / "jobs" / str(job_id)
         remote_job_dir = cluster_dir / "jobs" / str(job_id)
-        assert (backend_job_dir / "input.xyz").read_bytes() == b"standard xyz"
-        assert json.loads((backend_job_dir / "urls.json").read_text()) == {
-            "zip": f"put:{job_id}:standard"
-        }
         assert upload_url_calls == [(str(job_id), "standard")]
-        assert subprocess_calls == [
-            (
-                ["scp", "-r", str(backend_job_dir), f"cluster:{remote_job_dir}"],
-                {"check": True, "timeout": 120},
-            ),
-            (
-                [
-                    "ssh",
-                    "cluster",
-                    f"python3 {cluster_dir}/dispatch.py submit",
-                    f"{remote_job_dir}/input.xyz",
-                    str(job_id),
-                    "1",
-                    "2",
-                    "--opt-type ground ",
-                ],
-                {
-                    "check": True,
-                    "capture_output": True,
-                    "text": True,
-                    "timeout": 120,
-                    "cwd": None,
-                },
-            ),
+        assert len(subprocess_calls) == 1
+        command, kwargs = subprocess_calls[0]
+        assert command == [
+            "ssh",
+            "cluster",
+            _unpack_command(remote_job_dir),
+            f"python3 {cluster_dir}/dispatch.py submit",
+            f"{remote_job_dir}/input.xyz",
+            str(job_id),
+            "1",
+            "2",
+            "--opt-type ground ",
         ]
-        assert cleanup_calls == [str(backend_job_dir)]
+        assert _streamed_files(kwargs) == {
+            "input.xyz": b"2\nstandard\nH 0.00000000 0.00000000 0.00000000\nH 0.00000000 0.00000000 0.74000000\n",
+            "urls.json": json.dumps({"zip": f"put:{job_id}:standard"}).encode(),
+        }
+        assert not backend_dir.exists()
 
     def test_run_standard_analysis_local_non_numeric_output_returns_null_slurm_id(
         self, client, monkeypatch, tmp_path
@@ -196,7 +197,7 @@ class TestClusterRunAPI:
         """
         Local standard analysis should convert non-SLURM stdout into null slurm_id.
         """
-        cluster_routes, backend_dir, cluster_dir, cleanup_calls = _configure_cluster(
+        cluster_routes, backend_dir, cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
             env="local",
@@ -208,14 +209,19 @@ class TestClusterRunAPI:
         response = client.post(
             "/cluster/run_standard_analysis",
             data={"charge": "0", "multiplicity": "1"},
-            files=_xyz_file(b"local xyz"),
+            files=_xyz_file(b"2\nlocal\nH 0 0 0\nH 0 0 0.74\n"),
         )
 
         assert response.status_code == 200
         assert response.json() == {"job_id": str(job_id), "slurm_id": None}
-        backend_job_dir = backend_dir / "jobs" / str(job_id)
         remote_job_dir = cluster_dir / "jobs" / str(job_id)
-        assert (remote_job_dir / "input.xyz").read_bytes() == b"local xyz"
+        assert (remote_job_dir / "input.xyz").read_bytes() == normalize_xyz(
+            b"2\nlocal\nH 0 0 0\nH 0 0 0.74\n"
+        )
+        assert json.loads((remote_job_dir / "urls.json").read_text()) == {
+            "zip": f"put:{job_id}:standard"
+        }
+        assert not backend_dir.exists()
         assert subprocess_calls == [
             (
                 [
@@ -235,10 +241,49 @@ class TestClusterRunAPI:
                 },
             )
         ]
-        assert cleanup_calls == [str(backend_job_dir)]
 
     @pytest.mark.parametrize(
-        "endpoint, data, expected_detail",
+        "endpoint, data, content, detail",
+        [
+            (
+                "/cluster/run_advanced_analysis",
+                {
+                    "calculation_type": "energy",
+                    "method": "hf",
+                    "basis_set": "sto-3g",
+                    "charge": "0",
+                    "multiplicity": "1",
+                },
+                b"2\n\nH 0 0 0\nH 0 0 0.1\n",
+                "Invalid XYZ file: Frame 1: atoms 1 and 2 are 0.100 A apart",
+            ),
+            (
+                "/cluster/run_standard_analysis",
+                {"charge": "0", "multiplicity": "2"},
+                b"2\n\nH 0 0 0\nH 0 0 0.74\n",
+                "Invalid XYZ file: Multiplicity 2 is impossible with 2 electrons",
+            ),
+        ],
+    )
+    def test_run_analysis_rejects_invalid_input_before_contacting_cluster(
+        self, client, monkeypatch, tmp_path, endpoint, data, content, detail
+    ):
+        """
+        Malformed geometry or impossible spin states should fail in the API, not after queueing.
+        """
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(monkeypatch, tmp_path)
+        upload_url_calls = _mock_upload_urls(monkeypatch, cluster_routes)
+        subprocess_calls = _mock_subprocess_run(monkeypatch, cluster_routes)
+
+        response = client.post(endpoint, data=data, files=_advanced_files(content))
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == detail
+        assert upload_url_calls == []
+        assert subprocess_calls == []
+
+    @pytest.mark.parametrize(
+        "endpoint, data",
         [
             (
                 "/cluster/run_advanced_analysis",
@@ -249,40 +294,37 @@ class TestClusterRunAPI:
                     "charge": "0",
                     "multiplicity": "1",
                 },
-                "Cluster job submission failed",
             ),
             (
                 "/cluster/run_standard_analysis",
                 {"charge": "0", "multiplicity": "1"},
-                "Cluster job submission failed",
             ),
         ],
     )
     def test_run_analysis_subprocess_failure_returns_500(
-        self, client, monkeypatch, tmp_path, endpoint, data, expected_detail
+        self, client, monkeypatch, tmp_path, endpoint, data
     ):
         """
-        Cluster subprocess failures should return 500 and clean up staged files.
+        Cluster subprocess failures should return 500.
         """
-        cluster_routes, backend_dir, _cluster_dir, cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
-        job_id = _freeze_job_id(monkeypatch, cluster_routes)
+        _freeze_job_id(monkeypatch, cluster_routes)
         _mock_upload_urls(monkeypatch, cluster_routes)
         _mock_subprocess_run(
             monkeypatch,
             cluster_routes,
             side_effects=[
-                cluster_routes.subprocess.CalledProcessError(returncode=1, cmd=["scp"]),
+                cluster_routes.subprocess.CalledProcessError(returncode=1, cmd=["ssh"]),
             ],
         )
 
         response = client.post(endpoint, data=data, files=_xyz_file())
 
         assert response.status_code == 500
-        assert response.json()["detail"] == expected_detail
-        assert cleanup_calls == [str(backend_dir / "jobs" / str(job_id))]
+        assert response.json()["detail"] == "Cluster job submission failed"
 
     @pytest.mark.parametrize(
         "endpoint, data",
@@ -307,19 +349,18 @@ class TestClusterRunAPI:
         self, client, monkeypatch, tmp_path, endpoint, data
     ):
         """
-        Cluster submission timeouts should return 500 and clean up staged files.
+        Cluster submission timeouts should return 500.
         """
-        cluster_routes, backend_dir, _cluster_dir, cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
-        job_id = _freeze_job_id(monkeypatch, cluster_routes)
+        _freeze_job_id(monkeypatch, cluster_routes)
         _mock_upload_urls(monkeypatch, cluster_routes)
         _mock_subprocess_run(
             monkeypatch,
             cluster_routes,
             side_effects=[
-                None,
                 cluster_routes.subprocess.TimeoutExpired(cmd=["ssh"], timeout=120),
             ],
         )
@@ -328,12 +369,308 @@ class TestClusterRunAPI:
 
         assert response.status_code == 500
         assert response.json()["detail"] == "Cluster job submission failed"
-        assert cleanup_calls == [str(backend_dir / "jobs" / str(job_id))]
+
+
+class TestFakeClusterBackendAPI:
+    def test_fake_backend_runs_job_from_submission_to_result(
+        self, client, db, monkeypatch, tmp_path, job_factory, user_factory
+    ):
+        """
+        CLUSTER_BACKEND=fake should serve the submit, status, result, and result
+        upload flow without SSH.
+        """
+        clock = SimpleNamespace(now=0.0)
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
+            monkeypatch,
+            tmp_path,
+            env="local",
+        )
+        backend = FakeClusterBackend(
+            run_seconds=10, clock=lambda: clock.now, sleep=lambda _seconds: None
+        )
+        monkeypatch.setattr(cluster_routes, "CLUSTER_BACKEND", "fake")
+        monkeypatch.setattr(cluster_routes, "_fake_cluster_backend", backend)
+        # SQLite stores an all-digit UUID hex as a number, so use one with letters.
+        job_id = _freeze_job_id(monkeypatch, cluster_routes, "aaaaaaaa-1111-4111-8111-111111111111")
+        _mock_upload_urls(monkeypatch, cluster_routes)
+        subprocess_calls = _mock_subprocess_run(monkeypatch, cluster_routes)
+        user = user_factory(user_sub="auth0|testuser")
+
+        submitted = client.post(
+            "/cluster/run_standard_analysis",
+            data={"charge": "0", "multiplicity": "1"},
+            files=_xyz_file(),
+        )
+        slurm_id = submitted.json()["slurm_id"]
+        job = job_factory(
+            user_sub=user.user_sub, job_id=job_id, slurm_id=slurm_id, status="running"
+        )
+
+        assert submitted.status_code == 200
+        assert client.get(f"/cluster/status/{slurm_id}").json()["state"] == "RUNNING"
+        assert client.get(f"/cluster/result/{job_id}").status_code == 404
+        clock.now = 10
+        assert client.get(f"/cluster/status/{slurm_id}").json()["state"] == "COMPLETED"
+        result_response = client.get(f"/cluster/result/{job_id}")
+        assert result_response.status_code == 200
+        assert json.loads(result_response.json()["output"])["state"] == "COMPLETED"
+        status_response = client.patch(
+            "/jobs/status",
+            json={"updates": [{"job_id": str(job_id), "state": "completed"}]},
+        )
+        assert status_response.status_code == 200
+        db.refresh(job)
+        assert job.is_uploaded is True
+        assert backend.uploaded_job_ids == [str(job_id)]
+        assert subprocess_calls == []
+
+
+def _mock_batch_upload_urls(monkeypatch, cluster_routes):
+    calls = []
+
+    def fake_construct_upload_scripts(job_ids, calculation_type):
+        calls.append((list(job_ids), calculation_type))
+        return {job_id: {"zip": f"put:{job_id}"} for job_id in job_ids}
+
+    monkeypatch.setattr(cluster_routes, "construct_upload_scripts", fake_construct_upload_scripts)
+    return calls
+
+
+def _batch_form_data(**overrides):
+    data = {
+        "calculation_type": "energy",
+        "method": "hf",
+        "basis_set": "sto-3g",
+        "charge": "0",
+        "multiplicity": "1",
+    }
+    data.update(overrides)
+    return data
+
+
+class TestClusterBatchAPI:
+    def test_run_batch_analysis_submits_one_array_and_creates_all_jobs(
+        self, client, db, monkeypatch, tmp_path, group_factory, user_factory
+    ):
+        """
+        Every file and every frame should become one job in a single array submission.
+        """
+        group = group_factory()
+        user_factory(group=group, user_sub="auth0|testuser")
+        cluster_routes, _backend_dir, cluster_dir = _configure_cluster(monkeypatch, tmp_path)
+        url_calls = _mock_batch_upload_urls(monkeypatch, cluster_routes)
+        subprocess_calls = _mock_subprocess_run(monkeypatch, cluster_routes, stdout=["5555\n"])
+        water = b"3\nwater\nO 0 0 0\nH 0 0 1\nH 0 1 0\n"
+        conformers = b"2\nfirst\nH 0 0 0\nH 0 0 1\n2\nsecond\nH 0 0 0\nH 0 0 2\n"
+
+        response = client.post(
+            "/cluster/run_batch_analysis",
+            data=_batch_form_data(job_name="Scan", tags=["batch"], opt_type="ground"),
+            files=[
+                ("files", ("water.xyz", water, "chemical/x-xyz")),
+                ("files", ("h2.xyz", conformers, "chemical/x-xyz")),
+            ],
+        )
+
+        assert response.status_code == 201
+        body = response.json()
+        assert body["slurm_id"] == "5555"
+        assert [job["filename"] for job in body["jobs"]] == ["water.xyz", "h2_1.xyz", "h2_2.xyz"]
+        assert [job["job_name"] for job in body["jobs"]] == ["Scan (1)", "Scan (2)", "Scan (3)"]
+        assert [job["slurm_id"] for job in body["jobs"]] == ["5555_0", "5555_1", "5555_2"]
+        job_ids = [job["job_id"] for job in body["jobs"]]
+        assert url_calls == [(job_ids, "energy")]
+
+        assert len(subprocess_calls) == 1
+        command, kwargs = subprocess_calls[0]
+        remote_jobs_dir = cluster_dir / "jobs"
+        manifest_name = f"batch_{body['batch_id']}.txt"
+        assert command == [
+            "ssh",
+            "cluster",
+            _unpack_command(remote_jobs_dir),
+            f"python3 {cluster_dir}/dispatch.py submit-array",
+            f"{remote_jobs_dir}/{manifest_name}",
+            "energy",
+            "hf",
+            "sto-3g",
+            "0",
+            "1",
+            "--opt-type ground ",
+        ]
+        streamed_files = _streamed_files(kwargs)
+        assert streamed_files[manifest_name] == "".join(f"{job_id}\n" for job_id in job_ids).encode()
+        assert streamed_files[f"{job_ids[0]}/input.xyz"] == normalize_xyz(water)
+        assert streamed_files[f"{job_ids[2]}/input.xyz"] == normalize_xyz(b"2\nsecond\nH 0 0 0\nH 0 0 2\n")
+        assert json.loads(streamed_files[f"{job_ids[1]}/urls.json"]) == {"zip": f"put:{job_ids[1]}"}
+
+        jobs = db.query(Job).order_by(Job.slurm_id).all()
+        assert [str(job.job_id) for job in jobs] == job_ids
+        assert {job.group_id for job in jobs} == {group.group_id}
+        assert all(job.status == "pending" for job in jobs)
+        assert all([tag.name for tag in job.tags] == ["batch"] for job in jobs)
+
+    def test_run_batch_analysis_rejects_non_xyz_upload_before_submitting(
+        self, client, db, monkeypatch, tmp_path, user_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(monkeypatch, tmp_path)
+        _mock_batch_upload_urls(monkeypatch, cluster_routes)
+        subprocess_calls = _mock_subprocess_run(monkeypatch, cluster_routes)
+
+        response = client.post(
+            "/cluster/run_batch_analysis",
+            data=_batch_form_data(),
+            files=[("files", ("input.txt", b"2\n\nH 0 0 0\nH 0 0 1\n", "text/plain"))],
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid file format. Only .xyz allowed."
+        assert subprocess_calls == []
+        assert db.query(Job).count() == 0
+
+    def test_run_batch_analysis_rejects_truncated_frame(
+        self, client, db, monkeypatch, tmp_path, user_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(monkeypatch, tmp_path)
+        _mock_batch_upload_urls(monkeypatch, cluster_routes)
+        subprocess_calls = _mock_subprocess_run(monkeypatch, cluster_routes)
+
+        response = client.post(
+            "/cluster/run_batch_analysis",
+            data=_batch_form_data(),
+            files=[("files", ("broken.xyz", b"3\n\nH 0 0 0\n", "chemical/x-xyz"))],
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("broken.xyz:")
+        assert subprocess_calls == []
+
+    def test_run_batch_analysis_submission_failure_creates_no_jobs(
+        self, client, db, monkeypatch, tmp_path, user_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(monkeypatch, tmp_path)
+        _mock_batch_upload_urls(monkeypatch, cluster_routes)
+        _mock_subprocess_run(
+            monkeypatch,
+            cluster_routes,
+            side_effects=[
+                cluster_routes.subprocess.CalledProcessError(returncode=1, cmd=["ssh"]),
+            ],
+        )
+
+        response = client.post(
+            "/cluster/run_batch_analysis",
+            data=_batch_form_data(),
+            files=[("files", ("input.xyz", b"2\n\nH 0 0 0\nH 0 0 1\n", "chemical/x-xyz"))],
+        )
+
+        assert response.status_code == 500
+        assert response.json()["detail"] == "Cluster job submission failed"
+        assert db.query(Job).count() == 0
+
+
+    def test_run_batch_analysis_counts_frames_before_parsing(
+        self, client, db, monkeypatch, tmp_path, user_factory
+    ):
+        """
+        An oversized batch should be refused before any file reaches the pool.
+        """
+        user_factory(user_sub="auth0|testuser")
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(monkeypatch, tmp_path)
+        _mock_batch_upload_urls(monkeypatch, cluster_routes)
+        subprocess_calls = _mock_subprocess_run(monkeypatch, cluster_routes)
+        validated = []
+        monkeypatch.setattr(
+            cluster_routes,
+            "validate_xyz_upload",
+            lambda content, *args: validated.append(content) or content,
+        )
+        frame = b"1\n\nHe 0 0 0\n"
+
+        response = client.post(
+            "/cluster/run_batch_analysis",
+            data=_batch_form_data(),
+            files=[
+                ("files", ("first.xyz", frame * 60, "chemical/x-xyz")),
+                ("files", ("second.xyz", frame * 41, "chemical/x-xyz")),
+            ],
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == (
+            f"A batch can contain at most {cluster_routes.MAX_BATCH_JOBS} structures"
+        )
+        assert validated == []
+        assert subprocess_calls == []
+
+    def test_run_batch_analysis_cancels_array_when_jobs_are_not_saved(
+        self, client, db, monkeypatch, tmp_path, user_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        cluster_routes, _backend_dir, cluster_dir = _configure_cluster(monkeypatch, tmp_path)
+        _mock_batch_upload_urls(monkeypatch, cluster_routes)
+        subprocess_calls = _mock_subprocess_run(
+            monkeypatch,
+            cluster_routes,
+            stdout=["5555\n", "cancelled\n"],
+        )
+
+        def fail_set_asset_tags(*args, **kwargs):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(cluster_routes, "set_asset_tags", fail_set_asset_tags)
+
+        response = client.post(
+            "/cluster/run_batch_analysis",
+            data=_batch_form_data(),
+            files=[("files", ("input.xyz", b"2\n\nH 0 0 0\nH 0 0 1\n", "chemical/x-xyz"))],
+        )
+
+        assert response.status_code == 500
+        assert response.json()["detail"] == "Failed to create jobs"
+        assert subprocess_calls[-1][0] == [
+            "ssh",
+            "cluster",
+            f"python3 {cluster_dir}/dispatch.py cancel 5555",
+        ]
+        assert db.query(Job).count() == 0
+
+    def test_run_batch_analysis_cancels_fake_array_when_jobs_are_not_saved(
+        self, client, db, monkeypatch, tmp_path, user_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(monkeypatch, tmp_path)
+        backend = FakeClusterBackend(run_seconds=10, clock=lambda: 0.0, sleep=lambda _seconds: None)
+        monkeypatch.setattr(cluster_routes, "CLUSTER_BACKEND", "fake")
+        monkeypatch.setattr(cluster_routes, "_fake_cluster_backend", backend)
+        _mock_batch_upload_urls(monkeypatch, cluster_routes)
+
+        def fail_set_asset_tags(*args, **kwargs):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(cluster_routes, "set_asset_tags", fail_set_asset_tags)
+
+        response = client.post(
+            "/cluster/run_batch_analysis",
+            data=_batch_form_data(),
+            files=[
+                ("files", ("a.xyz", b"2\n\nH 0 0 0\nH 0 0 1\n", "chemical/x-xyz")),
+                ("files", ("b.xyz", b"2\n\nH 0 0 0\nH 0 0 2\n", "chemical/x-xyz")),
+            ],
+        )
+
+        assert response.status_code == 500
+        assert backend.status("1") == "CANCELLED"
+        assert [backend.status(f"1_{task}") for task in range(2)] == ["CANCELLED", "CANCELLED"]
+        assert db.query(Job).count() == 0
 
 
 class TestClusterStatusAPI:
     def test_status_returns_cluster_state(self, client, monkeypatch, tmp_path):
-        cluster_routes, _backend_dir, cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -351,7 +688,7 @@ class TestClusterStatusAPI:
         ]
 
     def test_status_failure_returns_500(self, client, monkeypatch, tmp_path):
-        cluster_routes, _backend_dir, _cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -369,7 +706,7 @@ class TestClusterStatusAPI:
         assert response.json()["detail"] == "Failed to fetch status"
 
     def test_status_timeout_returns_500(self, client, monkeypatch, tmp_path):
-        cluster_routes, _backend_dir, _cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -405,7 +742,7 @@ class TestClusterStatusAPI:
     ):
         user_factory(user_sub="auth0|testuser")
         job = job_factory(user_sub="auth0|testuser")
-        cluster_routes, _backend_dir, cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -438,7 +775,7 @@ class TestClusterStatusAPI:
     ):
         user_factory(user_sub="auth0|testuser")
         job = job_factory(user_sub="auth0|testuser")
-        cluster_routes, _backend_dir, _cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -467,7 +804,7 @@ class TestClusterStatusAPI:
     ):
         user_factory(user_sub="auth0|testuser")
         job = job_factory(user_sub="auth0|testuser")
-        cluster_routes, _backend_dir, _cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -514,7 +851,7 @@ class TestClusterStatusAPI:
             is_public=False,
         )
         set_auth_user(make_auth0_payload(member.user_sub))
-        cluster_routes, _backend_dir, _cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -545,7 +882,7 @@ class TestClusterStatusAPI:
         Missing backend jobs return 404 before contacting the cluster.
         """
         user_factory(user_sub="auth0|testuser")
-        cluster_routes, _backend_dir, _cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -557,8 +894,104 @@ class TestClusterStatusAPI:
         assert response.json()["detail"] == "Job not found"
         assert subprocess_calls == []
 
+    @pytest.mark.parametrize(
+        "endpoint, command_name",
+        [
+            ("/cluster/result/{job_id}", "result"),
+            ("/cluster/error/{job_id}", "error"),
+        ],
+    )
+    def test_result_endpoints_cache_finished_job_output(
+        self,
+        client,
+        monkeypatch,
+        tmp_path,
+        user_factory,
+        job_factory,
+        endpoint,
+        command_name,
+    ):
+        """
+        Finished job output should be fetched once, then served from the cache
+        with an ETag that answers conditional requests with 304.
+        """
+        user_factory(user_sub="auth0|testuser")
+        job = job_factory(user_sub="auth0|testuser", status="completed")
+        job_id = str(job.job_id)
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
+            monkeypatch,
+            tmp_path,
+        )
+        subprocess_calls = _mock_subprocess_run(monkeypatch, cluster_routes, stdout=["payload\n"])
+
+        first = client.get(endpoint.format(job_id=job_id))
+        second = client.get(endpoint.format(job_id=job_id))
+        not_modified = client.get(
+            endpoint.format(job_id=job_id),
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        assert first.status_code == 200
+        assert first.json() == {"job_id": job_id, "output": "payload\n"}
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["etag"].startswith('W/"')
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"]
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert len(subprocess_calls) == 1
+        assert subprocess_calls[0][0][2].endswith(f"dispatch.py {command_name} {job_id}")
+
+    def test_result_endpoint_does_not_cache_unfinished_job_output(
+        self, client, monkeypatch, tmp_path, user_factory, job_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        job = job_factory(user_sub="auth0|testuser", status="running")
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
+            monkeypatch,
+            tmp_path,
+        )
+        subprocess_calls = _mock_subprocess_run(
+            monkeypatch,
+            cluster_routes,
+            stdout=["first\n", "second\n"],
+        )
+
+        first = client.get(f"/cluster/result/{job.job_id}")
+        second = client.get(f"/cluster/result/{job.job_id}")
+
+        assert first.json()["output"] == "first\n"
+        assert second.json()["output"] == "second\n"
+        assert "etag" not in second.headers
+        assert len(subprocess_calls) == 2
+
+    def test_result_endpoint_does_not_cache_missing_output(
+        self, client, monkeypatch, tmp_path, user_factory, job_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        job = job_factory(user_sub="auth0|testuser", status="failed")
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
+            monkeypatch,
+            tmp_path,
+        )
+        subprocess_calls = _mock_subprocess_run(
+            monkeypatch,
+            cluster_routes,
+            side_effects=[
+                cluster_routes.subprocess.CalledProcessError(returncode=1, cmd=["ssh"]),
+            ],
+            stdout=["late output\n"],
+        )
+
+        missing = client.get(f"/cluster/error/{job.job_id}")
+        found = client.get(f"/cluster/error/{job.job_id}")
+
+        assert missing.status_code == 404
+        assert found.json()["output"] == "late output\n"
+        assert len(subprocess_calls) == 2
+
     def test_cancel_returns_success_flag(self, client, monkeypatch, tmp_path):
-        cluster_routes, _backend_dir, cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -576,7 +1009,7 @@ class TestClusterStatusAPI:
         ]
 
     def test_cancel_failure_returns_500(self, client, monkeypatch, tmp_path):
-        cluster_routes, _backend_dir, _cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -594,7 +1027,7 @@ class TestClusterStatusAPI:
         assert response.json()["detail"] == "Failed to cancel the job"
 
     def test_cancel_timeout_returns_500(self, client, monkeypatch, tmp_path):
-        cluster_routes, _backend_dir, _cluster_dir, _cleanup_calls = _configure_cluster(
+        cluster_routes, _backend_dir, _cluster_dir = _configure_cluster(
             monkeypatch,
             tmp_path,
         )
@@ -0,0 +1,133 @@
+import pytest
+
+from cluster.backends import ClusterBackend, ClusterCommandError, FakeClusterBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _fake_backend(clock, **kwargs):
+    return FakeClusterBackend(clock=clock, sleep=clock.sleep, seed=0, **kwargs)
+
+
+class TestFakeClusterBackend:
+    def test_jobs_queue_for_free_slots_and_finish_in_order(self):
+        clock = FakeClock()
+        backend = _fake_backend(clock, run_seconds=10, slots=1)
+
+        first = backend.submit("/jobs/a", {"input.xyz": b"a"}, ["submit"], ["job-a"]).strip()
+        second = backend.submit("/jobs/b", {"input.xyz": b"b"}, ["submit"], ["job-b"]).strip()
+
+        assert (first, second) == ("1", "2")
+        assert backend.status(first) == "RUNNING"
+        assert backend.status(second) == "PENDING"
+        clock.now = 10
+        assert backend.status(first) == "COMPLETED"
+        assert backend.status(second) == "RUNNING"
+        clock.now = 20
+        assert backend.status(second) == "COMPLETED"
+
+    def test_array_submission_creates_one_task_per_job(self):
+        clock = FakeClock()
+        backend = _fake_backend(clock, run_seconds=1, slots=2)
+        job_files = {
+            "batch.txt": b"job-a\njob-b\n",
+            "job-a/input.xyz": b"a",
+            "job-b/input.xyz": b"b",
+        }
+
+        array_id = backend.submit("/jobs", job_files, ["submit-array"], ["job-a", "job-b"]).strip()
+
+        assert backend.status(f"{array_id}_0") == "RUNNING"
+        assert backend.status(f"{array_id}_1") == "RUNNING"
+        assert backend._jobs_by_job_id["job-b"].files == {"input.xyz": b"b"}
+
+    def test_bare_array_id_covers_all_tasks(self):
+        clock = FakeClock()
+        backend = _fake_backend(clock, run_seconds=5, slots=1)
+        array_id = backend.submit("/jobs", {}, ["submit-array"], ["job-a", "job-b"]).strip()
+
+        assert backend.status(array_id) == "RUNNING"
+        clock.now = 5
+        assert backend.status(array_id) == "RUNNING"
+        assert backend.cancel(array_id) == "True"
+        assert backend.status(f"{array_id}_0") == "COMPLETED"
+        assert backend.status(f"{array_id}_1") == "CANCELLED"
+        assert backend.status(array_id) == "CANCELLED"
+        assert backend.cancel(array_id) == "False"
+
+    def test_failure_rate_marks_jobs_failed_with_error_output(self):
+        clock = FakeClock()
+        backend = _fake_backend(clock, run_seconds=1, failure_rate=1.0)
+        slurm_id = backend.submit("/jobs/a", {}, ["submit"], ["job-a"]).strip()
+
+        with pytest.raises(ClusterCommandError):
+            backend.output("job-a", "result")
+        clock.now = 1
+
+        assert backend.status(slurm_id) == "FAILED"
+        assert backend.output("job-a", "error") == "Simulated failure\n"
+
+    def test_full_queue_rejects_submission(self):
+        clock = FakeClock()
+        backend = _fake_backend(clock, run_seconds=5, queue_depth=2)
+        backend.submit("/jobs/a", {}, ["submit"], ["job-a"])
+
+        with pytest.raises(ClusterCommandError, match="Queue is full"):
+            backend.submit("/jobs", {}, ["submit-array"], ["job-b", "job-c"])
+        clock.now = 5
+        backend.submit("/jobs", {}, ["submit-array"], ["job-b", "job-c"])
+
+    def test_cancel_stops_unfinished_jobs_only(self):
+        clock = FakeClock()
+        backend = _fake_backend(clock, run_seconds=5)
+        running = backend.submit("/jobs/a", {}, ["submit"], ["job-a"]).strip()
+
+        assert backend.cancel(running) == "True"
+        assert backend.status(running) == "CANCELLED"
+        assert backend.cancel(running) == "False"
+        with pytest.raises(ClusterCommandError, match="Unknown job"):
+            backend.cancel("999")
+
+    def test_upload_results_records_finished_jobs_only(self):
+        clock = FakeClock()
+        backend = _fake_backend(clock, run_seconds=5)
+        backend.submit("/jobs/a", {}, ["submit"], ["job-a"])
+
+        with pytest.raises(ClusterCommandError, match="has not finished"):
+            backend.upload_results("job-a", "energy", True)
+        clock.now = 5
+        backend.upload_results("job-a", "energy", True)
+
+        assert backend.uploaded_job_ids == ["job-a"]
+        with pytest.raises(ClusterCommandError, match="Unknown job"):
+            backend.upload_results("job-b", "energy", True)
+
+    def test_every_call_waits_for_configured_latency(self):
+        clock = FakeClock()
+        backend = _fake_backend(clock, latency=0.25, run_seconds=1)
+
+        slurm_id = backend.submit("/jobs/a", {}, ["submit"], ["job-a"]).strip()
+        backend.status(slurm_id)
+
+        assert clock.sleeps == [0.25, 0.25]
+        assert backend._jobs_by_slurm_id[slurm_id].submitted_at == 0.25
+
+
+def test_backend_missing_an_operation_cannot_be_created():
+    class StatusOnlyBackend(ClusterBackend):
+        def status(self, slurm_id):
+            return "RUNNING"
+
+    with pytest.raises(TypeError, match="submit"):
+        StatusOnlyBackend()
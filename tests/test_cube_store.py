@@ -0,0 +1,147 @@
+import gzip
+
+import numpy as np
+import pytest
+
+from cube_store import (
+    MIN_LEVEL_POINTS,
+    Cube,
+    CubeParseError,
+    build_levels,
+    parse_cube,
+    write_cube,
+)
+
+
+def _cube_text(values, atom_count=1, orbitals=None, count_sign=1):
+    nx, ny, nz = values.shape
+    # Multi-orbital cubes list every orbital's value for a point together.
+    points_z = nz // len(orbitals) if orbitals else nz
+    header = [
+        "esp cube",
+        "generated for tests",
+        f"{atom_count:5d} -1.0 -2.0 -3.0",
+        f"{count_sign * nx:5d} 0.5 0.0 0.0",
+        f"{count_sign * ny:5d} 0.0 0.5 0.0",
+        f"{count_sign * points_z:5d} 0.0 0.0 0.5",
+    ]
+    header += ["    8 8.0 0.0 0.0 0.0"] * abs(atom_count)
+    if orbitals is not None:
+        header.append(" ".join(str(n) for n in [len(orbitals), *orbitals]))
+    lines = []
+    for row in values.reshape(-1, nz):
+        for start in range(0, nz, 6):
+            lines.append(" ".join(f"{value:13.5E}" for value in row[start:start + 6]))
+    return ("\n".join(header + lines) + "\n").encode()
+
+
+class TestParseCube:
+    def test_parses_header_atoms_and_grid(self):
+        values = np.arange(2 * 3 * 7, dtype=np.float32).reshape(2, 3, 7)
+
+        parsed = parse_cube(_cube_text(values))
+
+        assert parsed.comments == ["esp cube", "generated for tests"]
+        assert parsed.origin == [-1.0, -2.0, -3.0]
+        assert parsed.axes == [[0.5, 0.0, 0.0], [0.0, 0.5, 0.0], [0.0, 0.0, 0.5]]
+        assert parsed.atoms == [[8.0, 8.0, 0.0, 0.0, 0.0]]
+        assert parsed.units == "bohr"
+        np.testing.assert_array_equal(parsed.values, values)
+
+    def test_negative_voxel_counts_mean_angstrom(self):
+        values = np.arange(2 * 3 * 4, dtype=np.float32).reshape(2, 3, 4)
+
+        parsed = parse_cube(_cube_text(values, count_sign=-1))
+
+        assert parsed.units == "angstrom"
+        assert parsed.axes == [[0.5, 0.0, 0.0], [0.0, 0.5, 0.0], [0.0, 0.0, 0.5]]
+        np.testing.assert_array_equal(parsed.values, values)
+
+    def test_keeps_first_orbital_of_multi_orbital_cube(self):
+        values = np.arange(2 * 2 * 4, dtype=np.float32).reshape(2, 2, 4)
+
+        parsed = parse_cube(_cube_text(values, atom_count=-1, orbitals=[5, 6]))
+
+        np.testing.assert_array_equal(parsed.values, values[..., ::2])
+
+    def test_rejects_truncated_grid(self):
+        content = _cube_text(np.ones((2, 2, 2), dtype=np.float32))
+
+        with pytest.raises(CubeParseError, match="Expected 8 grid values"):
+            parse_cube(content.rsplit(b"\n", 2)[0])
+
+    def test_rejects_non_numeric_grid_values(self):
+        content = _cube_text(np.ones((2, 2, 2), dtype=np.float32))
+
+        with pytest.raises(CubeParseError, match="must be numbers"):
+            parse_cube(content.replace(b"1.00000E+00", b"x", 1))
+
+    def test_rejects_malformed_header(self):
+        with pytest.raises(CubeParseError):
+            parse_cube(b"not\na cube\n")
+
+
+class TestCubeLevels:
+    def test_levels_halve_until_small(self):
+        levels = build_levels(np.ones((70, 33, 20), dtype=np.float32))
+
+        assert [level.shape for level in levels] == [
+            (70, 33, 20),
+            (35, 17, 10),
+            (18, 9, 5),
+            (9, 5, 3),
+        ]
+        assert max(levels[-1].shape) <= MIN_LEVEL_POINTS
+
+    def test_levels_average_blocks(self):
+        values = np.arange(64, dtype=np.float32).reshape(4, 4, 4) * 0 + 1
+        values[:2, :2, :2] = 9
+
+        levels = build_levels(np.pad(values, ((0, 14), (0, 0), (0, 0))))
+
+        assert levels[1][0, 0, 0] == 9
+        assert levels[1][1, 0, 0] == 1
+
+
+class TestCube:
+    def test_stored_cube_serves_levels_and_byte_ranges(self, tmp_path):
+        values = np.random.default_rng(0).normal(size=(20, 4, 6)).astype(np.float32)
+        write_cube(parse_cube(_cube_text(values)), tmp_path / "job")
+
+        cube = Cube(tmp_path / "job")
+        stored = cube.values(0)
+
+        assert isinstance(stored, np.memmap)
+        assert cube.level_count == 2
+        assert cube.meta["levels"][1] == {
+            "level": 1,
+            "shape": [10, 2, 3],
+            "origin": [-0.75, -1.75, -2.75],
+            "axes": [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        }
+        full = stored.astype("<f4").tobytes()
+        assert cube.level_size(0, "float32") == len(full)
+        assert cube.level_bytes(0, "float32", 0, len(full)) == full
+        assert cube.level_bytes(0, "float32", 5, 17) == full[5:17]
+        half = stored.astype("<f2").tobytes()
+        assert cube.level_bytes(0, "float16", 3, 9) == half[3:9]
+
+    def test_stored_cube_keeps_compressed_levels(self, tmp_path):
+        values = np.random.default_rng(0).normal(size=(20, 4, 6)).astype(np.float32)
+        write_cube(parse_cube(_cube_text(values, count_sign=-1)), tmp_path / "job")
+
+        cube = Cube(tmp_path / "job")
+
+        assert cube.meta["units"] == "angstrom"
+        for level in range(cube.level_count):
+            for dtype in ("float32", "float16"):
+                size = cube.level_size(level, dtype)
+                assert gzip.decompress(cube.level_gzip(level, dtype)) == (
+                    cube.level_bytes(level, dtype, 0, size)
+                )
+
+    def test_cube_stored_without_compressed_levels_has_none(self, tmp_path):
+        write_cube(parse_cube(_cube_text(np.ones((2, 2, 2), dtype=np.float32))), tmp_path / "job")
+        (tmp_path / "job" / "level_0.float32.gz").unlink()
+
+        assert Cube(tmp_path / "job").level_gzip(0, "float32") is None
@@ -15,6 +15,12 @@ from conftest import TestingSessionLocal, engine
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 MIGRATION_PATH = PROJECT_ROOT / "migrations" / "001_pr14_database_changes.sql"
+FINGERPRINT_MIGRATION_PATH = PROJECT_ROOT / "migrations" / "002_structure_fingerprints.sql"
+COMPOSITION_MIGRATION_PATH = PROJECT_ROOT / "migrations" / "003_structure_composition.sql"
+THUMBNAIL_MIGRATION_PATH = PROJECT_ROOT / "migrations" / "004_structure_thumbnails.sql"
+JOB_FILTER_MIGRATION_PATH = PROJECT_ROOT / "migrations" / "005_job_list_filters.sql"
+SEARCH_MIGRATION_PATH = PROJECT_ROOT / "migrations" / "006_asset_search.sql"
+TAG_INDEX_MIGRATION_PATH = PROJECT_ROOT / "migrations" / "007_tag_indexes.sql"
 LEGACY_SCHEMA_PATH = PROJECT_ROOT / "tests" / "fixtures" / "pre_pr14_schema.sql"
 DUMP_PATH = PROJECT_ROOT / "molmaker.sql"
 
@@ -483,11 +489,129 @@ def test_molmaker_dump_restores_schema_and_data(db):
         session.close()
 
 
+def test_fingerprint_migration_adds_indexed_columns_and_can_run_twice(db):
+    _reset_public_schema(db)
+    _run_sql_file(LEGACY_SCHEMA_PATH)
+    _run_sql_file(MIGRATION_PATH)
+    _run_sql_file(FINGERPRINT_MIGRATION_PATH)
+    _run_sql_file(FINGERPRINT_MIGRATION_PATH)
+
+    session = TestingSessionLocal()
+    try:
+        assert {"fingerprint", "near_fingerprint"} <= _column_names(session, "structures")
+        assert {
+            "idx_structures_fingerprint",
+            "idx_structures_near_fingerprint",
+        } <= _index_names(session)
+    finally:
+        session.close()
+
+
+def test_composition_migration_adds_indexed_columns_and_can_run_twice(db):
+    _reset_public_schema(db)
+    _run_sql_file(LEGACY_SCHEMA_PATH)
+    _run_sql_file(MIGRATION_PATH)
+    _run_sql_file(FINGERPRINT_MIGRATION_PATH)
+    _run_sql_file(COMPOSITION_MIGRATION_PATH)
+    _run_sql_file(COMPOSITION_MIGRATION_PATH)
+
+    session = TestingSessionLocal()
+    try:
+        assert {"composition", "heavy_atom_count"} <= _column_names(session, "structures")
+        assert {
+            "idx_structures_composition",
+            "idx_structures_heavy_atom_count",
+        } <= _index_names(session)
+    finally:
+        session.close()
+
+
+def test_thumbnail_migration_adds_content_hash_and_can_run_twice(db):
+    _reset_public_schema(db)
+    _run_sql_file(LEGACY_SCHEMA_PATH)
+    _run_sql_file(MIGRATION_PATH)
+    _run_sql_file(FINGERPRINT_MIGRATION_PATH)
+    _run_sql_file(COMPOSITION_MIGRATION_PATH)
+    _run_sql_file(THUMBNAIL_MIGRATION_PATH)
+    _run_sql_file(THUMBNAIL_MIGRATION_PATH)
+
+    session = TestingSessionLocal()
+    try:
+        assert "content_hash" in _column_names(session, "structures")
+    finally:
+        session.close()
+
+
+def test_job_filter_migration_adds_partial_indexes_and_can_run_twice(db):
+    _reset_public_schema(db)
+    _run_sql_file(LEGACY_SCHEMA_PATH)
+    _run_sql_file(MIGRATION_PATH)
+    _run_sql_file(FINGERPRINT_MIGRATION_PATH)
+    _run_sql_file(COMPOSITION_MIGRATION_PATH)
+    _run_sql_file(THUMBNAIL_MIGRATION_PATH)
+    _run_sql_file(JOB_FILTER_MIGRATION_PATH)
+    _run_sql_file(JOB_FILTER_MIGRATION_PATH)
+
+    session = TestingSessionLocal()
+    try:
+        assert {
+            "idx_jobs_user_status_active",
+            "idx_jobs_group_status_active",
+            "idx_jobs_status_active",
+        } <= _index_names(session)
+    finally:
+        session.close()
+
+
+def test_search_migration_adds_indexed_vectors_and_can_run_twice(db):
+    _reset_public_schema(db)
+    _run_sql_file(LEGACY_SCHEMA_PATH)
+    _run_sql_file(MIGRATION_PATH)
+    _run_sql_file(FINGERPRINT_MIGRATION_PATH)
+    _run_sql_file(COMPOSITION_MIGRATION_PATH)
+    _run_sql_file(THUMBNAIL_MIGRATION_PATH)
+    _run_sql_file(JOB_FILTER_MIGRATION_PATH)
+    _run_sql_file(SEARCH_MIGRATION_PATH)
+    _run_sql_file(SEARCH_MIGRATION_PATH)
+
+    session = TestingSessionLocal()
+    try:
+        assert "search_vector" in _column_names(session, "jobs")
+        assert "search_vector" in _column_names(session, "structures")
+        assert {"idx_jobs_search", "idx_structures_search"} <= _index_names(session)
+    finally:
+        session.close()
+
+
+def test_tag_index_migration_adds_indexes_and_can_run_twice(db):
+    _reset_public_schema(db)
+    _run_sql_file(LEGACY_SCHEMA_PATH)
+    _run_sql_file(MIGRATION_PATH)
+    _run_sql_file(TAG_INDEX_MIGRATION_PATH)
+    _run_sql_file(TAG_INDEX_MIGRATION_PATH)
+
+    session = TestingSessionLocal()
+    try:
+        assert {
+            "idx_jobs_tags_tag_id",
+            "idx_structures_tags_tag_id",
+            "idx_tags_name",
+        } <= _index_names(session)
+    finally:
+        session.close()
+
+
 def test_migration_is_safe_after_restoring_molmaker_dump(db):
     _restore_dump(db)
     state_before_migration = _database_state()
 
     _run_sql_file(MIGRATION_PATH)
+    _run_sql_file(FINGERPRINT_MIGRATION_PATH)
+    _run_sql_file(COMPOSITION_MIGRATION_PATH)
+    _run_sql_file(THUMBNAIL_MIGRATION_PATH)
+    _run_sql_file(JOB_FILTER_MIGRATION_PATH)
+    _run_sql_file(SEARCH_MIGRATION_PATH)
+    _run_sql_file(TAG_INDEX_MIGRATION_PATH)
 
     assert _database_state() == state_before_migration
 
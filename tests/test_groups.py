@@ -578,6 +578,36 @@ class TestGroupsAPI:
         assert len(response.json()) == 5
         assert len(sql_statements) == expected_query_count
 
+    def test_group_jobs_with_fields_skip_relationship_queries(
+        self, client, sql_statements, group_factory, user_factory, job_factory
+    ):
+        group = group_factory()
+        user_factory(group=group, user_sub="auth0|testuser", role="group_admin")
+        owner = user_factory(group=group, user_sub="auth0|owner")
+        job = job_factory(user_sub=owner.user_sub, group_id=group.group_id, status="queued")
+        sql_statements.clear()
+
+        response = client.get("/group/jobs", params={"fields": "status,user_sub"})
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"job_id": str(job.job_id), "status": "queued", "user_sub": owner.user_sub}
+        ]
+        # Two fewer than the full list: no tag or structure loading.
+        assert len(sql_statements) == 3
+
+    def test_group_jobs_filter_by_status(self, client, group_factory, user_factory, job_factory):
+        group = group_factory()
+        user_factory(group=group, user_sub="auth0|testuser", role="group_admin")
+        owner = user_factory(group=group, user_sub="auth0|owner")
+        running = job_factory(user_sub=owner.user_sub, group_id=group.group_id, status="running")
+        job_factory(user_sub=owner.user_sub, group_id=group.group_id, status="completed")
+
+        response = client.get("/group/jobs", params={"status": "running"})
+
+        assert response.status_code == 200
+        assert [job["job_id"] for job in response.json()] == [str(running.job_id)]
+
     def test_group_admin_can_list_all_structures_with_persisted_group_id(
         self, client, group_factory, user_factory, structure_factory
     ):
@@ -1907,3 +1937,86 @@ class TestGroupsAPI:
         assert group_admin.role == "group_admin"
         assert member.group_id == group.group_id
         assert member.role == "member"
+
+
+class TestBulkOwnershipTransferAPI:
+    @pytest.mark.parametrize("asset_kind", ["job", "structure"])
+    def test_group_admin_transfers_many_assets_in_one_update(
+        self,
+        asset_kind,
+        client,
+        db,
+        group_factory,
+        user_factory,
+        job_factory,
+        structure_factory,
+        sql_statements,
+    ):
+        """
+        PATCH /group/jobs and /group/structures should apply every allowed
+        transfer with one UPDATE and report the refused ones per id.
+        """
+        group = group_factory()
+        other_group = group_factory()
+        user_factory(group=group, user_sub="auth0|testuser", role="group_admin")
+        member = user_factory(group=group, user_sub="auth0|member")
+        outsider = user_factory(group=other_group, user_sub="auth0|outsider")
+        owned = [
+            _create_asset(
+                asset_kind,
+                job_factory,
+                structure_factory,
+                user_sub=member.user_sub,
+                group_id=group.group_id,
+            )
+            for _ in range(3)
+        ]
+        foreign = _create_asset(
+            asset_kind,
+            job_factory,
+            structure_factory,
+            user_sub=outsider.user_sub,
+            group_id=other_group.group_id,
+        )
+        id_field = f"{asset_kind}_id"
+        asset_ids = [str(getattr(asset, id_field)) for asset in owned + [foreign]]
+        sql_statements.clear()
+
+        response = client.patch(
+            f"/group/{asset_kind}s",
+            json={
+                f"{asset_kind}_ids": asset_ids + [str(uuid.uuid4())],
+                "ownership": "group",
+                "group_id": str(group.group_id),
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status_code"] for result in results] == [200, 200, 200, 403, 404]
+        assert [result[id_field] for result in results[:4]] == asset_ids
+        updates = [s for s in sql_statements if s.startswith("UPDATE")]
+        assert len(updates) == 1
+        db.expire_all()
+        for asset in owned:
+            db.refresh(asset)
+            assert (asset.user_sub, asset.group_id) == (None, group.group_id)
+        db.refresh(foreign)
+        assert foreign.user_sub == outsider.user_sub
+
+    def test_invalid_bulk_transfer_request_fails_as_a_whole(
+        self, client, db, group_factory, user_factory, job_factory
+    ):
+        group = group_factory()
+        user_factory(group=group, user_sub="auth0|testuser", role="group_admin")
+        job = job_factory(user_sub="auth0|testuser", group_id=group.group_id)
+
+        response = client.patch(
+            "/group/jobs",
+            json={"job_ids": [str(job.job_id)], "ownership": "group"},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "group_id is required for group ownership"
+        db.refresh(job)
+        assert job.user_sub == "auth0|testuser"
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+from ir_spectrum import (
+    JCAMPParseError,
+    Spectrum,
+    parse_jcamp_spectrum,
+    read_spectrum,
+    resample_spectrum,
+    spectrum_grid,
+    spectrum_range,
+    write_spectrum,
+)
+
+XYDATA = b"""##TITLE=water frequencies
+##JCAMP-DX=4.24
+##DATA TYPE=INFRARED SPECTRUM
+##XUNITS=1/CM
+##YUNITS=ABSORBANCE
+##XFACTOR=1.0
+##YFACTOR=0.5
+##FIRSTX=400
+##LASTX=410
+##NPOINTS=6
+##XYDATA=(X++(Y..Y))
+400 0 2 4 $$ first line
+406 6 8 10
+##END=
+"""
+
+PEAK_TABLE = b"""##TITLE=computed
+##XUNITS=1/CM
+##YUNITS=KM/MOL
+##PEAK TABLE=(XY..XY)
+3756.1, 40.2 1595.3, 70.0
+3657.0, 2.5
+##END=
+"""
+
+
+def _spectrum(kind, x, y):
+    return Spectrum(
+        kind=kind,
+        title="",
+        x_units="1/CM",
+        y_units="KM/MOL",
+        x=np.array(x, dtype=float),
+        y=np.array(y, dtype=float),
+    )
+
+
+class TestParseJcampSpectrum:
+    def test_parses_xydata_with_factors(self):
+        spectrum = parse_jcamp_spectrum(XYDATA)
+
+        assert spectrum.kind == "continuous"
+        assert spectrum.title == "water frequencies"
+        assert spectrum.x_units == "1/CM"
+        assert spectrum.y_units == "ABSORBANCE"
+        np.testing.assert_allclose(spectrum.x, [400, 402, 404, 406, 408, 410])
+        np.testing.assert_allclose(spectrum.y, [0, 1, 2, 3, 4, 5])
+
+    def test_parses_peak_table_sorted_by_x(self):
+        spectrum = parse_jcamp_spectrum(PEAK_TABLE)
+
+        assert spectrum.kind == "peaks"
+        np.testing.assert_allclose(spectrum.x, [1595.3, 3657.0, 3756.1])
+        np.testing.assert_allclose(spectrum.y, [70.0, 2.5, 40.2])
+
+    def test_rejects_wrong_point_count(self):
+        with pytest.raises(JCAMPParseError, match="Expected 6 points, found 3"):
+            parse_jcamp_spectrum(XYDATA.replace(b"406 6 8 10\n", b""))
+
+    def test_rejects_compressed_data(self):
+        with pytest.raises(JCAMPParseError, match="ASDF"):
+            parse_jcamp_spectrum(XYDATA.replace(b"406 6 8 10", b"406@A1J"))
+
+    @pytest.mark.parametrize("line", [b"406E", b"406 E e E", b"406e5e"])
+    def test_rejects_compressed_data_using_only_exponent_letters(self, line):
+        with pytest.raises(JCAMPParseError, match="ASDF"):
+            parse_jcamp_spectrum(XYDATA.replace(b"406 6 8 10", line))
+
+    def test_accepts_exponents_and_packed_numbers(self):
+        spectrum = parse_jcamp_spectrum(XYDATA.replace(b"406 6 8 10", b"4.06E2 6e0+8+1.0E1"))
+
+        np.testing.assert_allclose(spectrum.y, [0, 1, 2, 3, 4, 5])
+
+    def test_rejects_content_without_data(self):
+        with pytest.raises(JCAMPParseError, match="No ##XYDATA"):
+            parse_jcamp_spectrum(b"##TITLE=empty\n##END=\n")
+
+
+class TestResampleSpectrum:
+    def test_grid_includes_both_ends(self):
+        np.testing.assert_allclose(spectrum_grid(400, 410, 5), [400, 405, 410])
+
+    def test_range_covers_every_spectrum(self):
+        spectra = [
+            _spectrum("peaks", [500, 900], [1, 1]),
+            _spectrum("peaks", [450, 700], [1, 1]),
+        ]
+
+        assert spectrum_range(spectra) == (450.0, 900.0)
+
+    def test_sums_peaks_in_each_bin(self):
+        spectrum = _spectrum("peaks", [99, 101, 110], [1, 2, 4])
+
+        resampled = resample_spectrum(spectrum, spectrum_grid(90, 110, 10), 10)
+
+        np.testing.assert_allclose(resampled, [0, 3, 4])
+
+    def test_averages_dense_curves_and_interpolates_sparse_ones(self):
+        spectrum = _spectrum("continuous", [0, 1, 2, 3, 10], [0, 2, 4, 6, 20])
+
+        coarse = resample_spectrum(spectrum, spectrum_grid(0, 2, 2), 2)
+        fine = resample_spectrum(spectrum, spectrum_grid(6, 12, 2), 2)
+
+        np.testing.assert_allclose(coarse, [0, 4])
+        np.testing.assert_allclose(fine, [12, 16, 20, 0])
+
+
+def test_written_spectrum_reads_back(tmp_path):
+    spectrum = parse_jcamp_spectrum(PEAK_TABLE)
+
+    write_spectrum(spectrum, tmp_path / "job")
+    loaded = read_spectrum(tmp_path / "job")
+
+    assert (loaded.kind, loaded.title, loaded.y_units) == ("peaks", "computed", "KM/MOL")
+    np.testing.assert_array_equal(loaded.x, spectrum.x)
+    np.testing.assert_array_equal(loaded.y, spectrum.y)
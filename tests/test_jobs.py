@@ -3,17 +3,21 @@ from types import SimpleNamespace
 import uuid
 
 import pytest
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import Session
 
 from conftest import make_auth0_payload
 from models import Job, Tags
-from asset_service import serialize_structure
+from asset_service import serialize_structure, tagged_asset_criterion
+from utils import MAX_BULK_ASSET_UPDATES
 
 
 def _mock_result_upload(monkeypatch, side_effect=None, returncode=0):
     """
     Configure the jobs route to use a fake cluster work dir and subprocess runner.
     """
-    import jobs.routes as jobs_routes
+    import cluster.backends as cluster_backends
+    import cluster.routes as cluster_routes
 
     calls = []
 
@@ -23,8 +27,8 @@ def _mock_result_upload(monkeypatch, side_effect=None, returncode=0):
             raise side_effect
         return SimpleNamespace(returncode=returncode)
 
-    monkeypatch.setattr(jobs_routes, "CLUSTER_WORK_DIR", "/cluster/work")
-    monkeypatch.setattr(jobs_routes.subprocess, "run", fake_run)
+    monkeypatch.setattr(cluster_routes, "CLUSTER_WORK_DIR", "/cluster/work")
+    monkeypatch.setattr(cluster_backends.subprocess, "run", fake_run)
     return calls
 
 
@@ -44,6 +48,9 @@ def _job_form_data(job_id=None, **overrides):
     return data
 
 
+WATER_XYZ = b"3\nwater\nO 0 0 0\nH 0 0 0.96\nH 0.93 0 -0.24\n"
+
+
 def _upload_file(filename="input.xyz", content=b"2\n\nH 0 0 0\nH 0 0 1\n"):
     return {"file": (filename, content, "chemical/x-xyz")}
 
@@ -178,6 +185,160 @@ class TestJobsAPI:
         assert result[0]["tags"] == ["baseline"]
         assert result[0]["structures"] == [serialize_structure(structure, include_tags=False)]
 
+    def test_get_jobs_uses_fixed_number_of_queries(
+        self, client, sql_statements, user_factory, job_factory, structure_factory, tag_factory
+    ):
+        """Tags come with the job rows and structures from one batched query."""
+        user = user_factory(user_sub="auth0|testuser")
+        for index in range(5):
+            job_factory(
+                user_sub=user.user_sub,
+                structures=[structure_factory(user_sub=user.user_sub)],
+                tags=[tag_factory(user_sub=user.user_sub, name=f"tag {index}")],
+            )
+        sql_statements.clear()
+
+        response = client.get("/jobs/")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+        assert len(sql_statements) == 2
+
+    def test_get_jobs_returns_only_requested_fields(
+        self, client, sql_statements, user_factory, job_factory, structure_factory, tag_factory
+    ):
+        """fields= reads only those columns and skips tags and structures."""
+        user = user_factory(user_sub="auth0|testuser")
+        job = job_factory(
+            user_sub=user.user_sub,
+            job_name="polled",
+            status="running",
+            structures=[structure_factory(user_sub=user.user_sub)],
+            tags=[tag_factory(user_sub=user.user_sub, name="baseline")],
+        )
+        sql_statements.clear()
+
+        response = client.get("/jobs/", params={"fields": "status,job_name"})
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"job_id": str(job.job_id), "status": "running", "job_name": "polled"}
+        ]
+        assert len(sql_statements) == 1
+        assert "jobs_tags" not in sql_statements[0]
+        assert "filename" not in sql_statements[0]
+
+    def test_get_jobs_includes_requested_collections_with_fields(
+        self, client, user_factory, job_factory, tag_factory
+    ):
+        user = user_factory(user_sub="auth0|testuser")
+        job_factory(
+            user_sub=user.user_sub,
+            tags=[tag_factory(user_sub=user.user_sub, name="baseline")],
+        )
+
+        response = client.get("/jobs/", params={"fields": "status", "include": "tags"})
+
+        assert response.status_code == 200
+        assert set(response.json()[0]) == {"job_id", "status", "tags"}
+        assert response.json()[0]["tags"] == ["baseline"]
+
+    @pytest.mark.parametrize(
+        "params,detail",
+        [
+            ({"fields": "status,password"}, "Unknown field: password"),
+            ({"include": "owners"}, "Unknown include: owners"),
+        ],
+    )
+    def test_get_jobs_rejects_unknown_fields(self, client, user_factory, params, detail):
+        user_factory(user_sub="auth0|testuser")
+
+        response = client.get("/jobs/", params=params)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == detail
+
+    def test_get_job_by_id_returns_requested_fields(
+        self, client, user_factory, job_factory, structure_factory
+    ):
+        user = user_factory(user_sub="auth0|testuser")
+        job = job_factory(
+            user_sub=user.user_sub,
+            status="completed",
+            structures=[structure_factory(user_sub=user.user_sub)],
+        )
+
+        response = client.get(
+            f"/jobs/{job.job_id}",
+            params={"fields": "status", "include": "structures"},
+        )
+
+        assert response.status_code == 200
+        result = response.json()
+        assert set(result) == {"job_id", "status", "structures"}
+        assert len(result["structures"]) == 1
+
+    def test_get_jobs_filters_in_sql(self, client, user_factory, job_factory, tag_factory):
+        user = user_factory(user_sub="auth0|testuser")
+        baseline = tag_factory(user_sub=user.user_sub, name="baseline")
+        running = job_factory(user_sub=user.user_sub, status="running", method="hf")
+        job_factory(user_sub=user.user_sub, status="running", method="mp2")
+        pending = job_factory(
+            user_sub=user.user_sub,
+            status="pending",
+            method="hf",
+            tags=[baseline],
+        )
+        job_factory(user_sub=user.user_sub, status="completed", method="hf")
+
+        def listed(params):
+            response = client.get("/jobs/", params=params)
+            assert response.status_code == 200
+            return {job["job_id"] for job in response.json()}
+
+        assert listed({"status": ["running", "pending"], "method": "hf"}) == {
+            str(running.job_id),
+            str(pending.job_id),
+        }
+        assert listed({"tag": "baseline"}) == {str(pending.job_id)}
+        assert listed({"status": "failed"}) == set()
+
+    def test_get_jobs_sorts_by_requested_field(self, client, user_factory, job_factory):
+        user = user_factory(user_sub="auth0|testuser")
+        finished = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        job_factory(user_sub=user.user_sub, job_name="b", completed_at=finished)
+        job_factory(user_sub=user.user_sub, job_name="a", completed_at=None)
+        job_factory(
+            user_sub=user.user_sub,
+            job_name="c",
+            completed_at=finished + timedelta(hours=1),
+        )
+
+        by_name = client.get("/jobs/", params={"sort": "job_name", "fields": "job_name"})
+        by_completion = client.get(
+            "/jobs/",
+            params={"sort": "-completed_at", "fields": "job_name"},
+        )
+
+        assert [job["job_name"] for job in by_name.json()] == ["a", "b", "c"]
+        assert [job["job_name"] for job in by_completion.json()] == ["c", "b", "a"]
+
+    @pytest.mark.parametrize(
+        "params,detail",
+        [
+            ({"status": "sleeping"}, "Unknown status: sleeping"),
+            ({"calculation_type": "md"}, "Unknown calculation_type: md"),
+            ({"sort": "-filename"}, "Unknown sort field: filename"),
+        ],
+    )
+    def test_get_jobs_rejects_unknown_filters(self, client, user_factory, params, detail):
+        user_factory(user_sub="auth0|testuser")
+
+        response = client.get("/jobs/", params=params)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == detail
+
     def test_get_job_by_id_returns_owned_job(self, client, group_factory, user_factory, job_factory):
         """
         GET /jobs/{job_id} should return a job owned by the authenticated user.
@@ -646,9 +807,9 @@ class TestJobsAPI:
         """
         Completed/failed updates should not crash when result upload is not configured.
         """
-        import jobs.routes as jobs_routes
+        import cluster.routes as cluster_routes
 
-        monkeypatch.setattr(jobs_routes, "CLUSTER_WORK_DIR", None)
+        monkeypatch.setattr(cluster_routes, "CLUSTER_WORK_DIR", None)
         group = group_factory()
         user = user_factory(group=group, user_sub="auth0|testuser")
         job = job_factory(user_sub=user.user_sub, status="pending", is_uploaded=False)
@@ -818,6 +979,148 @@ class TestJobsAPI:
         assert response.status_code == 404
         assert response.json()["detail"] == "Job not found"
 
+    def test_bulk_status_update_applies_all_updates_in_one_statement(
+        self, client, db, monkeypatch, sql_statements, user_factory, job_factory
+    ):
+        """
+        PATCH /jobs/status should load jobs once, batch the UPDATE, and upload results.
+        """
+        calls = _mock_result_upload(monkeypatch, returncode=0)
+        user = user_factory(user_sub="auth0|testuser")
+        running = job_factory(user_sub=user.user_sub, status="pending")
+        completed = job_factory(user_sub=user.user_sub, status="running", is_uploaded=False)
+        failed = job_factory(user_sub=user.user_sub, status="running", is_uploaded=False)
+        running_id, completed_id, failed_id = (
+            str(job.job_id) for job in (running, completed, failed)
+        )
+        sql_statements.clear()
+
+        response = client.patch(
+            "/jobs/status",
+            json={
+                "updates": [
+                    {"job_id": running_id, "state": "running"},
+                    {"job_id": completed_id, "state": "completed", "runtime": "00:10:00"},
+                    {"job_id": failed_id, "state": "FAILED"},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "results": [
+                {"job_id": running_id, "status_code": 200, "status": "running", "runtime": None},
+                {"job_id": completed_id, "status_code": 200, "status": "completed", "runtime": "0:10:00"},
+                {"job_id": failed_id, "status_code": 200, "status": "failed", "runtime": None},
+            ]
+        }
+        job_selects = [
+            statement for statement in sql_statements
+            if statement.lstrip().upper().startswith("SELECT") and "FROM jobs" in statement
+        ]
+        job_updates = [
+            statement for statement in sql_statements
+            if statement.lstrip().startswith("UPDATE jobs")
+        ]
+        assert len(job_selects) == 1
+        # One executemany for the statuses, one UPDATE marking the uploads.
+        assert len(job_updates) == 2
+        assert sorted(args[0][4] for args, _kwargs in calls) == sorted([completed_id, failed_id])
+
+        db.expire_all()
+        assert db.get(Job, running.job_id).status == "running"
+        assert db.get(Job, running.job_id).completed_at is None
+        assert db.get(Job, completed.job_id).status == "completed"
+        assert db.get(Job, completed.job_id).runtime == timedelta(minutes=10)
+        assert db.get(Job, completed.job_id).completed_at is not None
+        assert db.get(Job, completed.job_id).is_uploaded is True
+        assert db.get(Job, failed.job_id).is_uploaded is True
+
+    def test_bulk_status_update_commits_statuses_before_uploading(
+        self, client, db, monkeypatch, user_factory, job_factory
+    ):
+        """
+        Result uploads should run after the status commit, not inside it.
+        """
+        import cluster.backends as cluster_backends
+        import cluster.routes as cluster_routes
+
+        events = []
+
+        def failing_upload(command, **kwargs):
+            events.append("upload")
+            raise cluster_backends.subprocess.CalledProcessError(returncode=1, cmd=command)
+
+        monkeypatch.setattr(cluster_routes, "CLUSTER_WORK_DIR", "/cluster/work")
+        monkeypatch.setattr(cluster_backends.subprocess, "run", failing_upload)
+        user = user_factory(user_sub="auth0|testuser")
+        job = job_factory(user_sub=user.user_sub, status="running", is_uploaded=False)
+
+        def record_commit(_session):
+            events.append("commit")
+
+        event.listen(Session, "after_commit", record_commit)
+        try:
+            response = client.patch(
+                "/jobs/status",
+                json={"updates": [{"job_id": str(job.job_id), "state": "completed"}]},
+            )
+        finally:
+            event.remove(Session, "after_commit", record_commit)
+
+        assert response.status_code == 200
+        # The failed upload leaves nothing to record, so no second commit.
+        assert events == ["commit", "upload"]
+        db.expire_all()
+        assert db.get(Job, job.job_id).status == "completed"
+        assert db.get(Job, job.job_id).is_uploaded is False
+
+    def test_bulk_status_update_reports_per_job_errors(
+        self, client, db, set_auth_user, user_factory, job_factory
+    ):
+        """
+        Missing, forbidden, and invalid entries should not block valid updates.
+        """
+        user = user_factory(user_sub="auth0|testuser")
+        other = user_factory(user_sub="auth0|other")
+        owned = job_factory(user_sub=user.user_sub, status="pending")
+        bad_state = job_factory(user_sub=user.user_sub, status="pending")
+        bad_runtime = job_factory(user_sub=user.user_sub, status="pending")
+        foreign = job_factory(user_sub=other.user_sub, status="pending")
+        deleted = job_factory(user_sub=user.user_sub, status="pending", is_deleted=True)
+
+        response = client.patch(
+            "/jobs/status",
+            json={
+                "updates": [
+                    {"job_id": str(owned.job_id), "state": "running"},
+                    {"job_id": str(bad_state.job_id), "state": "not-a-status"},
+                    {"job_id": str(bad_runtime.job_id), "runtime": "later"},
+                    {"job_id": str(foreign.job_id), "state": "running"},
+                    {"job_id": str(deleted.job_id), "state": "running"},
+                    {"job_id": "not-a-uuid", "state": "running"},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status_code"] for result in results] == [200, 400, 400, 403, 404, 404]
+        assert results[2]["detail"] == "Invalid runtime format. Use HH:MM:SS."
+        assert results[3]["detail"] == "Insufficient permissions"
+        assert results[5]["detail"] == "Job not found"
+        db.expire_all()
+        assert db.get(Job, owned.job_id).status == "running"
+        assert db.get(Job, bad_state.job_id).status == "pending"
+        assert db.get(Job, foreign.job_id).status == "pending"
+
+    def test_bulk_status_update_rejects_empty_payload(self, client, user_factory):
+        user_factory(user_sub="auth0|testuser")
+
+        response = client.patch("/jobs/status", json={"updates": []})
+
+        assert response.status_code == 422
+
     def test_create_job_accepts_xyz_upload_and_persists_job_file_tags_and_structure(
         self,
         client,
@@ -854,7 +1157,7 @@ class TestJobsAPI:
                 tags=["existing", "new"],
                 structure_id=str(structure.structure_id),
             ),
-            files=_upload_file("../unsafe/input.xyz", b"water xyz content"),
+            files=_upload_file("../unsafe/input.xyz", WATER_XYZ),
         )
 
         assert response.status_code == 201
@@ -876,7 +1179,7 @@ class TestJobsAPI:
         assert result["structures"][0]["structure_id"] == str(structure.structure_id)
 
         saved_file = tmp_path / str(job_id) / "input.xyz"
-        assert saved_file.read_bytes() == b"water xyz content"
+        assert saved_file.read_bytes() == WATER_XYZ
         assert not (tmp_path / str(job_id) / "unsafe").exists()
 
         job = db.query(Job).filter_by(job_id=job_id).one()
@@ -991,6 +1294,53 @@ class TestJobsAPI:
         assert db.query(Job).filter_by(job_id=job_id).first() is None
         assert not (tmp_path / str(job_id)).exists()
 
+    def test_create_job_rejects_malformed_xyz_content(self, client, db, monkeypatch, tmp_path):
+        """
+        POST /jobs/ should parse the upload before creating files or DB rows.
+        """
+        import jobs.routes as jobs_routes
+
+        monkeypatch.setattr(jobs_routes, "JOB_DIR", str(tmp_path))
+        job_id = uuid.uuid4()
+
+        response = client.post(
+            "/jobs/",
+            data=_job_form_data(job_id=job_id),
+            files=_upload_file("input.xyz", b"3\n\nH 0 0 0\n"),
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid XYZ file: Frame starting on line 1 has fewer than 3 atoms"
+        assert db.query(Job).filter_by(job_id=job_id).first() is None
+        assert not (tmp_path / str(job_id)).exists()
+
+    def test_create_job_returns_503_when_structure_pool_is_saturated(
+        self, client, db, monkeypatch, tmp_path
+    ):
+        """
+        POST /jobs/ should shed load instead of queueing when the parser pool is full.
+        """
+        import jobs.routes as jobs_routes
+        import process_pool
+
+        monkeypatch.setattr(jobs_routes, "JOB_DIR", str(tmp_path))
+        monkeypatch.setattr(
+            process_pool,
+            "structure_pool",
+            process_pool.BoundedProcessPool(max_workers=0, max_pending=0),
+        )
+
+        response = client.post(
+            "/jobs/",
+            data=_job_form_data(),
+            files=_upload_file(),
+        )
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert db.query(Job).count() == 0
+        assert not list(tmp_path.iterdir())
+
     def test_create_job_rejects_invalid_job_id(self, client, db, monkeypatch, tmp_path):
         """
         POST /jobs/ should reject job IDs that are not UUIDs before saving files.
@@ -1304,3 +1654,441 @@ class TestJobsAPI:
         assert response.status_code == 500
         assert response.json()["detail"] == "Timed out submitting job to cluster"
         assert len(calls) == 2
+
+
+class TestJobSearchAPI:
+    def test_search_matches_names_and_notes_the_user_can_read(
+        self, client, group_factory, job_factory, set_auth_user, user_factory
+    ):
+        """
+        GET /jobs/search should only return readable, non-deleted matches.
+        """
+        group = group_factory()
+        user = user_factory(group=group, user_sub="auth0|searcher")
+        other = user_factory(user_sub="auth0|other")
+        own = job_factory(user_sub=user.user_sub, job_name="Benzene optimisation")
+        noted = job_factory(
+            user_sub=user.user_sub,
+            job_name="Ring scan",
+            job_notes="Checks the benzene ring torsions",
+        )
+        shared = job_factory(
+            user_sub=None,
+            group_id=group.group_id,
+            is_public=True,
+            job_name="Benzene dimer",
+        )
+        job_factory(
+            user_sub=None,
+            group_id=group.group_id,
+            is_public=False,
+            job_name="Private benzene",
+        )
+        job_factory(user_sub=other.user_sub, job_name="Benzene elsewhere")
+        job_factory(user_sub=user.user_sub, job_name="Deleted benzene", is_deleted=True)
+        job_factory(user_sub=user.user_sub, job_name="Water dimer")
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get("/jobs/search", params={"q": "benzene"})
+
+        assert response.status_code == 200
+        assert {job["job_id"] for job in response.json()} == {
+            str(own.job_id),
+            str(noted.job_id),
+            str(shared.job_id),
+        }
+
+    def test_search_needs_every_word_and_treats_the_last_as_a_prefix(
+        self, client, job_factory, set_auth_user, user_factory
+    ):
+        user = user_factory(user_sub="auth0|searcher")
+        both = job_factory(user_sub=user.user_sub, job_name="Benzene dimer scan")
+        job_factory(user_sub=user.user_sub, job_name="Benzene monomer")
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get("/jobs/search", params={"q": "benzene dim"})
+
+        assert [job["job_id"] for job in response.json()] == [str(both.job_id)]
+
+    def test_search_sees_renamed_jobs(
+        self, client, db, job_factory, set_auth_user, user_factory
+    ):
+        """
+        The search index should follow updates to job names.
+        """
+        user = user_factory(user_sub="auth0|searcher")
+        job = job_factory(user_sub=user.user_sub, job_name="Water dimer")
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        job.job_name = "Ammonia dimer"
+        db.commit()
+
+        assert client.get("/jobs/search", params={"q": "water"}).json() == []
+        assert [
+            result["job_id"]
+            for result in client.get("/jobs/search", params={"q": "ammonia"}).json()
+        ] == [str(job.job_id)]
+
+    def test_search_returns_requested_fields(
+        self, client, job_factory, set_auth_user, user_factory
+    ):
+        user = user_factory(user_sub="auth0|searcher")
+        job = job_factory(user_sub=user.user_sub, job_name="Benzene dimer")
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get(
+            "/jobs/search",
+            params={"q": "benzene", "fields": "job_name"},
+        )
+
+        assert response.json() == [{"job_id": str(job.job_id), "job_name": "Benzene dimer"}]
+
+    def test_search_without_words_returns_nothing(
+        self, client, job_factory, set_auth_user, user_factory
+    ):
+        user = user_factory(user_sub="auth0|searcher")
+        job_factory(user_sub=user.user_sub, job_name="Benzene dimer")
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get("/jobs/search", params={"q": "\"*-"})
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+
+class TestJobTagFilterAPI:
+    def test_tagged_jobs_match_all_or_any_tags(
+        self, client, job_factory, set_auth_user, tag_factory, user_factory
+    ):
+        user = user_factory(user_sub="auth0|tagger")
+        dft = tag_factory(user_sub=user.user_sub, name="dft")
+        benchmark = tag_factory(user_sub=user.user_sub, name="benchmark")
+        both = job_factory(user_sub=user.user_sub, tags=[dft, benchmark])
+        dft_only = job_factory(user_sub=user.user_sub, tags=[dft])
+        job_factory(user_sub=user.user_sub)
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        every = client.get("/jobs/tagged", params={"tag": ["dft", "benchmark"]})
+        either = client.get(
+            "/jobs/tagged",
+            params={"tag": ["dft", "benchmark"], "match": "any"},
+        )
+
+        assert every.status_code == 200
+        assert [job["job_id"] for job in every.json()] == [str(both.job_id)]
+        assert {job["job_id"] for job in either.json()} == {
+            str(both.job_id),
+            str(dft_only.job_id),
+        }
+
+    def test_tagged_jobs_match_names_across_users_and_stay_readable(
+        self, client, group_factory, job_factory, set_auth_user, tag_factory, user_factory
+    ):
+        """
+        A group admin's tag on a public group job should match the member's
+        search by name; unreadable jobs with the tag should not.
+        """
+        group = group_factory()
+        member = user_factory(group=group, user_sub="auth0|member")
+        admin = user_factory(group=group, user_sub="auth0|admin", role="group_admin")
+        outsider = user_factory(user_sub="auth0|outsider")
+        admin_tag = tag_factory(user_sub=admin.user_sub, name="paper")
+        shared = job_factory(
+            user_sub=None,
+            group_id=group.group_id,
+            is_public=True,
+            tags=[admin_tag],
+        )
+        job_factory(
+            user_sub=None,
+            group_id=group.group_id,
+            is_public=False,
+            tags=[admin_tag],
+        )
+        job_factory(
+            user_sub=outsider.user_sub,
+            tags=[tag_factory(user_sub=outsider.user_sub, name="paper")],
+        )
+        set_auth_user(make_auth0_payload(member.user_sub))
+
+        response = client.get("/jobs/tagged", params={"tag": "paper"})
+
+        assert [job["job_id"] for job in response.json()] == [str(shared.job_id)]
+
+    def test_tagged_jobs_require_a_tag(self, client, set_auth_user, user_factory):
+        user = user_factory(user_sub="auth0|tagger")
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get("/jobs/tagged", params={"tag": " "})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "At least one tag is required."
+
+    def test_tag_lookup_uses_tag_indexes(self, db):
+        if db.get_bind().dialect.name != "sqlite":
+            pytest.skip("reads the SQLite query plan")
+
+        query = select(Job.id).where(tagged_asset_criterion(Job, ["dft"], match_all=True))
+        compiled = query.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+        plan = " ".join(
+            row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+        )
+
+        assert "idx_tags_name" in plan
+        assert "idx_jobs_tags_tag_id" in plan
+
+
+class TestBulkJobTagsAPI:
+    def test_bulk_tag_update_writes_links_in_one_statement_each(
+        self, client, db, job_factory, sql_statements, tag_factory, user_factory
+    ):
+        """
+        PATCH /jobs/tags should add and remove tags on every job at once.
+        """
+        user = user_factory(user_sub="auth0|testuser")
+        draft = tag_factory(user_sub=user.user_sub, name="draft")
+        paper = tag_factory(user_sub=user.user_sub, name="paper")
+        tagged = job_factory(user_sub=user.user_sub, tags=[draft, paper])
+        jobs = [tagged] + [job_factory(user_sub=user.user_sub, tags=[draft]) for _ in range(3)]
+        job_ids = [str(job.job_id) for job in jobs]
+        paper_id = paper.tag_id
+        sql_statements.clear()
+
+        response = client.patch(
+            "/jobs/tags",
+            json={"job_ids": job_ids, "add": ["paper", "final "], "remove": ["draft"]},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "results": [{"job_id": job_id, "status_code": 200} for job_id in job_ids]
+        }
+        link_inserts = [s for s in sql_statements if s.startswith("INSERT INTO jobs_tags")]
+        link_deletes = [s for s in sql_statements if s.startswith("DELETE FROM jobs_tags")]
+        assert len(link_inserts) == 1
+        assert len(link_deletes) == 1
+
+        db.expire_all()
+        for job in jobs:
+            assert sorted(tag.name for tag in db.get(Job, job.job_id).tags) == ["final", "paper"]
+        assert db.query(Tags).filter_by(user_sub=user.user_sub, name="paper").one().tag_id == paper_id
+
+    def test_bulk_tag_update_reports_per_job_errors(
+        self, client, db, job_factory, tag_factory, user_factory
+    ):
+        user = user_factory(user_sub="auth0|testuser")
+        other = user_factory(user_sub="auth0|other")
+        owned = job_factory(user_sub=user.user_sub)
+        foreign = job_factory(user_sub=other.user_sub)
+        deleted = job_factory(user_sub=user.user_sub, is_deleted=True)
+
+        response = client.patch(
+            "/jobs/tags",
+            json={
+                "job_ids": [
+                    str(owned.job_id),
+                    str(foreign.job_id),
+                    str(deleted.job_id),
+                    "not-a-uuid",
+                ],
+                "add": ["paper"],
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status_code"] for result in results] == [200, 403, 404, 404]
+        assert results[1]["detail"] == "Insufficient permissions"
+        assert results[3]["detail"] == "Job not found"
+        db.expire_all()
+        assert [tag.name for tag in db.get(Job, owned.job_id).tags] == ["paper"]
+        assert db.get(Job, foreign.job_id).tags == []
+
+    def test_bulk_tag_removal_matches_tags_of_any_owner(
+        self, client, db, group_factory, job_factory, set_auth_user, tag_factory, user_factory
+    ):
+        group = group_factory()
+        admin = user_factory(group=group, user_sub="auth0|admin", role="group_admin")
+        member = user_factory(group=group, user_sub="auth0|member")
+        job = job_factory(
+            user_sub=member.user_sub,
+            group_id=group.group_id,
+            tags=[tag_factory(user_sub=member.user_sub, name="draft")],
+        )
+        set_auth_user(
+            make_auth0_payload(
+                admin.user_sub,
+                role="group_admin",
+                group_id=str(group.group_id),
+            )
+        )
+
+        response = client.patch(
+            "/jobs/tags",
+            json={"job_ids": [str(job.job_id)], "remove": ["draft"]},
+        )
+
+        assert response.json()["results"][0]["status_code"] == 200
+        db.expire_all()
+        assert db.get(Job, job.job_id).tags == []
+
+    @pytest.mark.parametrize(
+        ("body", "detail"),
+        [
+            ({"add": [" "]}, "No tags to add or remove."),
+            ({"add": ["paper"], "remove": ["paper"]}, "Tag cannot be both added and removed: paper"),
+        ],
+    )
+    def test_bulk_tag_update_rejects_empty_or_conflicting_tags(
+        self, client, job_factory, user_factory, body, detail
+    ):
+        user_factory(user_sub="auth0|testuser")
+        job = job_factory()
+
+        response = client.patch("/jobs/tags", json={"job_ids": [str(job.job_id)], **body})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == detail
+
+
+class TestBulkJobUpdatesAPI:
+    def test_bulk_delete_soft_deletes_allowed_jobs_in_one_update(
+        self, client, db, job_factory, sql_statements, user_factory
+    ):
+        """
+        POST /jobs/delete should soft-delete every allowed job with one UPDATE.
+        """
+        user = user_factory(user_sub="auth0|testuser")
+        other = user_factory(user_sub="auth0|other")
+        owned = [job_factory(user_sub=user.user_sub) for _ in range(3)]
+        foreign = job_factory(user_sub=other.user_sub)
+        job_ids = [str(job.job_id) for job in owned]
+        sql_statements.clear()
+
+        response = client.post(
+            "/jobs/delete",
+            json={"job_ids": job_ids + [str(foreign.job_id), "not-a-uuid"]},
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[:3] == [{"job_id": job_id, "status_code": 200} for job_id in job_ids]
+        assert [result["status_code"] for result in results[3:]] == [403, 404]
+        assert len([s for s in sql_statements if s.startswith("UPDATE jobs")]) == 1
+        db.expire_all()
+        assert all(db.get(Job, job.job_id).is_deleted for job in owned)
+        assert db.get(Job, foreign.job_id).is_deleted is False
+        assert client.get(f"/jobs/{job_ids[0]}").status_code == 404
+
+    def test_bulk_visibility_update_follows_single_job_rules(
+        self, client, db, group_factory, job_factory, user_factory
+    ):
+        group = group_factory()
+        user = user_factory(group=group, user_sub="auth0|testuser")
+        owned = job_factory(user_sub=user.user_sub)
+        group_job = job_factory(user_sub=None, group_id=group.group_id)
+
+        response = client.patch(
+            "/jobs/visibility",
+            json={"job_ids": [str(owned.job_id), str(group_job.job_id)], "is_public": True},
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status_code"] for result in results] == [200, 403]
+        db.expire_all()
+        assert db.get(Job, owned.job_id).is_public is True
+        assert db.get(Job, group_job.job_id).is_public is False
+
+    def test_bulk_updates_limit_the_number_of_jobs(self, client, user_factory):
+        user_factory(user_sub="auth0|testuser")
+
+        response = client.post(
+            "/jobs/delete",
+            json={"job_ids": [str(uuid.uuid4()) for _ in range(MAX_BULK_ASSET_UPDATES + 1)]},
+        )
+
+        assert response.status_code == 422
+
+
+class TestVisibleJobsAPI:
+    def test_lists_own_and_group_jobs_in_one_query(
+        self, client, group_factory, job_factory, sql_statements, user_factory
+    ):
+        """
+        GET /jobs/visible should combine own, co-owned, and public group jobs
+        in a single jobs query.
+        """
+        group = group_factory()
+        user = user_factory(group=group, user_sub="auth0|testuser")
+        colleague = user_factory(group=group, user_sub="auth0|colleague")
+        other = user_factory(user_sub="auth0|other")
+        now = datetime.now(timezone.utc)
+        own = job_factory(user_sub=user.user_sub, submitted_at=now - timedelta(minutes=3))
+        co_owned = job_factory(
+            user_sub=user.user_sub,
+            group_id=group.group_id,
+            submitted_at=now - timedelta(minutes=2),
+        )
+        public = job_factory(
+            user_sub=colleague.user_sub,
+            group_id=group.group_id,
+            is_public=True,
+            submitted_at=now - timedelta(minutes=1),
+        )
+        job_factory(user_sub=colleague.user_sub, group_id=group.group_id, is_public=False)
+        job_factory(user_sub=other.user_sub, is_public=True)
+        job_factory(user_sub=user.user_sub, is_deleted=True)
+        sql_statements.clear()
+
+        response = client.get("/jobs/visible", params={"fields": "job_id,user_sub"})
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"job_id": str(public.job_id)},
+            {"job_id": str(co_owned.job_id), "user_sub": user.user_sub},
+            {"job_id": str(own.job_id), "user_sub": user.user_sub},
+        ]
+        assert len([s for s in sql_statements if "FROM jobs" in s]) == 1
+
+    def test_group_admin_lists_private_group_jobs_and_filters_writable(
+        self, client, group_factory, job_factory, set_auth_user, user_factory
+    ):
+        group = group_factory()
+        admin = user_factory(group=group, user_sub="auth0|admin", role="group_admin")
+        member = user_factory(group=group, user_sub="auth0|member")
+        private = job_factory(
+            user_sub=member.user_sub,
+            group_id=group.group_id,
+            is_public=False,
+            status="running",
+        )
+        job_factory(user_sub=member.user_sub, group_id=group.group_id, status="completed")
+        job_factory(user_sub=member.user_sub, status="running")
+        set_auth_user(
+            make_auth0_payload(
+                admin.user_sub,
+                role="group_admin",
+                group_id=str(group.group_id),
+            )
+        )
+
+        response = client.get(
+            "/jobs/visible",
+            params={"writable": "true", "status": "running", "fields": "job_id"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [{"job_id": str(private.job_id)}]
+
+    def test_member_writable_jobs_exclude_public_group_jobs(
+        self, client, group_factory, job_factory, user_factory
+    ):
+        group = group_factory()
+        user = user_factory(group=group, user_sub="auth0|testuser")
+        own = job_factory(user_sub=user.user_sub)
+        job_factory(user_sub=None, group_id=group.group_id, is_public=True)
+
+        response = client.get("/jobs/visible", params={"writable": "true", "fields": "job_id"})
+
+        assert response.json() == [{"job_id": str(own.job_id)}]
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse
+
+from json_response import FastJSONResponse
+
+
+def test_matches_default_json_response_for_serialized_content():
+    content = [
+        {
+            "job_id": "6f1c8a8e-3f7b-4a8e-9a61-2a2e7c6d9b10",
+            "submitted_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc).isoformat(),
+            "job_name": "Café ☕",
+            "charge": -1,
+            "completed_at": None,
+            "is_public": True,
+            "tags": ["baseline"],
+        }
+    ]
+
+    assert FastJSONResponse(content).body == JSONResponse(content).body
+
+
+def test_sets_json_content_type():
+    response = FastJSONResponse({"status": "ok"}, status_code=201)
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
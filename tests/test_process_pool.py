@@ -0,0 +1,54 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from process_pool import BoundedProcessPool, PoolSaturatedError
+from xyz_parser import XYZParseError, summarize_xyz
+
+
+@pytest.fixture
+def process_pool():
+    pool = BoundedProcessPool(max_workers=1, max_pending=1)
+    yield pool
+    pool.shutdown()
+
+
+class TestBoundedProcessPool:
+    def test_runs_work_in_another_process(self, process_pool):
+        assert process_pool.run(os.getpid) != os.getpid()
+
+    def test_reraises_worker_exceptions(self, process_pool):
+        with pytest.raises(XYZParseError, match="XYZ file is empty"):
+            process_pool.run(summarize_xyz, b"")
+
+    def test_rejects_work_beyond_max_pending_until_a_slot_frees(self, process_pool):
+        future = process_pool.submit(time.sleep, 0.2)
+
+        with pytest.raises(PoolSaturatedError):
+            process_pool.submit(time.sleep, 0)
+        future.result()
+        # The slot is released by a done callback shortly after the result.
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                process_pool.run(os.getpid)
+                break
+            except PoolSaturatedError:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+    def test_run_async_awaits_pool_result(self, process_pool):
+        summary = asyncio.run(
+            process_pool.run_async(summarize_xyz, b"2\n\nH 0 0 0\nH 0 0 0.74\n")
+        )
+
+        assert summary.formula == "H2"
+        assert summary.bounding_box == ((0.0, 0.0, 0.0), (0.0, 0.0, 0.74))
+
+    def test_zero_workers_runs_inline(self):
+        pool = BoundedProcessPool(max_workers=0, max_pending=1)
+
+        assert pool.run(os.getpid) == os.getpid()
+        assert pool.run(os.getpid) == os.getpid()
@@ -0,0 +1,62 @@
+import gzip
+
+from result_cache import ResultCache, build_payload, etag_matches
+
+
+class TestResultCache:
+    def test_get_or_load_calls_loader_once(self):
+        cache = ResultCache()
+        calls = []
+
+        def load():
+            calls.append(True)
+            return b'{"output": "done"}'
+
+        first = cache.get_or_load("result:job", load)
+        second = cache.get_or_load("result:job", load)
+
+        assert first is second
+        assert first.body == b'{"output": "done"}'
+        assert gzip.decompress(first.gzip_body) == first.body
+        assert len(calls) == 1
+
+    def test_memory_tier_evicts_least_recently_used_entries(self):
+        entry_size = build_payload(b"a" * 100).size
+        cache = ResultCache(max_bytes=entry_size * 2)
+
+        cache.put("first", b"a" * 100)
+        cache.put("second", b"b" * 100)
+        cache.get("first")
+        cache.put("third", b"c" * 100)
+
+        assert cache.get("first") is not None
+        assert cache.get("second") is None
+        assert cache.get("third") is not None
+
+    def test_disk_tier_survives_a_new_cache_instance(self, tmp_path):
+        ResultCache(cache_dir=str(tmp_path)).put("result:job", b"saved")
+
+        payload = ResultCache(cache_dir=str(tmp_path)).get("result:job")
+
+        assert payload is not None
+        assert payload.body == b"saved"
+        assert payload.etag == build_payload(b"saved").etag
+
+    def test_oversized_payload_is_kept_only_on_disk(self, tmp_path):
+        cache = ResultCache(max_bytes=10, cache_dir=str(tmp_path))
+
+        cache.put("result:job", b"x" * 100)
+        cache.clear()
+
+        assert cache.get("result:job").body == b"x" * 100
+
+
+def test_etag_matches_weak_strong_and_wildcard_values():
+    etag = build_payload(b"body").etag
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
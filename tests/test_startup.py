@@ -0,0 +1,22 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_importing_app_does_not_load_chemistry_libraries():
+    """
+    ASE and Pymatgen should only be imported when a structure is parsed.
+    """
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, main; print(sorted(m for m in ('ase', 'pymatgen') if m in sys.modules))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+
+    assert proc.stdout.strip().splitlines()[-1] == "[]"
@@ -1,6 +1,9 @@
 import uuid
+from types import SimpleNamespace
 
+import numpy as np
 import pytest
+from botocore.exceptions import ClientError
 
 import storage
 from conftest import make_auth0_payload
@@ -106,6 +109,35 @@ class TestConstructUploadScript:
         }
 
 
+def test_construct_upload_scripts_builds_urls_for_each_job(mock_put_urls):
+    result = storage.construct_upload_scripts(["job-1", "job-2"], "energy")
+
+    assert list(result) == ["job-1", "job-2"]
+    assert result["job-2"] == storage.construct_upload_script("job-2", "energy")
+
+
+def test_presigning_reuses_one_s3_client(monkeypatch):
+    created = []
+
+    class FakeS3Client:
+        def generate_presigned_url(self, ClientMethod, Params, ExpiresIn):
+            return f"{ClientMethod}:{Params['Key']}"
+
+    def fake_client(*args, **kwargs):
+        created.append(args)
+        return FakeS3Client()
+
+    storage._s3_client.cache_clear()
+    monkeypatch.setattr(storage.boto3, "client", fake_client)
+    try:
+        storage.construct_upload_scripts(["job-1", "job-2"], "standard")
+        storage.generate_presigned_get_url("key")
+    finally:
+        storage._s3_client.cache_clear()
+
+    assert len(created) == 1
+
+
 class TestConstructFetchScript:
     @pytest.mark.parametrize(
         "calculation_type, expected_artifacts",
@@ -413,3 +445,380 @@ class TestDownloadJobArchive:
 
         assert response.status_code == 404
         assert response.json()["detail"] == "Job not found"
+
+
+class TestJobTrajectory:
+    @pytest.fixture(autouse=True)
+    def trajectory_files(self, monkeypatch, tmp_path):
+        import s3.routes as s3_routes
+        from trajectory_store import TrajectoryStore
+
+        objects = {}
+        reads = []
+
+        def fake_read_object(key):
+            reads.append(key)
+            if key not in objects:
+                raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+            return objects[key]
+
+        monkeypatch.setattr(s3_routes, "read_object", fake_read_object)
+        monkeypatch.setattr(s3_routes, "trajectory_store", TrajectoryStore(str(tmp_path)))
+        return SimpleNamespace(objects=objects, reads=reads)
+
+    def _completed_irc_job(self, job_factory, user_factory, set_auth_user):
+        owner = user_factory(user_sub="auth0|owner")
+        job = job_factory(
+            user_sub=owner.user_sub,
+            calculation_type="irc",
+            status="completed",
+        )
+        set_auth_user(make_auth0_payload(owner.user_sub))
+        return job
+
+    def test_returns_strided_frames_and_ingests_once(
+        self, client, set_auth_user, user_factory, job_factory, trajectory_files
+    ):
+        job = self._completed_irc_job(job_factory, user_factory, set_auth_user)
+        key = storage.job_artifact_key(str(job.job_id), "trajectory.xyz")
+        trajectory_files.objects[key] = "".join(
+            f"1\nstep {frame}\nH {frame} 0 0\n" for frame in range(10)
+        ).encode()
+
+        response = client.get(
+            f"/storage/trajectory/{job.job_id}",
+            params={"start": 1, "stop": 8, "step": 3},
+        )
+        single = client.get(
+            f"/storage/trajectory/{job.job_id}",
+            params={"start": 9},
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["frame_count"] == 10
+        assert [frame["index"] for frame in body["frames"]] == [1, 4, 7]
+        assert body["frames"][1]["positions"] == [[4.0, 0.0, 0.0]]
+        assert [frame["comment"] for frame in single.json()["frames"]] == ["step 9"]
+        assert trajectory_files.reads == [key]
+
+    def test_rejects_too_many_frames(
+        self, client, set_auth_user, user_factory, job_factory, trajectory_files
+    ):
+        import s3.routes as s3_routes
+
+        job = self._completed_irc_job(job_factory, user_factory, set_auth_user)
+        trajectory_files.objects[
+            storage.job_artifact_key(str(job.job_id), "trajectory.xyz")
+        ] = b"1\n\nH 0 0 0\n" * (s3_routes.MAX_TRAJECTORY_FRAMES + 1)
+
+        response = client.get(f"/storage/trajectory/{job.job_id}")
+
+        assert response.status_code == 400
+
+    def test_missing_trajectory_returns_404(
+        self, client, set_auth_user, user_factory, job_factory
+    ):
+        job = self._completed_irc_job(job_factory, user_factory, set_auth_user)
+
+        response = client.get(f"/storage/trajectory/{job.job_id}")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Trajectory not found."
+
+    def test_job_without_trajectory_returns_404_without_download(
+        self, client, set_auth_user, user_factory, job_factory, trajectory_files
+    ):
+        owner = user_factory(user_sub="auth0|owner")
+        job = job_factory(user_sub=owner.user_sub, calculation_type="energy", status="completed")
+        set_auth_user(make_auth0_payload(owner.user_sub))
+
+        response = client.get(f"/storage/trajectory/{job.job_id}")
+
+        assert response.status_code == 404
+        assert trajectory_files.reads == []
+
+    def test_member_cannot_read_private_trajectory(
+        self, client, set_auth_user, group_factory, user_factory, job_factory, trajectory_files
+    ):
+        group = group_factory()
+        owner = user_factory(group=group, user_sub="auth0|owner")
+        member = user_factory(group=group, user_sub="auth0|member")
+        job = job_factory(
+            user_sub=owner.user_sub,
+            group_id=group.group_id,
+            calculation_type="irc",
+            status="completed",
+        )
+        set_auth_user(make_auth0_payload(member.user_sub))
+
+        response = client.get(f"/storage/trajectory/{job.job_id}")
+
+        assert response.status_code == 403
+        assert trajectory_files.reads == []
+
+
+def _esp_cube_text(nx, ny, nz):
+    values = [str(float(index)) for index in range(nx * ny * nz)]
+    return (
+        "esp\n\n"
+        "    1 0.0 0.0 0.0\n"
+        f"   {nx} 0.5 0.0 0.0\n"
+        f"   {ny} 0.0 0.5 0.0\n"
+        f"   {nz} 0.0 0.0 0.5\n"
+        "    1 1.0 0.0 0.0 0.0\n"
+        + "\n".join(values)
+        + "\n"
+    ).encode()
+
+
+class TestJobCube:
+    @pytest.fixture(autouse=True)
+    def cube_files(self, monkeypatch, tmp_path):
+        import s3.routes as s3_routes
+        from cube_store import CubeStore
+
+        objects = {}
+        reads = []
+
+        def fake_read_object(key):
+            reads.append(key)
+            if key not in objects:
+                raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+            return objects[key]
+
+        monkeypatch.setattr(s3_routes, "read_object", fake_read_object)
+        monkeypatch.setattr(s3_routes, "cube_store", CubeStore(str(tmp_path)))
+        return SimpleNamespace(objects=objects, reads=reads)
+
+    @pytest.fixture
+    def orbitals_job(self, cube_files, job_factory, user_factory, set_auth_user):
+        owner = user_factory(user_sub="auth0|owner")
+        job = job_factory(
+            user_sub=owner.user_sub,
+            calculation_type="orbitals",
+            status="completed",
+        )
+        set_auth_user(make_auth0_payload(owner.user_sub))
+        cube_files.objects[storage.job_artifact_key(str(job.job_id), "esp.cube")] = (
+            _esp_cube_text(34, 2, 2)
+        )
+        return job
+
+    def test_metadata_lists_levels_and_ingests_once(self, client, orbitals_job, cube_files):
+        first = client.get(f"/storage/cube/{orbitals_job.job_id}")
+        second = client.get(f"/storage/cube/{orbitals_job.job_id}")
+
+        assert first.status_code == 200
+        assert second.json() == first.json()
+        assert first.json()["atoms"] == [[1.0, 1.0, 0.0, 0.0, 0.0]]
+        assert [level["shape"] for level in first.json()["levels"]] == [
+            [34, 2, 2],
+            [17, 1, 1],
+            [9, 1, 1],
+        ]
+        assert len(cube_files.reads) == 1
+
+    def test_level_returns_float16_grid(self, client, orbitals_job):
+        response = client.get(
+            f"/storage/cube/{orbitals_job.job_id}/levels/0",
+            params={"dtype": "float16"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert response.headers["x-cube-shape"] == "34,2,2"
+        values = np.frombuffer(response.content, dtype="<f2")
+        np.testing.assert_array_equal(values, np.arange(136, dtype=np.float16))
+
+    def test_whole_level_is_gzip_encoded_when_accepted(self, client, orbitals_job):
+        compressed = client.get(
+            f"/storage/cube/{orbitals_job.job_id}/levels/0",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        plain = client.get(
+            f"/storage/cube/{orbitals_job.job_id}/levels/0",
+            headers={"Accept-Encoding": "identity"},
+        )
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in plain.headers
+        assert compressed.content == plain.content
+        assert np.frombuffer(plain.content, dtype="<f4").tolist() == list(range(136))
+
+    def test_level_serves_byte_ranges(self, client, orbitals_job):
+        response = client.get(
+            f"/storage/cube/{orbitals_job.job_id}/levels/0",
+            headers={"Range": "bytes=8-15"},
+        )
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 8-15/544"
+        assert "content-encoding" not in response.headers
+        assert np.frombuffer(response.content, dtype="<f4").tolist() == [2.0, 3.0]
+
+    def test_unsatisfiable_range_returns_416(self, client, orbitals_job):
+        response = client.get(
+            f"/storage/cube/{orbitals_job.job_id}/levels/0",
+            headers={"Range": "bytes=544-"},
+        )
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */544"
+
+    def test_missing_level_returns_404(self, client, orbitals_job):
+        response = client.get(f"/storage/cube/{orbitals_job.job_id}/levels/3")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Cube level not found."
+
+    def test_job_without_cube_returns_404_without_download(
+        self, client, set_auth_user, user_factory, job_factory, cube_files
+    ):
+        owner = user_factory(user_sub="auth0|owner")
+        job = job_factory(user_sub=owner.user_sub, calculation_type="irc", status="completed")
+        set_auth_user(make_auth0_payload(owner.user_sub))
+
+        response = client.get(f"/storage/cube/{job.job_id}")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Cube file not found."
+        assert cube_files.reads == []
+
+
+
+def _ir_peak_table(*peaks):
+    return (
+        "##TITLE=computed\n##XUNITS=1/CM\n##YUNITS=KM/MOL\n##PEAK TABLE=(XY..XY)\n"
+        + "\n".join(f"{x}, {y}" for x, y in peaks)
+        + "\n##END=\n"
+    ).encode()
+
+
+class TestJobIRSpectra:
+    @pytest.fixture(autouse=True)
+    def spectrum_files(self, monkeypatch, tmp_path):
+        import s3.routes as s3_routes
+        from ir_spectrum import SpectrumStore
+
+        objects = {}
+        reads = []
+
+        def fake_read_object(key):
+            reads.append(key)
+            if key not in objects:
+                raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+            return objects[key]
+
+        monkeypatch.setattr(s3_routes, "read_object", fake_read_object)
+        monkeypatch.setattr(s3_routes, "spectrum_store", SpectrumStore(str(tmp_path)))
+        return SimpleNamespace(objects=objects, reads=reads)
+
+    @pytest.fixture
+    def frequency_jobs(self, spectrum_files, job_factory, user_factory, set_auth_user):
+        owner = user_factory(user_sub="auth0|owner")
+        jobs = [
+            job_factory(user_sub=owner.user_sub, calculation_type="frequency", status="completed")
+            for _ in range(2)
+        ]
+        set_auth_user(make_auth0_payload(owner.user_sub))
+        for job, peaks in zip(jobs, [[(1000, 10), (1003, 5)], [(1010, 2.5)]]):
+            key = storage.job_artifact_key(str(job.job_id), "ir.jdx")
+            spectrum_files.objects[key] = _ir_peak_table(*peaks)
+        return jobs
+
+    def test_compares_jobs_on_one_grid_and_parses_once(
+        self, client, frequency_jobs, spectrum_files
+    ):
+        params = {"job_ids": [str(job.job_id) for job in frequency_jobs], "resolution": 5}
+
+        first = client.get("/storage/spectrum/ir", params=params)
+        second = client.get("/storage/spectrum/ir", params=params)
+
+        assert first.status_code == 200
+        assert second.json() == first.json()
+        body = first.json()
+        assert body["x"] == [1000.0, 1005.0, 1010.0]
+        assert (body["x_units"], body["y_units"]) == ("1/CM", "KM/MOL")
+        assert [spectrum["y"] for spectrum in body["spectra"]] == [
+            [10.0, 5.0, 0.0],
+            [0.0, 0.0, 2.5],
+        ]
+        assert [spectrum["job_id"] for spectrum in body["spectra"]] == params["job_ids"]
+        assert len(spectrum_files.reads) == 2
+
+    def test_range_limits_grid(self, client, frequency_jobs):
+        response = client.get(
+            "/storage/spectrum/ir",
+            params={
+                "job_ids": str(frequency_jobs[0].job_id),
+                "resolution": 1,
+                "min_x": 1002,
+                "max_x": 1004,
+            },
+        )
+
+        assert response.json()["x"] == [1002.0, 1003.0, 1004.0]
+        assert response.json()["spectra"][0]["y"] == [0.0, 5.0, 0.0]
+
+    def test_response_is_gzipped_and_conditional(self, client, frequency_jobs):
+        params = {"job_ids": str(frequency_jobs[0].job_id)}
+
+        first = client.get("/storage/spectrum/ir", params=params)
+        repeat = client.get(
+            "/storage/spectrum/ir",
+            params=params,
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert repeat.status_code == 304
+
+    def test_rejects_too_many_points(self, client, frequency_jobs):
+        response = client.get(
+            "/storage/spectrum/ir",
+            params={"job_ids": str(frequency_jobs[0].job_id), "resolution": 0.0001},
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "param, value",
+        [("min_x", "nan"), ("max_x", "nan"), ("max_x", "inf"), ("resolution", "inf")],
+    )
+    def test_rejects_non_finite_range(self, client, frequency_jobs, spectrum_files, param, value):
+        response = client.get(
+            "/storage/spectrum/ir",
+            params={"job_ids": str(frequency_jobs[0].job_id), param: value},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == f"{param} must be a finite number."
+        assert spectrum_files.reads == []
+
+    def test_job_without_spectrum_returns_404_without_download(
+        self, client, set_auth_user, user_factory, job_factory, spectrum_files
+    ):
+        owner = user_factory(user_sub="auth0|owner")
+        job = job_factory(user_sub=owner.user_sub, calculation_type="orbitals", status="completed")
+        set_auth_user(make_auth0_payload(owner.user_sub))
+
+        response = client.get("/storage/spectrum/ir", params={"job_ids": str(job.job_id)})
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "IR spectrum not found."
+        assert spectrum_files.reads == []
+
+    def test_unreadable_job_returns_403(
+        self, client, set_auth_user, user_factory, frequency_jobs, spectrum_files
+    ):
+        user_factory(user_sub="auth0|other")
+        set_auth_user(make_auth0_payload("auth0|other"))
+
+        response = client.get(
+            "/storage/spectrum/ir",
+            params={"job_ids": str(frequency_jobs[0].job_id)},
+        )
+
+        assert response.status_code == 403
+        assert spectrum_files.reads == []
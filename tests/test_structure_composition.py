@@ -0,0 +1,54 @@
+import pytest
+
+from models import Structure
+from structure_composition import (
+    backfill_structure_compositions,
+    heavy_atom_count,
+    parse_formula,
+)
+
+
+class TestParseFormula:
+    @pytest.mark.parametrize(
+        ("formula", "expected"),
+        [
+            ("H2O", {"H": 2, "O": 1}),
+            ("C8H12Cr2O7(-2)", {"C": 8, "H": 12, "Cr": 2, "O": 7}),
+            ("Ca(OH)2", {"Ca": 1, "O": 2, "H": 2}),
+            ("NH4+", {"N": 1, "H": 4}),
+            ("SO4^2-", {"S": 1, "O": 4}),
+            ("Fe2(SO4)3", {"Fe": 2, "S": 3, "O": 12}),
+        ],
+    )
+    def test_parses_formulas(self, formula, expected):
+        assert parse_formula(formula) == expected
+
+    @pytest.mark.parametrize("formula", ["", "water", "Xx2", "Ca(OH", "OH)2", "()"])
+    def test_returns_none_for_text_that_is_not_a_formula(self, formula):
+        assert parse_formula(formula) is None
+
+    def test_heavy_atom_count_excludes_hydrogen(self):
+        assert heavy_atom_count({"C": 5, "H": 5, "N": 1}) == 6
+
+
+class TestBackfillStructureCompositions:
+    def test_backfill_fills_parseable_formulas_only(
+        self, db, structure_factory, user_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        parsed = structure_factory(formula="C5H5N")
+        unparsed = structure_factory(formula="unknown")
+        existing = structure_factory(
+            formula="C6H6",
+            composition={"C": 1},
+            heavy_atom_count=1,
+        )
+
+        assert backfill_structure_compositions(db, batch_size=1) == 1
+
+        db.expire_all()
+        parsed = db.get(Structure, parsed.id)
+        assert parsed.composition == {"C": 5, "H": 5, "N": 1}
+        assert parsed.heavy_atom_count == 6
+        assert db.get(Structure, unparsed.id).composition is None
+        assert db.get(Structure, existing.id).composition == {"C": 1}
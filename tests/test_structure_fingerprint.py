@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from structure_fingerprint import MAX_FINGERPRINT_ATOMS, fingerprint_frame, fingerprint_xyz
+from xyz_parser import XYZParseError
+from xyz_validation import XYZFrame
+
+WATER = b"3\nwater\nO 0 0 0\nH 0 0 0.96\nH 0.93 0 -0.24\n"
+
+
+def _xyz(symbols, positions):
+    lines = [str(len(symbols)), ""]
+    lines += [f"{symbol} {x} {y} {z}" for symbol, (x, y, z) in zip(symbols, positions)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _water_positions():
+    return np.array([[0, 0, 0], [0, 0, 0.96], [0.93, 0, -0.24]], dtype=float)
+
+
+class TestStructureFingerprint:
+    def test_fingerprint_includes_hill_formula(self):
+        fingerprint = fingerprint_xyz(WATER)
+
+        assert fingerprint.formula == "H2O"
+        assert fingerprint.composition == {"H": 2, "O": 1}
+        assert fingerprint.fingerprint.startswith("H2O:")
+        assert fingerprint.near_fingerprint.startswith("H2O:")
+
+    def test_fingerprint_ignores_translation_rotation_and_atom_order(self):
+        positions = _water_positions()
+        angle = 0.7
+        rotation = np.array(
+            [
+                [np.cos(angle), -np.sin(angle), 0],
+                [np.sin(angle), np.cos(angle), 0],
+                [0, 0, 1],
+            ]
+        )
+        moved = positions @ rotation.T + [5.0, -2.0, 1.5]
+
+        reordered = fingerprint_xyz(_xyz(["H", "O", "H"], moved[[1, 0, 2]]))
+
+        assert reordered == fingerprint_xyz(WATER)
+
+    def test_small_distortion_changes_exact_but_not_near_fingerprint(self):
+        positions = _water_positions()
+        positions[1, 2] += 0.03
+
+        distorted = fingerprint_xyz(_xyz(["O", "H", "H"], positions))
+        original = fingerprint_xyz(WATER)
+
+        assert distorted.fingerprint != original.fingerprint
+        assert distorted.near_fingerprint == original.near_fingerprint
+
+    def test_different_elements_with_same_geometry_do_not_match(self):
+        positions = _water_positions()
+
+        assert (
+            fingerprint_xyz(_xyz(["S", "H", "H"], positions)).near_fingerprint
+            != fingerprint_xyz(WATER).near_fingerprint
+        )
+
+    def test_fingerprint_uses_last_frame(self):
+        content = b"1\n\nHe 0 0 0\n" + WATER
+
+        assert fingerprint_xyz(content) == fingerprint_xyz(WATER)
+
+    def test_large_structures_have_no_fingerprint(self):
+        atom_count = MAX_FINGERPRINT_ATOMS + 1
+        frame = XYZFrame(
+            comment="",
+            symbols=["He"] * atom_count,
+            positions=np.arange(atom_count * 3, dtype=float).reshape(-1, 3),
+        )
+
+        fingerprint = fingerprint_frame(frame)
+
+        assert fingerprint.formula == f"He{atom_count}"
+        assert fingerprint.fingerprint is None
+        assert fingerprint.near_fingerprint is None
+
+    def test_invalid_content_raises(self):
+        with pytest.raises(XYZParseError):
+            fingerprint_xyz(b"not xyz")
@@ -0,0 +1,98 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from structure_thumbnail import (
+    THUMBNAIL_SIZES,
+    encode_png,
+    fingerprint_and_render_xyz,
+    render_frame,
+    render_xyz_thumbnails,
+)
+from structure_fingerprint import fingerprint_xyz
+from xyz_parser import XYZParseError
+from xyz_validation import parse_xyz_frames
+
+WATER = b"3\nwater\nO 0 0 0\nH 0 0 0.96\nH 0.93 0 -0.24\n"
+
+
+def _decode_png(png: bytes) -> np.ndarray:
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    position = 8
+    chunks = {}
+    while position < len(png):
+        (length,) = struct.unpack(">I", png[position:position + 4])
+        kind = png[position + 4:position + 8]
+        data = png[position + 8:position + 8 + length]
+        (crc,) = struct.unpack(">I", png[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(kind + data) & 0xFFFFFFFF
+        chunks[kind] = data
+        position += 12 + length
+
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert (bit_depth, color_type) == (8, 2)
+    rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8)
+    rows = rows.reshape(height, 1 + width * 3)
+    assert (rows[:, 0] == 0).all()
+    return rows[:, 1:].reshape(height, width, 3)
+
+
+class TestStructureThumbnail:
+    def test_encode_png_round_trips_pixels(self):
+        image = np.zeros((2, 3, 3))
+        image[0, 1] = (1.0, 0.5, 0.0)
+
+        pixels = _decode_png(encode_png(image))
+
+        assert pixels.shape == (2, 3, 3)
+        assert pixels[0, 1].tolist() == [255, 128, 0]
+        assert pixels[1, 2].tolist() == [0, 0, 0]
+
+    def test_renders_every_size(self):
+        thumbnails = render_xyz_thumbnails(WATER)
+
+        assert set(thumbnails) == set(THUMBNAIL_SIZES)
+        for name, size in THUMBNAIL_SIZES.items():
+            assert _decode_png(thumbnails[name]).shape == (size, size, 3)
+
+    def test_render_draws_atoms_on_white_background(self):
+        image = render_frame(parse_xyz_frames(WATER)[-1], 64)
+
+        assert image[0, 0].tolist() == [1.0, 1.0, 1.0]
+        # Oxygen is drawn in red.
+        red = (image[..., 0] > 0.5) & (image[..., 1] < 0.2) & (image[..., 2] < 0.2)
+        assert red.any()
+
+    def test_render_is_deterministic_and_ignores_translation(self):
+        moved = b"3\nwater\nO 5 5 5\nH 5 5 5.96\nH 5.93 5 4.76\n"
+
+        assert render_xyz_thumbnails(WATER) == render_xyz_thumbnails(WATER)
+        np.testing.assert_allclose(
+            render_frame(parse_xyz_frames(WATER)[-1], 32),
+            render_frame(parse_xyz_frames(moved)[-1], 32),
+            atol=1e-9,
+        )
+
+    def test_render_single_atom(self):
+        image = render_frame(parse_xyz_frames(b"1\n\nAr 0 0 0\n")[-1], 16)
+
+        assert image.shape == (16, 16, 3)
+        assert (image < 1.0).any()
+
+    def test_fingerprint_and_render_matches_separate_tasks(self):
+        fingerprint, thumbnails = fingerprint_and_render_xyz(WATER, True)
+
+        assert fingerprint == fingerprint_xyz(WATER)
+        assert thumbnails == render_xyz_thumbnails(WATER)
+
+    def test_fingerprint_without_rendering(self):
+        fingerprint, thumbnails = fingerprint_and_render_xyz(WATER, False)
+
+        assert fingerprint == fingerprint_xyz(WATER)
+        assert thumbnails is None
+
+    def test_fingerprint_and_render_rejects_invalid_xyz(self):
+        with pytest.raises(XYZParseError):
+            fingerprint_and_render_xyz(b"2\nshort\nH 0 0 0\n", True)
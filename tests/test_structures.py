@@ -1,9 +1,16 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import hashlib
 from types import SimpleNamespace
 import uuid
 
+from botocore.exceptions import ClientError
+import pytest
+
 from conftest import make_auth0_payload
 from models import Structure, Tags
+import process_pool
+from structure_fingerprint import fingerprint_xyz
+from tag_usage import TagUsageCache
 
 
 class FakeS3Client:
@@ -15,6 +22,8 @@ class FakeS3Client:
         self.calls = []
         self.upload_file_calls = []
         self.upload_fileobj_calls = []
+        self.copy_object_calls = []
+        self.objects = {}
 
     def generate_presigned_url(self, *args, **kwargs):
         self.calls.append((args, kwargs))
@@ -30,6 +39,18 @@ class FakeS3Client:
         fileobj.seek(position)
         self.upload_fileobj_calls.append((content, bucket, key))
 
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    def copy_object(self, Bucket, Key, CopySource):
+        self.copy_object_calls.append((CopySource["Key"], Key))
+        self.objects[Key] = self.objects[CopySource["Key"]]
+
 
 def _mock_structure_s3(monkeypatch):
     import structures.routes as structures_routes
@@ -40,6 +61,9 @@ def _mock_structure_s3(monkeypatch):
     return fake_s3
 
 
+WATER_XYZ = b"3\nwater\nO 0 0 0\nH 0 0 0.96\nH 0.93 0 -0.24\n"
+
+
 def _structure_file(filename="input.xyz", content=b"2\n\nH 0 0 0\nH 0 0 1\n"):
     return {"file": (filename, content, "chemical/x-xyz")}
 
@@ -55,6 +79,24 @@ def _structure_upload_files(
     }
 
 
+def _inline_formula_pool(monkeypatch, tmp_path):
+    """
+    Run structure pool tasks in the test process, so the ASE and Pymatgen
+    readers can be replaced, and write temporary files under tmp_path.
+    """
+    import structure_formula
+    import structures.routes as structures_routes
+    from process_pool import BoundedProcessPool
+
+    monkeypatch.setattr(
+        structures_routes,
+        "structure_pool",
+        BoundedProcessPool(max_workers=0, max_pending=4),
+    )
+    monkeypatch.setattr(structure_formula.tempfile, "tempdir", str(tmp_path))
+    return structure_formula
+
+
 class TestStructuresAPI:
     def test_list_structures_returns_current_users_non_deleted_structures_newest_first(
         self,
@@ -629,22 +671,42 @@ class TestStructuresAPI:
         assert response.status_code == 404
         assert response.json()["detail"] == "Structure not found."
 
+    def test_formula_parses_plain_xyz_in_memory(self, client, monkeypatch, tmp_path):
+        """
+        POST /structures/formula should return a Hill-order formula for plain XYZ without ASE or temp files.
+        """
+        structure_formula = _inline_formula_pool(monkeypatch, tmp_path)
+
+        def fail_read(_path):
+            raise AssertionError("ASE should not be used for plain XYZ")
+
+        monkeypatch.setattr(structure_formula, "_ase_read", fail_read)
+
+        response = client.post(
+            "/structures/formula",
+            files=_structure_file(
+                content=b"6\nmethanol\nO 0 0 1.4\nH 0 0 2\nC 0 0 0\nH 1 0 0\nH -1 0 0\nH 0 1 0\n"
+            ),
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"formula": "CH4O"}
+        assert not list(tmp_path.iterdir())
+
     def test_formula_returns_ase_formula_and_removes_temp_file(
         self, client, monkeypatch, tmp_path
     ):
         """
         POST /structures/formula should return the ASE formula and clean up its temp file.
         """
-        import structures.routes as structures_routes
-
-        monkeypatch.chdir(tmp_path)
+        structure_formula = _inline_formula_pool(monkeypatch, tmp_path)
         read_calls = []
 
         def fake_read(path):
             read_calls.append(path)
             return SimpleNamespace(get_chemical_formula=lambda: "H2O")
 
-        monkeypatch.setattr(structures_routes, "read", fake_read)
+        monkeypatch.setattr(structure_formula, "_ase_read", fake_read)
 
         response = client.post(
             "/structures/formula",
@@ -662,9 +724,7 @@ class TestStructuresAPI:
         """
         POST /structures/formula should use Pymatgen when ASE cannot parse the file.
         """
-        import structures.routes as structures_routes
-
-        monkeypatch.chdir(tmp_path)
+        structure_formula = _inline_formula_pool(monkeypatch, tmp_path)
         pymatgen_calls = []
 
         def fake_read(_path):
@@ -674,8 +734,8 @@ class TestStructuresAPI:
             pymatgen_calls.append(path)
             return SimpleNamespace(composition=SimpleNamespace(reduced_formula="CO2"))
 
-        monkeypatch.setattr(structures_routes, "read", fake_read)
-        monkeypatch.setattr(structures_routes.Molecule, "from_file", fake_from_file)
+        monkeypatch.setattr(structure_formula, "_ase_read", fake_read)
+        monkeypatch.setattr(structure_formula, "_pymatgen_molecule_from_file", fake_from_file)
 
         response = client.post(
             "/structures/formula",
@@ -693,9 +753,7 @@ class TestStructuresAPI:
         """
         Invalid molecular files should return 400 and still clean up the temp file.
         """
-        import structures.routes as structures_routes
-
-        monkeypatch.chdir(tmp_path)
+        structure_formula = _inline_formula_pool(monkeypatch, tmp_path)
 
         def fake_read(_path):
             raise ValueError("ASE failed")
@@ -703,8 +761,8 @@ class TestStructuresAPI:
         def fake_from_file(_path):
             raise ValueError("Pymatgen failed")
 
-        monkeypatch.setattr(structures_routes, "read", fake_read)
-        monkeypatch.setattr(structures_routes.Molecule, "from_file", fake_from_file)
+        monkeypatch.setattr(structure_formula, "_ase_read", fake_read)
+        monkeypatch.setattr(structure_formula, "_pymatgen_molecule_from_file", fake_from_file)
 
         response = client.post(
             "/structures/formula",
@@ -712,7 +770,7 @@ class TestStructuresAPI:
         )
 
         assert response.status_code == 400
-        assert response.json()["detail"].startswith("Could not calculate formula:")
+        assert response.json()["detail"] == "Could not calculate formula: Pymatgen failed"
         assert not list(tmp_path.glob("temp_*.xyz"))
 
     def test_create_structure_saves_uploads_persists_and_links_tags(
@@ -746,7 +804,7 @@ class TestStructuresAPI:
             },
             files=_structure_upload_files(
                 filename="../unsafe/input.xyz",
-                content=b"saved structure content",
+                content=WATER_XYZ,
                 image_content=b"saved image content",
             ),
         )
@@ -764,7 +822,7 @@ class TestStructuresAPI:
         assert sorted(result["tags"]) == ["existing", "new"]
 
         saved_file = tmp_path / str(structure_id) / "input.xyz"
-        assert saved_file.read_bytes() == b"saved structure content"
+        assert saved_file.read_bytes() == WATER_XYZ
         assert not (tmp_path / str(structure_id) / "unsafe").exists()
         assert fake_s3.upload_file_calls == [
             (
@@ -789,12 +847,208 @@ class TestStructuresAPI:
         assert structure.location == f"s3://test-bucket/structures/{structure_id}.xyz"
         assert structure.notes == "created structure"
         assert structure.is_deleted is False
+        assert structure.fingerprint == fingerprint_xyz(WATER_XYZ).fingerprint
+        assert structure.near_fingerprint == fingerprint_xyz(WATER_XYZ).near_fingerprint
+        assert structure.composition == {"H": 2, "O": 1}
+        assert structure.heavy_atom_count == 1
+        assert structure.content_hash is None
+        assert fake_s3.objects == {}
         assert sorted(tag.name for tag in structure.tags) == ["existing", "new"]
 
         existing_tags = db.query(Tags).filter_by(user_sub=user.user_sub, name="existing").all()
         assert [tag.tag_id for tag in existing_tags] == [existing_tag.tag_id]
         assert db.query(Tags).filter_by(user_sub=user.user_sub, name="new").one()
 
+    def test_create_structure_without_image_uses_rendered_thumbnail(
+        self, client, monkeypatch, tmp_path, user_factory
+    ):
+        """
+        POST /structures/ should copy the large rendered thumbnail to the
+        structure image when no image is uploaded.
+        """
+        fake_s3 = _mock_structure_s3(monkeypatch)
+        monkeypatch.setattr("structures.routes.JOB_DIR", str(tmp_path))
+        user_factory(user_sub="auth0|testuser")
+
+        response = client.post(
+            "/structures/",
+            data={"name": "Water", "formula": "H2O"},
+            files=_structure_file(content=WATER_XYZ),
+        )
+
+        assert response.status_code == 200
+        structure_id = response.json()["structure_id"]
+        large_key = f"thumbnails/{hashlib.sha256(WATER_XYZ).hexdigest()}/large.png"
+        assert fake_s3.upload_fileobj_calls == []
+        assert fake_s3.copy_object_calls == [(large_key, f"structures/{structure_id}.png")]
+        assert fake_s3.objects[large_key].startswith(b"\x89PNG\r\n\x1a\n")
+
+    def test_create_structure_reuses_cached_thumbnails(
+        self, client, monkeypatch, tmp_path, user_factory
+    ):
+        """
+        POST /structures/ should not render thumbnails again for a file whose
+        thumbnails are already stored.
+        """
+        import structures.routes as structures_routes
+
+        fake_s3 = _mock_structure_s3(monkeypatch)
+        monkeypatch.setattr(structures_routes, "JOB_DIR", str(tmp_path))
+        content_hash = hashlib.sha256(WATER_XYZ).hexdigest()
+        for size in ("small", "medium", "large"):
+            fake_s3.objects[f"thumbnails/{content_hash}/{size}.png"] = b"cached"
+
+        render_requests = []
+        fingerprint_and_render_upload = structures_routes.fingerprint_and_render_upload
+
+        def record_render(content, render_thumbnails):
+            render_requests.append(render_thumbnails)
+            return fingerprint_and_render_upload(content, render_thumbnails)
+
+        monkeypatch.setattr(structures_routes, "fingerprint_and_render_upload", record_render)
+        user_factory(user_sub="auth0|testuser")
+
+        response = client.post(
+            "/structures/",
+            data={"name": "Water", "formula": "H2O"},
+            files=_structure_file(content=WATER_XYZ),
+        )
+
+        assert response.status_code == 200
+        assert render_requests == [False]
+        assert fake_s3.objects[f"thumbnails/{content_hash}/large.png"] == b"cached"
+
+    def test_create_structure_with_image_parses_once_without_rendering(
+        self, client, monkeypatch, tmp_path, user_factory
+    ):
+        """
+        POST /structures/ should fingerprint the file in a single pool task
+        and skip thumbnail rendering when the client supplies an image.
+        """
+        import structure_thumbnail
+        import structures.routes as structures_routes
+
+        _mock_structure_s3(monkeypatch)
+        monkeypatch.setattr(structures_routes, "JOB_DIR", str(tmp_path))
+        submitted = []
+        monkeypatch.setattr(
+            process_pool.structure_pool,
+            "run",
+            lambda fn, *args: submitted.append(fn) or fn(*args),
+        )
+
+        def fail_render(frame):
+            raise AssertionError("thumbnails should not be rendered")
+
+        monkeypatch.setattr(structure_thumbnail, "render_frame_thumbnails", fail_render)
+        user_factory(user_sub="auth0|testuser")
+
+        response = client.post(
+            "/structures/",
+            data={"name": "Water", "formula": "H2O"},
+            files=_structure_upload_files(content=WATER_XYZ),
+        )
+
+        assert response.status_code == 200
+        assert submitted == [structure_thumbnail.fingerprint_and_render_xyz]
+
+    def test_list_structures_links_requested_thumbnail_size(
+        self, client, monkeypatch, set_auth_user, structure_factory, user_factory
+    ):
+        fake_s3 = _mock_structure_s3(monkeypatch)
+        user = user_factory(user_sub="auth0|testuser")
+        structure_factory(
+            user_sub=user.user_sub,
+            content_hash="abc123",
+            uploaded_at=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        )
+        legacy = structure_factory(
+            user_sub=user.user_sub,
+            uploaded_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get("/structures/", params={"thumbnail_size": "small"})
+
+        assert response.status_code == 200
+        assert [result["imageS3URL"] for result in response.json()] == [
+            "presigned:thumbnails/abc123/small.png",
+            f"presigned:structures/{legacy.structure_id}.png",
+        ]
+
+    def test_list_structures_returns_requested_fields_without_presigning(
+        self, client, monkeypatch, structure_factory, tag_factory, user_factory
+    ):
+        fake_s3 = _mock_structure_s3(monkeypatch)
+        user = user_factory(user_sub="auth0|testuser")
+        structure = structure_factory(
+            user_sub=user.user_sub,
+            name="Water",
+            tags=[tag_factory(user_sub=user.user_sub, name="favorite")],
+        )
+
+        response = client.get("/structures/", params={"fields": "name"})
+
+        assert response.status_code == 200
+        assert response.json() == [{"structure_id": str(structure.structure_id), "name": "Water"}]
+        assert fake_s3.calls == []
+
+    def test_get_structure_by_id_includes_tags_only_when_requested(
+        self, client, structure_factory, tag_factory, user_factory
+    ):
+        user = user_factory(user_sub="auth0|testuser")
+        structure = structure_factory(
+            user_sub=user.user_sub,
+            formula="H2O",
+            tags=[tag_factory(user_sub=user.user_sub, name="favorite")],
+        )
+
+        plain = client.get(f"/structures/{structure.structure_id}", params={"fields": "formula"})
+        tagged = client.get(
+            f"/structures/{structure.structure_id}",
+            params={"fields": "formula", "include": "tags"},
+        )
+
+        assert plain.json() == {"structure_id": str(structure.structure_id), "formula": "H2O"}
+        assert tagged.json()["tags"] == ["favorite"]
+
+    def test_create_structure_rejects_malformed_xyz_content(
+        self, client, db, monkeypatch, tmp_path, user_factory
+    ):
+        """
+        POST /structures/ should reject files the XYZ parser cannot read before uploading anything.
+        """
+        fake_s3 = _mock_structure_s3(monkeypatch)
+        monkeypatch.setattr("structures.routes.JOB_DIR", str(tmp_path))
+        user_factory(user_sub="auth0|testuser")
+
+        response = client.post(
+            "/structures/",
+            data={"name": "Water", "formula": "H2O"},
+            files=_structure_upload_files(content=b"1\n\nXx 0 0 0\n"),
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid XYZ file: Frame 1, atom 1: unknown element 'Xx'"
+        assert fake_s3.upload_file_calls == []
+        assert db.query(Structure).count() == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_formula_returns_503_when_structure_pool_is_saturated(self, client, monkeypatch):
+        import structures.routes as structures_routes
+        from process_pool import BoundedProcessPool
+
+        monkeypatch.setattr(
+            structures_routes,
+            "structure_pool",
+            BoundedProcessPool(max_workers=0, max_pending=0),
+        )
+
+        response = client.post("/structures/formula", files=_structure_file())
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
     def test_create_structure_rolls_back_and_removes_files_when_commit_fails(
         self, client, db, monkeypatch, tmp_path, user_factory
     ):
@@ -818,7 +1072,7 @@ class TestStructuresAPI:
                 "notes": "created structure",
                 "tags": ["new"],
             },
-            files=_structure_upload_files(content=b"saved structure content"),
+            files=_structure_upload_files(content=WATER_XYZ),
         )
 
         assert response.status_code == 500
@@ -826,3 +1080,578 @@ class TestStructuresAPI:
         assert db.query(Structure).count() == 0
         assert db.query(Tags).filter_by(user_sub="auth0|testuser", name="new").first() is None
         assert list(tmp_path.iterdir()) == []
+
+
+class TestTagUsageAPI:
+    def test_tag_usage_counts_live_jobs_and_structures_in_one_query(
+        self,
+        client,
+        job_factory,
+        sql_statements,
+        structure_factory,
+        tag_factory,
+        user_factory,
+    ):
+        user_factory(user_sub="auth0|testuser")
+        other = user_factory(user_sub="auth0|other")
+        solvent = tag_factory(user_sub="auth0|testuser", name="solvent")
+        paper = tag_factory(user_sub="auth0|testuser", name="paper")
+        unused = tag_factory(user_sub="auth0|testuser", name="unused")
+        structure_factory(tags=[solvent])
+        structure_factory(tags=[solvent, paper])
+        structure_factory(tags=[paper], is_deleted=True)
+        job_factory(tags=[solvent])
+        job_factory(
+            user_sub=other.user_sub,
+            tags=[tag_factory(user_sub=other.user_sub, name="solvent")],
+        )
+        expected = [
+            {
+                "tag_id": str(solvent.tag_id),
+                "name": "solvent",
+                "job_count": 1,
+                "structure_count": 2,
+            },
+            {"tag_id": str(paper.tag_id), "name": "paper", "job_count": 0, "structure_count": 1},
+            {"tag_id": str(unused.tag_id), "name": "unused", "job_count": 0, "structure_count": 0},
+        ]
+        sql_statements.clear()
+
+        response = client.get("/structures/tags/usage")
+
+        assert response.status_code == 200
+        assert response.json() == expected
+        assert len([
+            statement for statement in sql_statements if "FROM tags" in statement
+        ]) == 1
+
+    def test_tag_usage_is_cached_and_revalidated_by_etag(
+        self, client, sql_statements, structure_factory, tag_factory, user_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        structure_factory(tags=[tag_factory(user_sub="auth0|testuser", name="solvent")])
+        first = client.get("/structures/tags/usage")
+        sql_statements.clear()
+
+        second = client.get(
+            "/structures/tags/usage",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        assert second.status_code == 304
+        assert not [statement for statement in sql_statements if "FROM tags" in statement]
+
+    def test_tag_usage_is_refreshed_when_tags_change(
+        self, client, structure_factory, tag_factory, user_factory
+    ):
+        """
+        set_asset_tags should drop the cached counts once the update commits.
+        """
+        user_factory(user_sub="auth0|testuser")
+        structure = structure_factory(
+            tags=[tag_factory(user_sub="auth0|testuser", name="solvent")],
+        )
+        assert [tag["name"] for tag in client.get("/structures/tags/usage").json()] == [
+            "solvent"
+        ]
+
+        response = client.patch(
+            f"/structures/{structure.structure_id}",
+            data={"name": "Water", "formula": "H2O", "tags": ["polar"]},
+        )
+        usage = client.get("/structures/tags/usage").json()
+
+        assert response.status_code == 200
+        assert [(tag["name"], tag["structure_count"]) for tag in usage] == [
+            ("polar", 1),
+            ("solvent", 0),
+        ]
+
+    def test_tag_usage_is_refreshed_when_a_tagged_structure_is_deleted(
+        self, client, structure_factory, tag_factory, user_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        structure = structure_factory(
+            tags=[tag_factory(user_sub="auth0|testuser", name="solvent")],
+        )
+        client.get("/structures/tags/usage")
+
+        client.delete(f"/structures/{structure.structure_id}")
+
+        assert client.get("/structures/tags/usage").json()[0]["structure_count"] == 0
+
+    def test_bulk_tag_update_refreshes_tag_usage(
+        self, client, structure_factory, user_factory
+    ):
+        """
+        PATCH /structures/tags should tag every structure and drop cached counts.
+        """
+        user_factory(user_sub="auth0|testuser")
+        structure_ids = [str(structure_factory().structure_id) for _ in range(2)]
+        assert client.get("/structures/tags/usage").json() == []
+
+        response = client.patch(
+            "/structures/tags",
+            json={"structure_ids": structure_ids, "add": ["solvent"]},
+        )
+        usage = client.get("/structures/tags/usage").json()
+
+        assert response.json() == {
+            "results": [
+                {"structure_id": structure_id, "status_code": 200}
+                for structure_id in structure_ids
+            ]
+        }
+        assert [(tag["name"], tag["structure_count"]) for tag in usage] == [("solvent", 2)]
+
+    def test_bulk_delete_refreshes_tag_usage(
+        self, client, db, sql_statements, structure_factory, tag_factory, user_factory
+    ):
+        """
+        POST /structures/delete should soft-delete every structure with one
+        UPDATE and drop the cached counts of their tag owners.
+        """
+        user_factory(user_sub="auth0|testuser")
+        other = user_factory(user_sub="auth0|other")
+        solvent = tag_factory(user_sub="auth0|testuser", name="solvent")
+        structures = [structure_factory(tags=[solvent]) for _ in range(2)]
+        kept = structure_factory(tags=[solvent])
+        foreign = structure_factory(user_sub=other.user_sub)
+        structure_ids = [str(structure.structure_id) for structure in structures]
+        assert client.get("/structures/tags/usage").json()[0]["structure_count"] == 3
+        sql_statements.clear()
+
+        response = client.post(
+            "/structures/delete",
+            json={"structure_ids": structure_ids + [str(foreign.structure_id)]},
+        )
+
+        assert response.status_code == 200
+        assert [result["status_code"] for result in response.json()["results"]] == [
+            200,
+            200,
+            403,
+        ]
+        assert len([s for s in sql_statements if s.startswith("UPDATE structures")]) == 1
+        assert client.get("/structures/tags/usage").json()[0]["structure_count"] == 1
+        db.expire_all()
+        assert db.get(Structure, kept.structure_id).is_deleted is False
+        assert db.get(Structure, foreign.structure_id).is_deleted is False
+
+    def test_bulk_visibility_update_reports_per_structure_results(
+        self, client, db, structure_factory, user_factory
+    ):
+        user_factory(user_sub="auth0|testuser")
+        other = user_factory(user_sub="auth0|other")
+        owned = structure_factory()
+        foreign = structure_factory(user_sub=other.user_sub)
+        deleted = structure_factory(is_deleted=True)
+
+        response = client.patch(
+            "/structures/visibility",
+            json={
+                "structure_ids": [
+                    str(owned.structure_id),
+                    str(foreign.structure_id),
+                    str(deleted.structure_id),
+                ],
+                "is_public": True,
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status_code"] for result in results] == [200, 403, 404]
+        assert results[2]["detail"] == "Structure not found."
+        db.expire_all()
+        assert db.get(Structure, owned.structure_id).is_public is True
+        assert db.get(Structure, foreign.structure_id).is_public is False
+
+
+def test_tag_usage_cache_expires_entries():
+    cache = TagUsageCache(max_age=0)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return b"[]"
+
+    cache.get_or_load("auth0|user", load)
+    cache.get_or_load("auth0|user", load)
+
+    assert len(loads) == 2
+
+
+def test_tag_usage_cache_drops_load_started_before_invalidation():
+    cache = TagUsageCache()
+    loads = []
+
+    def stale_load():
+        # A commit lands while the counts are being queried.
+        cache.invalidate(["auth0|user"])
+        loads.append("stale")
+        return b'["stale"]'
+
+    def fresh_load():
+        loads.append("fresh")
+        return b'["fresh"]'
+
+    stale = cache.get_or_load("auth0|user", stale_load)
+    fresh = cache.get_or_load("auth0|user", fresh_load)
+
+    assert stale.body == b'["stale"]'
+    assert fresh.body == b'["fresh"]'
+    assert loads == ["stale", "fresh"]
+    assert cache.get_or_load("auth0|user", stale_load).body == b'["fresh"]'
+
+
+def test_tag_usage_cache_keeps_generations_only_during_loads():
+    cache = TagUsageCache()
+    cache.invalidate([f"auth0|user{index}" for index in range(100)])
+
+    def failing_load():
+        raise RuntimeError("database unavailable")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("auth0|user", failing_load)
+    cache.get_or_load("auth0|user", lambda: b"[]")
+
+    assert cache._generations == {}
+    assert cache._loading == {}
+
+
+def test_tag_usage_cache_clear_drops_load_in_flight():
+    cache = TagUsageCache()
+
+    def load_during_clear():
+        cache.clear()
+        return b'["stale"]'
+
+    cache.get_or_load("auth0|user", load_during_clear)
+
+    assert cache.get_or_load("auth0|user", lambda: b'["fresh"]').body == b'["fresh"]'
+
+
+class TestStructureSearchAPI:
+    def test_search_returns_readable_structures_with_same_fingerprint(
+        self, client, group_factory, set_auth_user, structure_factory, user_factory
+    ):
+        """
+        POST /structures/search should find exact duplicates the user can read.
+        """
+        group = group_factory()
+        user = user_factory(group=group, user_sub="auth0|searcher")
+        other = user_factory(user_sub="auth0|other")
+        fingerprint = fingerprint_xyz(WATER_XYZ)
+        own = structure_factory(user_sub=user.user_sub, fingerprint=fingerprint.fingerprint)
+        shared = structure_factory(
+            user_sub=None,
+            group_id=group.group_id,
+            is_public=True,
+            fingerprint=fingerprint.fingerprint,
+        )
+        structure_factory(user_sub=other.user_sub, fingerprint=fingerprint.fingerprint)
+        structure_factory(
+            user_sub=user.user_sub,
+            fingerprint=fingerprint.fingerprint,
+            is_deleted=True,
+        )
+        structure_factory(user_sub=user.user_sub, fingerprint="H2O:other")
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.post(
+            "/structures/search",
+            files=_structure_file(content=b"3\n\nH 0.93 0 -0.24\nO 0 0 0\nH 0 0 0.96\n"),
+        )
+
+        assert response.status_code == 200
+        assert {result["structure_id"] for result in response.json()} == {
+            str(own.structure_id),
+            str(shared.structure_id),
+        }
+
+    def test_search_histogram_match_uses_near_fingerprint(
+        self, client, set_auth_user, structure_factory, user_factory
+    ):
+        user = user_factory(user_sub="auth0|searcher")
+        near = structure_factory(
+            user_sub=user.user_sub,
+            fingerprint="H2O:different",
+            near_fingerprint=fingerprint_xyz(WATER_XYZ).near_fingerprint,
+        )
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        exact = client.post("/structures/search", files=_structure_file(content=WATER_XYZ))
+        histogram_response = client.post(
+            "/structures/search?match=histogram",
+            files=_structure_file(content=WATER_XYZ),
+        )
+
+        assert exact.json() == []
+        assert [result["structure_id"] for result in histogram_response.json()] == [
+            str(near.structure_id)
+        ]
+
+    def test_search_pages_matches_most_recent_first(
+        self, client, set_auth_user, structure_factory, user_factory
+    ):
+        user = user_factory(user_sub="auth0|searcher")
+        fingerprint = fingerprint_xyz(WATER_XYZ).fingerprint
+        structures = [
+            structure_factory(
+                user_sub=user.user_sub,
+                fingerprint=fingerprint,
+                uploaded_at=datetime(2024, 1, day, tzinfo=timezone.utc),
+            )
+            for day in (1, 2, 3)
+        ]
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.post(
+            "/structures/search",
+            params={"limit": 1, "offset": 1},
+            files=_structure_file(content=WATER_XYZ),
+        )
+
+        assert response.status_code == 200
+        assert [result["structure_id"] for result in response.json()] == [
+            str(structures[1].structure_id)
+        ]
+
+    def test_search_lookup_uses_fingerprint_index(
+        self, client, set_auth_user, sql_statements, user_factory
+    ):
+        user = user_factory(user_sub="auth0|searcher")
+        set_auth_user(make_auth0_payload(user.user_sub))
+        sql_statements.clear()
+
+        client.post("/structures/search", files=_structure_file(content=WATER_XYZ))
+
+        structure_queries = [
+            statement for statement in sql_statements if "FROM structures" in statement
+        ]
+        assert len(structure_queries) == 1
+        assert "structures.fingerprint = " in structure_queries[0]
+
+    def test_search_rejects_invalid_xyz(self, client, set_auth_user, user_factory):
+        user = user_factory(user_sub="auth0|searcher")
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.post("/structures/search", files=_structure_file(content=b"nope"))
+
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("Invalid XYZ file:")
+
+
+class TestStructureTextSearchAPI:
+    def test_text_search_ranks_readable_structures(
+        self, client, group_factory, set_auth_user, structure_factory, user_factory
+    ):
+        """
+        GET /structures/search should rank readable name and notes matches.
+        """
+        group = group_factory()
+        user = user_factory(group=group, user_sub="auth0|searcher")
+        named = structure_factory(
+            user_sub=user.user_sub,
+            name="Caffeine caffeine conformer",
+        )
+        noted = structure_factory(
+            user_sub=user.user_sub,
+            name="Conformer 2",
+            notes="Lowest caffeine conformer from the scan",
+        )
+        structure_factory(
+            user_sub=None,
+            group_id=group.group_id,
+            is_public=False,
+            name="Private caffeine",
+        )
+        structure_factory(user_sub=user.user_sub, name="Caffeine", is_deleted=True)
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get("/structures/search", params={"q": "caffeine"})
+
+        assert response.status_code == 200
+        assert [result["structure_id"] for result in response.json()] == [
+            str(named.structure_id),
+            str(noted.structure_id),
+        ]
+
+    def test_text_search_joins_the_search_table(
+        self, client, set_auth_user, sql_statements, structure_factory, user_factory
+    ):
+        user = user_factory(user_sub="auth0|searcher")
+        structure_factory(user_sub=user.user_sub, name="Caffeine")
+        set_auth_user(make_auth0_payload(user.user_sub))
+        sql_statements.clear()
+
+        client.get("/structures/search", params={"q": "caffeine", "include": ""})
+
+        structure_queries = [
+            statement for statement in sql_statements if "FROM structures" in statement
+        ]
+        assert len(structure_queries) == 1
+        assert "structures_search MATCH" in structure_queries[0]
+
+
+class TestStructureTagFilterAPI:
+    def test_tagged_structures_match_all_or_any_tags(
+        self, client, set_auth_user, structure_factory, tag_factory, user_factory
+    ):
+        user = user_factory(user_sub="auth0|tagger")
+        solvent = tag_factory(user_sub=user.user_sub, name="solvent")
+        polar = tag_factory(user_sub=user.user_sub, name="polar")
+        water = structure_factory(user_sub=user.user_sub, tags=[solvent, polar])
+        hexane = structure_factory(user_sub=user.user_sub, tags=[solvent])
+        structure_factory(user_sub=user.user_sub, tags=[solvent, polar], is_deleted=True)
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        every = client.get("/structures/tagged", params={"tag": ["solvent", "polar"]})
+        either = client.get(
+            "/structures/tagged",
+            params={"tag": ["solvent", "polar"], "match": "any", "fields": "name"},
+        )
+
+        assert [result["structure_id"] for result in every.json()] == [
+            str(water.structure_id)
+        ]
+        assert sorted(either.json(), key=lambda result: result["name"]) == sorted(
+            [
+                {"structure_id": str(water.structure_id), "name": water.name},
+                {"structure_id": str(hexane.structure_id), "name": hexane.name},
+            ],
+            key=lambda result: result["name"],
+        )
+
+
+class TestStructureCompositionAPI:
+    def test_composition_search_matches_all_elements_and_heavy_atom_range(
+        self, client, set_auth_user, structure_factory, user_factory
+    ):
+        """
+        GET /structures/composition should return the user's structures that
+        contain every element and fit the heavy atom range.
+        """
+        user = user_factory(user_sub="auth0|composition")
+        other = user_factory(user_sub="auth0|other")
+        pyridine = structure_factory(
+            user_sub=user.user_sub,
+            composition={"C": 5, "H": 5, "N": 1},
+            heavy_atom_count=6,
+        )
+        structure_factory(
+            user_sub=user.user_sub,
+            composition={"C": 6, "H": 6},
+            heavy_atom_count=6,
+        )
+        structure_factory(
+            user_sub=user.user_sub,
+            composition={"C": 24, "H": 12, "N": 2},
+            heavy_atom_count=26,
+        )
+        structure_factory(
+            user_sub=user.user_sub,
+            composition={"C": 5, "H": 5, "N": 1},
+            heavy_atom_count=6,
+            is_deleted=True,
+        )
+        structure_factory(
+            user_sub=other.user_sub,
+            composition={"C": 5, "H": 5, "N": 1},
+            heavy_atom_count=6,
+        )
+        structure_factory(user_sub=user.user_sub)
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get(
+            "/structures/composition",
+            params={"elements": ["C", "N"], "max_heavy_atoms": 20},
+        )
+
+        assert response.status_code == 200
+        assert [result["structure_id"] for result in response.json()] == [
+            str(pyridine.structure_id)
+        ]
+
+    def test_composition_search_filters_by_heavy_atoms_only(
+        self, client, set_auth_user, structure_factory, user_factory
+    ):
+        user = user_factory(user_sub="auth0|composition")
+        small = structure_factory(
+            user_sub=user.user_sub,
+            composition={"H": 2, "O": 1},
+            heavy_atom_count=1,
+        )
+        structure_factory(
+            user_sub=user.user_sub,
+            composition={"C": 6, "H": 6},
+            heavy_atom_count=6,
+        )
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get("/structures/composition", params={"max_heavy_atoms": 2})
+
+        assert [result["structure_id"] for result in response.json()] == [
+            str(small.structure_id)
+        ]
+
+    def test_composition_search_rejects_unknown_elements(
+        self, client, set_auth_user, user_factory
+    ):
+        user = user_factory(user_sub="auth0|composition")
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get("/structures/composition", params={"elements": ["Xx"]})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown element: Xx"
+
+    def test_composition_search_rejects_inverted_heavy_atom_range(
+        self, client, set_auth_user, user_factory
+    ):
+        user = user_factory(user_sub="auth0|composition")
+        set_auth_user(make_auth0_payload(user.user_sub))
+
+        response = client.get(
+            "/structures/composition",
+            params={"min_heavy_atoms": 5, "max_heavy_atoms": 2},
+        )
+
+        assert response.status_code == 400
+
+
+class TestVisibleStructuresAPI:
+    def test_lists_every_readable_structure_newest_first(
+        self, client, group_factory, structure_factory, user_factory
+    ):
+        """
+        GET /structures/visible should include group structures next to the
+        user's own, and writable=true should keep only editable ones.
+        """
+        group = group_factory()
+        user = user_factory(group=group, user_sub="auth0|testuser")
+        other = user_factory(user_sub="auth0|other")
+        now = datetime.now(timezone.utc)
+        own = structure_factory(user_sub=user.user_sub, uploaded_at=now - timedelta(minutes=2))
+        public = structure_factory(
+            user_sub=None,
+            group_id=group.group_id,
+            is_public=True,
+            uploaded_at=now - timedelta(minutes=1),
+        )
+        structure_factory(user_sub=None, group_id=group.group_id, is_public=False)
+        structure_factory(user_sub=other.user_sub, is_public=True)
+
+        visible = client.get("/structures/visible", params={"fields": "structure_id"})
+        writable = client.get(
+            "/structures/visible",
+            params={"fields": "structure_id", "writable": "true"},
+        )
+
+        assert visible.status_code == 200
+        assert visible.json() == [
+            {"structure_id": str(public.structure_id)},
+            {"structure_id": str(own.structure_id)},
+        ]
+        assert writable.json() == [{"structure_id": str(own.structure_id)}]
@@ -0,0 +1,104 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from trajectory_store import Trajectory, TrajectoryStore, parse_trajectory, write_trajectory
+from xyz_parser import XYZParseError
+
+
+def _trajectory_xyz(frame_count, atom_count=2):
+    return "".join(
+        f"{atom_count}\nstep {frame}\n"
+        + "".join(f"H {frame} {atom} 0.5\n" for atom in range(atom_count))
+        for frame in range(frame_count)
+    ).encode()
+
+
+class TestParseTrajectory:
+    def test_parses_frames_into_flat_arrays(self):
+        parsed = parse_trajectory(b"1\nfirst\nO 0 0 0\n2\nsecond\nO 1 0 0\nH 1 0 0.96\n")
+
+        assert parsed.offsets.tolist() == [0, 1, 3]
+        assert parsed.symbols.tolist() == [b"O", b"O", b"H"]
+        assert parsed.positions.dtype == np.float32
+        assert parsed.positions.shape == (3, 3)
+        assert parsed.comments == ["first", "second"]
+
+    def test_rejects_non_numeric_coordinates(self):
+        with pytest.raises(XYZParseError):
+            parse_trajectory(b"1\n\nO zero 0 0\n")
+
+    def test_rejects_empty_content(self):
+        with pytest.raises(XYZParseError):
+            parse_trajectory(b"")
+
+
+class TestTrajectory:
+    def test_reads_frames_from_memory_mapped_arrays(self, tmp_path):
+        write_trajectory(parse_trajectory(_trajectory_xyz(5)), tmp_path / "job")
+
+        trajectory = Trajectory(tmp_path / "job")
+
+        assert isinstance(trajectory.positions, np.memmap)
+        assert trajectory.frame_count == 5
+        assert trajectory.frame(3) == {
+            "index": 3,
+            "comment": "step 3",
+            "symbols": ["H", "H"],
+            "positions": [[3.0, 0.0, 0.5], [3.0, 1.0, 0.5]],
+        }
+        assert [frame["index"] for frame in trajectory.frames(range(5)[::2])] == [0, 2, 4]
+
+
+class TestTrajectoryStore:
+    def test_ingests_each_key_once(self, tmp_path):
+        store = TrajectoryStore(str(tmp_path))
+        loads = []
+        barrier = threading.Barrier(4)
+
+        def load():
+            loads.append(1)
+            return parse_trajectory(_trajectory_xyz(3))
+
+        def read():
+            barrier.wait()
+            return store.get_or_ingest("job", load).frame_count
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loads == [1]
+        assert store.get_or_ingest("job", load).frame_count == 3
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["job"]
+
+    def test_failed_load_leaves_nothing_behind(self, tmp_path):
+        store = TrajectoryStore(str(tmp_path))
+
+        def load():
+            raise RuntimeError("download failed")
+
+        with pytest.raises(RuntimeError):
+            store.get_or_ingest("job", load)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_evicts_least_recently_read_beyond_max_bytes(self, tmp_path):
+        store = TrajectoryStore(str(tmp_path), max_bytes=None)
+        for key in ("old", "recent"):
+            store.get_or_ingest(key, lambda: parse_trajectory(_trajectory_xyz(3)))
+        os.utime(tmp_path / "old", (1, 1))
+        os.utime(tmp_path / "recent", (2, 2))
+        one_artifact = sum(path.stat().st_size for path in (tmp_path / "old").iterdir())
+        store.max_bytes = 2 * one_artifact
+        store.get_or_ingest("old", lambda: pytest.fail("old is still stored"))
+
+        store.get_or_ingest("new", lambda: parse_trajectory(_trajectory_xyz(3)))
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["new", "old"]
+        reingested = store.get_or_ingest("recent", lambda: parse_trajectory(_trajectory_xyz(2)))
+        assert reingested.frame_count == 2
@@ -5,9 +5,9 @@ import pytest
 from sqlalchemy.exc import IntegrityError
 
 from utils import (
-    clean_up_upload_cache,
     commit_or_rollback,
     get_user_sub,
+    parse_byte_range,
 )
 
 
@@ -238,26 +238,29 @@ class TestGetUserSub:
         assert exc_info.value.detail == "Unauthorized"
 
 
-class TestCleanUpUploadCache:
-    def test_removes_existing_directory(self, tmp_path):
-        """
-        clean_up_upload_cache should remove an existing job upload directory.
-        """
-        job_dir = tmp_path / "job-cache"
-        nested_dir = job_dir / "nested"
-        nested_dir.mkdir(parents=True)
-        (nested_dir / "input.xyz").write_text("1\nH\n", encoding="utf-8")
-
-        clean_up_upload_cache(str(job_dir))
-
-        assert not job_dir.exists()
-
-    def test_missing_directory_does_not_fail(self, tmp_path):
-        """
-        clean_up_upload_cache should be safe to call for paths that do not exist.
-        """
-        missing_dir = tmp_path / "missing-job-cache"
+class TestParseByteRange:
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("bytes=0-9", (0, 10)),
+            ("bytes=90-", (90, 100)),
+            ("bytes=-10", (90, 100)),
+            ("bytes=95-200", (95, 100)),
+            ("bytes=-500", (0, 100)),
+        ],
+    )
+    def test_parses_single_ranges(self, header, expected):
+        assert parse_byte_range(header, 100) == expected
+
+    @pytest.mark.parametrize("header", [None, "", "items=0-9", "bytes=0-9,20-29", "bytes=a-b"])
+    def test_returns_none_for_whole_body(self, header):
+        assert parse_byte_range(header, 100) is None
+
+    @pytest.mark.parametrize("header", ["bytes=100-", "bytes=50-10"])
+    def test_rejects_unsatisfiable_ranges(self, header):
+        with pytest.raises(HTTPException) as exc_info:
+            parse_byte_range(header, 100)
 
-        clean_up_upload_cache(str(missing_dir))
+        assert exc_info.value.status_code == 416
+        assert exc_info.value.headers == {"Content-Range": "bytes */100"}
 
-        assert not missing_dir.exists()
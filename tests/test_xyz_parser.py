@@ -0,0 +1,70 @@
+import pytest
+
+from xyz_parser import XYZParseError, count_xyz_frames, split_xyz_frames, xyz_formula
+
+
+class TestSplitXYZFrames:
+    def test_single_frame_is_returned_unchanged(self):
+        content = b"2\nhydrogen\nH 0 0 0\nH 0 0 0.74\n"
+
+        assert split_xyz_frames(content) == [content]
+
+    def test_multi_frame_file_is_split_and_blank_lines_skipped(self):
+        first = b"1\nfirst\nHe 0 0 0\n"
+        second = b"1\nsecond\nHe 0 0 1\n"
+
+        assert split_xyz_frames(first + b"\n" + second) == [first, second]
+
+    @pytest.mark.parametrize(
+        "content, message",
+        [
+            (b"", "XYZ file is empty"),
+            (b"two\n\nH 0 0 0\n", "Invalid atom count on line 1"),
+            (b"0\n\n", "Invalid atom count on line 1"),
+            (b"3\n\nH 0 0 0\n", "Frame starting on line 1 has fewer than 3 atoms"),
+        ],
+    )
+    def test_malformed_content_raises(self, content, message):
+        with pytest.raises(XYZParseError, match=message):
+            split_xyz_frames(content)
+
+    def test_count_matches_split(self):
+        content = b"1\nfirst\nHe 0 0 0\n\n2\nsecond\nH 0 0 0\nH 0 0 1\n"
+
+        assert count_xyz_frames(content) == len(split_xyz_frames(content)) == 2
+
+    def test_count_rejects_empty_content(self):
+        with pytest.raises(XYZParseError, match="XYZ file is empty"):
+            count_xyz_frames(b"\n\n")
+
+
+class TestXYZFormula:
+    @pytest.mark.parametrize(
+        "content, formula",
+        [
+            (b"3\nwater\nO 0 0 0\nH 0 0 1\nH 0 1 0\n", "H2O"),
+            (b"5\n\nCl 0 0 0\nH 0 0 1\nC 0 1 0\nH 1 0 0\nBr 1 1 1\n", "CH2BrCl"),
+            (b"2\n\nNa 0 0 0\nCl 0 0 2.4\n", "ClNa"),
+        ],
+    )
+    def test_formula_uses_hill_order(self, content, formula):
+        assert xyz_formula(content) == formula
+
+    def test_formula_uses_last_frame(self):
+        content = b"1\nfirst\nHe 0 0 0\n\n2\nsecond\nH 0 0 0\nH 0 0 1\n"
+
+        assert xyz_formula(content) == "H2"
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"",
+            b"not an xyz file",
+            b"1\n\nXx 0 0 0\n",
+            b"1\n\nH 0 0\n",
+            b"1\n\nH 0 zero 0\n",
+        ],
+    )
+    def test_unsupported_content_raises(self, content):
+        with pytest.raises(XYZParseError):
+            xyz_formula(content)
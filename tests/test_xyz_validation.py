@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from xyz_parser import XYZParseError
+from xyz_validation import _closest_pair, normalize_xyz
+
+
+class TestNormalizeXYZ:
+    def test_normalizes_line_endings_symbols_and_columns(self):
+        content = b"3\r\n water \r\no 0 0 0 0.1\r\nH 0 0 0.96\r\nh 0.93 0 -0.24\r\n\r\n"
+
+        assert normalize_xyz(content, charge=0, multiplicity=1) == (
+            b"3\nwater\n"
+            b"O 0.00000000 0.00000000 0.00000000\n"
+            b"H 0.00000000 0.00000000 0.96000000\n"
+            b"H 0.93000000 0.00000000 -0.24000000\n"
+        )
+
+    def test_keeps_every_frame(self):
+        content = b"1\nfirst\nHe 0 0 0\n1\nsecond\nHe 0 0 1\n"
+
+        assert normalize_xyz(content).count(b"He ") == 2
+
+    @pytest.mark.parametrize(
+        "content, message",
+        [
+            (b"3\n\nH 0 0 0\nH 0 0 1\n", "fewer than 3 atoms"),
+            (b"1\n\nQ 0 0 0\n", "unknown element 'Q'"),
+            (b"1\n\nH 0 0\n", "expected a symbol and 3 coordinates"),
+            (b"1\n\nH 0 x 0\n", "coordinates must be numbers"),
+            (b"1\n\nH 0 inf 0\n", "coordinates must be finite"),
+            (b"3\n\nO 0 0 0\nH 0 0 1\nH 0 0 1.2\n", "atoms 2 and 3 are 0.200 A apart"),
+        ],
+    )
+    def test_rejects_malformed_geometry(self, content, message):
+        with pytest.raises(XYZParseError, match=message):
+            normalize_xyz(content)
+
+    @pytest.mark.parametrize(
+        "charge, multiplicity, message",
+        [
+            (0, 2, "Multiplicity 2 is impossible with 2 electrons"),
+            (1, 1, "Multiplicity 1 is impossible with 1 electrons"),
+            (0, 0, "Multiplicity must be at least 1"),
+            (3, 1, "Charge 3 leaves a negative number of electrons"),
+        ],
+    )
+    def test_rejects_charge_and_multiplicity_with_wrong_parity(
+        self, charge, multiplicity, message
+    ):
+        with pytest.raises(XYZParseError, match=message):
+            normalize_xyz(b"2\n\nH 0 0 0\nH 0 0 0.74\n", charge, multiplicity)
+
+    @pytest.mark.parametrize("charge, multiplicity", [(0, 1), (0, 3), (1, 2), (-1, 2)])
+    def test_accepts_consistent_charge_and_multiplicity(self, charge, multiplicity):
+        normalize_xyz(b"2\n\nH 0 0 0\nH 0 0 0.74\n", charge, multiplicity)
+
+
+def test_closest_pair_matches_brute_force_across_blocks(monkeypatch):
+    import xyz_validation
+
+    monkeypatch.setattr(xyz_validation, "_DISTANCE_BLOCK_ELEMENTS", 50)
+    positions = np.random.default_rng(0).random((40, 3)) * 10
+    distances = np.linalg.norm(positions[:, None] - positions[None, :], axis=-1)
+    distances[np.tril_indices(len(positions))] = np.inf
+    expected = np.unravel_index(np.argmin(distances), distances.shape)
+
+    i, j, distance = _closest_pair(positions)
+
+    assert (i, j) == tuple(int(index) for index in expected)
+    assert distance == pytest.approx(distances[expected])
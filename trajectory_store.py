@@ -0,0 +1,115 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from artifact_store import (
+    DEFAULT_ARTIFACT_STORE_MAX_BYTES,
+    ArtifactStore,
+    write_directory_atomically,
+)
+from xyz_parser import XYZParseError, split_xyz_frames
+
+# Frames are stored as one float32 coordinate array for every atom of every
+# frame, plus offsets where frame i is rows offsets[i]:offsets[i + 1].
+_POSITIONS_FILE = "positions.npy"
+_SYMBOLS_FILE = "symbols.npy"
+_OFFSETS_FILE = "offsets.npy"
+_COMMENTS_FILE = "comments.json"
+
+# Coordinates are float32, good to about 1e-6 angstrom near the origin.
+_COORDINATE_DECIMALS = 5
+
+# Element symbols have at most three letters.
+_SYMBOL_DTYPE = "S3"
+
+
+@dataclass
+class ParsedTrajectory:
+    positions: np.ndarray
+    symbols: np.ndarray
+    offsets: np.ndarray
+    comments: List[str]
+
+
+def parse_trajectory(content: bytes) -> ParsedTrajectory:
+    """
+    Parse multi-frame XYZ content into flat coordinate and symbol arrays.
+    Trajectories come from our own jobs, so only the layout is checked.
+    :raises XYZParseError: When the content is not multi-frame XYZ.
+    """
+    rows = []
+    offsets = [0]
+    comments = []
+    for frame_number, frame in enumerate(split_xyz_frames(content), start=1):
+        lines = frame.splitlines()
+        comments.append(lines[1].decode("utf-8", errors="replace").strip())
+        for line in lines[2:]:
+            row = line.split()
+            if len(row) < 4:
+                raise XYZParseError(
+                    f"Frame {frame_number}: expected a symbol and 3 coordinates"
+                )
+            rows.append(row[:4])
+        offsets.append(len(rows))
+
+    table = np.array(rows, dtype=np.bytes_)
+    try:
+        positions = table[:, 1:].astype(np.float32)
+    except ValueError:
+        raise XYZParseError("Trajectory coordinates must be numbers")
+    return ParsedTrajectory(
+        positions=positions,
+        symbols=table[:, 0].astype(_SYMBOL_DTYPE),
+        offsets=np.array(offsets, dtype=np.int64),
+        comments=comments,
+    )
+
+
+def write_trajectory(parsed: ParsedTrajectory, directory: Path) -> None:
+    def write_files(target: Path) -> None:
+        np.save(target / _POSITIONS_FILE, parsed.positions)
+        np.save(target / _SYMBOLS_FILE, parsed.symbols)
+        np.save(target / _OFFSETS_FILE, parsed.offsets)
+        (target / _COMMENTS_FILE).write_text(json.dumps(parsed.comments))
+
+    write_directory_atomically(directory, write_files)
+
+
+class Trajectory:
+    """
+    Read-only view of a stored trajectory. Coordinates and symbols are
+    memory-mapped, so reading a few frames only touches those pages.
+    """
+
+    def __init__(self, directory: Path):
+        self.positions = np.load(directory / _POSITIONS_FILE, mmap_mode="r")
+        self.symbols = np.load(directory / _SYMBOLS_FILE, mmap_mode="r")
+        self.offsets = np.load(directory / _OFFSETS_FILE)
+        self.comments = json.loads((directory / _COMMENTS_FILE).read_text())
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def frame(self, index: int) -> dict:
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return {
+            "index": index,
+            "comment": self.comments[index],
+            "symbols": np.char.decode(self.symbols[start:stop], "ascii").tolist(),
+            "positions": np.round(
+                self.positions[start:stop].astype(np.float64),
+                _COORDINATE_DECIMALS,
+            ).tolist(),
+        }
+
+    def frames(self, indices: range) -> List[dict]:
+        return [self.frame(index) for index in indices]
+
+
+class TrajectoryStore(ArtifactStore[ParsedTrajectory, Trajectory]):
+    def __init__(self, root: str, max_bytes: Optional[int] = DEFAULT_ARTIFACT_STORE_MAX_BYTES):
+        super().__init__(root, write_trajectory, Trajectory, max_bytes)
@@ -1,8 +1,6 @@
 import logging
-import shutil
 import uuid
-from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Optional, Tuple
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
@@ -26,6 +24,8 @@ MAX_USER_LIST_LIMIT = 100
 DEFAULT_GROUP_LIST_LIMIT = 25
 MAX_GROUP_LIST_LIMIT = 100
 
+MAX_BULK_ASSET_UPDATES = 500
+
 DEFAULT_SAVE_ERROR_DETAIL = "Could not save changes"
 DEFAULT_REFRESH_ERROR_DETAIL = (
     "Changes were saved, but the updated data could not be loaded"
@@ -117,14 +117,38 @@ def commit_or_rollback(
         ) from error
 
 
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range HTTP Range header such as "bytes=0-99", "bytes=100-"
+    or "bytes=-100" for a body of size bytes.
+    :return: (start, stop) with stop exclusive, or None when the whole body
+        should be sent, including for headers with several ranges.
+    :raises HTTPException: 416 when the range is outside the body.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header.removeprefix("bytes=").strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            stop = min(int(last) + 1, size) if last else size
+        else:
+            start, stop = max(size - int(last), 0), size
+    except ValueError:
+        return None
+
+    if start >= size or stop <= start:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, stop
+
+
 def get_user_sub(current_user) -> str:
     if isinstance(current_user, dict):
         user_sub = current_user.get("sub")
         if user_sub:
             return user_sub
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
-def clean_up_upload_cache(job_dir: str):
-    path = Path(job_dir)
-    if path.exists():
-        shutil.rmtree(path)
@@ -0,0 +1,160 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+
+class XYZParseError(ValueError):
+    pass
+
+
+# Element symbols in atomic number order, starting at hydrogen.
+ATOMIC_NUMBERS = {
+    symbol: atomic_number
+    for atomic_number, symbol in enumerate(
+        """
+        H He Li Be B C N O F Ne Na Mg Al Si P S Cl Ar K Ca Sc Ti V Cr Mn Fe Co Ni
+        Cu Zn Ga Ge As Se Br Kr Rb Sr Y Zr Nb Mo Tc Ru Rh Pd Ag Cd In Sn Sb Te I Xe
+        Cs Ba La Ce Pr Nd Pm Sm Eu Gd Tb Dy Ho Er Tm Yb Lu Hf Ta W Re Os Ir Pt Au Hg
+        Tl Pb Bi Po At Rn Fr Ra Ac Th Pa U Np Pu Am Cm Bk Cf Es Fm Md No Lr Rf Db Sg
+        Bh Hs Mt Ds Rg Cn Nh Fl Mc Lv Ts Og
+        """.split(),
+        start=1,
+    )
+}
+CHEMICAL_SYMBOLS = frozenset(ATOMIC_NUMBERS)
+
+
+def _frame_bounds(lines: List[bytes]) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the start and end line index of each frame. Each frame is an atom
+    count line, a comment line, and that many atom lines. Blank lines between
+    frames are ignored.
+    """
+    index = 0
+    while index < len(lines):
+        if not lines[index].strip():
+            index += 1
+            continue
+
+        try:
+            atom_count = int(lines[index].strip())
+        except ValueError:
+            raise XYZParseError(f"Invalid atom count on line {index + 1}")
+        if atom_count < 1:
+            raise XYZParseError(f"Invalid atom count on line {index + 1}")
+
+        end = index + atom_count + 2
+        if end > len(lines):
+            raise XYZParseError(
+                f"Frame starting on line {index + 1} has fewer than {atom_count} atoms"
+            )
+        yield index, end
+        index = end
+
+
+def split_xyz_frames(content: bytes) -> List[bytes]:
+    """
+    Split XYZ file content into one standalone XYZ document per frame.
+    """
+    lines = content.splitlines(keepends=True)
+    frames = [b"".join(lines[start:end]) for start, end in _frame_bounds(lines)]
+    if not frames:
+        raise XYZParseError("XYZ file is empty")
+    return frames
+
+
+def count_xyz_frames(content: bytes) -> int:
+    """
+    Count the frames of XYZ file content from its atom count lines, without
+    reading the atoms.
+    """
+    frame_count = sum(1 for _bounds in _frame_bounds(content.splitlines()))
+    if not frame_count:
+        raise XYZParseError("XYZ file is empty")
+    return frame_count
+
+
+def hill_formula(counts: Counter) -> str:
+    """
+    Format element counts in Hill order: C, then H, then the rest
+    alphabetically. Without carbon every element is alphabetical.
+    """
+    if "C" in counts:
+        symbols = ["C"] + (["H"] if "H" in counts else [])
+        symbols += sorted(symbol for symbol in counts if symbol not in ("C", "H"))
+    else:
+        symbols = sorted(counts)
+    return "".join(
+        symbol if counts[symbol] == 1 else f"{symbol}{counts[symbol]}"
+        for symbol in symbols
+    )
+
+
+@dataclass(frozen=True)
+class XYZSummary:
+    formula: str
+    atom_count: int
+    frame_count: int
+    # ((min_x, min_y, min_z), (max_x, max_y, max_z)) of the last frame.
+    bounding_box: Tuple[Tuple[float, float, float], Tuple[float, float, float]]
+
+
+def summarize_xyz(content: bytes) -> XYZSummary:
+    """
+    Validate XYZ content and summarize its last frame, as ase.io.read would
+    read it. Lines are scanned in place without building frames. Anything
+    other than plain element symbols followed by three coordinates raises
+    XYZParseError so callers can fall back to a full parser.
+    """
+    lines = content.splitlines()
+    counts = None
+    frame_count = 0
+    index = 0
+    while index < len(lines):
+        if not lines[index].strip():
+            index += 1
+            continue
+
+        try:
+            atom_count = int(lines[index])
+        except ValueError:
+            raise XYZParseError(f"Invalid atom count on line {index + 1}")
+        if atom_count < 1 or index + atom_count + 2 > len(lines):
+            raise XYZParseError(f"Invalid atom count on line {index + 1}")
+
+        counts = Counter()
+        lower = [float("inf")] * 3
+        upper = [float("-inf")] * 3
+        for line_number in range(index + 2, index + atom_count + 2):
+            fields = lines[line_number].split()
+            if len(fields) < 4:
+                raise XYZParseError(f"Invalid atom line {line_number + 1}")
+            symbol = fields[0].decode("ascii", errors="replace")
+            if symbol not in CHEMICAL_SYMBOLS:
+                raise XYZParseError(f"Unknown element {symbol!r} on line {line_number + 1}")
+            try:
+                position = (float(fields[1]), float(fields[2]), float(fields[3]))
+            except ValueError:
+                raise XYZParseError(f"Invalid coordinates on line {line_number + 1}")
+            counts[symbol] += 1
+            for axis, value in enumerate(position):
+                lower[axis] = min(lower[axis], value)
+                upper[axis] = max(upper[axis], value)
+        frame_count += 1
+        index += atom_count + 2
+
+    if counts is None:
+        raise XYZParseError("XYZ file is empty")
+    return XYZSummary(
+        formula=hill_formula(counts),
+        atom_count=sum(counts.values()),
+        frame_count=frame_count,
+        bounding_box=(tuple(lower), tuple(upper)),
+    )
+
+
+def xyz_formula(content: bytes) -> str:
+    """
+    Return the Hill-order formula of the last frame of XYZ content.
+    """
+    return summarize_xyz(content).formula
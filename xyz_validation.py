@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from xyz_parser import ATOMIC_NUMBERS, XYZParseError, split_xyz_frames
+
+# Closer nuclei than this (in angstrom) are treated as duplicated atoms; the
+# shortest real bond, H2, is about 0.74.
+MIN_INTERATOMIC_DISTANCE = 0.5
+
+# Upper bound on elements in one block of the pairwise distance matrix, so
+# large structures are checked in bounded memory.
+_DISTANCE_BLOCK_ELEMENTS = 4_000_000
+
+_SYMBOLS_BY_UPPER = {symbol.upper(): symbol for symbol in ATOMIC_NUMBERS}
+
+
+def _closest_pair(positions: np.ndarray) -> Optional[tuple[int, int, float]]:
+    """
+    Return (i, j, distance) of the closest pair of atoms, or None for one atom.
+    """
+    atom_count = len(positions)
+    if atom_count < 2:
+        return None
+
+    squared_norms = np.einsum("ij,ij->i", positions, positions)
+    block_size = max(1, _DISTANCE_BLOCK_ELEMENTS // atom_count)
+    best = (0, 1, np.inf)
+    for start in range(0, atom_count - 1, block_size):
+        block = positions[start:start + block_size]
+        squared = (
+            squared_norms[start:start + block_size, None]
+            + squared_norms[None, :]
+            - 2.0 * block @ positions.T
+        )
+        # Only pairs (i, j) with j > i count; this also masks the diagonal.
+        rows = np.arange(start, start + len(block))
+        squared[np.arange(atom_count)[None, :] <= rows[:, None]] = np.inf
+        index = np.unravel_index(np.argmin(squared), squared.shape)
+        if squared[index] < best[2]:
+            best = (start + int(index[0]), int(index[1]), float(squared[index]))
+    i, j, _squared = best
+    return i, j, float(np.linalg.norm(positions[i] - positions[j]))
+
+
+def _check_spin(atomic_numbers: np.ndarray, charge: int, multiplicity: int) -> None:
+    electrons = int(atomic_numbers.sum()) - charge
+    unpaired = multiplicity - 1
+    if multiplicity < 1:
+        raise XYZParseError("Multiplicity must be at least 1")
+    if electrons < 0:
+        raise XYZParseError(f"Charge {charge} leaves a negative number of electrons")
+    if unpaired > electrons or (electrons - unpaired) % 2:
+        raise XYZParseError(
+            f"Multiplicity {multiplicity} is impossible with {electrons} electrons"
+        )
+
+
+@dataclass
+class XYZFrame:
+    comment: str
+    symbols: List[str]
+    positions: np.ndarray
+
+
+def parse_xyz_frames(
+    content: bytes,
+    charge: Optional[int] = None,
+    multiplicity: Optional[int] = None,
+) -> List[XYZFrame]:
+    """
+    Parse and validate every frame of XYZ content. Every frame must have a
+    consistent atom count header, known elements, finite coordinates, and no
+    overlapping atoms. When charge and multiplicity are given, the electron
+    count must allow that multiplicity.
+    :raises XYZParseError: Describing the first problem found.
+    """
+    frames: List[XYZFrame] = []
+    for frame_number, frame in enumerate(split_xyz_frames(content), start=1):
+        lines = frame.splitlines()
+        comment = lines[1].decode("utf-8", errors="replace").strip()
+        rows = [line.split() for line in lines[2:]]
+        for row_number, row in enumerate(rows, start=1):
+            if len(row) < 4:
+                raise XYZParseError(
+                    f"Frame {frame_number}, atom {row_number}: "
+                    "expected a symbol and 3 coordinates"
+                )
+
+        symbols = []
+        for row_number, row in enumerate(rows, start=1):
+            raw_symbol = row[0].decode("ascii", errors="replace")
+            symbol = _SYMBOLS_BY_UPPER.get(raw_symbol.upper())
+            if symbol is None:
+                raise XYZParseError(
+                    f"Frame {frame_number}, atom {row_number}: "
+                    f"unknown element {raw_symbol!r}"
+                )
+            symbols.append(symbol)
+
+        try:
+            positions = np.array([row[1:4] for row in rows], dtype=np.bytes_).astype(np.float64)
+        except ValueError:
+            raise XYZParseError(f"Frame {frame_number}: coordinates must be numbers")
+        if not np.isfinite(positions).all():
+            raise XYZParseError(f"Frame {frame_number}: coordinates must be finite")
+
+        closest = _closest_pair(positions)
+        if closest is not None and closest[2] < MIN_INTERATOMIC_DISTANCE:
+            i, j, distance = closest
+            raise XYZParseError(
+                f"Frame {frame_number}: atoms {i + 1} and {j + 1} are {distance:.3f} A apart"
+            )
+
+        if charge is not None and multiplicity is not None:
+            _check_spin(
+                np.array([ATOMIC_NUMBERS[symbol] for symbol in symbols]),
+                charge,
+                multiplicity,
+            )
+
+        frames.append(XYZFrame(comment=comment, symbols=symbols, positions=positions))
+    return frames
+
+
+def format_xyz_frames(frames: List[XYZFrame]) -> bytes:
+    """
+    Write frames with LF line endings, canonical element symbols, coordinates
+    with eight decimals, and no extra columns.
+    """
+    return "".join(
+        "\n".join(
+            [str(len(frame.symbols)), frame.comment]
+            + [
+                f"{symbol} {x:.8f} {y:.8f} {z:.8f}"
+                for symbol, (x, y, z) in zip(frame.symbols, frame.positions.tolist())
+            ]
+        )
+        + "\n"
+        for frame in frames
+    ).encode()
+
+
+def normalize_xyz(
+    content: bytes,
+    charge: Optional[int] = None,
+    multiplicity: Optional[int] = None,
+) -> bytes:
+    """
+    Validate XYZ content with parse_xyz_frames and return it in the
+    normalized form written by format_xyz_frames.
+    :raises XYZParseError: Describing the first problem found.
+    """
+    return format_xyz_frames(parse_xyz_frames(content, charge, multiplicity))